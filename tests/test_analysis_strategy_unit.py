@@ -0,0 +1,272 @@
+"""Unit tests for running analysis strategies (common/analysis_strategy.py).
+
+Strategies are small stand-ins that sleep, fail, echo their input or
+count the records a DelegationScan feeds them.
+"""
+
+import pickle
+import threading
+import time
+import pytest
+from pathlib import Path
+
+from tools.common import analysis_strategy, metrics_service
+from tools.common.analysis_strategy import (
+    Accumulator,
+    AnalysisResult,
+    AnalysisStrategy,
+    CompositeAnalysisStrategy,
+    DelegationScan,
+    ScanningAnalysisStrategy,
+    run_strategies
+)
+from tools.common.metrics_service import MetricsMemo
+from tools.pipeline.analysis_runner import AnalysisRunner
+
+DATA = {'delegations': [{'agent_type': 'developer'}] * 3, 'sessions': []}
+
+
+class SleepStrategy(AnalysisStrategy):
+    def __init__(self, name: str, seconds: float = 0.0, fail: bool = False):
+        super().__init__()
+        self.name = name
+        self.seconds = seconds
+        self.fail = fail
+
+    def get_name(self) -> str:
+        return self.name
+
+    def analyze(self, data):
+        time.sleep(self.seconds)
+        if self.fail:
+            raise RuntimeError("boom")
+        return AnalysisResult(
+            name=self.name,
+            data={'delegations': len(data['delegations'])},
+            summary=f"{self.name} done"
+        )
+
+
+@pytest.mark.unit
+class TestRunStrategies:
+    """Test run_strategies() ordering, timings and failures."""
+
+    def test_results_keep_given_order(self):
+        strategies = [SleepStrategy('slow', 0.2), SleepStrategy('fast')]
+
+        results = run_strategies(strategies, DATA, workers=2)
+
+        assert [r.name for r in results] == ['slow', 'fast']
+        assert results[0].data == {'delegations': 3}
+
+    def test_wall_time_follows_slowest_strategy(self):
+        strategies = [SleepStrategy(f"s{i}", 0.5) for i in range(3)]
+        start = time.perf_counter()
+
+        results = run_strategies(strategies, DATA, workers=3)
+
+        assert time.perf_counter() - start < 1.25
+        assert all(r.metadata['timings']['wall_seconds'] >= 0.5 for r in results)
+
+    def test_failure_stays_in_its_result(self):
+        results = run_strategies([SleepStrategy('bad', fail=True), SleepStrategy('good')], DATA, workers=2)
+
+        assert 'boom' in results[0].errors[0]
+        assert results[1].errors == []
+
+    def test_single_worker_runs_in_process(self):
+        strategy = SleepStrategy('bad', fail=True)
+
+        run_strategies([strategy, SleepStrategy('good')], DATA, workers=1)
+
+        assert strategy._errors  # Recorded on this instance, not a forked copy
+
+    def test_runs_in_parallel_while_other_threads_run(self):
+        """Other live threads (e.g. the stage thread pool) rule out fork, not parallelism."""
+        release = threading.Event()
+        thread = threading.Thread(target=release.wait)
+        thread.start()
+        try:
+            strategies = [SleepStrategy(f"s{i}", 1.0) for i in range(3)]
+            start = time.perf_counter()
+            results = run_strategies(strategies, DATA, workers=3)
+            elapsed = time.perf_counter() - start
+        finally:
+            release.set()
+            thread.join()
+
+        assert elapsed < 2.5
+        assert [r.data for r in results] == [{'delegations': 3}] * 3
+
+    def test_unpicklable_data_runs_in_process_while_other_threads_run(self):
+        release = threading.Event()
+        thread = threading.Thread(target=release.wait)
+        thread.start()
+        try:
+            strategy = SleepStrategy('bad', fail=True)
+            data = dict(DATA, lock=threading.Lock())
+            run_strategies([strategy, SleepStrategy('good')], data, workers=2)
+        finally:
+            release.set()
+            thread.join()
+
+        assert strategy._errors  # Recorded on this instance, not a worker's copy
+
+    def test_nested_runs_keep_their_own_state(self):
+        """A composite running strategies inside a forked worker gets its own data."""
+        composite = CompositeAnalysisStrategy([SleepStrategy('inner-a'), SleepStrategy('inner-b')], workers=2)
+
+        results = run_strategies([composite, SleepStrategy('outer')], DATA, workers=2)
+
+        inner = results[0].data['results']
+        assert [r['data'] for r in inner.values()] == [{'delegations': 3}, {'delegations': 3}]
+        assert results[1].data == {'delegations': 3}
+        assert analysis_strategy._worker_state is None  # Only set inside workers
+
+
+@pytest.mark.unit
+class TestConcurrentCallers:
+    """Test the composite strategy and AnalysisRunner on top of run_strategies()."""
+
+    def test_registered_strategies_can_be_pickled_after_shared_scan(self):
+        """forkserver/spawn workers receive the strategies with their filled accumulators."""
+        strategies = list(AnalysisRunner()._registry.values())
+        delegation = {'agent_type': 'developer', 'tokens_in': 5, 'timestamp': '2025-09-15T10:00:00Z'}
+        data = {'delegations': [delegation], 'sessions': [{'session_id': 's1', 'delegations': [delegation]}]}
+        analysis_strategy._scan_together(strategies, data)
+
+        pickle.dumps((strategies, data))
+
+    def test_composite_collects_sub_results_in_order(self):
+        composite = CompositeAnalysisStrategy(
+            [SleepStrategy('a', 0.1), SleepStrategy('b', fail=True), SleepStrategy('c')], workers=3
+        )
+
+        result = composite.run(DATA)
+
+        assert list(result.data['results']) == ['a', 'b', 'c']
+        assert result.errors == ["Critical failure: boom"]
+        assert 'timings' in result.metadata
+
+    def test_runner_reports_in_registration_order(self, tmp_path: Path, capsys):
+        runner = AnalysisRunner(output_dir=tmp_path, workers=2)
+        runner._registry = {}
+        runner.register('slow', SleepStrategy('slow', 0.2))
+        runner.register('fast', SleepStrategy('fast'))
+
+        results = runner.run_multiple(['slow', 'missing', 'fast'], save=False, repository=FakeRepository())
+
+        assert list(results) == ['slow', 'missing', 'fast']
+        assert 'error' in results['missing']
+        assert results['fast']['metadata']['timings']['wall_seconds'] < 0.2
+        output = capsys.readouterr().out
+        assert output.index('Running: slow') < output.index('Running: fast')
+
+
+class FakeRepository:
+    def load_delegations(self, with_text=True):
+        return DATA['delegations']
+
+    def load_sessions(self, with_text=True):
+        return DATA['sessions']
+
+    def metrics_memo(self):
+        return MetricsMemo()
+
+
+class AgentCounter(Accumulator):
+    def __init__(self):
+        self.agents = []
+        self.sessions = 0
+
+    def visit_delegation(self, delegation, metrics):
+        self.agents.append(metrics['agent_type'])
+
+    def visit_session(self, session):
+        self.sessions += 1
+
+
+class CountingStrategy(ScanningAnalysisStrategy):
+    def __init__(self, name: str):
+        super().__init__()
+        self.name = name
+
+    def get_name(self) -> str:
+        return self.name
+
+    def create_accumulators(self):
+        return {'counter': AgentCounter()}
+
+    def summarize(self, data, accumulators):
+        counter = accumulators['counter']
+        return AnalysisResult(
+            name=self.name,
+            data={'agents': counter.agents, 'sessions': counter.sessions},
+            summary="counted"
+        )
+
+
+@pytest.fixture
+def normalized(monkeypatch):
+    """Delegations normalized (not served from a memo) by scans."""
+    calls = []
+    normalize = metrics_service._normalize
+
+    def counting_normalize(delegation):
+        calls.append(delegation)
+        return normalize(delegation)
+
+    monkeypatch.setattr(metrics_service, '_normalize', counting_normalize)
+    return calls
+
+
+@pytest.mark.unit
+class TestDelegationScan:
+    """Test the single-pass accumulator engine."""
+
+    def test_accumulators_share_one_normalization(self, normalized):
+        scan = DelegationScan()
+        first, second = scan.add(AgentCounter()), scan.add(AgentCounter())
+
+        scan.run({**DATA, 'sessions': [{'delegations': []}]})
+
+        assert first.agents == second.agents == ['developer'] * 3
+        assert first.sessions == 1
+        assert len(normalized) == 3
+
+    def test_session_only_accumulator_skips_delegations(self, normalized):
+        class SessionCounter(Accumulator):
+            sessions = 0
+
+            def visit_session(self, session):
+                self.sessions += 1
+
+        scan = DelegationScan()
+        counter = scan.add(SessionCounter())
+        scan.run({**DATA, 'sessions': [{}, {}]})
+
+        assert counter.sessions == 2
+        assert normalized == []
+
+    def test_strategies_share_one_pass(self, normalized):
+        results = run_strategies([CountingStrategy('a'), CountingStrategy('b')], DATA, workers=1)
+
+        assert [r.data['agents'] for r in results] == [['developer'] * 3] * 2
+        assert len(normalized) == 3
+
+    def test_later_scans_reuse_the_dataset_memo(self, normalized):
+        delegations = [{'tool_use_id': f'toolu_{i}', 'agent_type': 'developer'} for i in range(3)]
+        data = {'delegations': delegations, 'sessions': [], 'metrics_memo': MetricsMemo()}
+
+        first = CountingStrategy('a').run(data)
+        second = CountingStrategy('b').run(data)
+
+        assert first.data['agents'] == second.data['agents'] == ['developer'] * 3
+        assert len(normalized) == 3
+
+    def test_standalone_run_scans_its_data(self, normalized):
+        strategy = CountingStrategy('a')
+
+        assert strategy.run(DATA).data['agents'] == ['developer'] * 3
+        assert strategy.run({'delegations': [{'agent_type': 'tester'}]}).data['agents'] == ['tester']
+        assert len(normalized) == 4
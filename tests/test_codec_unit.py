@@ -0,0 +1,94 @@
+"""Unit tests for the JSON codec (common/codec.py).
+
+Every available backend must behave like the stdlib for the pipeline.
+"""
+
+import json
+import pytest
+
+from tools.common import codec
+
+BACKENDS = ['stdlib'] + [
+    name for name, module in (('orjson', codec.orjson), ('msgspec', codec.msgspec))
+    if module is not None
+]
+
+SAMPLE = {
+    'session_id': 'abc',
+    'delegations': [{'agent_type': 'développeur', 'tokens_in': 12, 'success': True}],
+    'top_agents': [('developer', 3)],
+    'ratio': 0.25,
+    'missing': None,
+}
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """Run a test once per installed backend."""
+    monkeypatch.setattr(codec, 'BACKEND', request.param)
+    return request.param
+
+
+@pytest.mark.unit
+class TestCodec:
+    """Test decode/encode parity across backends."""
+
+    def test_roundtrip_matches_stdlib(self, backend):
+        """Encoded output should decode back to the stdlib result."""
+        encoded = codec.dumps(SAMPLE)
+        assert codec.loads(encoded) == json.loads(json.dumps(SAMPLE))
+
+    def test_pretty_and_compact_output(self, backend):
+        """Pretty output is indented, compact output has no whitespace."""
+        pretty = codec.dumps({'a': [1, 2]}, pretty=True)
+        compact = codec.dumps({'a': [1, 2]}, pretty=False)
+
+        assert pretty == json.dumps({'a': [1, 2]}, indent=2).encode()
+        assert compact == b'{"a":[1,2]}'
+
+    def test_set_pretty_switch_changes_default(self, backend, monkeypatch):
+        """set_pretty(False) should make compact the default."""
+        monkeypatch.setattr(codec, 'PRETTY', True)
+        codec.set_pretty(False)
+
+        assert codec.dumps({'a': 1}) == b'{"a":1}'
+
+    def test_invalid_json_raises_json_decode_error(self, backend):
+        """All backends surface the same exception type."""
+        with pytest.raises(codec.JSONDecodeError):
+            codec.loads(b'{"truncated": ')
+
+    def test_unsupported_type_raises_type_error(self, backend):
+        """Unsupported objects fail the same way as with the stdlib."""
+        with pytest.raises(TypeError):
+            codec.dumps({'value': object()})
+
+    def test_file_roundtrip(self, backend, tmp_path):
+        """dump_file/load_file should round-trip through disk."""
+        path = tmp_path / 'out.json'
+        codec.dump_file(SAMPLE, path)
+
+        assert codec.load_file(path) == json.loads(json.dumps(SAMPLE))
+
+    def test_stdlib_output_matches_json_dump(self, monkeypatch):
+        """The stdlib path keeps json.dump's ASCII-escaped bytes."""
+        monkeypatch.setattr(codec, 'BACKEND', 'stdlib')
+
+        assert codec.dumps(SAMPLE, pretty=True) == json.dumps(SAMPLE, indent=2).encode()
+        assert b'\\u00e9' in codec.dumps(SAMPLE, pretty=False)
+
+    def test_ensure_ascii_matches_stdlib_on_every_backend(self, backend):
+        """Escaping follows json.dumps whichever backend encodes."""
+        sample = {'text': 'café ✓ 𝄞', 'plain': 'ascii'}
+
+        assert codec.loads(codec.dumps(sample)) == sample
+        assert codec.dumps(sample, pretty=False) == json.dumps(sample, separators=(',', ':')).encode()
+        assert codec.dumps(sample, pretty=False, ensure_ascii=False) == json.dumps(
+            sample, separators=(',', ':'), ensure_ascii=False
+        ).encode('utf-8')
+
+    def test_dump_file_passes_ensure_ascii(self, backend, tmp_path):
+        path = tmp_path / 'out.json'
+        codec.dump_file({'text': 'café'}, path, pretty=False, ensure_ascii=False)
+
+        assert path.read_bytes() == '{"text":"café"}'.encode('utf-8')
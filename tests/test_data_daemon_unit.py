@@ -0,0 +1,148 @@
+"""Unit tests for the parsed-data daemon (common/data_daemon.py).
+
+The daemon serves a small enriched sessions file from a temporary
+directory on a background thread.
+"""
+
+import json
+import shutil
+import tempfile
+import threading
+import time
+import pytest
+from pathlib import Path
+
+from tools.common import data_daemon, data_repository
+from tools.common.data_daemon import DaemonUnavailable, DataDaemon
+from tools.common.data_repository import DataLoadError, DataRepository
+
+SESSIONS = {
+    'sessions': [
+        {'session_id': 's1', 'message_count': 4, 'delegations': [
+            {'agent_type': 'developer', 'success': True, 'tokens_in': 10},
+            {'agent_type': 'solution-architect', 'success': False, 'tokens_in': 20},
+        ]},
+        {'session_id': 's2', 'message_count': 2, 'delegations': [
+            {'agent_type': 'developer', 'success': False, 'tokens_in': 30},
+        ]},
+    ]
+}
+
+
+def write_sessions(base: Path, document: dict) -> None:
+    (base / 'data').mkdir(exist_ok=True)
+    (base / 'data' / 'enriched_sessions_data.json').write_text(json.dumps(document))
+
+
+@pytest.fixture
+def base_path():
+    """Short temporary root (Unix socket paths are limited to ~100 bytes)."""
+    path = Path(tempfile.mkdtemp(prefix='dd', dir='/tmp'))
+    write_sessions(path, SESSIONS)
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def daemon(base_path: Path, monkeypatch):
+    """Daemon serving base_path; module functions target the same root."""
+    monkeypatch.delenv(data_daemon.DAEMON_ENV, raising=False)
+    monkeypatch.setattr(data_repository, '_repository', DataRepository(base_path=base_path))
+    daemon = DataDaemon(DataRepository(base_path=base_path))
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if daemon.path.exists():
+            break
+        time.sleep(0.01)
+    yield daemon
+    daemon.shutdown()
+    thread.join(timeout=5)
+
+
+@pytest.mark.unit
+class TestDaemonRequests:
+    """Test module-level functions answered by a running daemon."""
+
+    def test_loads_match_local_repository(self, daemon, base_path: Path):
+        local = DataRepository(base_path=base_path)
+
+        assert data_repository.load_delegations() == local.load_delegations()
+        assert data_repository.load_sessions() == local.load_sessions()
+        assert data_repository.get_session('s2') == local.get_session('s2')
+        assert daemon.stats['requests'] == 3
+
+    def test_repeated_load_reuses_response(self, daemon):
+        data_repository.load_delegations()
+        data_repository.load_delegations()
+
+        assert daemon.stats['cache_hits'] == 1
+
+    def test_rewritten_file_is_reloaded(self, daemon, base_path: Path):
+        data_repository.load_delegations()
+        write_sessions(base_path, {'sessions': SESSIONS['sessions'][:1]})
+
+        assert len(data_repository.load_delegations()) == 2
+
+    def test_query(self, daemon):
+        result = data_repository.query_delegations({'agent_type': 'developer'}, fields=['session_id', 'tokens_in'])
+
+        assert result == [{'session_id': 's1', 'tokens_in': 10}, {'session_id': 's2', 'tokens_in': 30}]
+
+    def test_errors_are_reraised(self, daemon):
+        with pytest.raises(DataLoadError):
+            data_repository.load_agent_calls()
+        with pytest.raises(ValueError):
+            data_repository.load_routing_patterns('unknown')
+
+    def test_disabled_by_environment(self, daemon, monkeypatch):
+        monkeypatch.setenv(data_daemon.DAEMON_ENV, 'off')
+
+        assert len(data_repository.load_delegations()) == 3
+        assert daemon.stats['requests'] == 0
+
+
+@pytest.mark.unit
+class TestWithoutDaemon:
+    """Test fallback and socket handling when no daemon runs."""
+
+    def test_functions_load_locally(self, base_path: Path, monkeypatch):
+        monkeypatch.setattr(data_repository, '_repository', DataRepository(base_path=base_path))
+
+        with pytest.raises(DaemonUnavailable):
+            data_daemon.request('ping', path=data_daemon.socket_path(base_path))
+        assert len(data_repository.load_delegations()) == 3
+
+    def test_stale_socket_is_replaced(self, base_path: Path):
+        path = data_daemon.socket_path(base_path)
+        path.parent.mkdir(parents=True)
+        path.touch()
+        daemon = DataDaemon(DataRepository(base_path=base_path))
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+
+        for _ in range(100):
+            try:
+                assert data_daemon.request('ping', path=path)['base_path'] == str(base_path)
+                break
+            except DaemonUnavailable:
+                time.sleep(0.01)
+        else:
+            pytest.fail("Daemon did not start on a stale socket path")
+
+        daemon.shutdown()
+        thread.join(timeout=5)
+        assert not path.exists()
+
+
+@pytest.mark.unit
+class TestQueryDelegations:
+    """Test DataRepository.query_delegations() filtering."""
+
+    def test_any_of_values_and_limit(self, base_path: Path):
+        repo = DataRepository(base_path=base_path)
+
+        assert len(repo.query_delegations({'success': [True, False]})) == 3
+        assert len(repo.query_delegations({'agent_type': 'developer'}, limit=1)) == 1
+        assert repo.query_delegations({'agent_type': 'developer', 'success': False},
+                                      fields=['tokens_in']) == [{'tokens_in': 30}]
@@ -0,0 +1,105 @@
+"""Unit tests for the columnar delegation table (common/delegation_table.py)."""
+
+import pytest
+from collections import Counter
+from pathlib import Path
+
+from tools.common.data_repository import DataRepository, DataLoadError
+from tools.common.delegation_table import DelegationTable, NULL_TIMESTAMP
+
+SESSIONS = [
+    {'session_id': 's1', 'delegations': [
+        {'timestamp': '2025-09-15T10:00:00Z', 'agent_type': 'developer', 'tokens_in': 100,
+         'tokens_out': 10, 'cache_read': 5, 'success': True, 'is_error': False,
+         'sequence_number': 1, 'prompt_length': 42},
+        {'timestamp': '2025-09-15T10:05:00.250Z', 'agent_type': 'architect', 'tokens_in': 200,
+         'tokens_out': 20, 'cache_read': 0, 'success': False, 'is_error': True,
+         'sequence_number': 2, 'prompt_length': 7},
+    ]},
+    {'session_id': 's2', 'delegations': [
+        {'timestamp': None, 'agent_type': 'developer', 'tokens_in': 50, 'tokens_out': None,
+         'sequence_number': 1, 'prompt_length': 0},
+    ]},
+]
+
+
+@pytest.mark.unit
+class TestDelegationTable:
+    """Test building, aggregating and persisting the table."""
+
+    def test_columns_are_typed_and_encoded(self):
+        """Dictionary columns decode back, missing values get sentinels."""
+        table = DelegationTable.from_sessions(SESSIONS)
+
+        assert len(table) == 3
+        assert table.values('session_id') == ['s1', 's1', 's2']
+        assert table.values('agent_type') == ['developer', 'architect', 'developer']
+        assert table.values('timestamp') == [1757930400000, 1757930700250, NULL_TIMESTAMP]
+        assert table.values('success') == [1, 0, -1]
+        assert table.values('tokens_out') == [10, 20, 0]
+
+    def test_group_sum_matches_dict_aggregation(self):
+        """Vectorized totals equal a plain loop over delegation dicts."""
+        table = DelegationTable.from_sessions(SESSIONS)
+
+        expected = Counter()
+        for session in SESSIONS:
+            for delegation in session['delegations']:
+                expected[delegation['agent_type']] += delegation['tokens_in']
+
+        assert table.group_sum('tokens_in') == dict(expected)
+        assert table.group_count() == {'developer': 2, 'architect': 1}
+
+    def test_save_load_roundtrip(self, tmp_path: Path):
+        """A saved table loads back with identical columns."""
+        table = DelegationTable.from_sessions(SESSIONS)
+        table.save(tmp_path / 'table.bin')
+
+        loaded = DelegationTable.load(tmp_path / 'table.bin')
+
+        assert loaded.columns == table.columns
+        assert loaded.dictionaries == table.dictionaries
+
+    def test_empty_table_roundtrip(self, tmp_path: Path):
+        """No delegations still produces a readable file."""
+        DelegationTable.from_sessions([]).save(tmp_path / 'table.bin')
+
+        assert len(DelegationTable.load(tmp_path / 'table.bin')) == 0
+
+    def test_save_replaces_file(self, tmp_path: Path):
+        """A rewrite swaps in a new inode and leaves no temporary file."""
+        path = tmp_path / 'table.bin'
+        DelegationTable.from_sessions([]).save(path)
+        previous = path.stat().st_ino
+
+        DelegationTable.from_sessions(SESSIONS).save(path)
+
+        assert path.stat().st_ino != previous
+        assert [p.name for p in tmp_path.iterdir()] == ['table.bin']
+        assert len(DelegationTable.load(path)) == len(DelegationTable.from_sessions(SESSIONS))
+
+
+@pytest.mark.unit
+class TestRepositoryDelegationTable:
+    """Test DataRepository.load_delegation_table()."""
+
+    def test_loads_and_caches_table(self, tmp_path: Path):
+        (tmp_path / 'data').mkdir()
+        DelegationTable.from_sessions(SESSIONS).save(tmp_path / 'data' / 'delegation_table.bin')
+        repo = DataRepository(base_path=tmp_path)
+
+        table = repo.load_delegation_table()
+
+        assert len(table) == 3
+        assert repo.load_delegation_table() is table
+
+    def test_missing_table_raises(self, tmp_path: Path):
+        with pytest.raises(DataLoadError):
+            DataRepository(base_path=tmp_path).load_delegation_table()
+
+    def test_invalid_table_raises(self, tmp_path: Path):
+        (tmp_path / 'data').mkdir()
+        (tmp_path / 'data' / 'delegation_table.bin').write_bytes(b'{"not": "a table"}')
+
+        with pytest.raises(DataLoadError):
+            DataRepository(base_path=tmp_path).load_delegation_table()
@@ -0,0 +1,109 @@
+"""Unit tests for the enriched extraction writer (pipeline/extract_enriched_data.py).
+
+Outputs are redirected to a temporary directory.
+"""
+
+import gc
+import weakref
+import pytest
+from pathlib import Path
+
+from tools.common import codec
+from tools.common.sessions_file import SessionsFileWriter
+from tools.common.text_store import open_text_store
+from tools.pipeline import extract_enriched_data
+
+
+class Message(dict):
+    """Message dict that can be weakly referenced."""
+
+
+def delegation_messages(session_id: str, tool_id: str) -> list:
+    """A Task call, its result and the assistant's synthesis."""
+    base = {'sessionId': session_id}
+    return [
+        {**base, 'type': 'assistant', 'timestamp': '2025-09-15T11:00:01Z',
+         'message': {'content': [{'type': 'tool_use', 'name': 'Task', 'id': tool_id,
+                                  'input': {'subagent_type': 'developer', 'prompt': f'prompt {session_id}'}}]}},
+        {**base, 'type': 'user', 'timestamp': '2025-09-15T11:00:02Z',
+         'message': {'content': [{'type': 'tool_result', 'tool_use_id': tool_id,
+                                  'content': f'result {session_id}'}]}},
+        {**base, 'type': 'assistant', 'timestamp': '2025-09-15T11:00:03Z',
+         'message': {'content': [{'type': 'text', 'text': 'summary'}]}},
+    ]
+
+
+@pytest.fixture
+def outputs(tmp_path: Path, monkeypatch) -> Path:
+    """Point every enriched output at a temporary directory."""
+    for name, filename in (
+        ('ENRICHED_SESSIONS_FILE', 'enriched_sessions_data.json'),
+        ('ENRICHED_SESSIONS_INDEX_FILE', 'enriched_sessions_data.idx.json'),
+        ('ENRICHED_SESSIONS_FRAME_FILE', 'enriched_sessions.frame'),
+        ('DELEGATION_TABLE_FILE', 'delegation_table.bin'),
+        ('TEXT_BLOBS_FILE', 'enriched_texts.bin'),
+    ):
+        monkeypatch.setattr(extract_enriched_data, name, tmp_path / filename)
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestWriteEnrichedData:
+    """Test the enriched outputs and the order they are published in."""
+
+    def test_blobs_are_replaced_before_sessions_file(self, outputs: Path, monkeypatch):
+        """When the sessions file is published, its text_refs resolve."""
+        resolved = []
+        finish = SessionsFileWriter.finish
+
+        def checking_finish(self, metadata):
+            store = open_text_store(outputs / 'enriched_sessions_data.json', metadata)
+            resolved.append(store.get([0, len('prompt s1')]))
+            return finish(self, metadata)
+
+        monkeypatch.setattr(SessionsFileWriter, 'finish', checking_finish)
+
+        extract_enriched_data.write_enriched_data([('s1', delegation_messages('s1', 'toolu_1'))])
+
+        assert resolved == ['prompt s1']
+        data = codec.load_file(outputs / 'enriched_sessions_data.json')
+        delegation = data['sessions'][0]['delegations'][0]
+        assert open_text_store(outputs / 'enriched_sessions_data.json', data).get(
+            delegation['text_refs']['result_full']
+        ) == 'result s1'
+
+    def test_streamed_sessions_are_released(self, outputs: Path):
+        """Messages of a written session are not kept while later ones stream."""
+        refs, released = [], []
+
+        def stream():
+            for number, session_id in enumerate(('s1', 's2', 's3')):
+                if number == 2:
+                    gc.collect()
+                    released.append(all(ref() is None for ref in refs[0]))
+                messages = [Message(msg) for msg in delegation_messages(session_id, f'toolu_{number}')]
+                refs.append([weakref.ref(msg) for msg in messages])
+                yield session_id, messages
+                del messages
+
+        extract_enriched_data.write_enriched_data(stream())
+
+        assert released == [True]
+        data = codec.load_file(outputs / 'enriched_sessions_data.json')
+        assert [session['session_id'] for session in data['sessions']] == ['s1', 's2', 's3']
+        assert data['total_sessions_scanned'] == 3
+
+    def test_failed_stream_keeps_previous_outputs(self, outputs: Path):
+        extract_enriched_data.write_enriched_data([('s1', delegation_messages('s1', 'toolu_1'))])
+        before = (outputs / 'enriched_texts.bin').read_bytes()
+
+        def failing():
+            yield 's2', delegation_messages('s2', 'toolu_2')
+            raise OSError('disk gone')
+
+        with pytest.raises(OSError):
+            extract_enriched_data.write_enriched_data(failing())
+
+        assert (outputs / 'enriched_texts.bin').read_bytes() == before
+        data = codec.load_file(outputs / 'enriched_sessions_data.json')
+        assert [session['session_id'] for session in data['sessions']] == ['s1']
@@ -0,0 +1,177 @@
+"""Unit tests for the fused extractor (pipeline/extract_sessions.py).
+
+Projections are replaced by recorders so no output files are written.
+"""
+
+import json
+import sys
+import pytest
+from pathlib import Path
+
+from tools.common import config
+from tools.common.config import RuntimeConfig
+from tools.pipeline import extract_all_sessions, extract_sessions, file_scan_cache
+
+SESSIONS = {
+    's1': [{'sessionId': 's1', 'cwd': '/work/alpha', 'timestamp': '2025-09-15T10:00:00Z'}],
+    's2': [{'sessionId': 's2', 'cwd': '/work/beta', 'timestamp': '2025-09-16T10:00:00Z'}],
+}
+
+
+class Recorder:
+    """Projection keeping what it was fed."""
+
+    def __init__(self, log: list, name: str):
+        self.log = log
+        self.name = name
+        self.sessions = {}
+
+    def add_session(self, session_id, messages):
+        self.log.append((self.name, 'add', session_id))
+        self.sessions[session_id] = messages
+
+    def finish(self):
+        self.log.append((self.name, 'finish'))
+
+    def close(self):
+        self.log.append((self.name, 'close'))
+
+
+@pytest.fixture
+def projections(monkeypatch) -> dict:
+    """Isolated projection registry."""
+    registry = {}
+    monkeypatch.setattr(extract_sessions, 'PROJECTIONS', registry)
+    monkeypatch.setattr(extract_sessions, 'FILTERED_PROJECTIONS', set())
+    return registry
+
+
+def write_projects(tmp_path: Path, folders: dict) -> Path:
+    """Write one session file per folder: folder -> (cwd, session_id, timestamps)."""
+    projects = tmp_path / 'projects'
+    for folder, (cwd, session_id, timestamps) in folders.items():
+        (projects / folder).mkdir(parents=True)
+        (projects / folder / f'{session_id}.jsonl').write_text(''.join(
+            json.dumps({'sessionId': session_id, 'type': 'user', 'cwd': cwd, 'timestamp': timestamp}) + '\n'
+            for timestamp in timestamps
+        ))
+    return projects
+
+
+def register_recorders(log: list, *names: str) -> dict:
+    """Register a Recorder per name; returns name -> recorder once built."""
+    built = {}
+    for name in names:
+        extract_sessions.register_projection(
+            name, lambda runtime_config, name=name: built.setdefault(name, Recorder(log, name))
+        )
+    return built
+
+
+@pytest.mark.unit
+class TestProjections:
+    """Test registering and running projections."""
+
+    def test_projections_share_one_scan(self, projections, monkeypatch, tmp_path: Path):
+        """main() scans once and streams each session to every projection."""
+        scans, log = [], []
+        monkeypatch.setattr(extract_sessions, 'resolve_projects_dir', lambda config: tmp_path)
+        monkeypatch.setattr(extract_sessions, 'stream_sessions',
+                            lambda *a, **kw: scans.append(a) or iter(SESSIONS.items()))
+        monkeypatch.setattr(sys, 'argv', ['extract_sessions.py'])
+        built = register_recorders(log, 'first', 'second')
+
+        extract_sessions.main()
+
+        assert len(scans) == 1
+        assert log == [
+            ('first', 'add', 's1'), ('second', 'add', 's1'),
+            ('first', 'add', 's2'), ('second', 'add', 's2'),
+            ('first', 'finish'), ('second', 'finish'),
+            ('second', 'close'), ('first', 'close'),
+        ]
+        assert built['first'].sessions['s1'] is SESSIONS['s1']
+        assert built['second'].sessions['s1'] is SESSIONS['s1']
+
+    def test_run_selected_projection(self, projections):
+        log = []
+        register_recorders(log, 'first', 'second')
+
+        scanned = extract_sessions.run_projections(iter(SESSIONS.items()), RuntimeConfig(), ['second'])
+
+        assert scanned == 2
+        assert {entry[0] for entry in log} == {'second'}
+
+    def test_unknown_projection_raises(self, projections):
+        with pytest.raises(KeyError):
+            extract_sessions.run_projections(iter(SESSIONS.items()), RuntimeConfig(), ['missing'])
+
+    def test_failed_scan_closes_without_finishing(self, projections):
+        """Projections are closed (and so discard partial output) on errors."""
+        log = []
+        register_recorders(log, 'first')
+
+        def failing_scan():
+            yield 's1', SESSIONS['s1']
+            raise OSError('disk gone')
+
+        with pytest.raises(OSError):
+            extract_sessions.run_projections(failing_scan(), RuntimeConfig())
+
+        assert log == [('first', 'add', 's1'), ('first', 'close')]
+
+    def test_pipeline_run_pushes_filters_into_scan(self, projections, monkeypatch, tmp_path: Path):
+        """Only a run of filtered projections reads just the filtered project's files."""
+        projects = write_projects(tmp_path, {
+            '-work-alpha': ('/work/alpha', 's1', ['2025-09-15T10:00:00Z']),
+            '-work-beta': ('/work/beta', 's2', ['2025-09-15T10:00:00Z']),
+        })
+        read, log = [], []
+        original = file_scan_cache.read_jsonl_from
+        monkeypatch.setattr(file_scan_cache, 'read_jsonl_from', lambda path, *a: read.append(Path(path).name) or original(path, *a))
+        monkeypatch.setattr(file_scan_cache, 'CACHE_DIR', tmp_path / 'cache')
+        monkeypatch.setattr(extract_sessions, 'resolve_projects_dir', lambda runtime_config: projects)
+        monkeypatch.setattr(config, '_runtime_config', RuntimeConfig(project_filter='alpha'))
+        built = register_recorders(log, 'enriched')
+        extract_sessions.register_projection(
+            'sessions', lambda runtime_config: built.setdefault('sessions', Recorder(log, 'sessions')), filtered=True
+        )
+
+        extract_sessions.run(use_cache=False, names=['sessions'])
+        assert read == ['s1.jsonl']
+
+        read.clear()
+        extract_sessions.run(use_cache=False)
+        # The enriched projection is unfiltered, so nothing is skipped
+        assert sorted(read) == ['s1.jsonl', 's2.jsonl']
+        assert list(built['enriched'].sessions) == ['s1', 's2']
+
+    def test_fused_sessions_output_matches_standalone(self, projections, monkeypatch, tmp_path: Path):
+        """Next to the unfiltered enriched projection, SESSIONS_DATA_FILE keeps its date floor."""
+        projects = write_projects(tmp_path, {
+            '-work-alpha': ('/work/alpha', 's1', ['2025-07-01T10:00:00Z', '2025-09-15T10:00:00Z']),
+            '-work-beta': ('/work/beta', 's2', ['2025-07-02T10:00:00Z']),
+        })
+        csv_path = tmp_path / 'agent_calls.csv'
+        csv_path.write_text('session_id\ns1\ns2\n')
+        output = tmp_path / 'sessions_data.json'
+        monkeypatch.setattr(file_scan_cache, 'CACHE_DIR', tmp_path / 'cache')
+        monkeypatch.setattr(extract_all_sessions, 'AGENT_CALLS_CSV', csv_path)
+        monkeypatch.setattr(extract_all_sessions, 'SESSIONS_DATA_FILE', output)
+        monkeypatch.setattr(extract_all_sessions, 'resolve_projects_dir', lambda runtime_config: projects)
+        monkeypatch.setattr(extract_sessions, 'resolve_projects_dir', lambda runtime_config: projects)
+        monkeypatch.setattr(config, '_runtime_config', RuntimeConfig())
+        log = []
+        built = register_recorders(log, 'enriched')
+        extract_sessions.register_projection('sessions', extract_all_sessions.SessionsDataWriter, filtered=True)
+
+        extract_sessions.run()
+        fused = json.loads(output.read_text())
+        extract_all_sessions.main()
+        standalone = json.loads(output.read_text())
+
+        assert list(built['enriched'].sessions) == ['s1', 's2']
+        for document in (fused, standalone):
+            del document['extraction_date']
+        assert fused == standalone
+        assert [(s['session_id'], s['message_count']) for s in fused['sessions']] == [('s1', 1)]
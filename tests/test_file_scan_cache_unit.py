@@ -0,0 +1,431 @@
+"""Unit tests for the per-file scan cache (pipeline/file_scan_cache.py).
+
+Uses a synthetic projects tree in a temporary directory.
+"""
+
+import json
+import os
+import pytest
+from pathlib import Path
+
+from tools.pipeline import file_scan_cache
+from tools.pipeline.jsonl_prefilter import materialize
+
+
+def write_session(path: Path, session_id: str, count: int, start: int = 0) -> None:
+    """Append `count` messages for a session to a JSONL file."""
+    with open(path, 'a') as f:
+        for i in range(start, start + count):
+            f.write(json.dumps({
+                'sessionId': session_id,
+                'type': 'user',
+                'timestamp': f'2025-09-15T10:{i:02d}:00Z'
+            }) + '\n')
+
+
+@pytest.fixture
+def projects_tree(tmp_path: Path, monkeypatch) -> Path:
+    """Projects dir with two project folders and an isolated cache dir."""
+    monkeypatch.setattr(file_scan_cache, 'CACHE_DIR', tmp_path / 'cache')
+
+    projects = tmp_path / 'projects'
+    (projects / 'proj-a').mkdir(parents=True)
+    (projects / 'proj-b').mkdir(parents=True)
+    write_session(projects / 'proj-a' / 's1.jsonl', 's1', 3)
+    write_session(projects / 'proj-b' / 's2.jsonl', 's2', 2)
+    return projects
+
+
+@pytest.fixture
+def parse_calls(monkeypatch) -> list:
+    """Record which files get read (fully or from an offset)."""
+    calls = []
+    original = file_scan_cache.read_jsonl_from
+
+    def recording_read(path, start=0, *args):
+        calls.append(Path(path).name)
+        return original(path, start, *args)
+
+    monkeypatch.setattr(file_scan_cache, 'read_jsonl_from', recording_read)
+    return calls
+
+
+@pytest.mark.unit
+class TestIncrementalScan:
+    """Test that only new or changed files are re-parsed."""
+
+    def test_cold_scan_parses_all_files(self, projects_tree, parse_calls):
+        """First scan should parse every file and fill the cache."""
+        sessions = file_scan_cache.scan_sessions(projects_tree)
+
+        assert sorted(parse_calls) == ['s1.jsonl', 's2.jsonl']
+        assert len(sessions['s1']) == 3
+        assert len(sessions['s2']) == 2
+        assert file_scan_cache.is_cache_valid(projects_tree)
+
+    def test_warm_scan_parses_nothing(self, projects_tree, parse_calls):
+        """Unchanged tree should be served entirely from cache."""
+        first = file_scan_cache.scan_sessions(projects_tree)
+        parse_calls.clear()
+
+        second = file_scan_cache.scan_sessions(projects_tree)
+
+        assert parse_calls == []
+        assert first == second
+
+    def test_changed_file_is_only_one_reparsed(self, projects_tree, parse_calls):
+        """A grown file should be re-parsed and merged with cached ones."""
+        file_scan_cache.scan_sessions(projects_tree)
+        parse_calls.clear()
+
+        write_session(projects_tree / 'proj-a' / 's1.jsonl', 's1', 2, start=3)
+        sessions = file_scan_cache.scan_sessions(projects_tree)
+
+        assert parse_calls == ['s1.jsonl']
+        assert len(sessions['s1']) == 5
+        assert len(sessions['s2']) == 2
+
+    def test_new_and_removed_files(self, projects_tree, parse_calls):
+        """New files are parsed, deleted files drop out of the result."""
+        file_scan_cache.scan_sessions(projects_tree)
+        parse_calls.clear()
+
+        write_session(projects_tree / 'proj-b' / 's3.jsonl', 's3', 1)
+        os.remove(projects_tree / 'proj-a' / 's1.jsonl')
+        sessions = file_scan_cache.scan_sessions(projects_tree)
+
+        assert parse_calls == ['s3.jsonl']
+        assert set(sessions) == {'s2', 's3'}
+
+    def test_no_cache_mode_leaves_no_cache_file(self, projects_tree):
+        """use_cache=False should neither read nor write the cache."""
+        file_scan_cache.scan_sessions(projects_tree, use_cache=False)
+
+        assert not file_scan_cache.get_cache_file(projects_tree).exists()
+
+
+@pytest.mark.unit
+class TestTailReading:
+    """Test append-only resumption from the stored byte offset."""
+
+    def _entry(self, path: Path):
+        meta = {'size': path.stat().st_size, 'mtime': path.stat().st_mtime}
+        entry, mode = file_scan_cache.refresh_entry(path, None, meta)
+        return entry, mode
+
+    def _refresh(self, path: Path, entry):
+        meta = {'size': path.stat().st_size, 'mtime': path.stat().st_mtime}
+        return file_scan_cache.refresh_entry(path, entry, meta)
+
+    def test_grown_file_parses_only_appended_lines(self, tmp_path, monkeypatch):
+        """Appending 20 lines should cost 20 decodes, not a full re-read."""
+        path = tmp_path / 'marathon.jsonl'
+        write_session(path, 's1', 50)
+        entry, mode = self._entry(path)
+        assert mode == 'full'
+
+        decoded = []
+        original_loads = file_scan_cache.codec.loads
+        monkeypatch.setattr(file_scan_cache.codec, 'loads',
+                            lambda raw: decoded.append(raw) or original_loads(raw))
+
+        write_session(path, 's1', 20, start=50)
+        entry, mode = self._refresh(path, entry)
+
+        assert mode == 'tail'
+        assert len(decoded) == 20
+        assert len(entry['messages']) == 70
+        assert entry['offset'] == path.stat().st_size
+
+    def test_truncated_file_is_fully_reread(self, tmp_path):
+        """A file shorter than the consumed offset must be re-read."""
+        path = tmp_path / 's.jsonl'
+        write_session(path, 's1', 10)
+        entry, _ = self._entry(path)
+
+        path.write_text('')
+        write_session(path, 's1', 3)
+        entry, mode = self._refresh(path, entry)
+
+        assert mode == 'full'
+        assert len(entry['messages']) == 3
+
+    def test_rewritten_file_is_fully_reread(self, tmp_path):
+        """Changed content under the stored offset invalidates the tail."""
+        path = tmp_path / 's.jsonl'
+        write_session(path, 's1', 5)
+        entry, _ = self._entry(path)
+
+        path.write_text('')
+        write_session(path, 'other', 8)
+        entry, mode = self._refresh(path, entry)
+
+        assert mode == 'full'
+        assert {m['sessionId'] for m in entry['messages']} == {'other'}
+
+    def test_partial_last_line_is_left_for_next_read(self, tmp_path):
+        """A half-written trailing line should be picked up once complete."""
+        path = tmp_path / 's.jsonl'
+        write_session(path, 's1', 2)
+        line = json.dumps({'sessionId': 's1', 'timestamp': '2025-09-15T11:00:00Z'})
+        with open(path, 'a') as f:
+            f.write(line[:10])
+        entry, _ = self._entry(path)
+        assert len(entry['messages']) == 2
+
+        with open(path, 'a') as f:
+            f.write(line[10:] + '\n')
+        entry, mode = self._refresh(path, entry)
+
+        assert mode == 'tail'
+        assert len(entry['messages']) == 3
+
+
+@pytest.mark.unit
+class TestStreaming:
+    """Test yielding sessions one at a time from the scanned entries."""
+
+    def test_stream_matches_merged_sessions(self, projects_tree):
+        """A session split over files is yielded once, in merge order."""
+        write_session(projects_tree / 'proj-b' / 'cont.jsonl', 's1', 2, start=10)
+        write_session(projects_tree / 'proj-b' / 'cont.jsonl', 's3', 1)
+
+        streamed = list(file_scan_cache.stream_sessions(projects_tree, use_cache=False))
+
+        assert len(streamed) == len({session_id for session_id, _ in streamed})
+        assert dict(streamed) == file_scan_cache.scan_sessions(projects_tree, use_cache=False)
+        assert [session_id for session_id, _ in streamed] == ['s1', 's3', 's2']
+        assert len(dict(streamed)['s1']) == 5
+
+    def test_files_are_released_as_sessions_are_consumed(self):
+        def entry(*session_ids):
+            return {'messages': [{'sessionId': session_id} for session_id in session_ids]}
+
+        entries = {'a.jsonl': entry('s1'), 'b.jsonl': entry('s2', 's3'), 'c.jsonl': entry('s3')}
+        sessions = file_scan_cache.iter_sessions(entries)
+
+        assert next(sessions)[0] == 's1'
+        assert 'a.jsonl' not in entries
+        assert next(sessions)[0] == 's2'
+        assert [len(msgs) for session_id, msgs in sessions] == [2]
+        assert entries == {}
+
+
+@pytest.mark.unit
+class TestParallelScan:
+    """Test process-pool scanning and worker-side filtering."""
+
+    def test_parallel_scan_matches_serial(self, projects_tree):
+        """Sharding files across workers should not change the result."""
+        for i in range(6):
+            write_session(projects_tree / 'proj-b' / f'x{i}.jsonl', f'x{i}', 4)
+
+        serial = file_scan_cache.scan_sessions(projects_tree, use_cache=False)
+        parallel = file_scan_cache.scan_sessions(projects_tree, use_cache=False, workers=3)
+
+        assert parallel == serial
+        assert list(parallel) == list(serial)
+
+    def test_parallel_scan_from_threaded_process(self, projects_tree, monkeypatch):
+        """Scanning from a worker thread must not fork the threaded process."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        contexts = []
+        original = file_scan_cache.multiprocessing.get_context
+
+        def recording_context(method=None):
+            contexts.append(method)
+            return original(method)
+
+        monkeypatch.setattr(file_scan_cache.multiprocessing, 'get_context', recording_context)
+        for i in range(4):
+            write_session(projects_tree / 'proj-b' / f'x{i}.jsonl', f'x{i}', 2)
+
+        with ThreadPoolExecutor(max_workers=2) as threads:
+            parallel = threads.submit(
+                file_scan_cache.scan_sessions, projects_tree, use_cache=False, workers=2
+            ).result()
+
+        assert parallel == file_scan_cache.scan_sessions(projects_tree, use_cache=False)
+        assert contexts and 'fork' not in contexts
+
+    def test_runtime_filters_applied_with_and_without_cache(self, projects_tree):
+        """Project/date filters should give the same result on both paths."""
+        from tools.common.config import RuntimeConfig
+
+        config = RuntimeConfig(start_date='2025-09-15', end_date='2025-09-15')
+        with open(projects_tree / 'proj-a' / 'old.jsonl', 'w') as f:
+            f.write(json.dumps({'sessionId': 'old', 'timestamp': '2025-08-01T10:00:00Z'}) + '\n')
+
+        uncached = file_scan_cache.scan_sessions(
+            projects_tree, use_cache=False, workers=2, runtime_config=config
+        )
+        cached = file_scan_cache.scan_sessions(projects_tree, runtime_config=config)
+
+        assert uncached == cached
+        assert set(cached) == {'s1', 's2'}
+
+
+def write_delegation(path: Path, session_id: str, tool_id: str, minute: int) -> None:
+    """Append a user prompt, a Task call, its result and a synthesis."""
+    base = {'sessionId': session_id, 'cwd': '/work/proj-a'}
+    lines = [
+        {**base, 'type': 'user', 'timestamp': f'2025-09-15T11:{minute:02d}:00Z',
+         'message': {'role': 'user', 'content': 'please review'}},
+        {**base, 'type': 'assistant', 'timestamp': f'2025-09-15T11:{minute:02d}:01Z',
+         'message': {'content': [{'type': 'tool_use', 'name': 'Task', 'id': tool_id,
+                                  'input': {'subagent_type': 'developer', 'prompt': 'go'}}]}},
+        {**base, 'type': 'user', 'timestamp': f'2025-09-15T11:{minute:02d}:02Z',
+         'message': {'content': [{'type': 'tool_result', 'tool_use_id': tool_id,
+                                  'content': 'done'}]}},
+        {**base, 'type': 'assistant', 'timestamp': f'2025-09-15T11:{minute:02d}:03Z',
+         'message': {'content': [{'type': 'text', 'text': 'summary'}]}},
+    ]
+    with open(path, 'a') as f:
+        for line in lines:
+            f.write(json.dumps(line) + '\n')
+
+
+@pytest.mark.unit
+class TestPrefilter:
+    """Test that only Task calls and their results are decoded."""
+
+    @pytest.fixture
+    def session_file(self, projects_tree) -> Path:
+        path = projects_tree / 'proj-a' / 'd1.jsonl'
+        write_delegation(path, 'd1', 'toolu_1', 0)
+        return path
+
+    def test_light_records_materialize_to_full_messages(self, session_file):
+        """Skipped lines keep metadata and decode back to the original."""
+        full = file_scan_cache.read_jsonl_from(session_file)['messages']
+        light = file_scan_cache.read_jsonl_from(session_file, prefilter=True)['messages']
+
+        assert len(light) == len(full)
+        assert [materialize(msg) for msg in light] == full
+        for msg, original in zip(light, full):
+            for key in ('sessionId', 'type', 'timestamp', 'cwd'):
+                assert msg[key] == original[key]
+
+    def test_only_task_lines_are_decoded(self, session_file, monkeypatch):
+        """The Task call and its tool_result are the only decoded lines."""
+        decoded = []
+        original_loads = file_scan_cache.codec.loads
+        monkeypatch.setattr(file_scan_cache.codec, 'loads',
+                            lambda raw: decoded.append(raw) or original_loads(raw))
+
+        result = file_scan_cache.read_jsonl_from(session_file, prefilter=True)
+
+        assert len(decoded) == 2
+        assert result['pending_ids'] == []
+
+    def test_pending_ids_carry_over_tail_reads(self, session_file):
+        """A result appended later is still decoded when resuming."""
+        with open(session_file, 'a') as f:
+            f.write(json.dumps({
+                'sessionId': 'd1', 'type': 'assistant', 'timestamp': '2025-09-15T12:00:00Z',
+                'message': {'content': [{'type': 'tool_use', 'name': 'Task', 'id': 'toolu_2'}]}
+            }) + '\n')
+        meta = {'size': session_file.stat().st_size, 'mtime': session_file.stat().st_mtime}
+        entry, _ = file_scan_cache.refresh_entry(session_file, None, meta, prefilter=True)
+        assert entry['pending_ids'] == ['toolu_2']
+
+        with open(session_file, 'a') as f:
+            f.write(json.dumps({
+                'sessionId': 'd1', 'type': 'user', 'timestamp': '2025-09-15T12:00:05Z',
+                'message': {'content': [{'type': 'tool_result', 'tool_use_id': 'toolu_2'}]}
+            }) + '\n')
+        meta = {'size': session_file.stat().st_size, 'mtime': session_file.stat().st_mtime}
+        entry, mode = file_scan_cache.refresh_entry(session_file, entry, meta, prefilter=True)
+
+        assert mode == 'tail'
+        assert entry['pending_ids'] == []
+        assert 'message' in entry['messages'][-1]
+
+    def test_ambiguous_lines_are_decoded(self, projects_tree):
+        """Nested keys that would confuse the byte scan force a full decode."""
+        path = projects_tree / 'proj-a' / 'n1.jsonl'
+        with open(path, 'w') as f:
+            f.write(json.dumps({
+                'sessionId': 'n1', 'type': 'user', 'timestamp': '2025-09-15T12:00:00Z',
+                'toolUseResult': {'timestamp': '2020-01-01T00:00:00Z'}
+            }) + '\n')
+
+        msg = file_scan_cache.read_jsonl_from(path, prefilter=True)['messages'][0]
+
+        assert msg['timestamp'] == '2025-09-15T12:00:00Z'
+        assert '_ref' not in msg
+
+    def test_prefilter_uses_separate_cache(self, projects_tree):
+        """Light and full entries never share a cache file."""
+        file_scan_cache.scan_sessions(projects_tree, prefilter=True)
+
+        assert file_scan_cache.is_cache_valid(projects_tree, prefilter=True)
+        assert not file_scan_cache.get_cache_file(projects_tree).exists()
+
+
+def write_messages(path: Path, session_id: str, cwd: str, days: list) -> None:
+    """One message per day (YYYY-MM-DD) for a session in a given working directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        for day in days:
+            f.write(json.dumps({'sessionId': session_id, 'cwd': cwd, 'timestamp': f'{day}T10:00:00Z'}) + '\n')
+
+
+@pytest.mark.unit
+class TestPredicatePushdown:
+    """Test that filtered scans skip folders and files that cannot match."""
+
+    @pytest.fixture
+    def tree(self, tmp_path: Path, monkeypatch) -> Path:
+        monkeypatch.setattr(file_scan_cache, 'CACHE_DIR', tmp_path / 'cache')
+        projects = tmp_path / 'projects'
+        write_messages(projects / '-home-me-my-app' / 'a.jsonl', 'a', '/home/me/my_app', ['2025-09-14', '2025-09-15'])
+        write_messages(projects / '-home-me-my-app' / 'late.jsonl', 'late', '/home/me/my_app', ['2025-10-01'])
+        write_messages(projects / '-home-me-my-app' / 'old.jsonl', 'old', '/home/me/my_app', ['2025-08-01'])
+        os.utime(projects / '-home-me-my-app' / 'old.jsonl', (1754042400, 1754042400))  # 2025-08-01
+        write_messages(projects / '-home-me-other' / 'b.jsonl', 'b', '/home/me/other', ['2025-09-15'])
+        return projects
+
+    def filtered_full_scan(self, tree: Path, config) -> dict:
+        return file_scan_cache.filter_sessions(file_scan_cache.scan_sessions(tree, use_cache=False), config)
+
+    def test_only_matching_files_are_read(self, tree, parse_calls):
+        from tools.common.config import RuntimeConfig
+
+        config = RuntimeConfig(project_filter='my_app', start_date='2025-09-15', end_date='2025-09-20')
+        expected = self.filtered_full_scan(tree, config)
+        parse_calls.clear()
+
+        sessions = file_scan_cache.scan_sessions(tree, runtime_config=config)
+
+        assert sessions == expected
+        assert set(sessions) == {'a'}
+        assert parse_calls == ['a.jsonl']
+
+    def test_cached_span_skips_files_unopened(self, tree, parse_calls, monkeypatch):
+        from tools.common.config import RuntimeConfig
+
+        file_scan_cache.scan_sessions(tree)
+        parse_calls.clear()
+        monkeypatch.setattr(file_scan_cache, 'read_first_timestamp', lambda path: pytest.fail("file opened"))
+
+        config = RuntimeConfig(start_date='2025-09-20', end_date='2025-10-31')
+        sessions = file_scan_cache.scan_sessions(tree, runtime_config=config)
+
+        assert set(sessions) == {'late'}
+        assert parse_calls == []
+
+    def test_skipped_entries_stay_cached(self, tree, parse_calls, capsys):
+        from tools.common.config import RuntimeConfig
+
+        file_scan_cache.scan_sessions(tree)
+        write_messages(tree / '-home-me-my-app' / 'a.jsonl', 'a', '/home/me/my_app', ['2025-09-16'])
+        file_scan_cache.scan_sessions(tree, runtime_config=RuntimeConfig(project_filter='my-app'))
+        parse_calls.clear()
+
+        sessions = file_scan_cache.scan_sessions(tree)
+
+        assert parse_calls == []
+        assert set(sessions) == {'a', 'b', 'late', 'old'}
+        assert '0 removed' in capsys.readouterr().out
@@ -0,0 +1,108 @@
+"""Unit tests for normalized delegation metrics (common/metrics_service.py)."""
+
+import gc
+import weakref
+
+import pytest
+
+from tools.common import metrics_service
+from tools.common.metrics_service import (
+    DelegationMetrics,
+    MetricsMemo,
+    calculate_token_totals,
+    extract_delegation_metrics,
+    extract_session_metrics,
+    normalized_metrics
+)
+
+ENRICHED = {'agent_type': 'developer', 'tokens_in': 1000, 'tokens_out': 500,
+            'cache_read': 250, 'timestamp': '2025-09-10T10:00:00Z'}
+RAW = {'message': {'usage': {'input_tokens': 200, 'output_tokens': 0, 'cache_creation_input_tokens': 40},
+                   'content': [{'type': 'tool_use', 'name': 'Task', 'input': {'subagent_type': 'tester'}}]},
+       'stop': '2025-09-11T08:00:00Z'}
+
+
+@pytest.mark.unit
+class TestNormalizedMetrics:
+    """Test the per-delegation record."""
+
+    def test_enriched_format(self):
+        metrics = normalized_metrics(ENRICHED)
+
+        assert (metrics.agent_type, metrics.total_tokens) == ('developer', 1500)
+        assert metrics.amplification_ratio == 0.5
+        assert metrics.cache_hit_rate == 0.25
+        assert metrics['timestamp'] == '2025-09-10T10:00:00Z'
+
+    def test_raw_format(self):
+        metrics = normalized_metrics(RAW)
+
+        assert metrics.agent_type == 'tester'
+        assert metrics.cache_write_tokens == 40
+        assert metrics.timestamp == '2025-09-11T08:00:00Z'
+        assert metrics.cost_usd == pytest.approx((200 * 3.00 + 40 * 3.75) / 1_000_000)
+
+    def test_no_reference_is_kept(self):
+        class Record(dict):
+            pass
+
+        delegation = Record(ENRICHED)
+        ref = weakref.ref(delegation)
+        calculate_token_totals([delegation])
+        extract_session_metrics({'delegations': [delegation]})
+
+        del delegation
+        gc.collect()
+        assert ref() is None
+
+    def test_memo_normalizes_each_delegation_once(self, monkeypatch):
+        """Every metrics function reads the record of the first call, even from a copy."""
+        calls = []
+        normalize = metrics_service._normalize
+        monkeypatch.setattr(metrics_service, '_normalize', lambda d: calls.append(d) or normalize(d))
+        delegation = dict(ENRICHED, tool_use_id='toolu_1')
+        memo = MetricsMemo()
+
+        first = normalized_metrics(delegation, memo)
+        extract_delegation_metrics(delegation, memo)
+        calculate_token_totals([dict(delegation)], memo)
+        extract_session_metrics({'delegations': [delegation]}, memo)
+
+        assert normalized_metrics(dict(delegation), memo) is first
+        assert len(calls) == 1
+
+    def test_memo_skips_delegations_without_uuid(self):
+        memo = MetricsMemo()
+
+        assert normalized_metrics(ENRICHED, memo) is not normalized_metrics(ENRICHED, memo)
+        assert len(memo) == 0
+
+    def test_extract_returns_independent_dict(self):
+        metrics = extract_delegation_metrics(ENRICHED)
+        metrics['input_tokens'] = 0
+
+        assert set(metrics) == set(DelegationMetrics.FIELDS)
+        assert normalized_metrics(ENRICHED).input_tokens == 1000
+
+    def test_unknown_key(self):
+        with pytest.raises(KeyError):
+            normalized_metrics(ENRICHED)['tokens_in']
+        assert normalized_metrics(ENRICHED).get('tokens_in', 0) == 0
+
+
+@pytest.mark.unit
+class TestAggregates:
+    """Test metrics functions reading the shared records."""
+
+    def test_session_metrics(self):
+        result = extract_session_metrics({'session_id': 's1', 'delegations': [ENRICHED, RAW]})
+
+        assert result['total_input_tokens'] == 1200
+        assert result['avg_amplification_ratio'] == 0.5
+        assert result['agent_counts'] == {'developer': 1, 'tester': 1}
+
+    def test_token_totals(self):
+        totals = calculate_token_totals([ENRICHED, RAW])
+
+        assert totals['total_tokens'] == 1700
+        assert totals['global_cache_efficiency'] == 250 / 1200
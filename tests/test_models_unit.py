@@ -6,16 +6,22 @@ Following CLAUDE.md guidelines:
 - No external dependencies
 """
 
+import pickle
+import random
 import pytest
 from decimal import Decimal
 from datetime import datetime
+from pathlib import Path
+from tools.common.text_store import TextBlobStore, TextBlobWriter
 from tools.common.models import (
     TokenMetrics,
     Delegation,
+    DelegationBatch,
     Session,
     Period,
     AgentCall,
-    ValidationError
+    ValidationError,
+    round_cost_units
 )
 
 
@@ -76,6 +82,28 @@ class TestTokenMetrics:
         assert isinstance(cost, Decimal)
         assert cost == Decimal("22.05")  # 3 + 15 + 3.75 + 0.30
 
+    def test_integer_cost_matches_decimal_pricing(self):
+        """Integer cost equals the Decimal formula, digits and exponent included."""
+        rng = random.Random(0)
+        for _ in range(2000):
+            counts = [rng.choice([0, rng.randrange(100), rng.randrange(10**7)]) for _ in range(4)]
+            expected = (
+                Decimal(counts[0]) / Decimal("1000000") * Decimal("3.00") +
+                Decimal(counts[1]) / Decimal("1000000") * Decimal("15.00") +
+                Decimal(counts[2]) / Decimal("1000000") * Decimal("3.75") +
+                Decimal(counts[3]) / Decimal("1000000") * Decimal("0.30")
+            ).quantize(Decimal("0.0001"))
+
+            cost = TokenMetrics(*counts).total_cost()
+
+            assert cost.as_tuple() == expected.as_tuple()
+
+    def test_cost_rounds_ties_to_even(self):
+        assert round_cost_units(5000) == 0
+        assert round_cost_units(15000) == 2
+        assert round_cost_units(15001) == 2
+        assert round_cost_units(24999) == 2
+
     def test_cache_efficiency_calculation(self):
         """Should calculate cache hit ratio correctly."""
         # 50% cache hit
@@ -230,6 +258,18 @@ class TestDelegation:
         assert deleg.prompt == 'Design a scalable system'
         assert deleg.success is True
 
+    def test_delegation_is_slotted_and_interns_shared_strings(self, minimal_delegation: dict):
+        """Delegations carry no __dict__ and share agent/session strings."""
+        first = Delegation.from_dict(minimal_delegation)
+        second = Delegation.from_dict({key: ''.join(value) if isinstance(value, str) else value
+                                       for key, value in minimal_delegation.items()})
+
+        assert not hasattr(first, '__dict__')
+        assert not hasattr(first.tokens, '__dict__')
+        assert first.agent_type is second.agent_type
+        assert first.session_id is second.session_id
+        assert pickle.loads(pickle.dumps(first)) == first
+
 
 @pytest.mark.unit
 class TestSession:
@@ -435,3 +475,54 @@ class TestValidationErrors:
                 start_date='2025-09-01',
                 end_date='2025-09-30'
             )
+
+
+@pytest.mark.unit
+class TestDelegationBatch:
+    """Test column-oriented DelegationBatch."""
+
+    def test_views_equal_delegations(self, minimal_delegation: dict, complete_delegation: dict):
+        """Items rebuild the same Delegation as from_dict()."""
+        data = [minimal_delegation, complete_delegation]
+        batch = DelegationBatch.from_dicts(data)
+
+        assert len(batch) == 2
+        assert list(batch) == [Delegation.from_dict(d) for d in data]
+        assert batch[-1].prompt == 'Design a scalable system'
+        assert batch[0].success is None
+        assert batch[0:1] == [Delegation.from_dict(minimal_delegation)]
+        with pytest.raises(IndexError):
+            batch[2]
+
+    def test_aggregates_read_columns(self, minimal_delegation: dict, complete_delegation: dict):
+        batch = DelegationBatch.from_dicts([minimal_delegation, complete_delegation])
+
+        assert batch.total_tokens() == sum(d.total_tokens() for d in batch)
+        assert batch.token_totals()['cache_read_tokens'] == 10000
+        assert batch.agent_counts() == {'developer': 1, 'solution-architect': 1}
+
+    def test_cost_rollups(self, minimal_delegation: dict, complete_delegation: dict):
+        """Rollups sum rounded per-delegation costs like Session.total_cost()."""
+        data = [minimal_delegation, complete_delegation, dict(complete_delegation, timestamp='2025-10-01T09:00:00Z')]
+        batch = DelegationBatch.from_dicts(data)
+        costs = [Delegation.from_dict(d).cost() for d in data]
+        period = Period(period_id='P1', name='September', start_date='2025-09-01', end_date='2025-09-30')
+
+        assert batch.total_cost() == sum(costs)
+        assert batch.cost_by_agent() == {'developer': costs[0], 'solution-architect': costs[1] + costs[2]}
+        assert sum(batch.cost_by_session().values()) == sum(costs)
+        assert batch.cost_by_period([period]) == {'P1': costs[0] + costs[1]}
+
+    def test_views_read_text_lazily(self, minimal_delegation: dict, tmp_path: Path):
+        delegation = dict(minimal_delegation, prompt='Long prompt', result_full=None)
+        with TextBlobWriter(tmp_path / 'texts.bin') as writer:
+            writer.externalize(delegation)
+        store = TextBlobStore(tmp_path / 'texts.bin')
+
+        batch = DelegationBatch.from_dicts([delegation], text_store=store)
+
+        assert batch[0].prompt is None
+        assert not store.is_open
+        assert batch[0].prompt_text() == 'Long prompt'
+        assert batch[0].get_text('result_full') is None
+        assert batch[0].to_dict()['prompt'] == 'Long prompt'
@@ -0,0 +1,74 @@
+"""Unit tests for period classification (common/period_index.py).
+
+Results are checked against the linear scan the pipeline stages used
+before, on overlapping and gapped period definitions.
+"""
+
+import random
+import pytest
+from datetime import date, datetime, timedelta
+
+from tools.common.models import Period
+from tools.common.period_index import PeriodIndex
+
+PERIODS = {
+    'P2': {'name': 'Early', 'start': '2025-09-03', 'end': '2025-09-11'},
+    'P3': {'name': 'Middle', 'start': '2025-09-10', 'end': '2025-09-20'},  # Overlaps P2
+    'P4': {'name': 'Late', 'start': '2025-09-25', 'end': '2025-10-06'},  # Gap before
+}
+
+
+def linear_scan(timestamp: str, periods: dict):
+    day = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).date()
+    for period_id, meta in periods.items():
+        if datetime.fromisoformat(meta['start']).date() <= day <= datetime.fromisoformat(meta['end']).date():
+            return period_id
+    return None
+
+
+@pytest.mark.unit
+class TestPeriodIndex:
+    """Test lookups against the linear scan."""
+
+    def test_matches_linear_scan(self):
+        index = PeriodIndex(PERIODS)
+        rng = random.Random(0)
+        for _ in range(500):
+            day = date(2025, 8, 25) + timedelta(days=rng.randrange(50))
+            timestamp = f"{day.isoformat()}T{rng.randrange(24):02d}:15:00.000Z"
+
+            assert index.classify(timestamp) == linear_scan(timestamp, PERIODS)
+
+    def test_boundaries_are_inclusive_and_first_period_wins(self):
+        index = PeriodIndex(PERIODS)
+
+        assert index.classify('2025-09-02T23:59:59Z') is None
+        assert index.classify('2025-09-03') == 'P2'
+        assert index.classify('2025-09-11T12:00:00Z') == 'P2'
+        assert index.classify('2025-09-12 08:00:00') == 'P3'
+        assert index.classify('2025-09-21T00:00:00Z') is None
+        assert index.classify('2025-10-06T23:00:00+02:00') == 'P4'
+        assert index.classify('2025-10-07T00:00:00Z') is None
+
+    def test_days_are_parsed_once_per_date(self):
+        index = PeriodIndex(PERIODS)
+
+        index.classify('2025-09-15T10:00:00Z')
+        index.classify('2025-09-15T11:00:00Z')
+
+        assert index._days == {'2025-09-15': date(2025, 9, 15).toordinal()}
+
+    def test_invalid_timestamps_raise(self):
+        index = PeriodIndex(PERIODS)
+
+        with pytest.raises(ValueError):
+            index.classify('')
+        with pytest.raises(ValueError):
+            index.classify('not-a-date')
+
+    def test_classify_many_and_from_periods(self):
+        periods = [Period.from_dict({'period_id': pid, **meta}) for pid, meta in PERIODS.items()]
+        timestamps = ['2025-09-10T09:00:00Z', '2025-09-22T09:00:00Z', '2025-09-10T10:00:00Z', '20250926']
+
+        assert PeriodIndex.from_periods(periods).classify_many(timestamps) == ['P2', None, 'P2', 'P4']
+        assert PeriodIndex({}).classify('2025-09-10') is None
@@ -0,0 +1,225 @@
+"""Unit tests for in-process and scheduled stage execution (pipeline/run_analysis_pipeline.py).
+
+Stages use temporary output files and recording callables.
+"""
+
+import json
+import threading
+import pytest
+from pathlib import Path
+
+from tools.common.data_repository import DataRepository
+from tools.common.metrics_service import normalized_metrics
+from tools.pipeline import run_analysis_pipeline
+from tools.pipeline.run_analysis_pipeline import PipelineOrchestrator, PipelineStage, StageDefinition
+from tools.pipeline.stage_manifest import StageManifest
+
+
+def make_stage(tmp_path: Path, stage: PipelineStage, depends_on=()) -> StageDefinition:
+    return StageDefinition(
+        stage=stage,
+        name=stage.value,
+        description="test stage",
+        scripts=["tools/pipeline/does_not_exist.py"],
+        produces=[tmp_path / f"{stage.value}.out"],
+        requires=[],
+        depends_on=list(depends_on)
+    )
+
+
+@pytest.fixture(autouse=True)
+def manifest(tmp_path: Path, monkeypatch) -> StageManifest:
+    """Keep stage fingerprints out of the real data directory."""
+    manifest = StageManifest(tmp_path / 'stage_manifest.json')
+    monkeypatch.setattr(run_analysis_pipeline, 'StageManifest', lambda path: manifest)
+    return manifest
+
+
+@pytest.fixture
+def callables(monkeypatch) -> dict:
+    """Isolated stage callable registry."""
+    registry = {}
+    monkeypatch.setattr(run_analysis_pipeline, 'STAGE_CALLABLES', registry)
+    return registry
+
+
+@pytest.mark.unit
+class TestInProcessStages:
+    """Test running stages through registered callables."""
+
+    def test_callables_share_one_repository(self, callables, tmp_path: Path):
+        seen = []
+        run_analysis_pipeline.register_stage_callable(PipelineStage.ENRICHMENT, seen.append)
+        run_analysis_pipeline.register_stage_callable(PipelineStage.SEGMENTATION, seen.append)
+        repository = DataRepository(base_path=tmp_path)
+        orchestrator = PipelineOrchestrator(verbose=False, force=True, repository=repository)
+
+        assert orchestrator.execute_stage(make_stage(tmp_path, PipelineStage.ENRICHMENT))
+        assert orchestrator.execute_stage(make_stage(tmp_path, PipelineStage.SEGMENTATION))
+
+        assert seen == [repository, repository]
+
+    def test_string_entry_points_are_imported(self, callables, tmp_path: Path):
+        run_analysis_pipeline.register_stage_callable(PipelineStage.ENRICHMENT, 'json:dumps')
+
+        assert run_analysis_pipeline.resolve_stage_callable(callables[PipelineStage.ENRICHMENT][0]) is json.dumps
+
+    def test_failing_callable_fails_stage(self, callables, tmp_path: Path):
+        def broken(repository):
+            raise ValueError("boom")
+
+        run_analysis_pipeline.register_stage_callable(PipelineStage.ENRICHMENT, broken)
+        orchestrator = PipelineOrchestrator(verbose=False, force=True)
+
+        assert not orchestrator.execute_stage(make_stage(tmp_path, PipelineStage.ENRICHMENT))
+
+    def test_subprocess_fallback(self, callables, monkeypatch, tmp_path: Path):
+        """Stages without callables, or with in_process=False, run scripts."""
+        ran = []
+        monkeypatch.setattr(PipelineOrchestrator, '_run_script', lambda self, script: ran.append(script) or True)
+        run_analysis_pipeline.register_stage_callable(PipelineStage.ENRICHMENT, lambda repository: None)
+
+        PipelineOrchestrator(verbose=False, force=True).execute_stage(make_stage(tmp_path, PipelineStage.SEGMENTATION))
+        PipelineOrchestrator(verbose=False, force=True, in_process=False).execute_stage(
+            make_stage(tmp_path, PipelineStage.ENRICHMENT)
+        )
+
+        assert ran == ["tools/pipeline/does_not_exist.py"] * 2
+
+
+@pytest.fixture
+def dag(tmp_path: Path, monkeypatch) -> dict:
+    """EXTRACTION -> (ENRICHMENT, SEGMENTATION) -> ANALYSIS, writing to tmp_path."""
+    definitions = {
+        PipelineStage.EXTRACTION: make_stage(tmp_path, PipelineStage.EXTRACTION),
+        PipelineStage.ENRICHMENT: make_stage(tmp_path, PipelineStage.ENRICHMENT, [PipelineStage.EXTRACTION]),
+        PipelineStage.SEGMENTATION: make_stage(tmp_path, PipelineStage.SEGMENTATION, [PipelineStage.EXTRACTION]),
+        PipelineStage.ANALYSIS: make_stage(tmp_path, PipelineStage.ANALYSIS, [PipelineStage.ENRICHMENT]),
+    }
+    monkeypatch.setattr(run_analysis_pipeline, 'STAGE_DEFINITIONS', definitions)
+    return definitions
+
+
+@pytest.mark.unit
+class TestScheduler:
+    """Test dependency-driven concurrent stage execution."""
+
+    def register(self, dag: dict, stage: PipelineStage, events: list, wait=None):
+        def unit(repository):
+            if wait is not None:
+                wait()
+            events.append(stage)
+            dag[stage].produces[0].touch()
+        run_analysis_pipeline.register_stage_callable(stage, unit)
+
+    def test_independent_stages_overlap(self, callables, dag):
+        """ENRICHMENT and SEGMENTATION only finish if they run at the same time."""
+        events = []
+        barrier = threading.Barrier(2, timeout=5)
+        self.register(dag, PipelineStage.EXTRACTION, events)
+        self.register(dag, PipelineStage.ENRICHMENT, events, barrier.wait)
+        self.register(dag, PipelineStage.SEGMENTATION, events, barrier.wait)
+        self.register(dag, PipelineStage.ANALYSIS, events)
+
+        orchestrator = PipelineOrchestrator(verbose=False, force=True, max_workers=2)
+
+        assert orchestrator._run_scheduled(list(dag))
+        assert events[0] == PipelineStage.EXTRACTION
+        assert events.index(PipelineStage.ANALYSIS) > events.index(PipelineStage.ENRICHMENT)
+
+    def test_scripts_within_stage_overlap(self, callables, dag):
+        events = []
+        barrier = threading.Barrier(2, timeout=5)
+        self.register(dag, PipelineStage.EXTRACTION, events, barrier.wait)
+        self.register(dag, PipelineStage.EXTRACTION, events, barrier.wait)
+
+        orchestrator = PipelineOrchestrator(verbose=False, force=True, max_workers=2)
+
+        assert orchestrator._run_scheduled([PipelineStage.EXTRACTION])
+        assert events == [PipelineStage.EXTRACTION] * 2
+
+    def test_concurrent_stage_output_is_not_interleaved(self, callables, dag, capsys):
+        """Stages printing in lockstep still show up as one block each."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def printer(stage):
+            def unit(repository):
+                for line in range(3):
+                    print(f"{stage.value} line {line}")
+                    barrier.wait()
+                dag[stage].produces[0].touch()
+            return unit
+
+        self.register(dag, PipelineStage.EXTRACTION, [])
+        for stage in (PipelineStage.ENRICHMENT, PipelineStage.SEGMENTATION):
+            run_analysis_pipeline.register_stage_callable(stage, printer(stage))
+
+        orchestrator = PipelineOrchestrator(verbose=True, force=True, max_workers=2)
+
+        assert orchestrator._run_scheduled(
+            [PipelineStage.EXTRACTION, PipelineStage.ENRICHMENT, PipelineStage.SEGMENTATION]
+        )
+        lines = [
+            line.strip() for line in capsys.readouterr().out.splitlines()
+            if ' line ' in line or 'Executing' in line
+        ][1:]  # EXTRACTION
+        assert ['Executing' in line for line in lines] == [True, False, False, False] * 2
+        assert len({line.split()[0] for line in lines[1:4]}) == 1
+
+    def test_failure_stops_dependent_stages(self, callables, dag):
+        events = []
+        self.register(dag, PipelineStage.EXTRACTION, events)
+        run_analysis_pipeline.register_stage_callable(PipelineStage.ENRICHMENT, lambda repository: 1 / 0)
+        self.register(dag, PipelineStage.SEGMENTATION, events)
+        self.register(dag, PipelineStage.ANALYSIS, events)
+
+        orchestrator = PipelineOrchestrator(verbose=False, force=True, max_workers=1)
+
+        assert not orchestrator._run_scheduled(list(dag))
+        assert PipelineStage.ANALYSIS not in events
+
+
+@pytest.mark.unit
+class TestSharedDocuments:
+    """Test DataRepository.load_document() reuse across stages."""
+
+    def test_document_is_parsed_once(self, tmp_path: Path):
+        data = tmp_path / 'data'
+        data.mkdir()
+        (data / 'full_sessions_data.json').write_text(json.dumps({'sessions': [{'session_id': 's1'}]}))
+        repo = DataRepository(base_path=tmp_path)
+
+        assert repo.load_document('full_sessions') is repo.load_document('full_sessions')
+        assert repo.load_sessions(enriched=False)[0] is repo.load_document('full_sessions')['sessions'][0]
+
+    def test_rewritten_file_is_reloaded(self, tmp_path: Path):
+        """A stage rewriting a file invalidates the shared copy."""
+        data = tmp_path / 'data'
+        data.mkdir()
+        path = data / 'full_sessions_data.json'
+        path.write_text(json.dumps({'sessions': [{'session_id': 's1'}]}))
+        repo = DataRepository(base_path=tmp_path)
+        repo.load_document('full_sessions')
+
+        path.write_text(json.dumps({'sessions': [{'session_id': 's2'}, {'session_id': 's3'}]}))
+
+        assert len(repo.load_document('full_sessions')['sessions']) == 2
+
+    def test_metrics_memo_lives_with_the_dataset(self, tmp_path: Path):
+        """Delegation copies from both loaders share one record until the file changes."""
+        data = tmp_path / 'data'
+        data.mkdir()
+        path = data / 'enriched_sessions_data.json'
+        delegation = {'tool_use_id': 'toolu_1', 'agent_type': 'developer', 'tokens_in': 10}
+        path.write_text(json.dumps({'sessions': [{'session_id': 's1', 'delegations': [delegation]}]}))
+        repo = DataRepository(base_path=tmp_path)
+        memo = repo.metrics_memo()
+
+        record = normalized_metrics(repo.load_delegations()[0], repo.metrics_memo())
+
+        assert repo.metrics_memo() is memo
+        assert normalized_metrics(repo.load_sessions()[0]['delegations'][0], memo) is record
+
+        path.write_text(json.dumps({'sessions': [{'session_id': 's1', 'delegations': [dict(delegation, tokens_in=200)]}]}))
+
+        assert normalized_metrics(repo.load_delegations()[0], repo.metrics_memo()).input_tokens == 200
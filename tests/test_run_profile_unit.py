@@ -0,0 +1,147 @@
+"""Unit tests for stage resource profiling (pipeline/run_profile.py).
+
+Subprocess tests run short `python -c` commands.
+"""
+
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+
+from tools.pipeline import run_analysis_pipeline
+from tools.pipeline.run_analysis_pipeline import PipelineOrchestrator, PipelineStage, StageDefinition
+from tools.pipeline.run_profile import (
+    count_records,
+    find_regressions,
+    load_history,
+    profile_report,
+    profile_unit,
+    run_profiled
+)
+from tools.pipeline.stage_manifest import StageManifest
+
+CHILD = (
+    "from tools.pipeline.run_profile import count_records; "
+    "count_records(records_in=10, records_out=4); count_records(records_out=1); print('done')"
+)
+
+
+def entry(duration: float, records_in: int = 0, **fields) -> dict:
+    return {'stage': 'extraction', 'unit': None, 'mode': 'in-process', 'success': True,
+            'duration_seconds': duration, 'records_in': records_in, **fields}
+
+
+@pytest.mark.unit
+class TestMeasurement:
+    """Test measuring in-process and subprocess units."""
+
+    def test_records_go_to_active_unit(self):
+        with profile_unit() as profile:
+            count_records(records_in=3, records_out=2)
+            count_records(records_in=1)
+
+        assert (profile.records_in, profile.records_out) == (4, 2)
+        assert profile.duration_seconds > 0
+        assert profile.peak_rss_kb > 0
+
+    def test_records_outside_profiled_run_are_ignored(self, monkeypatch):
+        monkeypatch.delenv('ANALYSIS_RECORD_COUNTS_FILE', raising=False)
+        count_records(records_in=5)
+
+    def test_subprocess_usage_and_records(self):
+        with profile_unit(in_thread=False) as profile:
+            result = run_profiled([sys.executable, '-c', CHILD], timeout=30, cwd=Path(__file__).parent.parent)
+
+        assert result.returncode == 0
+        assert result.stdout == 'done\n'
+        assert (profile.records_in, profile.records_out) == (10, 5)
+        assert profile.cpu_user_seconds + profile.cpu_system_seconds > 0
+        assert profile.peak_rss_kb > 0
+
+    def test_subprocess_failure_keeps_stderr(self):
+        result = run_profiled([sys.executable, '-c', 'import sys; sys.exit("bad")'], timeout=30)
+
+        assert result.returncode == 1
+        assert 'bad' in result.stderr
+
+    def test_subprocess_timeout(self):
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_profiled([sys.executable, '-c', 'import time; time.sleep(10)'], timeout=0.2)
+
+
+@pytest.mark.unit
+class TestRegressions:
+    """Test comparing the latest run with earlier ones."""
+
+    def test_more_data_at_same_rate_is_not_a_regression(self):
+        series = [entry(10.0, 1000), entry(11.0, 1000), entry(21.0, 2000)]
+
+        assert find_regressions(series) == []
+
+    def test_superlinear_slowdown_is_a_regression(self):
+        series = [entry(10.0, 1000), entry(10.0, 1000), entry(40.0, 2000)]
+
+        regressions = find_regressions(series)
+
+        assert len(regressions) == 1
+        assert 'x2.00' in regressions[0]
+
+    def test_wall_time_without_records(self):
+        assert find_regressions([entry(2.0), entry(2.0), entry(4.0)])
+
+    def test_small_absolute_change_is_noise(self):
+        assert find_regressions([entry(0.1), entry(0.1), entry(0.4)]) == []
+
+    def test_memory_regression(self):
+        series = [entry(1.0, peak_rss_kb=100_000), entry(1.0, peak_rss_kb=300_000)]
+
+        assert 'peak RSS' in find_regressions(series)[0]
+
+    def test_report_lists_regressions_and_legacy_entries(self):
+        legacy = {'stage': 'analysis', 'timestamp': '2025-10-02T10:00:00', 'duration_seconds': 3.0, 'success': True}
+        report = profile_report([legacy, entry(10.0, 1000), entry(10.0, 1000), entry(40.0, 2000)])
+
+        assert 'extraction (in-process)' in report
+        assert 'analysis' in report
+        assert 'REGRESSIONS' in report
+
+
+def make_stage(tmp_path: Path, stage: PipelineStage) -> StageDefinition:
+    return StageDefinition(
+        stage=stage,
+        name=stage.value,
+        description="test stage",
+        scripts=["tools/pipeline/does_not_exist.py"],
+        produces=[tmp_path / f"{stage.value}.out"],
+        requires=[],
+        depends_on=[]
+    )
+
+
+@pytest.mark.unit
+class TestRunHistory:
+    """Test the orchestrator's per-unit and per-stage entries."""
+
+    def test_units_and_stage_are_logged(self, monkeypatch, tmp_path: Path):
+        def unit(repository):
+            count_records(records_in=7, records_out=2)
+
+        monkeypatch.setattr(run_analysis_pipeline, 'STAGE_CALLABLES', {})
+        monkeypatch.setattr(run_analysis_pipeline, 'STAGE_DEFINITIONS', {
+            PipelineStage.EXTRACTION: make_stage(tmp_path, PipelineStage.EXTRACTION)
+        })
+        run_analysis_pipeline.register_stage_callable(PipelineStage.EXTRACTION, unit)
+        run_analysis_pipeline.register_stage_callable(PipelineStage.EXTRACTION, unit)
+        orchestrator = PipelineOrchestrator(
+            verbose=False, force=True, manifest=StageManifest(tmp_path / 'manifest.json')
+        )
+
+        assert orchestrator._run_scheduled([PipelineStage.EXTRACTION])
+        orchestrator.save_execution_log(tmp_path / 'history.jsonl')
+
+        entries = load_history(tmp_path / 'history.jsonl')
+        assert [e['unit'] is None for e in entries] == [False, False, True]
+        assert entries[-1]['records_in'] == 14
+        assert entries[-1]['records_out'] == 4
+        assert {e['run_id'] for e in entries} == {orchestrator.run_id}
+        assert orchestrator.execution_log == []
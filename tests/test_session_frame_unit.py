@@ -0,0 +1,191 @@
+"""Unit tests for the mapped session frame (common/session_frame.py).
+
+Frames are checked to rebuild the JSON document exactly, and consumers
+reading them are checked against their JSON path.
+"""
+
+import os
+import pytest
+from pathlib import Path
+
+from tools.common import codec
+from tools.common.config import RuntimeConfig
+from tools.common.data_repository import DataLoadError, DataRepository
+from tools.common.session_frame import SessionFrame, open_session_frame
+
+DOCUMENT = {
+    'schema_version': '2.0',
+    'matched_sessions': 3,
+    'enrichments': ['Sequence numbers within session'],
+    'sessions': [
+        {
+            'session_id': 'aaaaaaaa-1',
+            'first_timestamp': '2025-09-15T10:00:00Z',
+            'delegation_count': 2,
+            'delegations': [
+                {'agent_type': 'developer', 'prompt': 'Implement ünïcode', 'success': True,
+                 'tokens_in': 120, 'next_agent': 'code-quality-analyst', 'sequence_number': 1,
+                 'timestamp': '2025-09-15T10:00:00Z', 'timestamp_ms': 1757930400000},
+                {'agent_type': 'code-quality-analyst', 'prompt': '', 'success': False,
+                 'tokens_in': 0, 'next_agent': None, 'sequence_number': 2,
+                 'timestamp': '2025-09-15T10:05:00Z', 'timestamp_ms': None,
+                 'text_refs': {'result': [0, 12]}},
+            ],
+        },
+        {'session_id': 'bbbbbbbb-2', 'first_timestamp': '2025-09-16T10:00:00Z', 'delegation_count': 0,
+         'delegations': []},
+        {'session_id': 'cccccccc-3', 'first_timestamp': None, 'delegation_count': 1,
+         'delegations': [{'agent_type': 'git-workflow-manager', 'tokens_in': 1.5}]},
+    ],
+}
+
+
+@pytest.fixture
+def written(tmp_path: Path):
+    """JSON document and the frame written from it."""
+    json_path = tmp_path / 'enriched_sessions_data.json'
+    frame_path = tmp_path / 'enriched_sessions.frame'
+    codec.dump_file(DOCUMENT, json_path)
+    SessionFrame.write(frame_path, DOCUMENT, source=json_path)
+    return json_path, frame_path
+
+
+@pytest.mark.unit
+class TestSessionFrame:
+    """Test writing, mapping and rebuilding documents."""
+
+    def test_round_trip(self, written):
+        json_path, frame_path = written
+
+        frame = SessionFrame.open(frame_path)
+
+        assert frame.to_document() == codec.load_file(json_path)
+        assert list(frame.to_document()) == list(DOCUMENT)
+
+    def test_mixed_and_late_columns(self, tmp_path: Path):
+        values = [3, 'three', True, None, 2.5, [1], {'a': 1}, 1 << 70, False, '']
+        sessions = [
+            {'session_id': f's{i}', f'late{i % 3}': None, 'mixed': values[i], 'delegations': [
+                {'value': values[(i + j) % len(values)]} if j % 2 else {'other': values[j]} for j in range(i)
+            ]}
+            for i in range(len(values))
+        ]
+        path = tmp_path / 'mixed.frame'
+
+        SessionFrame.write(path, {'sessions': sessions})
+        frame = SessionFrame.open(path)
+
+        assert frame.to_document() == {'sessions': sessions}
+        assert frame.sessions.columns['mixed'].kind == 'json'
+        assert frame.sessions.columns['late1'].kind == 'json'  # Only nulls
+
+    def test_spilled_heaps(self, tmp_path: Path, monkeypatch):
+        from tools.common import session_frame
+
+        monkeypatch.setattr(session_frame, '_SPOOL_BYTES', 16)
+        sessions = [{'session_id': f'session-{i:04d}', 'delegations': [{'note': 'x' * i}]} for i in range(50)]
+        sessions.append({'session_id': 7, 'delegations': []})  # Spilled str column becomes json
+        path = tmp_path / 'spilled.frame'
+
+        SessionFrame.write(path, {'sessions': sessions})
+
+        assert SessionFrame.open(path).to_document() == {'sessions': sessions}
+
+    def test_absent_keys_stay_absent(self, written):
+        frame = SessionFrame.open(written[1])
+
+        second = frame.delegations.record(1)
+        third = frame.delegations.record(2)
+
+        assert second['next_agent'] is None and second['timestamp_ms'] is None
+        assert 'prompt' not in third and 'next_agent' not in third
+        assert third['tokens_in'] == 1.5  # Mixed int/float column keeps both
+
+    def test_columns_and_projection(self, written):
+        frame = SessionFrame.open(written[1])
+
+        assert list(frame.sessions.column('delegation_count')) == [2, 0, 1]
+        assert frame.sessions.values('first_timestamp')[2] is None
+        assert frame.session(0, fields=['session_id', 'delegations'], delegation_fields=['agent_type']) == {
+            'session_id': 'aaaaaaaa-1',
+            'delegations': [{'agent_type': 'developer'}, {'agent_type': 'code-quality-analyst'}],
+        }
+        with pytest.raises(ValueError):
+            frame.sessions.column('session_id')
+
+    def test_stale_or_invalid_frames_are_ignored(self, written, tmp_path: Path):
+        json_path, frame_path = written
+
+        assert open_session_frame(frame_path, json_path) is not None
+        assert open_session_frame(tmp_path / 'missing.frame', json_path) is None
+
+        stat = json_path.stat()
+        os.utime(json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert open_session_frame(frame_path, json_path) is None
+
+        frame_path.write_bytes(b'{"sessions": []}')
+        assert open_session_frame(frame_path, frame_path) is None
+
+    def test_repository_load(self, tmp_path: Path):
+        repo = DataRepository(base_path=tmp_path)
+        with pytest.raises(DataLoadError):
+            repo.load_session_frame()
+
+        (tmp_path / 'data').mkdir()
+        json_path = repo.paths['enriched_sessions']
+        codec.dump_file(DOCUMENT, json_path)
+        SessionFrame.write(repo.paths['session_frame'], DOCUMENT, source=json_path)
+
+        assert repo.load_session_frame().to_document() == DOCUMENT
+
+        codec.dump_file({**DOCUMENT, 'matched_sessions': 4}, json_path)
+        with pytest.raises(DataLoadError):
+            repo.load_session_frame()
+
+
+@pytest.mark.unit
+class TestFrameConsumers:
+    """Test pipeline stages reading the frame instead of the JSON."""
+
+    def test_marathon_candidates(self, tmp_path: Path, monkeypatch):
+        from tools.pipeline import classify_marathons
+
+        sessions = [
+            {'session_id': f'{i:08d}-x', 'first_timestamp': '2025-09-15T10:00:00Z', 'delegation_count': count,
+             'delegations': [{'agent_type': 'developer', 'prompt': 'backlog', 'success': j % 7 != 0}
+                             for j in range(count)]}
+            for i, count in enumerate([3, 25, 21, 20])
+        ]
+        json_path = tmp_path / 'enriched_sessions_data.json'
+        frame_path = tmp_path / 'enriched_sessions.frame'
+        codec.dump_file({'sessions': sessions}, json_path)
+        SessionFrame.write(frame_path, {'sessions': sessions}, source=json_path)
+        monkeypatch.setattr(classify_marathons, 'ENRICHED_SESSIONS_FILE', json_path)
+        monkeypatch.setattr(classify_marathons, 'ENRICHED_SESSIONS_FRAME_FILE', frame_path)
+
+        candidates, scanned, text_store = classify_marathons.load_marathon_candidates()
+
+        assert scanned == 4 and text_store is None
+        assert [classify_marathons.classify_marathon(s) for s in candidates] == [
+            m for m in map(classify_marathons.classify_marathon, sessions) if m
+        ]
+
+    def test_routing_patterns_match_json(self, written, monkeypatch):
+        from tools.pipeline import extract_routing_patterns as stage
+
+        json_path, frame_path = written
+        monkeypatch.setattr(stage, 'ENRICHED_SESSIONS_FRAME_FILE', frame_path)
+        config = RuntimeConfig(start_date='2025-09-15', end_date='2025-09-15')  # Second session outside
+        monkeypatch.setattr(stage, 'get_runtime_config', lambda: config)
+        document = codec.load_file(json_path)
+        document['sessions'] = document['sessions'][:2]  # Third has no first_timestamp
+        del document['sessions'][0]['delegations'][1]['text_refs']  # No blob store here
+        codec.dump_file(document, json_path)
+        SessionFrame.write(frame_path, document, source=json_path)
+        assert open_session_frame(frame_path, json_path) is not None
+
+        from_frame = stage.extract_routing_patterns(str(json_path))
+        from_json = stage.extract_routing_patterns(str(json_path), data=codec.load_file(json_path))
+
+        assert from_frame == from_json
+        assert sum(len(period['delegations']) for period in from_frame.values()) == 2
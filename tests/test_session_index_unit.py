@@ -0,0 +1,80 @@
+"""Unit tests for the session result index (pipeline/session_index.py).
+
+Lookups must match the forward scans the extractors used to do.
+"""
+
+import random
+import pytest
+
+from tools.pipeline.session_index import SessionIndex
+
+
+def task_call(tool_id: str) -> dict:
+    return {'type': 'assistant', 'message': {'content': [
+        {'type': 'tool_use', 'name': 'Task', 'id': tool_id}
+    ]}}
+
+
+def tool_result(*tool_ids: str) -> dict:
+    return {'type': 'user', 'message': {'content': [
+        {'type': 'tool_result', 'tool_use_id': tool_id, 'content': f'{tool_id}#{n}'}
+        for n, tool_id in enumerate(tool_ids)
+    ]}}
+
+
+def scan_result(messages, tool_use_id, after):
+    """Reference forward scan (previous extractor behaviour)."""
+    for msg in messages[after + 1:]:
+        if msg.get('type') == 'user':
+            content = msg.get('message', {}).get('content', [])
+            if isinstance(content, list):
+                for res in content:
+                    if res.get('type') == 'tool_result' and res.get('tool_use_id') == tool_use_id:
+                        return res
+    return None
+
+
+@pytest.mark.unit
+class TestSessionIndex:
+    """Test result and synthesis lookups."""
+
+    def test_finds_first_result_after_call(self):
+        """Results before the call are ignored, the first later one wins."""
+        messages = [tool_result('a'), task_call('a'), tool_result('b', 'a', 'a'), tool_result('a')]
+        index = SessionIndex(messages)
+
+        assert index.find_result('a', 1) is messages[2]['message']['content'][1]
+        assert index.find_result('a', 3) is None
+        assert index.find_result('missing', 0) is None
+
+    def test_next_assistant(self):
+        """Synthesis is the first assistant message after the call."""
+        messages = [task_call('a'), tool_result('a'), {'type': 'user'}, task_call('b'), tool_result('b')]
+        index = SessionIndex(messages)
+
+        assert index.next_assistant(0) == 3
+        assert index.next_assistant(3) is None
+
+    def test_matches_forward_scan_on_random_session(self):
+        """Index lookups agree with the quadratic scan everywhere."""
+        rng = random.Random(7)
+        ids = [f'toolu_{n}' for n in range(15)]
+        messages = []
+        for _ in range(300):
+            roll = rng.random()
+            if roll < 0.3:
+                messages.append(task_call(rng.choice(ids)))
+            elif roll < 0.7:
+                messages.append(tool_result(*rng.sample(ids, rng.randint(1, 3))))
+            else:
+                messages.append({'type': rng.choice(['user', 'assistant', 'system'])})
+
+        index = SessionIndex(messages)
+        for i in range(len(messages)):
+            for tool_id in ids:
+                assert index.find_result(tool_id, i) is scan_result(messages, tool_id, i)
+            expected = next(
+                (k for k in range(i + 1, len(messages)) if messages[k].get('type') == 'assistant'),
+                None
+            )
+            assert index.next_assistant(i) == expected
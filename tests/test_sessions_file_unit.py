@@ -0,0 +1,156 @@
+"""Unit tests for indexed session access (common/sessions_file.py).
+
+Covers the byte-range writer, index staleness and DataRepository.get_session().
+"""
+
+import mmap
+import pytest
+from pathlib import Path
+
+from tools.common import codec
+from tools.common.data_repository import DataRepository
+from tools.common.text_store import TextBlobWriter
+from tools.common.sessions_file import SessionsFileWriter, write_sessions_file, load_index, read_session
+
+METADATA = {'schema_version': '2.0.0', 'schema_type': 'enriched_sessions'}
+SESSIONS = [
+    {'session_id': 's1', 'delegation_count': 1, 'delegations': [{'agent_type': 'developer', 'prompt': 'é\nx'}]},
+    {'session_id': 's2', 'delegation_count': 0, 'delegations': []},
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    """Repository data dir holding an indexed enriched sessions file."""
+    data = tmp_path / 'data'
+    data.mkdir()
+    write_sessions_file(
+        METADATA, SESSIONS,
+        data / 'enriched_sessions_data.json',
+        data / 'enriched_sessions_data.idx.json'
+    )
+    return data
+
+
+@pytest.mark.unit
+class TestSessionsFile:
+    """Test writing and slicing the sessions document."""
+
+    @pytest.mark.parametrize('pretty', [True, False])
+    def test_output_matches_single_dump(self, tmp_path: Path, pretty: bool):
+        """Session-by-session writing produces the same bytes as one dumps()."""
+        path = tmp_path / 'sessions.json'
+        write_sessions_file(METADATA, SESSIONS, path, pretty=pretty)
+
+        assert path.read_bytes() == codec.dumps({**METADATA, 'sessions': SESSIONS}, pretty=pretty)
+
+    def test_metadata_given_after_sessions(self, tmp_path: Path):
+        """Streamed sessions with totals known only at the end."""
+        path = tmp_path / 'sessions.json'
+        with SessionsFileWriter(path) as writer:
+            for session in SESSIONS:
+                writer.write(session)
+            ranges = writer.finish({**METADATA, 'matched_sessions': len(SESSIONS)})
+
+        assert codec.load_file(path) == {**METADATA, 'matched_sessions': 2, 'sessions': SESSIONS}
+        assert [read_session(path, ranges[s['session_id']]) for s in SESSIONS] == SESSIONS
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['sessions.idx.json', 'sessions.json']
+
+    def test_unfinished_writer_keeps_previous_output(self, data_dir: Path):
+        """A failed extraction leaves the last complete file in place."""
+        path = data_dir / 'enriched_sessions_data.json'
+        before = path.read_bytes()
+
+        with pytest.raises(RuntimeError):
+            with SessionsFileWriter(path) as writer:
+                writer.write(SESSIONS[0])
+                raise RuntimeError('interrupted')
+
+        assert path.read_bytes() == before
+        assert not (data_dir / 'enriched_sessions_data.json.body').exists()
+
+    def test_rewrite_keeps_mapped_file_valid(self, data_dir: Path):
+        """A reader's map of the previous file survives a new extraction."""
+        path = data_dir / 'enriched_sessions_data.json'
+        index = load_index(data_dir / 'enriched_sessions_data.idx.json', path)
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        write_sessions_file(METADATA, [{'session_id': 's3', 'delegations': []}], path,
+                            data_dir / 'enriched_sessions_data.idx.json')
+
+        assert read_session(mapped, index['s1']) == SESSIONS[0]
+        assert sorted(p.name for p in data_dir.iterdir()) == [
+            'enriched_sessions_data.idx.json', 'enriched_sessions_data.json'
+        ]
+        mapped.close()
+
+    def test_byte_ranges_decode_to_sessions(self, data_dir: Path):
+        """Each indexed slice decodes to exactly its session."""
+        path = data_dir / 'enriched_sessions_data.json'
+        index = load_index(data_dir / 'enriched_sessions_data.idx.json', path)
+
+        assert [read_session(path, index[s['session_id']]) for s in SESSIONS] == SESSIONS
+
+    def test_index_is_stale_after_rewrite(self, data_dir: Path):
+        """A sessions file changed after indexing invalidates the index."""
+        path = data_dir / 'enriched_sessions_data.json'
+        path.write_bytes(path.read_bytes() + b'\n')
+
+        assert load_index(data_dir / 'enriched_sessions_data.idx.json', path) is None
+
+
+@pytest.mark.unit
+class TestGetSession:
+    """Test DataRepository.get_session()."""
+
+    def test_returns_session_by_id(self, data_dir: Path):
+        repo = DataRepository(base_path=data_dir.parent)
+
+        assert repo.get_session('s2') == SESSIONS[1]
+        assert repo.get_session('s1') == SESSIONS[0]
+        assert repo.get_session('missing') is None
+
+    def test_falls_back_without_index(self, data_dir: Path):
+        """Without a sidecar index the file is streamed instead."""
+        (data_dir / 'enriched_sessions_data.idx.json').unlink()
+        repo = DataRepository(base_path=data_dir.parent)
+
+        assert repo.get_session('s1') == SESSIONS[0]
+
+    def test_reopens_after_file_rewritten(self, data_dir: Path):
+        """A new extraction run is picked up by an existing repository."""
+        repo = DataRepository(base_path=data_dir.parent)
+        assert repo.get_session('s1') == SESSIONS[0]
+
+        replacement = [{'session_id': 's3', 'delegations': []}]
+        write_sessions_file(
+            METADATA, replacement,
+            data_dir / 'enriched_sessions_data.json',
+            data_dir / 'enriched_sessions_data.idx.json'
+        )
+
+        assert repo.get_session('s3') == replacement[0]
+        assert repo.get_session('s1') is None
+
+    def test_texts_follow_reextraction(self, data_dir: Path):
+        """Texts of a re-extracted session come from the new blob file."""
+        def extract(prompt: str) -> None:
+            session = {'session_id': 's1', 'delegations': [{'agent_type': 'developer', 'prompt': prompt}]}
+            with TextBlobWriter(data_dir / 'enriched_texts.bin') as writer:
+                writer.externalize(session['delegations'][0])
+            write_sessions_file(
+                METADATA, [session],
+                data_dir / 'enriched_sessions_data.json',
+                data_dir / 'enriched_sessions_data.idx.json'
+            )
+
+        repo = DataRepository(base_path=data_dir.parent)
+        extract('short')
+        assert repo.get_session('s1')['delegations'][0]['prompt'] == 'short'
+
+        extract('a much longer prompt')
+        assert repo.get_session('s1')['delegations'][0]['prompt'] == 'a much longer prompt'
+
+        extract('tiny')
+        assert repo.get_session('s1')['delegations'][0]['prompt'] == 'tiny'
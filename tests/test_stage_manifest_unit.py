@@ -0,0 +1,181 @@
+"""Unit tests for the content-hash stage manifest (pipeline/stage_manifest.py).
+
+Stages read and write files in a temporary directory.
+"""
+
+import os
+import pytest
+from pathlib import Path
+
+from tools.common.config import RuntimeConfig
+from tools.pipeline.run_analysis_pipeline import PipelineOrchestrator, PipelineStage, StageDefinition
+from tools.pipeline.stage_manifest import StageManifest
+
+
+@pytest.fixture
+def stage(tmp_path: Path) -> StageDefinition:
+    """Enrichment-like stage with one input and one existing output."""
+    (tmp_path / 'input.json').write_text('{"sessions": []}')
+    (tmp_path / 'output.json').write_text('{}')
+    return StageDefinition(
+        stage=PipelineStage.ENRICHMENT,
+        name="test",
+        description="test stage",
+        scripts=["tools/pipeline/extract_routing_patterns.py"],
+        produces=[tmp_path / 'output.json'],
+        requires=[tmp_path / 'input.json'],
+        depends_on=[]
+    )
+
+
+@pytest.fixture
+def manifest(tmp_path: Path, stage: StageDefinition) -> StageManifest:
+    """Manifest holding a completed run of `stage`."""
+    manifest = StageManifest(tmp_path / 'manifest.json')
+    manifest.record(stage, RuntimeConfig())
+    return manifest
+
+
+@pytest.mark.unit
+class TestStageManifest:
+    """Test fingerprint matching."""
+
+    def test_unknown_stage_has_no_verdict(self, tmp_path: Path, stage: StageDefinition):
+        assert StageManifest(tmp_path / 'manifest.json').is_current(stage, RuntimeConfig()) is None
+
+    def test_recorded_stage_is_current_after_reload(self, tmp_path: Path, stage: StageDefinition, manifest):
+        assert StageManifest(tmp_path / 'manifest.json').is_current(stage, RuntimeConfig())
+
+    def test_touched_input_is_still_current(self, stage: StageDefinition, manifest):
+        """A newer mtime with identical bytes does not trigger a re-run."""
+        path = stage.requires[0]
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert manifest.is_current(stage, RuntimeConfig())
+
+    def test_regenerated_metadata_is_still_current(self, tmp_path: Path):
+        """Only the generation timestamp differs between two extractions."""
+        path = tmp_path / 'data.json'
+        manifest = StageManifest(tmp_path / 'manifest.json')
+        path.write_text('{"generated_at": "2025-10-01T10:00:00", "sessions": []}')
+        first = manifest.file_hash(path)
+
+        path.write_text('{"generated_at": "2025-10-02T11:30:00", "sessions": []}')
+
+        assert manifest.file_hash(path) == first
+
+    def test_changed_input_is_not_current(self, stage: StageDefinition, manifest):
+        stage.requires[0].write_text('{"sessions": [1]}')
+
+        assert manifest.is_current(stage, RuntimeConfig()) is False
+
+    def test_changed_config_is_not_current(self, stage: StageDefinition, manifest):
+        assert manifest.is_current(stage, RuntimeConfig(start_date='2025-09-01')) is False
+
+    def test_scan_workers_are_ignored(self, stage: StageDefinition, manifest):
+        assert manifest.is_current(stage, RuntimeConfig(scan_workers=8))
+
+    def test_replaced_output_is_not_current(self, stage: StageDefinition, manifest):
+        stage.produces[0].write_text('{"edited": true}')
+
+        assert manifest.is_current(stage, RuntimeConfig()) is False
+
+
+@pytest.mark.unit
+class TestEarlyCutoff:
+    """Test PipelineOrchestrator.should_run_stage() with a manifest."""
+
+    def test_skips_stage_when_fingerprint_matches(self, stage: StageDefinition, manifest):
+        # Upstream rewrote identical bytes: the input is now newer than the output
+        stage.requires[0].write_text('{"sessions": []}')
+        os.utime(stage.produces[0], ns=(0, 0))
+        orchestrator = PipelineOrchestrator(verbose=False, manifest=manifest)
+
+        should_run, reason = orchestrator.should_run_stage(stage)
+
+        assert not should_run
+        assert 'manifest' in reason
+
+    def test_falls_back_to_mtimes_without_entry(self, tmp_path: Path, stage: StageDefinition):
+        os.utime(stage.produces[0], ns=(0, 0))
+        orchestrator = PipelineOrchestrator(verbose=False, manifest=StageManifest(tmp_path / 'empty.json'))
+
+        should_run, reason = orchestrator.should_run_stage(stage)
+
+        assert should_run
+        assert 'stale' in reason
+
+
+@pytest.mark.unit
+class TestCodeHash:
+    """Test which code a stage fingerprint covers."""
+
+    def test_changed_imported_module_is_not_current(self, tmp_path: Path, monkeypatch):
+        """Editing a module the script imports (transitively) re-runs the stage."""
+        from tools.pipeline import stage_manifest
+
+        monkeypatch.setattr(stage_manifest, 'PROJECT_ROOT', tmp_path)
+        monkeypatch.setattr(stage_manifest, 'SHARED_SOURCES', [])
+        package = tmp_path / 'tools' / 'pipeline'
+        package.mkdir(parents=True)
+        (package / '__init__.py').write_text('')
+        (package / 'main.py').write_text('from tools.pipeline import helper\n')
+        (package / 'helper.py').write_text('from .deep import VALUE\n')
+        (package / 'deep.py').write_text('VALUE = 1\n')
+        (tmp_path / 'out.json').write_text('{}')
+        stage = StageDefinition(
+            stage=PipelineStage.EXTRACTION,
+            name="test",
+            description="test stage",
+            scripts=["tools/pipeline/main.py"],
+            produces=[tmp_path / 'out.json'],
+            requires=[],
+            depends_on=[]
+        )
+        manifest = StageManifest(tmp_path / 'manifest.json')
+        manifest.record(stage, RuntimeConfig())
+
+        (package / 'deep.py').write_text('VALUE = 2\n')
+
+        assert manifest.is_current(stage, RuntimeConfig()) is False
+
+    def test_extraction_covers_fused_extractor_modules(self):
+        """The real extraction stage hashes the modules doing the work."""
+        from tools.common.config import PROJECT_ROOT
+        from tools.pipeline.run_analysis_pipeline import STAGE_DEFINITIONS
+        from tools.pipeline.stage_manifest import imported_sources
+
+        script = STAGE_DEFINITIONS[PipelineStage.EXTRACTION].scripts[0]
+        covered = {path.name for path in imported_sources(PROJECT_ROOT / script)}
+
+        assert {
+            'extract_enriched_data.py', 'extract_all_sessions.py', 'file_scan_cache.py',
+            'jsonl_prefilter.py', 'session_index.py'
+        } <= covered
+
+
+@pytest.mark.unit
+class TestStageDefinitions:
+    """Test the pipeline's declared stage outputs and inputs."""
+
+    def test_deleted_session_frame_reruns_extraction(self, tmp_path: Path, monkeypatch):
+        """The frame enrichment maps is an extraction output like the JSON."""
+        from tools.pipeline import run_analysis_pipeline
+
+        definitions = run_analysis_pipeline.STAGE_DEFINITIONS
+        frame = run_analysis_pipeline.ENRICHED_SESSIONS_FRAME_FILE
+        assert frame in definitions[PipelineStage.ENRICHMENT].requires
+
+        extraction = definitions[PipelineStage.EXTRACTION]
+        outputs = [tmp_path / path.name for path in extraction.produces]
+        for path in outputs:
+            path.write_text('{}')
+        monkeypatch.setattr(extraction, 'produces', outputs)
+        manifest = StageManifest(tmp_path / 'manifest.json')
+        manifest.record(extraction, RuntimeConfig())
+
+        (tmp_path / frame.name).unlink()
+
+        assert manifest.is_current(extraction, RuntimeConfig()) is False
+        assert not extraction.check_outputs_exist()
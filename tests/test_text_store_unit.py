@@ -0,0 +1,165 @@
+"""Unit tests for the delegation text blob store (common/text_store.py).
+
+Covers the writer/reader round-trip, lazy Delegation accessors and
+DataRepository loading with and without text.
+"""
+
+import json
+import pytest
+from pathlib import Path
+
+from tools.common.data_repository import DataRepository, DataLoadError
+from tools.common.models import Delegation
+from tools.common.text_store import TextBlobWriter, TextBlobStore, resolve_texts
+
+DELEGATION = {
+    'tool_use_id': 'toolu_1',
+    'timestamp': '2025-09-15T10:00:00Z',
+    'agent_type': 'developer',
+    'prompt': 'Implement the café feature',
+    'prompt_length': 26,
+    'tokens_in': 100,
+    'user_context_before': None,
+    'result_full': 'done ✓',
+    'assistant_synthesis': 'All good',
+}
+
+
+def externalized_data_dir(tmp_path: Path) -> Path:
+    """Write an enriched sessions file whose text lives in the blob store."""
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    delegation = dict(DELEGATION)
+    with TextBlobWriter(data_dir / 'enriched_texts.bin') as writer:
+        writer.externalize(delegation)
+    sessions = {
+        'text_store': 'enriched_texts.bin',
+        'sessions': [{'session_id': 's1', 'message_count': 4, 'delegations': [delegation]}],
+    }
+    (data_dir / 'enriched_sessions_data.json').write_text(json.dumps(sessions))
+    return data_dir
+
+
+@pytest.mark.unit
+class TestTextBlobStore:
+    """Test moving text out and resolving it back."""
+
+    def test_externalize_and_resolve_roundtrip(self, tmp_path: Path):
+        """Resolved delegation equals the original, including None fields."""
+        delegation = dict(DELEGATION)
+        with TextBlobWriter(tmp_path / 'texts.bin') as writer:
+            writer.externalize(delegation)
+
+        assert 'prompt' not in delegation
+        assert delegation['text_refs']['user_context_before'] is None
+
+        resolve_texts(delegation, TextBlobStore(tmp_path / 'texts.bin'))
+        assert delegation == DELEGATION
+
+    def test_partial_resolution_keeps_remaining_refs(self, tmp_path: Path):
+        """Resolving only the prompt leaves other references in place."""
+        delegation = dict(DELEGATION)
+        with TextBlobWriter(tmp_path / 'texts.bin') as writer:
+            writer.externalize(delegation)
+
+        resolve_texts(delegation, TextBlobStore(tmp_path / 'texts.bin'), fields=('prompt',))
+
+        assert delegation['prompt'] == DELEGATION['prompt']
+        assert 'prompt' not in delegation['text_refs']
+        assert 'result_full' in delegation['text_refs']
+
+    def test_store_opens_file_lazily(self, tmp_path: Path):
+        """Creating a store does not touch the file."""
+        store = TextBlobStore(tmp_path / 'missing.bin')
+        assert not store.is_open
+
+    def test_rewrite_keeps_mapped_file_valid(self, tmp_path: Path):
+        path = tmp_path / 'texts.bin'
+        with TextBlobWriter(path) as writer:
+            ref = writer.put('a fairly long original text')
+        store = TextBlobStore(path)
+        assert store.get(ref) == 'a fairly long original text'
+
+        with TextBlobWriter(path) as writer:
+            new_ref = writer.put('new')
+
+        assert store.get(ref) == 'a fairly long original text'  # Previous inode
+        assert TextBlobStore(path).get(new_ref) == 'new'
+
+    def test_failed_write_keeps_previous_file(self, tmp_path: Path):
+        path = tmp_path / 'texts.bin'
+        with TextBlobWriter(path) as writer:
+            ref = writer.put('kept')
+
+        with pytest.raises(RuntimeError):
+            with TextBlobWriter(path) as writer:
+                writer.put('partial')
+                raise RuntimeError('interrupted')
+
+        assert TextBlobStore(path).get(ref) == 'kept'
+        assert [p.name for p in tmp_path.iterdir()] == ['texts.bin']
+
+    def test_delegation_fetches_text_on_demand(self, tmp_path: Path):
+        """Typed delegations read text only through get_text()."""
+        delegation = dict(DELEGATION, session_id='s1')
+        with TextBlobWriter(tmp_path / 'texts.bin') as writer:
+            writer.externalize(delegation)
+        store = TextBlobStore(tmp_path / 'texts.bin')
+
+        typed = Delegation.from_dict(delegation, text_store=store)
+
+        assert typed.prompt is None
+        assert not store.is_open
+        assert typed.prompt_text() == DELEGATION['prompt']
+        assert typed.get_text('result_full') == DELEGATION['result_full']
+
+
+@pytest.mark.unit
+class TestRepositoryText:
+    """Test DataRepository text inlining."""
+
+    def test_default_load_inlines_text(self, tmp_path: Path):
+        repo = DataRepository(base_path=externalized_data_dir(tmp_path).parent)
+
+        delegation = repo.load_delegations()[0]
+
+        assert delegation['prompt'] == DELEGATION['prompt']
+        assert 'text_refs' not in delegation
+
+    def test_metrics_only_load_never_reads_text(self, tmp_path: Path):
+        repo = DataRepository(base_path=externalized_data_dir(tmp_path).parent)
+
+        delegations = repo.load_delegations(with_text=False)
+        sessions = repo.load_sessions(with_text=False)
+
+        assert 'prompt' not in delegations[0]
+        assert 'prompt' not in sessions[0]['delegations'][0]
+        assert not repo.get_text_store().is_open
+
+    def test_typed_load_reads_text_on_demand(self, tmp_path: Path):
+        repo = DataRepository(base_path=externalized_data_dir(tmp_path).parent)
+
+        typed = repo.load_delegations(typed=True)[0]
+        batch = repo.load_delegation_batch()
+
+        assert typed.prompt is None
+        assert not repo.get_text_store().is_open
+        assert typed.prompt_text() == batch[0].prompt_text() == DELEGATION['prompt']
+
+    def test_inlining_leaves_shared_document_untouched(self, tmp_path: Path):
+        repo = DataRepository(base_path=externalized_data_dir(tmp_path).parent)
+
+        document = repo.load_document('enriched_sessions')
+        sessions = repo.load_sessions()
+
+        assert sessions[0]['delegations'][0]['prompt'] == DELEGATION['prompt']
+        shared = document['sessions'][0]['delegations'][0]
+        assert 'prompt' not in shared
+        assert set(shared['text_refs']) >= {'prompt', 'result_full'}
+
+    def test_missing_blob_file_raises(self, tmp_path: Path):
+        data_dir = externalized_data_dir(tmp_path)
+        (data_dir / 'enriched_texts.bin').unlink()
+
+        with pytest.raises(DataLoadError):
+            DataRepository(base_path=tmp_path).load_sessions()
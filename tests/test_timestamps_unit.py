@@ -0,0 +1,75 @@
+"""Unit tests for epoch-millisecond timestamps (common/timestamps.py).
+
+Integer buckets are checked against the datetime values consumers
+computed before.
+"""
+
+import random
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from tools.common.models import Delegation, DelegationBatch
+from tools.common.timestamps import (
+    date_of,
+    day_key,
+    hour_of,
+    record_ms,
+    timestamp_to_ms,
+    weekday_name
+)
+
+
+@pytest.mark.unit
+class TestTimestamps:
+    """Test parsing and integer bucketing."""
+
+    def test_buckets_match_datetime(self):
+        rng = random.Random(0)
+        start = datetime(2024, 12, 25, tzinfo=timezone.utc)
+        for _ in range(1000):
+            moment = start + timedelta(milliseconds=rng.randrange(400 * 86_400_000))
+            timestamp = moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+            ms = timestamp_to_ms(timestamp)
+
+            assert ms == int(moment.timestamp()) * 1000 + moment.microsecond // 1000
+            assert day_key(ms) == moment.strftime('%Y-%m-%d')
+            assert date_of(ms) == moment.date()
+            assert hour_of(ms) == moment.hour
+            assert weekday_name(ms) == moment.strftime('%A')
+
+    def test_offsets_and_naive_timestamps(self):
+        assert timestamp_to_ms('2025-09-15T12:00:00+02:00') == timestamp_to_ms('2025-09-15T10:00:00Z')
+        assert timestamp_to_ms('2025-09-15T10:00:00') == timestamp_to_ms('2025-09-15T10:00:00Z')
+        assert timestamp_to_ms('1969-12-31T23:59:59.999Z') == -1
+
+    def test_invalid_timestamps(self):
+        assert timestamp_to_ms(None) is None
+        assert timestamp_to_ms('') is None
+        assert timestamp_to_ms('not-a-date') is None
+
+    def test_record_prefers_stored_value(self):
+        assert record_ms({'timestamp': '2025-09-15T10:00:00Z', 'timestamp_ms': 5}) == 5
+        assert record_ms({'timestamp': '1970-01-01T00:00:01Z'}) == 1000
+        assert record_ms({'first_timestamp': '1970-01-01T00:00:02Z'}, 'first_timestamp') == 2000
+        assert record_ms({}) is None
+
+
+@pytest.mark.unit
+class TestModelTimestamps:
+    """Test epoch milliseconds on typed models."""
+
+    def test_delegation_epoch_ms(self, minimal_delegation: dict):
+        parsed = Delegation.from_dict(minimal_delegation)
+        stored = Delegation.from_dict(dict(minimal_delegation, timestamp_ms=7))
+
+        assert parsed.epoch_ms() == timestamp_to_ms(minimal_delegation['timestamp'])
+        assert stored.epoch_ms() == 7
+        assert stored == parsed  # Derived field, not part of equality
+
+    def test_batch_column(self, minimal_delegation: dict):
+        batch = DelegationBatch.from_dicts([minimal_delegation, dict(minimal_delegation, timestamp='bad')])
+
+        assert batch.timestamps_ms[0] == timestamp_to_ms(minimal_delegation['timestamp'])
+        assert batch[0].timestamp_ms == batch.timestamps_ms[0]
+        assert batch[1].epoch_ms() is None
@@ -5,6 +5,12 @@ from .data_repository import (
     load_sessions,
     load_routing_patterns,
     load_agent_calls,
+    load_delegation_table,
+    load_session_frame,
+    load_delegation_batch,
+    get_session,
+    query_delegations,
+    get_repository,
     DataLoadError,
 )
 
@@ -13,5 +19,11 @@ __all__ = [
     'load_sessions',
     'load_routing_patterns',
     'load_agent_calls',
+    'load_delegation_table',
+    'load_session_frame',
+    'load_delegation_batch',
+    'get_session',
+    'query_delegations',
+    'get_repository',
     'DataLoadError',
 ]
@@ -18,14 +18,48 @@ Usage:
 
     # Run analysis
     result = MyCustomAnalysis().run()
+
+    # Run independent analyses in parallel on shared data
+    results = run_strategies([MetricsAnalysis(), MarathonAnalysis()], data, workers=2)
+
+    # Or fold each delegation into accumulators during one shared pass
+    class AgentCounts(Accumulator):
+        def __init__(self):
+            self.counts = Counter()
+
+        def visit_delegation(self, delegation, metrics):
+            self.counts[metrics.agent_type] += 1
+
+    class AgentCountAnalysis(ScanningAnalysisStrategy):
+        def get_name(self) -> str:
+            return "Agent Counts"
+
+        def create_accumulators(self):
+            return {'agents': AgentCounts()}
+
+        def summarize(self, data, accumulators):
+            counts = accumulators['agents'].counts
+            return AnalysisResult(name=self.get_name(), data=dict(counts), summary=f"{len(counts)} agents")
 """
 
+import gc
+import multiprocessing
+import os
+import pickle
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
-import json
+
+from tools.common import codec
+from tools.common.metrics_service import DelegationMetrics, normalized_metrics
+
+# Strategies run at the same time by run_strategies() (1 = one after another)
+DEFAULT_STRATEGY_WORKERS = min(4, os.cpu_count() or 1)
 
 
 @dataclass
@@ -69,8 +103,7 @@ class AnalysisResult:
     def save_to_file(self, path: Path) -> None:
         """Save result to JSON file."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        codec.dump_file(self.to_dict(), path, ensure_ascii=False)
 
     def print_summary(self) -> None:
         """Print formatted summary to console."""
@@ -126,6 +159,11 @@ class AnalysisStrategy(ABC):
                 )
     """
 
+    # Whether analyze() reads delegation text (prompt, result_full, ...).
+    # Strategies that only use metrics set this to False so the text blob
+    # store is never read on their behalf.
+    needs_text: bool = True
+
     def __init__(self):
         """Initialize strategy with error tracking."""
         self._warnings: List[str] = []
@@ -194,6 +232,7 @@ class AnalysisStrategy(ABC):
         2. Validate data
         3. Execute analyze()
         4. Attach warnings/errors to result
+        5. Attach wall and CPU time to result.metadata['timings']
 
         Args:
             data: Optional pre-loaded data. If None, loads from repository.
@@ -201,6 +240,15 @@ class AnalysisStrategy(ABC):
         Returns:
             AnalysisResult with findings
         """
+        start, cpu_start = time.perf_counter(), time.process_time()
+        result = self._run(data)
+        result.metadata['timings'] = {
+            'wall_seconds': round(time.perf_counter() - start, 3),
+            'cpu_seconds': round(time.process_time() - cpu_start, 3),
+        }
+        return result
+
+    def _run(self, data: Optional[Dict[str, Any]]) -> AnalysisResult:
         try:
             # Load data if not provided
             if data is None:
@@ -244,15 +292,270 @@ class AnalysisStrategy(ABC):
         Override if analysis needs specific data sources.
 
         Returns:
-            Dictionary with 'delegations' and 'sessions' keys
+            Dictionary with 'delegations', 'sessions' and 'metrics_memo' keys
+        """
+        from tools.common.data_repository import load_delegations, load_sessions, metrics_memo
+
+        return {
+            'delegations': load_delegations(with_text=self.needs_text),
+            'sessions': load_sessions(with_text=self.needs_text),
+            'metrics_memo': metrics_memo()
+        }
+
+
+class Accumulator:
+    """
+    Incremental state folded from the records of a DelegationScan.
+
+    Override visit_delegation() and/or visit_session(); the scan only calls
+    the methods a subclass overrides. Keep results on the instance for the
+    owning strategy to read once the scan finished.
+    """
+
+    def visit_delegation(self, delegation: Dict[str, Any], metrics: DelegationMetrics) -> None:
+        """
+        Fold one delegation.
+
+        Args:
+            delegation: Delegation record as loaded
+            metrics: Its shared normalized_metrics() record (read-only)
+        """
+        pass
+
+    def visit_session(self, session: Dict[str, Any]) -> None:
+        """Fold one session (with its nested delegations)."""
+        pass
+
+
+class DelegationScan:
+    """
+    Single streaming pass over data['delegations'] and data['sessions'].
+
+    Every registered accumulator sees each record once; each delegation is
+    normalized by normalized_metrics() once for all of them, so
+    adding accumulators (or strategies) adds no further scan. With a
+    data['metrics_memo'] (see DataRepository.metrics_memo()), later scans
+    and metrics_service calls over the same dataset reuse the records.
+    """
+
+    def __init__(self):
+        self._delegation_visitors = []
+        self._session_visitors = []
+
+    def add(self, accumulator: Accumulator) -> Accumulator:
+        """Register accumulator for the next run() and return it."""
+        if type(accumulator).visit_delegation is not Accumulator.visit_delegation:
+            self._delegation_visitors.append(accumulator.visit_delegation)
+        if type(accumulator).visit_session is not Accumulator.visit_session:
+            self._session_visitors.append(accumulator.visit_session)
+        return accumulator
+
+    def run(self, data: Dict[str, Any]) -> None:
+        """Feed all records of data to the registered accumulators."""
+        if self._delegation_visitors:
+            memo = data.get('metrics_memo')
+            for delegation in data.get('delegations', []):
+                metrics = normalized_metrics(delegation, memo)
+                for visit in self._delegation_visitors:
+                    visit(delegation, metrics)
+
+        if self._session_visitors:
+            for session in data.get('sessions', []):
+                for visit in self._session_visitors:
+                    visit(session)
+
+
+class ScanningAnalysisStrategy(AnalysisStrategy):
+    """
+    Strategy computed from accumulators instead of its own passes over data.
+
+    Subclasses implement:
+    1. create_accumulators(): fresh accumulators for one run
+    2. summarize(data, accumulators): build the result from their state
+
+    Run alone, analyze() scans data for this strategy only. run_strategies()
+    registers the accumulators of all scanning strategies on one shared
+    DelegationScan first, and analyze() then only summarizes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # (data, accumulators) filled by a shared scan of that data
+        self._scanned: Optional[tuple] = None
+
+    @abstractmethod
+    def create_accumulators(self) -> Dict[str, Accumulator]:
+        """
+        Create the accumulators this strategy reads.
+
+        Returns:
+            Fresh accumulators by name
         """
-        from tools.common.data_repository import load_delegations, load_sessions
+        pass
+
+    @abstractmethod
+    def summarize(self, data: Dict[str, Any], accumulators: Dict[str, Accumulator]) -> AnalysisResult:
+        """
+        Build the result once every record went through the accumulators.
+
+        Args:
+            data: Scanned input data
+            accumulators: The accumulators from create_accumulators()
+
+        Returns:
+            AnalysisResult with findings
+        """
+        pass
+
+    def register(self, scan: DelegationScan, data: Dict[str, Any]) -> None:
+        """Add fresh accumulators to scan, to be used by the next analyze(data)."""
+        self._scanned = (data, {name: scan.add(a) for name, a in self.create_accumulators().items()})
+
+    def analyze(self, data: Dict[str, Any]) -> AnalysisResult:
+        scanned, self._scanned = self._scanned, None
+        if scanned is not None and scanned[0] is data:
+            accumulators = scanned[1]
+        else:
+            scan = DelegationScan()
+            accumulators = {name: scan.add(a) for name, a in self.create_accumulators().items()}
+            scan.run(data)
+        return self.summarize(data, accumulators)
+
 
+def _scan_together(strategies: List[AnalysisStrategy], data: Dict[str, Any]) -> None:
+    """Fill the accumulators of all scanning strategies in one pass over data."""
+    scanning = [s for s in strategies if isinstance(s, ScanningAnalysisStrategy)]
+    if len(scanning) < 2:
+        return
+
+    scan = DelegationScan()
+    for strategy in scanning:
+        strategy.register(scan, data)
+    try:
+        scan.run(data)
+    except Exception:
+        # Let each strategy scan on its own and report its failure
+        for strategy in scanning:
+            strategy._scanned = None
+
+
+# (strategies, data) of the pool a forked worker process belongs to; only
+# ever set inside workers, each of which serves a single run_strategies() call
+_worker_state: Optional[tuple] = None
+
+
+def _init_worker(strategies: List['AnalysisStrategy'], data: Optional[Dict[str, Any]]) -> None:
+    # Fork passes initargs to the child by inheritance, without pickling
+    global _worker_state
+    _worker_state = (strategies, data)
+
+
+def _init_started_worker(payload: bytes) -> None:
+    # forkserver/spawn workers get (strategies, data) pickled once by the parent
+    global _worker_state
+    _worker_state = pickle.loads(payload)
+
+
+def _run_forked(index: int) -> AnalysisResult:
+    strategies, data = _worker_state
+    return strategies[index].run(data)
+
+
+def can_fork() -> bool:
+    """Whether forking worker processes is safe from the calling process.
+
+    Forking while other threads run (e.g. the in-process pipeline's stage
+    pool) can copy a lock another thread holds into the child, which then
+    deadlocks on it; run_strategies() starts workers without forking then.
+    """
+    return 'fork' in multiprocessing.get_all_start_methods() and threading.active_count() == 1
+
+
+def _pool_options(strategies: List[AnalysisStrategy], data: Optional[Dict[str, Any]]) -> Optional[dict]:
+    """ProcessPoolExecutor arguments handing (strategies, data) to workers.
+
+    Returns:
+        Options for a fork pool if can_fork(), else for a forkserver (or
+        spawn) pool; None if the strategies or data cannot be pickled
+    """
+    if can_fork():
         return {
-            'delegations': load_delegations(),
-            'sessions': load_sessions()
+            'mp_context': multiprocessing.get_context('fork'),
+            'initializer': _init_worker,
+            'initargs': (strategies, data),
         }
 
+    try:
+        # Pickled once here instead of once per worker
+        payload = pickle.dumps((strategies, data), protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return {
+        'mp_context': multiprocessing.get_context(method),
+        'initializer': _init_started_worker,
+        'initargs': (payload,),
+    }
+
+
+def run_strategies(
+    strategies: List[AnalysisStrategy],
+    data: Optional[Dict[str, Any]],
+    workers: int = DEFAULT_STRATEGY_WORKERS
+) -> List[AnalysisResult]:
+    """
+    Run independent strategies on the same data, possibly in parallel.
+
+    With workers > 1, strategies run in worker processes, so wall time
+    follows the slowest strategy rather than the sum. In a single-threaded
+    process where fork is available (see can_fork()) the workers are forked
+    and inherit `data` copy-on-write. Otherwise, e.g. inside the in-process
+    pipeline's stage threads, they are started by a forkserver (or spawn)
+    and each receives one pickled copy of the strategies and `data`; if
+    those cannot be pickled the strategies run one after another. Scanning
+    strategies first share one DelegationScan of `data` (before starting
+    workers).
+
+    Warnings and errors a strategy records in a worker stay in the worker's
+    copy of the instance; they reach the caller through the returned result.
+
+    Args:
+        strategies: Strategies to run
+        data: Shared input data (None: each strategy loads its default data)
+        workers: Maximum number of strategies running at once
+
+    Returns:
+        One AnalysisResult per strategy, in the order given
+    """
+    if data is not None:
+        _scan_together(strategies, data)
+
+    workers = min(workers, len(strategies))
+    options = _pool_options(strategies, data) if workers > 1 else None
+    if options is None:
+        return [strategy.run(data) for strategy in strategies]
+
+    # Keep the collector from touching (and so copying) the inherited objects
+    gc.freeze()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, **options) as pool:
+            futures = [pool.submit(_run_forked, index) for index in range(len(strategies))]
+            results = []
+            for strategy, future in zip(strategies, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # Worker died or the result could not be sent back
+                    results.append(AnalysisResult(
+                        name=strategy.get_name(),
+                        data={},
+                        summary="Analysis failed with exception",
+                        errors=[f"Critical failure: {e}"]
+                    ))
+            return results
+    finally:
+        gc.unfreeze()
+
 
 class CompositeAnalysisStrategy(AnalysisStrategy):
     """
@@ -269,15 +572,18 @@ class CompositeAnalysisStrategy(AnalysisStrategy):
         result = composite.run()
     """
 
-    def __init__(self, strategies: List[AnalysisStrategy]):
+    def __init__(self, strategies: List[AnalysisStrategy], workers: int = DEFAULT_STRATEGY_WORKERS):
         """
         Initialize with list of strategies to execute.
 
         Args:
             strategies: List of AnalysisStrategy instances to run
+            workers: Sub-strategies run in parallel (see run_strategies())
         """
         super().__init__()
         self.strategies = strategies
+        self.workers = workers
+        self.needs_text = any(s.needs_text for s in strategies)
 
     def get_name(self) -> str:
         """Return composite name."""
@@ -298,16 +604,10 @@ class CompositeAnalysisStrategy(AnalysisStrategy):
         all_warnings = []
         all_errors = []
 
-        for strategy in self.strategies:
-            try:
-                result = strategy.run(data)
-                results[strategy.get_name()] = result.to_dict()
-                all_warnings.extend(result.warnings)
-                all_errors.extend(result.errors)
-            except Exception as e:
-                error_msg = f"{strategy.get_name()} failed: {str(e)}"
-                all_errors.append(error_msg)
-                results[strategy.get_name()] = {'error': error_msg}
+        for strategy, result in zip(self.strategies, run_strategies(self.strategies, data, self.workers)):
+            results[strategy.get_name()] = result.to_dict()
+            all_warnings.extend(result.warnings)
+            all_errors.extend(result.errors)
 
         successful = sum(1 for r in results.values()
                         if isinstance(r, dict) and r.get('metadata', {}).get('success', False))
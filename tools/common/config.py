@@ -7,10 +7,12 @@ This module provides:
 - Single source of truth for all project constants
 """
 
+import re
 from pathlib import Path
 from typing import Dict, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -32,6 +34,10 @@ PROJECTS_DIR = Path.home() / ".claude" / "projects"
 DELEGATION_RAW_FILE = RAW_DATA_DIR / "delegation_raw.jsonl"
 SESSIONS_DATA_FILE = DATA_DIR / "full_sessions_data.json"
 ENRICHED_SESSIONS_FILE = DATA_DIR / "enriched_sessions_data.json"
+ENRICHED_SESSIONS_INDEX_FILE = DATA_DIR / "enriched_sessions_data.idx.json"
+ENRICHED_SESSIONS_FRAME_FILE = DATA_DIR / "enriched_sessions.frame"
+DELEGATION_TABLE_FILE = DATA_DIR / "delegation_table.bin"
+TEXT_BLOBS_FILE = DATA_DIR / "enriched_texts.bin"
 AGENT_CALLS_CSV = RAW_DATA_DIR / "agent_calls_metadata.csv"
 
 # Output files
@@ -42,6 +48,12 @@ SYSTEM_METRICS_FILE = DATA_DIR / "system_metrics_report.json"
 TRANSITION_ANALYSIS_FILE = DATA_DIR / "transition_analysis.json"
 TEMPORAL_SEGMENTATION_FILE = PROJECT_ROOT / "temporal-segmentation-report.json"
 
+# Pipeline stage fingerprints (see tools/pipeline/stage_manifest.py)
+STAGE_MANIFEST_FILE = DATA_DIR / ".cache" / "stage_manifest.json"
+
+# Append-only stage and script run history (see tools/pipeline/run_profile.py)
+PIPELINE_EXECUTION_LOG = PROJECT_ROOT / "pipeline_execution_log.json"
+
 # Historical data
 CONVERSATIONS_DIR = DATA_DIR / "conversations"
 HISTORICAL_DIR = DATA_DIR / "historical"
@@ -74,7 +86,7 @@ def _get_fallback_period_from_data() -> Dict[str, Dict]:
     Raises:
         ConfigurationError: If no data exists or cannot create period
     """
-    import json
+    from tools.common import codec
 
     if not SESSIONS_DATA_FILE.exists():
         raise ConfigurationError(
@@ -86,8 +98,7 @@ def _get_fallback_period_from_data() -> Dict[str, Dict]:
         )
 
     try:
-        with open(SESSIONS_DATA_FILE, 'r') as f:
-            data = json.load(f)
+        data = codec.load_file(SESSIONS_DATA_FILE)
 
         sessions = data.get('sessions', [])
         if not sessions:
@@ -124,7 +135,7 @@ def _get_fallback_period_from_data() -> Dict[str, Dict]:
             }
         }
 
-    except json.JSONDecodeError as e:
+    except codec.JSONDecodeError as e:
         raise ConfigurationError(f"Failed to parse session data: {e}")
     except Exception as e:
         raise ConfigurationError(f"Error creating fallback period: {e}")
@@ -202,6 +213,9 @@ class RuntimeConfig:
     # Source configuration
     source_live: bool = False  # Read from ~/.claude/projects/ instead of backup
 
+    # Extraction parallelism
+    scan_workers: int = 1  # Processes used to scan JSONL files (0 = one per CPU)
+
     def get_periods(self) -> Dict[str, Dict]:
         """Get period definitions with intelligent fallback chain.
 
@@ -244,19 +258,16 @@ class RuntimeConfig:
         if 'T' in date_str:
             date_str = date_str.split('T')[0]
 
-        date_obj = datetime.fromisoformat(date_str).date()
+        day = _day_ordinal(date_str)
 
         # Default start date: multi-agent launch
         start_date = self.start_date or DEFAULT_ANALYSIS_START
-        start = datetime.fromisoformat(start_date).date()
-        if date_obj < start:
+        if day < _day_ordinal(start_date):
             return False
 
         # End date is optional (defaults to "ongoing")
-        if self.end_date:
-            end = datetime.fromisoformat(self.end_date).date()
-            if date_obj > end:
-                return False
+        if self.end_date and day > _day_ordinal(self.end_date):
+            return False
 
         return True
 
@@ -267,6 +278,43 @@ class RuntimeConfig:
 
         return self.project_filter.lower() in project_path.lower()
 
+    def matches_project_dir(self, dir_name: str) -> bool:
+        """Check if a projects folder can hold messages matching the project filter.
+
+        Claude Code names each folder after its working directory with every
+        non-alphanumeric character replaced by '-', so both sides are compared
+        with those characters folded to '-'. Used to skip folders unopened.
+        """
+        if not self.project_filter:
+            return True
+
+        return _fold_path(self.project_filter) in _fold_path(dir_name)
+
+    def overlaps_date_range(self, first: Optional[str], last: Optional[str]) -> bool:
+        """Check if any day from first to last (ISO dates or timestamps) is in range.
+
+        None leaves that side unbounded. Used to skip files whose messages
+        all fall outside matches_date_range().
+        """
+        start = _day_ordinal(self.start_date or DEFAULT_ANALYSIS_START)
+        if last is not None and _day_ordinal(last.split('T')[0]) < start:
+            return False
+
+        if self.end_date and first is not None:
+            return _day_ordinal(first.split('T')[0]) <= _day_ordinal(self.end_date)
+        return True
+
+
+@lru_cache(maxsize=4096)
+def _day_ordinal(date_str: str) -> int:
+    """Day number of an ISO date, parsed once per distinct date (scans check every message)."""
+    return datetime.fromisoformat(date_str).toordinal()
+
+
+def _fold_path(path: str) -> str:
+    """Lowercase path with non-alphanumeric characters as '-' (project folder naming)."""
+    return re.sub(r'[^0-9a-z]', '-', path.lower())
+
 
 # Global runtime configuration (can be set by pipeline)
 _runtime_config: Optional[RuntimeConfig] = None
@@ -291,14 +339,16 @@ def get_runtime_config() -> RuntimeConfig:
         end_date = os.getenv('ANALYSIS_END_DATE')
         discover_periods = os.getenv('ANALYSIS_DISCOVER_PERIODS') == 'true'
         source_live = os.getenv('ANALYSIS_SOURCE_LIVE') == 'true'
+        scan_workers = os.getenv('ANALYSIS_SCAN_WORKERS')
 
-        if any([project_filter, start_date, end_date, discover_periods, source_live]):
+        if any([project_filter, start_date, end_date, discover_periods, source_live, scan_workers]):
             _runtime_config = RuntimeConfig(
                 project_filter=project_filter,
                 start_date=start_date,
                 end_date=end_date,
                 discover_periods=discover_periods,
-                source_live=source_live
+                source_live=source_live,
+                scan_workers=int(scan_workers) if scan_workers else 1
             )
         else:
             _runtime_config = RuntimeConfig()  # Default: no filtering
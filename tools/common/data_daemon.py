@@ -0,0 +1,317 @@
+"""
+Optional long-lived process holding a parsed DataRepository in memory.
+
+Interactive work (the /assess-agents loop of pipeline runs followed by
+repeated `analysis_runner.py --strategy ...` calls) re-parses the enriched
+sessions JSON on every invocation. While this daemon runs, the module-level
+functions of data_repository (load_delegations(), load_sessions(),
+get_session(), query_delegations(), ...) ask it over a Unix socket instead:
+the daemon keeps the loaded data and the encoded response of each request,
+so a repeated load costs one socket read and one JSON decode (no file read,
+session flattening or text blob resolution). Queries and single sessions
+return only the requested records and come back in milliseconds.
+
+Responses are dropped and rebuilt when any data file's size or mtime
+changes, so a pipeline run in between is picked up on the next request.
+Clients fall back to loading locally whenever the daemon is not running,
+and never use it when ANALYSIS_DATA_DAEMON=off.
+
+Usage:
+    python -m tools.common.data_daemon start      # in the background
+    python -m tools.common.data_daemon serve      # in the foreground
+    python -m tools.common.data_daemon status
+    python -m tools.common.data_daemon stop
+
+Protocol (one request per connection): a 4-byte big-endian length and a
+JSON request {"op": ..., "args": {...}}; the reply is a status byte (0 ok,
+1 error), a 4-byte length and the JSON result or {"error", "message"}.
+"""
+
+import gc
+import os
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from tools.common import codec
+
+# Set to "off" to always load in-process
+DAEMON_ENV = 'ANALYSIS_DATA_DAEMON'
+
+# Socket location relative to a repository's base path
+SOCKET_NAME = Path('data') / '.cache' / 'data_daemon.sock'
+
+# Requests the daemon answers: op -> DataRepository method
+OPERATIONS = {
+    'load_delegations': 'load_delegations',
+    'load_sessions': 'load_sessions',
+    'get_session': 'get_session',
+    'load_routing_patterns': 'load_routing_patterns',
+    'load_agent_calls': 'load_agent_calls',
+    'query_delegations': 'query_delegations',
+}
+
+# Seconds `start` waits for the socket to appear
+START_TIMEOUT = 10.0
+
+_HEADER = struct.Struct('>I')
+_OK, _ERROR = b'\x00', b'\x01'
+
+
+class DaemonUnavailable(Exception):
+    """Raised when no daemon answers on the socket (callers load locally)."""
+    pass
+
+
+def socket_path(base_path: Path) -> Path:
+    """Socket of the daemon serving the repository rooted at base_path."""
+    return Path(base_path) / SOCKET_NAME
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed mid-message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _recv_frame(sock: socket.socket) -> bytes:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return _recv_exact(sock, size)
+
+
+def _send_frame(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = codec.loads(_recv_frame(self.request))
+        except (ConnectionError, struct.error, codec.JSONDecodeError):
+            return
+
+        status, payload = self.server.data_daemon.respond(request)
+        self.request.sendall(status)
+        _send_frame(self.request, payload)
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class DataDaemon:
+    """Serves a DataRepository's loads and queries over a Unix socket."""
+
+    def __init__(self, repository=None, path: Optional[Path] = None):
+        """
+        Args:
+            repository: DataRepository to serve (default: a new one at the project root)
+            path: Socket path (default: socket_path(repository.base_path))
+        """
+        if repository is None:
+            from tools.common.data_repository import DataRepository
+            repository = DataRepository()
+        self.repository = repository
+        self.path = Path(path) if path is not None else socket_path(repository.base_path)
+
+        # Encoded response per request, with the data files' signatures it was built from
+        self._responses: Dict[bytes, tuple] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self.started = time.time()
+        self.stats = {'requests': 0, 'cache_hits': 0}
+
+    def _signature(self) -> tuple:
+        return tuple(self.repository._file_signature(path) for path in self.repository.paths.values())
+
+    def respond(self, request: Dict) -> tuple:
+        """
+        Answer one decoded request.
+
+        Returns:
+            (status byte, encoded payload)
+        """
+        op = request.get('op')
+        args = request.get('args') or {}
+
+        if op == 'ping':
+            return _OK, codec.dumps(self.status(), pretty=False)
+        if op == 'shutdown':
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return _OK, codec.dumps(True, pretty=False)
+        if op not in OPERATIONS:
+            return _ERROR, codec.dumps({'error': 'ValueError', 'message': f"Unknown op: {op}"}, pretty=False)
+
+        key = codec.dumps([op, sorted(args.items())], pretty=False)
+        with self._lock:
+            self.stats['requests'] += 1
+            signature = self._signature()
+            cached = self._responses.get(key)
+            if cached is not None and cached[0] == signature and args.get('use_cache', True):
+                self.stats['cache_hits'] += 1
+                return _OK, cached[1]
+
+            try:
+                result = getattr(self.repository, OPERATIONS[op])(**args)
+                payload = codec.dumps(result, pretty=False)
+            except Exception as e:
+                return _ERROR, codec.dumps({'error': type(e).__name__, 'message': str(e)}, pretty=False)
+
+            self._responses[key] = (signature, payload)
+            return _OK, payload
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'pid': os.getpid(),
+            'base_path': str(self.repository.base_path),
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'cached_responses': len(self._responses),
+            **self.stats,
+        }
+
+    def serve_forever(self) -> None:
+        """Bind the socket (owner access only) and serve until shutdown()."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            try:
+                request('ping', path=self.path)
+            except DaemonUnavailable:
+                self.path.unlink()  # Left behind by a daemon that died
+            else:
+                raise RuntimeError(f"A data daemon is already running on {self.path}")
+
+        old_umask = os.umask(0o077)
+        try:
+            self._server = _Server(str(self.path), _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.data_daemon = self
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if self.path.exists():
+                self.path.unlink()
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def request(op: str, path: Path, **args) -> Any:
+    """
+    Send one request to the daemon listening on path.
+
+    Raises:
+        DaemonUnavailable: If no daemon owned by this user answers
+        DataLoadError, ValueError, KeyError: Re-raised from the daemon's repository
+        RuntimeError: For any other error inside the daemon
+    """
+    try:
+        if os.stat(path).st_uid != os.getuid():
+            raise DaemonUnavailable(f"{path} belongs to another user")
+    except FileNotFoundError:
+        raise DaemonUnavailable(f"No daemon socket at {path}")
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(path))
+            _send_frame(sock, codec.dumps({'op': op, 'args': args}, pretty=False))
+            status = _recv_exact(sock, 1)
+            payload = _recv_frame(sock)
+    except (OSError, ConnectionError, struct.error) as e:
+        raise DaemonUnavailable(f"Data daemon on {path} not answering: {e}")
+
+    # The decoded JSON holds no reference cycles; collections triggered by
+    # allocating it would only rescan the growing heap
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        result = codec.loads(payload)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    if status == _OK:
+        return result
+
+    from tools.common.data_repository import DataLoadError
+    errors = {'DataLoadError': DataLoadError, 'ValueError': ValueError, 'KeyError': KeyError}
+    raise errors.get(result['error'], RuntimeError)(result['message'])
+
+
+def enabled() -> bool:
+    """Whether clients may use a running daemon (ANALYSIS_DATA_DAEMON != off)."""
+    return os.environ.get(DAEMON_ENV, '').lower() not in ('off', '0', 'false', 'no')
+
+
+def start(path: Path) -> int:
+    """Start `serve` in a detached process and wait until it answers."""
+    try:
+        print(f"Already running: {request('ping', path=path)}")
+        return 0
+    except DaemonUnavailable:
+        pass
+
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'tools.common.data_daemon', 'serve'],
+        cwd=path.parent.parent.parent,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    deadline = time.time() + START_TIMEOUT
+    while time.time() < deadline:
+        try:
+            print(f"Started: {request('ping', path=path)}")
+            return 0
+        except DaemonUnavailable:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    print(f"Data daemon did not start (see `python -m tools.common.data_daemon serve`)")
+    return 1
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Keep parsed analysis data in memory for repeated loads")
+    parser.add_argument('command', choices=['start', 'serve', 'status', 'stop'])
+    args = parser.parse_args()
+
+    from tools.common.data_repository import get_repository
+    repository = get_repository()
+    path = socket_path(repository.base_path)
+
+    if args.command == 'serve':
+        print(f"Serving {repository.base_path / 'data'} on {path}", flush=True)
+        DataDaemon(repository, path).serve_forever()
+        return 0
+    if args.command == 'start':
+        return start(path)
+
+    try:
+        result = request('ping' if args.command == 'status' else 'shutdown', path=path)
+    except DaemonUnavailable:
+        print("Data daemon not running")
+        return 1
+    print(result if args.command == 'status' else "Data daemon stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,18 +9,29 @@ Usage:
     
     delegations = load_delegations()
     sessions = load_sessions()
+
+The module-level functions are answered by the data daemon when one is
+running (see data_daemon.py), so repeated script runs skip re-parsing.
 """
 
-import json
 import csv
+import mmap
+import threading
 import ijson
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable, Iterator, Union
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, Union
 from datetime import datetime
 
+from tools.common import codec
+from tools.common.delegation_table import DelegationTable
+from tools.common.metrics_service import MetricsMemo
+from tools.common.session_frame import SessionFrame
+from tools.common.text_store import TextBlobStore, resolve_texts
+from tools.common.sessions_file import load_index, read_session
+
 # Conditional import for typed models
 try:
-    from tools.common.models import Delegation, Session, AgentCall
+    from tools.common.models import Delegation, DelegationBatch, Session, AgentCall
     MODELS_AVAILABLE = True
 except ImportError:
     MODELS_AVAILABLE = False
@@ -47,12 +58,31 @@ class DataRepository:
         
         # Cache for loaded data
         self._cache: Dict[str, Any] = {}
+
+        # Cache key -> (source file, (size, mtime_ns)) when it was loaded
+        self._cache_sources: Dict[str, tuple] = {}
+
+        # Serializes document loads when pipeline stages run concurrently
+        self._load_lock = threading.RLock()
+
+        # Opened on first text access only
+        self._text_store: Optional[TextBlobStore] = None
+        self._text_store_signature: Optional[tuple] = None
+
+        # Memory-mapped enriched sessions file for get_session()
+        self._session_map: Optional[mmap.mmap] = None
+        self._session_index: Optional[Dict[str, List[int]]] = None
+        self._session_stat: Optional[tuple] = None
         
         # Data file paths
         self.paths = {
             'delegations_jsonl': self.base_path / 'data' / 'raw' / 'delegation_raw.jsonl',
             'enriched_sessions': self.base_path / 'data' / 'enriched_sessions_data.json',
+            'enriched_sessions_index': self.base_path / 'data' / 'enriched_sessions_data.idx.json',
             'full_sessions': self.base_path / 'data' / 'full_sessions_data.json',
+            'session_frame': self.base_path / 'data' / 'enriched_sessions.frame',
+            'delegation_table': self.base_path / 'data' / 'delegation_table.bin',
+            'text_blobs': self.base_path / 'data' / 'enriched_texts.bin',
             'routing_analysis': self.base_path / 'data' / 'routing_quality_analysis.json',
             'routing_patterns': self.base_path / 'data' / 'routing_patterns_by_period.json',
             'good_patterns': self.base_path / 'data' / 'good_routing_patterns.json',
@@ -60,18 +90,119 @@ class DataRepository:
         }
     
     def _get_cached(self, key: str) -> Optional[Any]:
-        """Get cached data if available."""
+        """Get cached data if available and its source file is unchanged."""
+        if key in self._cache_sources:
+            source, signature = self._cache_sources[key]
+            if self._file_signature(source) != signature:
+                # Rewritten by a pipeline stage sharing this repository
+                del self._cache[key]
+                del self._cache_sources[key]
+                if source == self.paths['enriched_sessions']:
+                    # The blob file is rewritten together with the sessions file
+                    self._close_text_store()
+                return None
         return self._cache.get(key)
     
-    def _set_cached(self, key: str, data: Any) -> None:
-        """Cache loaded data."""
+    def _set_cached(self, key: str, data: Any, source: Optional[Path] = None) -> None:
+        """Cache loaded data, optionally tied to the file it was read from."""
         self._cache[key] = data
+        if source is not None:
+            self._cache_sources[key] = (source, self._file_signature(source))
+
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[tuple]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def load_document(self, name: str, use_cache: bool = True) -> Dict:
+        """
+        Load a whole JSON data file by its key in self.paths.
+
+        Pipeline stages running in one process share the parsed document
+        instead of each re-reading the file; the cached copy is dropped
+        when the file changes on disk.
+
+        Args:
+            name: Key in self.paths (e.g. 'enriched_sessions')
+            use_cache: Whether to use cached data
+
+        Returns:
+            Parsed JSON document (shared; treat as read-only)
+
+        Raises:
+            DataLoadError: If file not found or invalid JSON
+        """
+        cache_key = f'document_{name}'
+
+        with self._load_lock:
+            if use_cache and (cached := self._get_cached(cache_key)):
+                return cached
+
+            file_path = self.paths[name]
+            if not file_path.exists():
+                raise DataLoadError(
+                    f"Data file not found: {file_path}\n"
+                    f"Run data extraction pipeline first."
+                )
+
+            try:
+                data = codec.load_file(file_path)
+            except codec.JSONDecodeError as e:
+                raise DataLoadError(f"Invalid JSON in {file_path}: {e}")
+
+            self._set_cached(cache_key, data, source=file_path)
+            return data
+
+    def get_text_store(self) -> TextBlobStore:
+        """
+        Blob store holding delegation text fields (prompt, result_full, ...).
+
+        The file itself is only opened when a text is first read. A blob file
+        rewritten since (new extraction run) gets a new store.
+        """
+        with self._load_lock:
+            signature = self._file_signature(self.paths['text_blobs'])
+            if self._text_store is not None and self._text_store_signature != signature:
+                self._close_text_store()
+            if self._text_store is None:
+                self._text_store = TextBlobStore(self.paths['text_blobs'])
+                self._text_store_signature = signature
+            return self._text_store
+
+    def _close_text_store(self) -> None:
+        if self._text_store is not None:
+            self._text_store.close()
+        self._text_store = None
+        self._text_store_signature = None
+
+    def _inline_texts(self, delegations: Iterable[Dict]) -> List[Dict]:
+        """Copies of delegation dicts with their 'text_refs' resolved into inline fields.
+
+        The given dicts are left untouched, since they may belong to a
+        document shared through load_document().
+        """
+        inlined = []
+        for delegation in delegations:
+            if 'text_refs' in delegation:
+                if not self.paths['text_blobs'].exists():
+                    raise DataLoadError(
+                        f"Text blob store not found: {self.paths['text_blobs']}\n"
+                        f"Run data extraction pipeline first."
+                    )
+                delegation = dict(delegation, text_refs=dict(delegation['text_refs']))
+                resolve_texts(delegation, self.get_text_store())
+            inlined.append(delegation)
+        return inlined
     
     def load_delegations(
         self,
         source: str = 'enriched',
         use_cache: bool = True,
-        typed: bool = False
+        typed: bool = False,
+        with_text: bool = True
     ) -> Union[List[Dict], List['Delegation']]:
         """
         Load delegation data from enriched sessions JSON (recommended)
@@ -81,6 +212,10 @@ class DataRepository:
             source: 'enriched' (default) or 'raw'
             use_cache: Whether to use cached data if available
             typed: If True, return typed Delegation objects instead of dicts
+            with_text: Inline text fields from the blob store. If False,
+                delegations keep 'text_refs' and the text file is never read.
+                Typed delegations always keep their references and fetch text
+                only when asked (prompt_text(), get_text())
 
         Returns:
             List of delegation dictionaries (typed=False) or Delegation objects (typed=True)
@@ -105,24 +240,30 @@ class DataRepository:
         if typed and not MODELS_AVAILABLE:
             raise RuntimeError("Typed mode requires common.models module")
 
-        cache_key = f'delegations_{source}_{"typed" if typed else "dict"}'
+        cache_key = f'delegations_{source}_{"typed" if typed else "dict"}{"" if with_text else "_notext"}'
 
-        if use_cache and (cached := self._get_cached(cache_key)):
-            return cached
+        with self._load_lock:
+            if use_cache and (cached := self._get_cached(cache_key)):
+                return cached
 
-        if source == 'enriched':
-            data = self._load_enriched_delegations()
-        elif source == 'raw':
-            data = self._load_raw_delegations()
-        else:
-            raise ValueError(f"Unknown source: {source}. Use 'enriched' or 'raw'")
+            if source == 'enriched':
+                data = self._load_enriched_delegations()
+            elif source == 'raw':
+                data = self._load_raw_delegations()
+            else:
+                raise ValueError(f"Unknown source: {source}. Use 'enriched' or 'raw'")
 
-        # Convert to typed objects if requested
-        if typed:
-            data = [Delegation.from_dict(d) for d in data]
+            # Typed delegations read text lazily through their text store
+            if with_text and not typed:
+                data = self._inline_texts(data)
 
-        self._set_cached(cache_key, data)
-        return data
+            # Convert to typed objects if requested
+            if typed:
+                data = [Delegation.from_dict(d, text_store=self.get_text_store()) for d in data]
+
+            source_key = 'enriched_sessions' if source == 'enriched' else 'delegations_jsonl'
+            self._set_cached(cache_key, data, source=self.paths[source_key])
+            return data
     
     def _load_enriched_delegations(self) -> List[Dict]:
         """Load delegations from enriched sessions JSON."""
@@ -136,9 +277,8 @@ class DataRepository:
             )
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except json.JSONDecodeError as e:
+            data = codec.load_file(file_path)
+        except codec.JSONDecodeError as e:
             raise DataLoadError(f"Invalid JSON in {file_path}: {e}")
         
         # Validate structure
@@ -174,16 +314,16 @@ class DataRepository:
         line_num = 0
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(file_path, 'rb') as f:
                 for line in f:
                     line_num += 1
                     if not line.strip():
                         continue
                     
                     try:
-                        delegation = json.loads(line.strip())
+                        delegation = codec.loads(line)
                         delegations.append(delegation)
-                    except json.JSONDecodeError as e:
+                    except codec.JSONDecodeError as e:
                         # Log warning but continue
                         print(f"Warning: Skipping invalid JSON at line {line_num}: {e}")
                         continue
@@ -199,7 +339,8 @@ class DataRepository:
         self,
         enriched: bool = True,
         use_cache: bool = True,
-        typed: bool = False
+        typed: bool = False,
+        with_text: bool = True
     ) -> Union[List[Dict], List['Session']]:
         """
         Load session data with delegation metadata.
@@ -208,6 +349,8 @@ class DataRepository:
             enriched: Use enriched sessions (True) or full sessions (False)
             use_cache: Whether to use cached data
             typed: If True, return typed Session objects instead of dicts
+            with_text: Inline delegation text fields from the blob store
+                (typed sessions' delegations fetch text lazily instead)
 
         Returns:
             List of session dictionaries (typed=False) or Session objects (typed=True)
@@ -219,12 +362,265 @@ class DataRepository:
         if typed and not MODELS_AVAILABLE:
             raise RuntimeError("Typed mode requires common.models module")
 
-        cache_key = f'sessions_{"enriched" if enriched else "full"}_{"typed" if typed else "dict"}'
+        cache_key = f'sessions_{"enriched" if enriched else "full"}_{"typed" if typed else "dict"}{"" if with_text else "_notext"}'
+
+        with self._load_lock:
+            if use_cache and (cached := self._get_cached(cache_key)):
+                return cached
+
+            file_path = self.paths['enriched_sessions' if enriched else 'full_sessions']
+
+            if not file_path.exists():
+                raise DataLoadError(
+                    f"Sessions file not found: {file_path}\n"
+                    f"Run session extraction pipeline first."
+                )
+
+            # Typed delegations read text lazily through their text store
+            inline = with_text and not typed
+
+            if inline:
+                # Shared with pipeline stages reading the same document
+                data = self.load_document('enriched_sessions' if enriched else 'full_sessions', use_cache=use_cache)
+            else:
+                try:
+                    data = codec.load_file(file_path)
+                except codec.JSONDecodeError as e:
+                    raise DataLoadError(f"Invalid JSON in {file_path}: {e}")
+
+            sessions = data.get('sessions', [])
+
+            if not sessions:
+                raise DataLoadError(f"No sessions found in {file_path}")
+
+            if inline:
+                # The shared document keeps its references; texts go into per-call dicts
+                sessions = [
+                    dict(s, delegations=self._inline_texts(s['delegations'])) if s.get('delegations') else s
+                    for s in sessions
+                ]
+
+            # Convert to typed objects if requested
+            if typed:
+                sessions = [Session.from_dict(s, text_store=self.get_text_store()) for s in sessions]
+
+            self._set_cached(cache_key, sessions, source=file_path)
+            return sessions
+    
+    def query_delegations(
+        self,
+        where: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        with_text: bool = False
+    ) -> List[Dict]:
+        """
+        Select enriched delegations by field values.
+
+        Small results make this cheap to answer through the data daemon.
+
+        Args:
+            where: field -> required value (a list matches any of its values)
+            fields: Keys kept in each result (default: all)
+            limit: Maximum number of results
+            with_text: Inline text fields from the blob store
+
+        Returns:
+            Matching delegation dictionaries, in file order
+
+        Example:
+            >>> query_delegations({'agent_type': 'developer', 'success': False},
+            ...                   fields=['session_id', 'description'])
+        """
+        conditions = [
+            (key, value if isinstance(value, list) else [value])
+            for key, value in (where or {}).items()
+        ]
+
+        results = []
+        for delegation in self.load_delegations(with_text=with_text):
+            if not all(delegation.get(key) in values for key, values in conditions):
+                continue
+            results.append({key: delegation.get(key) for key in fields} if fields else delegation)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def load_delegation_table(self, use_cache: bool = True) -> DelegationTable:
+        """
+        Load the columnar delegation table written by the extraction stage.
+
+        Aggregations (per-agent token totals, success counts) run over typed
+        columns without building a dict per delegation.
+
+        Args:
+            use_cache: Whether to use cached data
+
+        Returns:
+            DelegationTable with one row per delegation
+
+        Raises:
+            DataLoadError: If file not found or not a valid table
+
+        Example:
+            >>> table = load_delegation_table()
+            >>> table.group_sum('tokens_in')['developer']
+            120340
+        """
+        cache_key = 'delegation_table'
 
         if use_cache and (cached := self._get_cached(cache_key)):
             return cached
 
-        file_path = self.paths['enriched_sessions' if enriched else 'full_sessions']
+        file_path = self.paths['delegation_table']
+
+        if not file_path.exists():
+            raise DataLoadError(
+                f"Delegation table not found: {file_path}\n"
+                f"Run data extraction pipeline first."
+            )
+
+        try:
+            table = DelegationTable.load(file_path)
+        except (ValueError, KeyError, codec.JSONDecodeError) as e:
+            raise DataLoadError(f"Invalid delegation table {file_path}: {e}")
+
+        self._set_cached(cache_key, table, source=file_path)
+        return table
+
+    def load_session_frame(self, use_cache: bool = True) -> SessionFrame:
+        """
+        Map the enriched sessions frame written by the extraction stage.
+
+        Opening parses only the frame header; session and delegation dicts
+        are built on demand, for just the rows and fields asked for.
+
+        Args:
+            use_cache: Whether to use cached data
+
+        Returns:
+            SessionFrame mirroring enriched_sessions_data.json
+
+        Raises:
+            DataLoadError: If file not found, invalid or older than the JSON
+
+        Example:
+            >>> frame = load_session_frame()
+            >>> frame.session(0, delegation_fields=['agent_type'])['delegations'][0]
+            {'agent_type': 'developer'}
+        """
+        cache_key = 'session_frame'
+
+        cached = self._get_cached(cache_key) if use_cache else None
+        if cached is not None and cached.is_current(self.paths['enriched_sessions']):
+            return cached
+
+        file_path = self.paths['session_frame']
+
+        if not file_path.exists():
+            raise DataLoadError(
+                f"Session frame not found: {file_path}\n"
+                f"Run data extraction pipeline first."
+            )
+
+        try:
+            frame = SessionFrame.open(file_path)
+        except (ValueError, KeyError, codec.JSONDecodeError) as e:
+            raise DataLoadError(f"Invalid session frame {file_path}: {e}")
+
+        if not frame.is_current(self.paths['enriched_sessions']):
+            raise DataLoadError(
+                f"Session frame {file_path} does not match {self.paths['enriched_sessions']}\n"
+                f"Run data extraction pipeline again."
+            )
+
+        self._set_cached(cache_key, frame, source=file_path)
+        return frame
+
+    def load_delegation_batch(self, source: str = 'enriched', use_cache: bool = True) -> 'DelegationBatch':
+        """
+        Load typed delegations into a column-oriented DelegationBatch.
+
+        Same delegations as load_delegations(typed=True) at a fraction of the
+        memory: items are Delegation views built on access, and text stays in
+        the blob store until a view's get_text() asks for it.
+
+        Args:
+            source: 'enriched' (default) or 'raw'
+            use_cache: Whether to use cached data
+
+        Returns:
+            DelegationBatch with one row per delegation
+
+        Raises:
+            DataLoadError: If file not found or invalid JSON
+            RuntimeError: If models not available
+        """
+        if not MODELS_AVAILABLE:
+            raise RuntimeError("Typed mode requires common.models module")
+
+        cache_key = f'delegation_batch_{source}'
+
+        if use_cache and (cached := self._get_cached(cache_key)):
+            return cached
+
+        data = self.load_delegations(source=source, use_cache=False, with_text=False)
+        batch = DelegationBatch.from_dicts(data, text_store=self.get_text_store())
+
+        source_key = 'enriched_sessions' if source == 'enriched' else 'delegations_jsonl'
+        self._set_cached(cache_key, batch, source=self.paths[source_key])
+        return batch
+
+    def metrics_memo(self, source: str = 'enriched') -> MetricsMemo:
+        """
+        Normalized metrics records of the delegations loaded from source.
+
+        Shared by every caller of this repository (e.g. pipeline stages and
+        the strategies of one analysis run), so each delegation is
+        normalized once; replaced by an empty memo when the source file
+        changes on disk.
+
+        Args:
+            source: 'enriched' (default) or 'raw'
+
+        Returns:
+            MetricsMemo to pass to metrics_service functions
+        """
+        cache_key = f'metrics_memo_{source}'
+
+        with self._load_lock:
+            memo = self._get_cached(cache_key)
+            if memo is None:
+                memo = MetricsMemo()
+                source_key = 'enriched_sessions' if source == 'enriched' else 'delegations_jsonl'
+                self._set_cached(cache_key, memo, source=self.paths[source_key])
+            return memo
+
+    def get_session(self, session_id: str, with_text: bool = True) -> Optional[Dict]:
+        """
+        Fetch one enriched session by id without parsing the whole file.
+
+        Uses the session_id -> byte range sidecar index written at
+        extraction time: the sessions file is memory-mapped once and only
+        the requested session's slice is decoded. Falls back to streaming
+        the file if the index is missing or stale.
+
+        Args:
+            session_id: Session UUID
+            with_text: Inline delegation text fields from the blob store
+
+        Returns:
+            Session dictionary, or None if no session has that id
+
+        Raises:
+            DataLoadError: If the sessions file is not found
+
+        Example:
+            >>> session = get_session('0b7c...')
+            >>> session['delegation_count']
+            42
+        """
+        file_path = self.paths['enriched_sessions']
 
         if not file_path.exists():
             raise DataLoadError(
@@ -232,24 +628,53 @@ class DataRepository:
                 f"Run session extraction pipeline first."
             )
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except json.JSONDecodeError as e:
-            raise DataLoadError(f"Invalid JSON in {file_path}: {e}")
+        index = self._open_session_index()
+        if index is None:
+            session = next(
+                self.stream_sessions(lambda s: s.get('session_id') == session_id, with_text=False),
+                None
+            )
+        elif session_id in index:
+            session = read_session(self._session_map, index[session_id])
+        else:
+            session = None
 
-        sessions = data.get('sessions', [])
+        if session is not None and with_text and session.get('delegations'):
+            session['delegations'] = self._inline_texts(session['delegations'])
+        return session
 
-        if not sessions:
-            raise DataLoadError(f"No sessions found in {file_path}")
+    def _open_session_index(self) -> Optional[Dict[str, List[int]]]:
+        """Load the sidecar index and mmap the sessions file.
 
-        # Convert to typed objects if requested
-        if typed:
-            sessions = [Session.from_dict(s) for s in sessions]
+        Both are kept open across calls and re-opened if the sessions file
+        was rewritten since (e.g. by a new extraction run).
+        """
+        stat = self.paths['enriched_sessions'].stat()
+        current = (stat.st_size, stat.st_mtime_ns)
+
+        if self._session_index is not None and self._session_stat == current:
+            return self._session_index
+
+        if self._session_stat is not None:
+            # Rewritten by a new extraction run, together with the blob file
+            self._close_text_store()
+        self._close_session_map()
+        index = load_index(self.paths['enriched_sessions_index'], self.paths['enriched_sessions'])
+        if index is None or stat.st_size == 0:
+            return None
+        with open(self.paths['enriched_sessions'], 'rb') as f:
+            self._session_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._session_index = index
+        self._session_stat = current
+        return index
+
+    def _close_session_map(self) -> None:
+        if self._session_map is not None:
+            self._session_map.close()
+        self._session_map = None
+        self._session_index = None
+        self._session_stat = None
 
-        self._set_cached(cache_key, sessions)
-        return sessions
-    
     def load_routing_patterns(
         self,
         pattern_type: str = 'by_period',
@@ -294,12 +719,11 @@ class DataRepository:
             )
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except json.JSONDecodeError as e:
+            data = codec.load_file(file_path)
+        except codec.JSONDecodeError as e:
             raise DataLoadError(f"Invalid JSON in {file_path}: {e}")
         
-        self._set_cached(cache_key, data)
+        self._set_cached(cache_key, data, source=file_path)
         return data
     
     def load_agent_calls(
@@ -351,17 +775,21 @@ class DataRepository:
         if typed:
             data = [AgentCall.from_dict(row) for row in data]
 
-        self._set_cached(cache_key, data)
+        self._set_cached(cache_key, data, source=file_path)
         return data
     
     def clear_cache(self) -> None:
         """Clear all cached data."""
         self._cache.clear()
+        self._cache_sources.clear()
+        self._close_text_store()
+        self._close_session_map()
 
     def stream_sessions(
         self,
         filter_func: Optional[Callable[[Dict], bool]] = None,
-        enriched: bool = True
+        enriched: bool = True,
+        with_text: bool = True
     ) -> Iterator[Dict]:
         """
         Stream sessions one at a time from large JSON file.
@@ -372,6 +800,7 @@ class DataRepository:
         Args:
             filter_func: Optional function to filter sessions (session) -> bool
             enriched: Use enriched sessions (True) or full sessions (False)
+            with_text: Inline delegation text fields from the blob store
 
         Yields:
             Session dictionaries one at a time
@@ -405,6 +834,8 @@ class DataRepository:
                 for session in sessions_iterator:
                     # Apply filter early to reduce memory usage
                     if filter_func is None or filter_func(session):
+                        if with_text and session.get('delegations'):
+                            session['delegations'] = self._inline_texts(session['delegations'])
                         yield session
 
         except Exception as e:
@@ -413,7 +844,8 @@ class DataRepository:
     def stream_delegations(
         self,
         filter_func: Optional[Callable[[Dict], bool]] = None,
-        enriched: bool = True
+        enriched: bool = True,
+        with_text: bool = True
     ) -> Iterator[Dict]:
         """
         Stream delegations one at a time from sessions JSON.
@@ -424,6 +856,7 @@ class DataRepository:
         Args:
             filter_func: Optional function to filter delegations (delegation) -> bool
             enriched: Use enriched sessions (True) or full sessions (False)
+            with_text: Inline delegation text fields from the blob store
 
         Yields:
             Delegation dictionaries one at a time
@@ -441,7 +874,7 @@ class DataRepository:
             - Processes 1,315 delegations with ~1-2MB peak memory
             - Scales to 100K+ delegations without memory issues
         """
-        for session in self.stream_sessions(enriched=enriched):
+        for session in self.stream_sessions(enriched=enriched, with_text=with_text):
             session_id = session.get('session_id', 'unknown')
             session_msg_count = session.get('message_count', 0)
 
@@ -458,12 +891,28 @@ class DataRepository:
 # Global repository instance
 _repository = DataRepository()
 
+# Returned by _from_daemon() when the caller must load locally
+_NO_DAEMON = object()
+
+
+def _from_daemon(op: str, **args) -> Any:
+    """Answer a request through a running data daemon, if there is one."""
+    from tools.common import data_daemon
+
+    if not data_daemon.enabled():
+        return _NO_DAEMON
+    try:
+        return data_daemon.request(op, path=data_daemon.socket_path(_repository.base_path), **args)
+    except data_daemon.DaemonUnavailable:
+        return _NO_DAEMON
+
 
 # Convenience functions for backward compatibility
 def load_delegations(
     source: str = 'enriched',
     use_cache: bool = True,
-    typed: bool = False
+    typed: bool = False,
+    with_text: bool = True
 ) -> Union[List[Dict], List['Delegation']]:
     """
     Load delegation data (recommended: use enriched source).
@@ -472,17 +921,25 @@ def load_delegations(
         source: 'enriched' (default, from sessions) or 'raw' (from JSONL)
         use_cache: Whether to use cached data
         typed: If True, return typed Delegation objects instead of dicts
+        with_text: Inline text fields (False never reads the text blob file)
 
     Returns:
         List of delegation dictionaries (typed=False) or Delegation objects (typed=True)
     """
-    return _repository.load_delegations(source=source, use_cache=use_cache, typed=typed)
+    if not typed:
+        result = _from_daemon('load_delegations', source=source, use_cache=use_cache, with_text=with_text)
+        if result is not _NO_DAEMON:
+            return result
+    return _repository.load_delegations(
+        source=source, use_cache=use_cache, typed=typed, with_text=with_text
+    )
 
 
 def load_sessions(
     enriched: bool = True,
     use_cache: bool = True,
-    typed: bool = False
+    typed: bool = False,
+    with_text: bool = True
 ) -> Union[List[Dict], List['Session']]:
     """
     Load session data.
@@ -491,11 +948,112 @@ def load_sessions(
         enriched: Use enriched sessions (True) or full sessions (False)
         use_cache: Whether to use cached data
         typed: If True, return typed Session objects instead of dicts
+        with_text: Inline text fields (False never reads the text blob file)
 
     Returns:
         List of session dictionaries (typed=False) or Session objects (typed=True)
     """
-    return _repository.load_sessions(enriched=enriched, use_cache=use_cache, typed=typed)
+    if not typed:
+        result = _from_daemon('load_sessions', enriched=enriched, use_cache=use_cache, with_text=with_text)
+        if result is not _NO_DAEMON:
+            return result
+    return _repository.load_sessions(
+        enriched=enriched, use_cache=use_cache, typed=typed, with_text=with_text
+    )
+
+
+def load_delegation_table(use_cache: bool = True) -> DelegationTable:
+    """
+    Load the columnar delegation table.
+
+    Args:
+        use_cache: Whether to use cached data
+
+    Returns:
+        DelegationTable with one row per delegation
+    """
+    return _repository.load_delegation_table(use_cache=use_cache)
+
+
+def load_session_frame(use_cache: bool = True) -> SessionFrame:
+    """
+    Map the enriched sessions frame.
+
+    Args:
+        use_cache: Whether to use cached data
+
+    Returns:
+        SessionFrame mirroring enriched_sessions_data.json
+    """
+    return _repository.load_session_frame(use_cache=use_cache)
+
+
+def metrics_memo(source: str = 'enriched') -> MetricsMemo:
+    """
+    Normalized metrics records of the delegations loaded from source.
+
+    Args:
+        source: 'enriched' (default) or 'raw'
+
+    Returns:
+        MetricsMemo of this process's repository
+    """
+    return _repository.metrics_memo(source)
+
+
+def load_delegation_batch(source: str = 'enriched', use_cache: bool = True) -> 'DelegationBatch':
+    """
+    Load typed delegations into a column-oriented DelegationBatch.
+
+    Args:
+        source: 'enriched' (default) or 'raw'
+        use_cache: Whether to use cached data
+
+    Returns:
+        DelegationBatch with one row per delegation
+    """
+    return _repository.load_delegation_batch(source=source, use_cache=use_cache)
+
+
+def get_session(session_id: str, with_text: bool = True) -> Optional[Dict]:
+    """
+    Fetch one enriched session by id (indexed, no full-file parse).
+
+    Args:
+        session_id: Session UUID
+        with_text: Inline text fields (False never reads the text blob file)
+
+    Returns:
+        Session dictionary, or None if not found
+    """
+    result = _from_daemon('get_session', session_id=session_id, with_text=with_text)
+    if result is not _NO_DAEMON:
+        return result
+    return _repository.get_session(session_id, with_text=with_text)
+
+
+def query_delegations(
+    where: Optional[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    with_text: bool = False
+) -> List[Dict]:
+    """
+    Select enriched delegations by field values.
+
+    Args:
+        where: field -> required value (a list matches any of its values)
+        fields: Keys kept in each result (default: all)
+        limit: Maximum number of results
+        with_text: Inline text fields
+
+    Returns:
+        Matching delegation dictionaries
+    """
+    result = _from_daemon('query_delegations', where=where, fields=fields, limit=limit, with_text=with_text)
+    if result is not _NO_DAEMON:
+        return result
+    return _repository.query_delegations(where=where, fields=fields, limit=limit, with_text=with_text)
 
 
 def load_routing_patterns(pattern_type: str = 'by_period', use_cache: bool = True) -> Dict:
@@ -509,6 +1067,9 @@ def load_routing_patterns(pattern_type: str = 'by_period', use_cache: bool = Tru
     Returns:
         Routing patterns dictionary
     """
+    result = _from_daemon('load_routing_patterns', pattern_type=pattern_type, use_cache=use_cache)
+    if result is not _NO_DAEMON:
+        return result
     return _repository.load_routing_patterns(pattern_type=pattern_type, use_cache=use_cache)
 
 
@@ -526,6 +1087,10 @@ def load_agent_calls(
     Returns:
         List of agent call dictionaries (typed=False) or AgentCall objects (typed=True)
     """
+    if not typed:
+        result = _from_daemon('load_agent_calls', use_cache=use_cache)
+        if result is not _NO_DAEMON:
+            return result
     return _repository.load_agent_calls(use_cache=use_cache, typed=typed)
 
 
@@ -534,9 +1099,15 @@ def clear_cache() -> None:
     _repository.clear_cache()
 
 
+def get_repository() -> DataRepository:
+    """Shared repository behind the convenience functions."""
+    return _repository
+
+
 def stream_sessions(
     filter_func: Optional[Callable[[Dict], bool]] = None,
-    enriched: bool = True
+    enriched: bool = True,
+    with_text: bool = True
 ) -> Iterator[Dict]:
     """
     Stream sessions one at a time from large JSON file (memory efficient).
@@ -544,6 +1115,7 @@ def stream_sessions(
     Args:
         filter_func: Optional function to filter sessions (session) -> bool
         enriched: Use enriched sessions (True) or full sessions (False)
+        with_text: Inline text fields (False never reads the text blob file)
 
     Yields:
         Session dictionaries one at a time
@@ -551,12 +1123,13 @@ def stream_sessions(
     Performance:
         5-10x memory reduction vs load_sessions()
     """
-    return _repository.stream_sessions(filter_func=filter_func, enriched=enriched)
+    return _repository.stream_sessions(filter_func=filter_func, enriched=enriched, with_text=with_text)
 
 
 def stream_delegations(
     filter_func: Optional[Callable[[Dict], bool]] = None,
-    enriched: bool = True
+    enriched: bool = True,
+    with_text: bool = True
 ) -> Iterator[Dict]:
     """
     Stream delegations one at a time from sessions JSON (memory efficient).
@@ -564,6 +1137,7 @@ def stream_delegations(
     Args:
         filter_func: Optional function to filter delegations (delegation) -> bool
         enriched: Use enriched sessions (True) or full sessions (False)
+        with_text: Inline text fields (False never reads the text blob file)
 
     Yields:
         Delegation dictionaries one at a time
@@ -571,4 +1145,4 @@ def stream_delegations(
     Performance:
         10-20x memory reduction vs load_delegations()
     """
-    return _repository.stream_delegations(filter_func=filter_func, enriched=enriched)
+    return _repository.stream_delegations(filter_func=filter_func, enriched=enriched, with_text=with_text)
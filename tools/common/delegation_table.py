@@ -0,0 +1,256 @@
+"""
+Columnar delegation table for vectorized aggregation.
+
+Downstream stages re-read enriched_sessions_data.json as nested dicts just
+to sum tokens or count agents. The extraction stage therefore also writes
+one flat, typed column per delegation field:
+
+    session_id       int32  (dictionary-encoded)
+    timestamp        int64  (epoch milliseconds, NULL_TIMESTAMP if missing)
+    agent_type       int32  (dictionary-encoded)
+    tokens_in        int64
+    tokens_out       int64
+    cache_read       int64
+    success          int8   (1 / 0, -1 if no result was found)
+    is_error         int8   (1 / 0, -1 if no result was found)
+    sequence_number  int32
+    prompt_length    int64
+
+Columns are stdlib `array.array` objects, so aggregations loop over packed
+machine integers instead of materializing a dict per delegation.
+
+File layout (little overhead, no third-party dependency):
+
+    MAGIC | uint32 header length | JSON header | padding | column bytes...
+
+The header holds the row count, byte order, dictionaries and the offset of
+each column relative to the 8-byte aligned data section.
+
+Usage:
+    from tools.common.delegation_table import DelegationTable
+
+    table = DelegationTable.from_sessions(enriched_sessions)
+    table.save(DELEGATION_TABLE_FILE)
+
+    builder = DelegationTableBuilder()      # Sessions produced one at a time
+    builder.add_session(session)
+    builder.build().save(DELEGATION_TABLE_FILE)
+
+    table = DelegationTable.load(DELEGATION_TABLE_FILE)
+    tokens_by_agent = table.group_sum('tokens_in')
+"""
+
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from tools.common import codec, timestamps
+
+
+MAGIC = b"DLGTBL01"
+ALIGNMENT = 8
+
+# Sentinel for delegations without a parseable timestamp
+NULL_TIMESTAMP = timestamps.NULL_MS
+
+# Column name -> array typecode, in file order
+COLUMNS = {
+    'session_id': 'i',
+    'timestamp': 'q',
+    'agent_type': 'i',
+    'tokens_in': 'q',
+    'tokens_out': 'q',
+    'cache_read': 'q',
+    'success': 'b',
+    'is_error': 'b',
+    'sequence_number': 'i',
+    'prompt_length': 'q',
+}
+
+# Columns stored as int32 codes into a list of distinct values
+DICTIONARY_COLUMNS = ('session_id', 'agent_type')
+
+
+def timestamp_to_ms(timestamp: Optional[str]) -> int:
+    """Convert an ISO timestamp to epoch milliseconds (NULL_TIMESTAMP if invalid)."""
+    ms = timestamps.timestamp_to_ms(timestamp)
+    return NULL_TIMESTAMP if ms is None else ms
+
+
+def _flag(value: Any) -> int:
+    """Encode an optional boolean as 1 / 0 / -1 (unknown)."""
+    if value is None:
+        return -1
+    return 1 if value else 0
+
+
+def _int(value: Any) -> int:
+    """Token counts may be missing or null in older extractions."""
+    return int(value or 0)
+
+
+class DelegationTableBuilder:
+    """Appends sessions one at a time, for extraction that streams them."""
+
+    def __init__(self):
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        self.codes: Dict[str, Dict[Any, int]] = {name: {} for name in DICTIONARY_COLUMNS}
+
+    def _encode(self, column: str, value: Any) -> int:
+        codes = self.codes[column]
+        return codes.setdefault(value, len(codes))
+
+    def add_session(self, session: Dict) -> None:
+        """Append a session's delegations (enriched format)."""
+        columns = self.columns
+        session_code = self._encode('session_id', session.get('session_id'))
+        for delegation in session.get('delegations', []):
+            columns['session_id'].append(session_code)
+            ms = timestamps.record_ms(delegation)
+            columns['timestamp'].append(NULL_TIMESTAMP if ms is None else ms)
+            columns['agent_type'].append(self._encode('agent_type', delegation.get('agent_type')))
+            columns['tokens_in'].append(_int(delegation.get('tokens_in')))
+            columns['tokens_out'].append(_int(delegation.get('tokens_out')))
+            columns['cache_read'].append(_int(delegation.get('cache_read')))
+            columns['success'].append(_flag(delegation.get('success')))
+            columns['is_error'].append(_flag(delegation.get('is_error')))
+            columns['sequence_number'].append(_int(delegation.get('sequence_number')))
+            columns['prompt_length'].append(_int(delegation.get('prompt_length')))
+
+    def build(self) -> 'DelegationTable':
+        dictionaries = {name: list(values) for name, values in self.codes.items()}
+        return DelegationTable(self.columns, dictionaries)
+
+
+class DelegationTable:
+    """Typed, column-oriented view of all extracted delegations."""
+
+    def __init__(self, columns: Dict[str, array], dictionaries: Dict[str, List[Any]]):
+        """
+        Initialize from prepared columns.
+
+        Args:
+            columns: Column name -> array, all of the same length
+            dictionaries: Dictionary column name -> distinct values by code
+        """
+        self.columns = columns
+        self.dictionaries = dictionaries
+
+    def __len__(self) -> int:
+        return len(self.columns['timestamp'])
+
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[Dict]) -> 'DelegationTable':
+        """
+        Build a table from enriched session dicts.
+
+        Args:
+            sessions: Sessions with a 'delegations' list (enriched format)
+
+        Returns:
+            DelegationTable with one row per delegation
+        """
+        builder = DelegationTableBuilder()
+        for session in sessions:
+            builder.add_session(session)
+        return builder.build()
+
+    def column(self, name: str) -> array:
+        """Raw column (dictionary columns hold int codes)."""
+        return self.columns[name]
+
+    def values(self, name: str) -> List[Any]:
+        """Column values, with dictionary columns decoded."""
+        if name in self.dictionaries:
+            lookup = self.dictionaries[name]
+            return [lookup[code] for code in self.columns[name]]
+        return self.columns[name].tolist()
+
+    def group_sum(self, value: str, by: str = 'agent_type') -> Dict[Any, int]:
+        """
+        Sum an integer column per value of a dictionary column.
+
+        Example:
+            >>> table.group_sum('tokens_in')
+            {'developer': 120340, 'solution-architect': 48211}
+        """
+        totals = [0] * len(self.dictionaries[by])
+        for code, amount in zip(self.columns[by], self.columns[value]):
+            totals[code] += amount
+        return dict(zip(self.dictionaries[by], totals))
+
+    def group_count(self, by: str = 'agent_type') -> Dict[Any, int]:
+        """Number of rows per value of a dictionary column."""
+        counts = [0] * len(self.dictionaries[by])
+        for code in self.columns[by]:
+            counts[code] += 1
+        return dict(zip(self.dictionaries[by], counts))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the table in the columnar file layout."""
+        layout = []
+        offset = 0
+        for name, typecode in COLUMNS.items():
+            nbytes = len(self.columns[name]) * self.columns[name].itemsize
+            layout.append({'name': name, 'typecode': typecode, 'offset': offset, 'nbytes': nbytes})
+            offset += -(-nbytes // ALIGNMENT) * ALIGNMENT
+
+        header = codec.dumps({
+            'rows': len(self),
+            'byteorder': sys.byteorder,
+            'dictionaries': self.dictionaries,
+            'columns': layout,
+        }, pretty=False)
+
+        prefix = MAGIC + struct.pack('<I', len(header)) + header
+        prefix += b'\0' * (-len(prefix) % ALIGNMENT)
+
+        # Written beside the target and swapped in, so readers loading the
+        # table while the pipeline runs never see a partial file
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(prefix)
+            for spec in layout:
+                data = self.columns[spec['name']].tobytes()
+                f.write(data)
+                f.write(b'\0' * (-len(data) % ALIGNMENT))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'DelegationTable':
+        """
+        Read a table written by save().
+
+        Raises:
+            ValueError: If the file is not a delegation table or is truncated
+        """
+        with open(path, 'rb') as f:
+            raw = f.read()
+
+        if raw[:len(MAGIC)] != MAGIC or len(raw) < len(MAGIC) + 4:
+            raise ValueError(f"Not a delegation table: {path}")
+
+        (header_len,) = struct.unpack_from('<I', raw, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = codec.loads(raw[header_start:header_start + header_len])
+        data_start = header_start + header_len
+        data_start += -data_start % ALIGNMENT
+
+        view = memoryview(raw)
+        columns = {}
+        for spec in header['columns']:
+            start = data_start + spec['offset']
+            end = start + spec['nbytes']
+            if end > len(raw):
+                raise ValueError(f"Truncated delegation table: {path}")
+            column = array(spec['typecode'])
+            column.frombytes(view[start:end])
+            if header['byteorder'] != sys.byteorder:
+                column.byteswap()
+            columns[spec['name']] = column
+
+        return cls(columns, header['dictionaries'])
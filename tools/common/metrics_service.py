@@ -21,45 +21,99 @@ PRICING_PER_1M = {
 }
 
 
-def extract_delegation_metrics(delegation: Dict) -> Dict[str, Any]:
+class DelegationMetrics:
     """
-    Extract all metrics from a delegation object.
+    Canonical metrics of one delegation, computed once by normalized_metrics().
 
-    Handles both raw delegation format (from delegation_raw.jsonl)
-    and enriched format (from sessions data).
+    Fields are read as attributes (metrics.input_tokens) or, like the dict
+    returned by extract_delegation_metrics(), by key (metrics['input_tokens']).
+    Records are shared by every accumulator of a DelegationScan and, through
+    a MetricsMemo, by every call over the same dataset: treat them as
+    read-only.
+    """
+
+    FIELDS = (
+        'agent_type',
+        'input_tokens',
+        'output_tokens',
+        'cache_read_tokens',
+        'cache_write_tokens',
+        'total_tokens',
+        'amplification_ratio',
+        'cache_hit_rate',
+        'cost_usd',
+        'timestamp'
+    )
+    __slots__ = FIELDS
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default) if key in self.FIELDS else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class MetricsMemo:
+    """
+    normalized_metrics() records of one loaded dataset, keyed by delegation uuid.
+
+    Owned by the dataset's loader (DataRepository.metrics_memo()) and dropped
+    with it, so each delegation is normalized once however many calls and
+    copies of it (load_delegations() and load_sessions() build their own
+    dicts) read its metrics. Delegations without a uuid are normalized on
+    every call.
+    """
+
+    __slots__ = ('_records',)
+
+    def __init__(self):
+        self._records: Dict[str, DelegationMetrics] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, delegation: Dict) -> DelegationMetrics:
+        """Record of delegation, normalized on first use."""
+        # Same identifier Delegation.from_dict() uses as the uuid
+        key = delegation.get('tool_use_id') or delegation.get('uuid')
+        if not key:
+            return _normalize(delegation)
+        record = self._records.get(key)
+        if record is None:
+            record = self._records[key] = _normalize(delegation)
+        return record
+
+
+def normalized_metrics(delegation: Dict, memo: Optional[MetricsMemo] = None) -> DelegationMetrics:
+    """
+    Canonical metrics of a delegation.
+
+    Probes the alternative field locations and derives ratios and cost.
 
     Args:
         delegation: Delegation object from any source
+        memo: Records of the dataset delegation belongs to; without one
+            nothing is kept between calls
 
     Returns:
-        Standardized metrics dictionary with fields:
-        - agent_type: str or None
-        - input_tokens: int
-        - output_tokens: int
-        - cache_read_tokens: int
-        - cache_write_tokens: int
-        - total_tokens: int
-        - amplification_ratio: float
-        - cache_hit_rate: float
-        - cost_usd: float
-        - timestamp: str or None
+        DelegationMetrics record (shared through memo: read-only)
     """
-    metrics = {
-        'agent_type': None,
-        'input_tokens': 0,
-        'output_tokens': 0,
-        'cache_read_tokens': 0,
-        'cache_write_tokens': 0,
-        'total_tokens': 0,
-        'amplification_ratio': 0.0,
-        'cache_hit_rate': 0.0,
-        'cost_usd': 0.0,
-        'timestamp': None
-    }
+    if memo is not None:
+        return memo.get(delegation)
+    return _normalize(delegation)
+
+
+def _normalize(delegation: Dict) -> DelegationMetrics:
+    metrics = DelegationMetrics()
 
     # Extract agent type
     # Try multiple locations where agent might be stored
-    metrics['agent_type'] = (
+    metrics.agent_type = (
         delegation.get('agent_type') or
         delegation.get('agent') or
         _extract_agent_from_message(delegation)
@@ -73,52 +127,51 @@ def extract_delegation_metrics(delegation: Dict) -> Dict[str, Any]:
         {}
     )
 
-    # Also check for direct token fields (enriched format)
-    metrics['input_tokens'] = (
+    # Also check for direct token fields (enriched format), then
+    # validate numeric values
+    input_tokens = max(0, int(
         usage.get('input_tokens') or
         delegation.get('tokens_in') or
         delegation.get('input_tokens') or
         0
-    )
-
-    metrics['output_tokens'] = (
+    ))
+    output_tokens = max(0, int(
         usage.get('output_tokens') or
         delegation.get('tokens_out') or
         delegation.get('output_tokens') or
         0
-    )
-
-    metrics['cache_read_tokens'] = (
+    ))
+    cache_read_tokens = max(0, int(
         usage.get('cache_read_input_tokens') or
         delegation.get('cache_read') or
         delegation.get('cache_read_tokens') or
         0
-    )
-
-    metrics['cache_write_tokens'] = (
+    ))
+    cache_write_tokens = max(0, int(
         usage.get('cache_creation_input_tokens') or
         delegation.get('cache_write') or
         delegation.get('cache_write_tokens') or
         0
-    )
+    ))
 
-    # Validate numeric values
-    metrics['input_tokens'] = max(0, int(metrics['input_tokens']))
-    metrics['output_tokens'] = max(0, int(metrics['output_tokens']))
-    metrics['cache_read_tokens'] = max(0, int(metrics['cache_read_tokens']))
-    metrics['cache_write_tokens'] = max(0, int(metrics['cache_write_tokens']))
+    metrics.input_tokens = input_tokens
+    metrics.output_tokens = output_tokens
+    metrics.cache_read_tokens = cache_read_tokens
+    metrics.cache_write_tokens = cache_write_tokens
 
     # Calculate derived metrics
-    metrics['total_tokens'] = metrics['input_tokens'] + metrics['output_tokens']
-
-    if metrics['input_tokens'] > 0:
-        metrics['amplification_ratio'] = metrics['output_tokens'] / metrics['input_tokens']
-        metrics['cache_hit_rate'] = metrics['cache_read_tokens'] / metrics['input_tokens']
+    metrics.total_tokens = input_tokens + output_tokens
+    if input_tokens > 0:
+        metrics.amplification_ratio = output_tokens / input_tokens
+        metrics.cache_hit_rate = cache_read_tokens / input_tokens
+    else:
+        metrics.amplification_ratio = 0.0
+        metrics.cache_hit_rate = 0.0
 
-    metrics['cost_usd'] = calculate_cost(metrics)
+    metrics.cost_usd = calculate_cost(metrics)
 
     # Extract timestamp
-    metrics['timestamp'] = (
+    metrics.timestamp = (
         delegation.get('timestamp') or
         delegation.get('stop') or
         None
@@ -127,6 +180,34 @@ def extract_delegation_metrics(delegation: Dict) -> Dict[str, Any]:
     return metrics
 
 
+def extract_delegation_metrics(delegation: Dict, memo: Optional[MetricsMemo] = None) -> Dict[str, Any]:
+    """
+    Extract all metrics from a delegation object.
+
+    Handles both raw delegation format (from delegation_raw.jsonl)
+    and enriched format (from sessions data). Reads the
+    normalized_metrics() record; use that directly to avoid the copy.
+
+    Args:
+        delegation: Delegation object from any source
+        memo: Records of the dataset (see normalized_metrics())
+
+    Returns:
+        Standardized metrics dictionary (a fresh copy) with fields:
+        - agent_type: str or None
+        - input_tokens: int
+        - output_tokens: int
+        - cache_read_tokens: int
+        - cache_write_tokens: int
+        - total_tokens: int
+        - amplification_ratio: float
+        - cache_hit_rate: float
+        - cost_usd: float
+        - timestamp: str or None
+    """
+    return normalized_metrics(delegation, memo).to_dict()
+
+
 def _extract_agent_from_message(delegation: Dict) -> Optional[str]:
     """Extract agent type from message content structure."""
     message = delegation.get('message')
@@ -148,12 +229,13 @@ def _extract_agent_from_message(delegation: Dict) -> Optional[str]:
     return None
 
 
-def extract_session_metrics(session: Dict) -> Dict[str, Any]:
+def extract_session_metrics(session: Dict, memo: Optional[MetricsMemo] = None) -> Dict[str, Any]:
     """
     Aggregate metrics for an entire session.
 
     Args:
         session: Session object containing delegations list
+        memo: Records of the dataset (see normalized_metrics())
 
     Returns:
         Aggregated metrics for the session:
@@ -188,21 +270,21 @@ def extract_session_metrics(session: Dict) -> Dict[str, Any]:
             'agent_counts': {}
         }
 
-    # Extract metrics for all delegations
-    delegation_metrics = [extract_delegation_metrics(d) for d in delegations]
+    # Normalized metrics for all delegations
+    delegation_metrics = [normalized_metrics(d, memo) for d in delegations]
 
     # Aggregate totals
-    total_input = sum(m['input_tokens'] for m in delegation_metrics)
-    total_output = sum(m['output_tokens'] for m in delegation_metrics)
-    total_cache_read = sum(m['cache_read_tokens'] for m in delegation_metrics)
-    total_cache_write = sum(m['cache_write_tokens'] for m in delegation_metrics)
-    total_cost = sum(m['cost_usd'] for m in delegation_metrics)
+    total_input = sum(m.input_tokens for m in delegation_metrics)
+    total_output = sum(m.output_tokens for m in delegation_metrics)
+    total_cache_read = sum(m.cache_read_tokens for m in delegation_metrics)
+    total_cache_write = sum(m.cache_write_tokens for m in delegation_metrics)
+    total_cost = sum(m.cost_usd for m in delegation_metrics)
 
     # Calculate averages for non-zero values
-    amplification_ratios = [m['amplification_ratio'] for m in delegation_metrics
-                            if m['amplification_ratio'] > 0]
-    cache_hit_rates = [m['cache_hit_rate'] for m in delegation_metrics
-                       if m['cache_hit_rate'] > 0]
+    amplification_ratios = [m.amplification_ratio for m in delegation_metrics
+                            if m.amplification_ratio > 0]
+    cache_hit_rates = [m.cache_hit_rate for m in delegation_metrics
+                       if m.cache_hit_rate > 0]
 
     avg_amplification = (
         sum(amplification_ratios) / len(amplification_ratios)
@@ -217,7 +299,7 @@ def extract_session_metrics(session: Dict) -> Dict[str, Any]:
     # Count agent usage
     agent_counts = {}
     for m in delegation_metrics:
-        agent = m['agent_type']
+        agent = m.agent_type
         if agent:
             agent_counts[agent] = agent_counts.get(agent, 0) + 1
 
@@ -237,12 +319,13 @@ def extract_session_metrics(session: Dict) -> Dict[str, Any]:
     }
 
 
-def calculate_token_totals(delegations: List[Dict]) -> Dict[str, Any]:
+def calculate_token_totals(delegations: List[Dict], memo: Optional[MetricsMemo] = None) -> Dict[str, Any]:
     """
     Calculate total token metrics across multiple delegations.
 
     Args:
         delegations: List of delegation objects
+        memo: Records of the dataset (see normalized_metrics())
 
     Returns:
         Total metrics:
@@ -269,15 +352,15 @@ def calculate_token_totals(delegations: List[Dict]) -> Dict[str, Any]:
             'global_cache_efficiency': 0.0
         }
 
-    # Extract metrics for all delegations
-    delegation_metrics = [extract_delegation_metrics(d) for d in delegations]
+    # Normalized metrics for all delegations
+    delegation_metrics = [normalized_metrics(d, memo) for d in delegations]
 
     # Calculate totals
-    total_input = sum(m['input_tokens'] for m in delegation_metrics)
-    total_output = sum(m['output_tokens'] for m in delegation_metrics)
-    total_cache_read = sum(m['cache_read_tokens'] for m in delegation_metrics)
-    total_cache_write = sum(m['cache_write_tokens'] for m in delegation_metrics)
-    total_cost = sum(m['cost_usd'] for m in delegation_metrics)
+    total_input = sum(m.input_tokens for m in delegation_metrics)
+    total_output = sum(m.output_tokens for m in delegation_metrics)
+    total_cache_read = sum(m.cache_read_tokens for m in delegation_metrics)
+    total_cache_write = sum(m.cache_write_tokens for m in delegation_metrics)
+    total_cost = sum(m.cost_usd for m in delegation_metrics)
 
     # Calculate global ratios
     global_amplification = total_output / total_input if total_input > 0 else 0.0
@@ -301,7 +384,7 @@ def calculate_cost(metrics: Dict[str, int]) -> float:
     Calculate cost in USD based on Anthropic pricing.
 
     Args:
-        metrics: Dictionary with token counts (input_tokens, output_tokens, etc.)
+        metrics: Dictionary (or DelegationMetrics) with token counts (input_tokens, output_tokens, etc.)
 
     Returns:
         Cost in USD
@@ -3,10 +3,13 @@ Domain Model - Typed Entities for Delegation Retrospective Analysis
 
 This module defines the core domain entities to replace Dict[str, Any] primitive obsession.
 All entities are immutable dataclasses with type safety, validation, and business logic.
+They use __slots__ (no per-instance __dict__), and from_dict() interns the
+strings shared by many records (agent types, session ids, working directories).
 
 Entities:
 - TokenMetrics: Token usage and cost tracking
 - Delegation: Single agent invocation with metadata
+- DelegationBatch: Column-oriented storage of many delegations
 - Session: Collection of delegations with analysis
 - Period: Temporal boundary for segmentation
 - AgentCall: Agent usage from CSV metadata
@@ -25,11 +28,18 @@ Usage:
         rate = session.success_rate()
 """
 
+import sys
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Union
 from decimal import Decimal
 
+from tools.common.period_index import PeriodIndex
+from tools.common.text_store import pack_refs, packed_ref
+from tools.common.timestamps import NULL_MS, timestamp_to_ms
+
 
 # =============================================================================
 # Custom Exceptions
@@ -40,11 +50,51 @@ class ValidationError(Exception):
     pass
 
 
+def _intern(value: Any) -> Any:
+    """Share one copy of strings repeated across many records."""
+    return sys.intern(value) if type(value) is str else value
+
+
+# =============================================================================
+# Cost Arithmetic
+# =============================================================================
+
+# Claude 3.5 Sonnet prices per token in units of 10^-8 USD (the per-million
+# prices $3.00 / $15.00 / $3.75 / $0.30 have two decimals), so token count
+# times price is the exact cost as an integer
+PRICE_UNITS_PER_TOKEN = {
+    'input_tokens': 300,
+    'output_tokens': 1500,
+    'cache_creation_tokens': 375,
+    'cache_read_tokens': 30,
+}
+
+# Price units per reported cost step of $0.0001
+COST_STEP_UNITS = 10_000
+
+
+def round_cost_units(units: int) -> int:
+    """Round an exact cost in price units to whole $0.0001 steps.
+
+    Ties go to the even step, as Decimal.quantize() does by default.
+    """
+    steps, remainder = divmod(units, COST_STEP_UNITS)
+    half = COST_STEP_UNITS // 2
+    if remainder > half or (remainder == half and steps % 2):
+        steps += 1
+    return steps
+
+
+def cost_to_decimal(steps: int) -> Decimal:
+    """USD amount of a cost in $0.0001 steps (four decimal places)."""
+    return Decimal(steps).scaleb(-4)
+
+
 # =============================================================================
 # Token Metrics
 # =============================================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TokenMetrics:
     """Token usage and cost metrics for a delegation.
 
@@ -85,6 +135,19 @@ class TokenMetrics:
             self.cache_read_tokens
         )
 
+    def cost_units(self) -> int:
+        """Exact cost in price units (10^-8 USD, see PRICE_UNITS_PER_TOKEN)."""
+        return (
+            self.input_tokens * PRICE_UNITS_PER_TOKEN['input_tokens'] +
+            self.output_tokens * PRICE_UNITS_PER_TOKEN['output_tokens'] +
+            self.cache_creation_tokens * PRICE_UNITS_PER_TOKEN['cache_creation_tokens'] +
+            self.cache_read_tokens * PRICE_UNITS_PER_TOKEN['cache_read_tokens']
+        )
+
+    def cost_steps(self) -> int:
+        """total_cost() in whole $0.0001 steps."""
+        return round_cost_units(self.cost_units())
+
     def total_cost(self) -> Decimal:
         """Estimated USD cost based on Claude 3.5 Sonnet pricing.
 
@@ -93,20 +156,10 @@ class TokenMetrics:
         - Output: $15.00
         - Cache write: $3.75
         - Cache read: $0.30
+
+        Computed in integers and rounded to 4 decimal places.
         """
-        # Pricing per million tokens
-        INPUT_PRICE = Decimal("3.00")
-        OUTPUT_PRICE = Decimal("15.00")
-        CACHE_WRITE_PRICE = Decimal("3.75")
-        CACHE_READ_PRICE = Decimal("0.30")
-
-        cost = (
-            (Decimal(self.input_tokens) / Decimal("1000000")) * INPUT_PRICE +
-            (Decimal(self.output_tokens) / Decimal("1000000")) * OUTPUT_PRICE +
-            (Decimal(self.cache_creation_tokens) / Decimal("1000000")) * CACHE_WRITE_PRICE +
-            (Decimal(self.cache_read_tokens) / Decimal("1000000")) * CACHE_READ_PRICE
-        )
-        return cost.quantize(Decimal("0.0001"))  # Round to 4 decimal places
+        return cost_to_decimal(self.cost_steps())
 
     def cache_efficiency(self) -> float:
         """Ratio of cached reads to total reads (0.0 to 1.0).
@@ -184,7 +237,7 @@ class TokenMetrics:
 # Delegation
 # =============================================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Delegation:
     """Single agent invocation with full metadata.
 
@@ -195,14 +248,20 @@ class Delegation:
         agent_type: Type of agent invoked (e.g., 'developer', 'solution-architect')
         cwd: Working directory path
         description: Brief task description
-        prompt: Full prompt text (optional)
+        prompt: Prompt text when stored inline (optional; see prompt_text())
         tokens: Token usage metrics
         success: Whether delegation succeeded (optional)
+        text_refs: References into the text blob store, as a dict or packed
+            by text_store.pack_refs() (optional)
+        text_store: Blob store the references point into (optional)
+        timestamp_ms: Epoch milliseconds stored at extraction (optional;
+            see epoch_ms())
 
     Business Logic:
         - total_tokens(): Sum of token usage
         - cost(): Estimated USD cost
         - is_success(): Whether task completed successfully
+        - get_text(): Text field, fetched from the blob store on demand
     """
     uuid: str
     timestamp: str
@@ -213,6 +272,9 @@ class Delegation:
     tokens: TokenMetrics
     prompt: Optional[str] = None
     success: Optional[bool] = None
+    text_refs: Optional[Dict[str, Any]] = field(default=None, compare=False, repr=False)
+    text_store: Optional[Any] = field(default=None, compare=False, repr=False)
+    timestamp_ms: Optional[int] = field(default=None, compare=False, repr=False)
 
     def __post_init__(self):
         """Validate required fields."""
@@ -243,8 +305,33 @@ class Delegation:
         ts = self.timestamp.replace('Z', '+00:00')
         return datetime.fromisoformat(ts)
 
+    def epoch_ms(self) -> Optional[int]:
+        """Timestamp as epoch milliseconds (None if unparseable), without building a datetime when stored."""
+        if self.timestamp_ms is not None:
+            return self.timestamp_ms
+        return timestamp_to_ms(self.timestamp)
+
+    def get_text(self, name: str) -> Optional[str]:
+        """Text field ('prompt', 'result_full', 'user_context_before',
+        'assistant_synthesis'), read from the blob store only when asked.
+
+        Returns:
+            Inline prompt if present, else the referenced text, else None
+        """
+        if name == 'prompt' and self.prompt is not None:
+            return self.prompt
+        if not self.text_refs or self.text_store is None:
+            return None
+        if isinstance(self.text_refs, dict):
+            return self.text_store.get(self.text_refs.get(name))
+        return self.text_store.get(packed_ref(self.text_refs, name))
+
+    def prompt_text(self) -> Optional[str]:
+        """Full prompt, whether stored inline or in the blob store."""
+        return self.get_text('prompt')
+
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Delegation':
+    def from_dict(cls, data: Dict[str, Any], text_store: Optional[Any] = None) -> 'Delegation':
         """Construct from raw delegation JSON or enriched session format.
 
         Supports two formats:
@@ -253,6 +340,7 @@ class Delegation:
 
         Args:
             data: Delegation dict from JSONL or enriched sessions
+            text_store: Blob store for enriched delegations holding 'text_refs'
 
         Returns:
             Delegation instance
@@ -311,13 +399,16 @@ class Delegation:
             return cls(
                 uuid=data.get('tool_use_id', data.get('uuid', '')),
                 timestamp=data.get('timestamp', ''),
-                session_id=data.get('session_id', ''),
-                agent_type=agent_type,
-                cwd=cwd,
+                session_id=_intern(data.get('session_id', '')),
+                agent_type=_intern(agent_type),
+                cwd=_intern(cwd),
                 description=description,
                 prompt=prompt,
                 tokens=tokens,
-                success=data.get('success')
+                success=data.get('success'),
+                text_refs=pack_refs(data.get('text_refs')),
+                text_store=text_store,
+                timestamp_ms=data.get('timestamp_ms')
             )
         else:
             # Raw JSONL format: nested message structure
@@ -349,9 +440,9 @@ class Delegation:
             return cls(
                 uuid=data.get('uuid', ''),
                 timestamp=data.get('timestamp', ''),
-                session_id=data.get('sessionId', data.get('session_id', '')),
-                agent_type=agent_type,
-                cwd=data.get('cwd', ''),
+                session_id=_intern(data.get('sessionId', data.get('session_id', ''))),
+                agent_type=_intern(agent_type),
+                cwd=_intern(data.get('cwd', '')),
                 description=description,
                 prompt=prompt,
                 tokens=tokens,
@@ -370,19 +461,201 @@ class Delegation:
             'tokens': self.tokens.to_dict()
         }
 
-        if self.prompt:
-            result['prompt'] = self.prompt
+        prompt = self.prompt_text()
+        if prompt:
+            result['prompt'] = prompt
         if self.success is not None:
             result['success'] = self.success
 
         return result
 
 
+# =============================================================================
+# Delegation Batch
+# =============================================================================
+
+# Packed references of a delegation without any
+_NO_REFS = pack_refs({})
+
+class DelegationBatch(Sequence):
+    """Many delegations stored column by column.
+
+    Token counts, epoch-ms timestamps and flags live in array('q') /
+    array('b') columns, text references in offset/length columns, and
+    shared strings are interned,
+    so a delegation costs a few machine words instead of a Delegation, a
+    TokenMetrics and a text_refs dict. Indexing builds a Delegation view on
+    demand; aggregates read the columns without building any.
+
+    Business Logic:
+        - total_tokens(): Sum of token usage over all delegations
+        - token_totals(): Sum per token column
+        - agent_counts(): Delegations per agent type
+        - total_cost(), cost_by_agent(), cost_by_session(), cost_by_period():
+          Costs summed from per-row integer costs (as Session.total_cost())
+    """
+
+    TOKEN_COLUMNS = ('input_tokens', 'output_tokens', 'cache_creation_tokens', 'cache_read_tokens')
+
+    def __init__(self, text_store: Optional[Any] = None):
+        """
+        Create an empty batch.
+
+        Args:
+            text_store: Blob store the delegations' text references point into
+        """
+        self.text_store = text_store
+        self.uuids: List[str] = []
+        self.timestamps: List[str] = []
+        self.timestamps_ms = array('q')  # NULL_MS if unparseable
+        self.session_ids: List[str] = []
+        self.agent_types: List[str] = []
+        self.cwds: List[str] = []
+        self.descriptions: List[str] = []
+        self.prompts: Dict[int, str] = {}  # Inline prompts by row (usually none)
+        self.success = array('b')  # 1 / 0, -1 if unknown
+        self.tokens = {name: array('q') for name in self.TOKEN_COLUMNS}
+        # Packed text references (text_store.pack_refs()), one array for all rows
+        self.has_text_refs = array('b')
+        self.text_refs = array('q')
+
+    @classmethod
+    def from_dicts(cls, data: Iterable[Dict[str, Any]], text_store: Optional[Any] = None) -> 'DelegationBatch':
+        """Build from delegation dicts (validated by Delegation.from_dict()).
+
+        Args:
+            data: Delegation dicts in any format Delegation.from_dict() accepts
+            text_store: Blob store for delegations holding 'text_refs'
+
+        Returns:
+            DelegationBatch with one row per delegation
+        """
+        batch = cls(text_store=text_store)
+        for item in data:
+            batch.append(Delegation.from_dict(item, text_store=text_store))
+        return batch
+
+    def append(self, delegation: Delegation) -> None:
+        """Store a delegation as one row of every column."""
+        row = len(self.uuids)
+        self.uuids.append(delegation.uuid)
+        self.timestamps.append(delegation.timestamp)
+        epoch_ms = delegation.epoch_ms()
+        self.timestamps_ms.append(NULL_MS if epoch_ms is None else epoch_ms)
+        self.session_ids.append(_intern(delegation.session_id))
+        self.agent_types.append(_intern(delegation.agent_type))
+        self.cwds.append(_intern(delegation.cwd))
+        self.descriptions.append(delegation.description)
+        if delegation.prompt is not None:
+            self.prompts[row] = delegation.prompt
+        self.success.append(-1 if delegation.success is None else int(bool(delegation.success)))
+
+        for name in self.TOKEN_COLUMNS:
+            self.tokens[name].append(getattr(delegation.tokens, name))
+
+        refs = delegation.text_refs
+        if isinstance(refs, dict):
+            refs = pack_refs(refs)
+        self.has_text_refs.append(refs is not None)
+        self.text_refs.extend(refs if refs is not None else _NO_REFS)
+
+    def __len__(self) -> int:
+        return len(self.uuids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Delegation, List[Delegation]]:
+        if isinstance(index, slice):
+            return [self._view(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("DelegationBatch index out of range")
+        return self._view(index)
+
+    def _text_refs(self, row: int) -> Optional[array]:
+        if not self.has_text_refs[row]:
+            return None
+        width = len(_NO_REFS)
+        return self.text_refs[row * width:(row + 1) * width]
+
+    def _view(self, row: int) -> Delegation:
+        success = self.success[row]
+        return Delegation(
+            uuid=self.uuids[row],
+            timestamp=self.timestamps[row],
+            session_id=self.session_ids[row],
+            agent_type=self.agent_types[row],
+            cwd=self.cwds[row],
+            description=self.descriptions[row],
+            tokens=TokenMetrics(*(self.tokens[name][row] for name in self.TOKEN_COLUMNS)),
+            prompt=self.prompts.get(row),
+            success=None if success == -1 else bool(success),
+            text_refs=self._text_refs(row),
+            text_store=self.text_store,
+            timestamp_ms=None if self.timestamps_ms[row] == NULL_MS else self.timestamps_ms[row]
+        )
+
+    def total_tokens(self) -> int:
+        """Sum of all token usage (as Delegation.total_tokens() per row)."""
+        return sum(sum(column) for column in self.tokens.values())
+
+    def token_totals(self) -> Dict[str, int]:
+        """Sum of each token column."""
+        return {name: sum(column) for name, column in self.tokens.items()}
+
+    def agent_counts(self) -> Dict[str, int]:
+        """Number of delegations per agent type."""
+        counts: Dict[str, int] = {}
+        for agent_type in self.agent_types:
+            counts[agent_type] = counts.get(agent_type, 0) + 1
+        return counts
+
+    def cost_steps(self) -> array:
+        """Per-row cost in whole $0.0001 steps (TokenMetrics.cost_steps())."""
+        prices = [PRICE_UNITS_PER_TOKEN[name] for name in self.TOKEN_COLUMNS]
+        columns = [self.tokens[name] for name in self.TOKEN_COLUMNS]
+        return array('q', (
+            round_cost_units(a * prices[0] + b * prices[1] + c * prices[2] + d * prices[3])
+            for a, b, c, d in zip(*columns)
+        ))
+
+    def total_cost(self) -> Decimal:
+        """Sum of all delegation costs."""
+        return cost_to_decimal(sum(self.cost_steps()))
+
+    def _cost_by(self, keys: Iterable[Any]) -> Dict[Any, Decimal]:
+        steps: Dict[Any, int] = {}
+        for key, cost in zip(keys, self.cost_steps()):
+            steps[key] = steps.get(key, 0) + cost
+        return {key: cost_to_decimal(total) for key, total in steps.items()}
+
+    def cost_by_agent(self) -> Dict[str, Decimal]:
+        """Summed cost per agent type."""
+        return self._cost_by(self.agent_types)
+
+    def cost_by_session(self) -> Dict[str, Decimal]:
+        """Summed cost per session (equal to each Session.total_cost())."""
+        return self._cost_by(self.session_ids)
+
+    def cost_by_period(self, periods: Iterable['Period']) -> Dict[str, Decimal]:
+        """Summed cost per period; delegations outside every period are left out.
+
+        Args:
+            periods: Periods to attribute delegations to (first match wins)
+
+        Returns:
+            Cost by period_id, for periods holding at least one delegation
+        """
+        index = PeriodIndex.from_periods(periods)
+        costs = self._cost_by(index.classify_many(self.timestamps))
+        costs.pop(None, None)
+        return costs
+
+
 # =============================================================================
 # Session
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """Collection of delegations within a single user session.
 
@@ -446,8 +719,10 @@ class Session:
         return sum(d.total_tokens() for d in self.delegations)
 
     def total_cost(self) -> Decimal:
-        """Sum of all delegation costs."""
-        return sum((d.cost() for d in self.delegations), Decimal("0"))
+        """Sum of all delegation costs (each rounded to 4 decimal places)."""
+        if not self.delegations:
+            return Decimal("0")
+        return cost_to_decimal(sum(d.tokens.cost_steps() for d in self.delegations))
 
     def duration_seconds(self) -> Optional[int]:
         """Duration in seconds between first and last delegation.
@@ -467,16 +742,17 @@ class Session:
         return list(set(d.agent_type for d in self.delegations))
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Session':
+    def from_dict(cls, data: Dict[str, Any], text_store: Optional[Any] = None) -> 'Session':
         """Construct from session dict.
 
         Args:
             data: Session dict with 'delegations' list
+            text_store: Blob store for delegations holding 'text_refs'
 
         Returns:
             Session instance
         """
-        session_id = data.get('session_id', '')
+        session_id = _intern(data.get('session_id', ''))
 
         # Build delegations with session_id enrichment
         delegations = []
@@ -484,7 +760,7 @@ class Session:
             # Ensure delegation has session_id set
             if not d.get('session_id'):
                 d = {**d, 'session_id': session_id}
-            delegations.append(Delegation.from_dict(d))
+            delegations.append(Delegation.from_dict(d, text_store=text_store))
 
         return cls(
             session_id=session_id,
@@ -522,7 +798,7 @@ class Session:
 # Period
 # =============================================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Period:
     """Temporal boundary for analysis segmentation.
 
@@ -620,7 +896,7 @@ class Period:
 # Agent Call (CSV Metadata)
 # =============================================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AgentCall:
     """Agent usage metadata from CSV export.
 
@@ -670,9 +946,9 @@ class AgentCall:
         """
         return cls(
             timestamp=data.get('timestamp', ''),
-            session_id=data.get('session_id', ''),
-            project_path=data.get('project_path', ''),
-            agent_type=data.get('agent_type', ''),
+            session_id=_intern(data.get('session_id', '')),
+            project_path=_intern(data.get('project_path', '')),
+            agent_type=_intern(data.get('agent_type', '')),
             prompt_length=int(data.get('prompt_length', 0)),
             description=data.get('description', '').strip()
         )
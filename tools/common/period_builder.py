@@ -20,10 +20,11 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import subprocess
-import json
 import logging
 from dataclasses import dataclass
 
+from tools.common import codec
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -604,8 +605,7 @@ class PeriodBuilder:
             return None
 
         try:
-            with open(self.cache_file, 'r') as f:
-                cache_data = json.load(f)
+            cache_data = codec.load_file(self.cache_file)
 
             # Check cache freshness
             cached_at = datetime.fromisoformat(cache_data.get('cached_at', ''))
@@ -619,7 +619,7 @@ class PeriodBuilder:
                 logger.debug(f"Cache expired ({age_hours:.1f}h old)")
                 return None
 
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
+        except (codec.JSONDecodeError, ValueError, KeyError) as e:
             logger.warning(f"Failed to load cache: {e}")
             return None
 
@@ -639,8 +639,7 @@ class PeriodBuilder:
         }
 
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            codec.dump_file(cache_data, self.cache_file)
             logger.debug(f"Cached periods to {self.cache_file}")
         except IOError as e:
             logger.warning(f"Failed to save cache: {e}")
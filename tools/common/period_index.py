@@ -0,0 +1,120 @@
+"""
+Sorted interval index for classifying timestamps into analysis periods.
+
+Period definitions ({period_id: {'start': 'YYYY-MM-DD', 'end': ..., ...}},
+as returned by RuntimeConfig.get_periods()) are turned once into sorted
+day-number boundaries, so classifying a timestamp is one bisect over the
+boundaries instead of parsing every period's start and end again. Days are
+parsed once per distinct date and cached.
+
+Semantics match the former per-stage loops: a timestamp belongs to the
+first period (in definition order) whose inclusive [start, end] day range
+contains its calendar date (taken as written, without timezone
+conversion); overlapping periods therefore resolve to the earlier one.
+
+Usage:
+    from tools.common.period_index import PeriodIndex
+
+    index = PeriodIndex.from_config()
+    index.classify('2025-09-15T10:30:00Z')      # 'P3' or None
+    index.classify_many(batch.timestamps)        # one period per timestamp
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+# What follows the date part of a timestamp whose day is cached by date
+_DATE_ENDS = ('', 'T', ' ')
+
+
+def parse_day(timestamp: str) -> int:
+    """Calendar day (proleptic ordinal) of an ISO date or timestamp.
+
+    Raises:
+        ValueError: If timestamp is not ISO formatted
+    """
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).toordinal()
+
+
+class PeriodIndex:
+    """Period lookup over sorted day boundaries."""
+
+    def __init__(self, periods: Dict[str, Dict]):
+        """
+        Build the index.
+
+        Args:
+            periods: Period definitions with 'start' and 'end' ISO dates
+        """
+        ranges = [
+            (period_id, parse_day(meta['start']), parse_day(meta['end']))
+            for period_id, meta in periods.items()
+        ]
+        self.period_ids = [period_id for period_id, _, _ in ranges]
+
+        # Elementary segments [boundaries[i], boundaries[i + 1]) each covered
+        # by the same periods; owners[i] is the first of them (or None)
+        self._boundaries = sorted({day for _, start, end in ranges for day in (start, end + 1)})
+        self._owners: List[Optional[str]] = [
+            next((period_id for period_id, start, end in ranges if start <= day <= end), None)
+            for day in self._boundaries
+        ]
+        self._days: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, runtime_config=None) -> 'PeriodIndex':
+        """Index of the runtime configuration's periods (get_runtime_config() by default)."""
+        if runtime_config is None:
+            from tools.common.config import get_runtime_config
+            runtime_config = get_runtime_config()
+        return cls(runtime_config.get_periods())
+
+    @classmethod
+    def from_periods(cls, periods: Iterable) -> 'PeriodIndex':
+        """Index of typed Period models (date parts of start_date / end_date)."""
+        return cls({
+            period.period_id: {'start': period.start_date.split('T')[0], 'end': period.end_date.split('T')[0]}
+            for period in periods
+        })
+
+    def classify_day(self, day: int) -> Optional[str]:
+        """Period containing a day ordinal, or None if outside all periods."""
+        position = bisect_right(self._boundaries, day) - 1
+        return self._owners[position] if position >= 0 else None
+
+    def day_of(self, timestamp: str) -> int:
+        """Day ordinal of a timestamp, cached per date.
+
+        Only the date part ('YYYY-MM-DD' before a 'T' or space) is parsed
+        for regular timestamps; anything else goes through parse_day().
+        """
+        if timestamp[10:11] not in _DATE_ENDS:
+            return parse_day(timestamp)
+        key = timestamp[:10]
+        day = self._days.get(key)
+        if day is None:
+            day = self._days[key] = date.fromisoformat(key).toordinal()
+        return day
+
+    def classify(self, timestamp: str) -> Optional[str]:
+        """Period of an ISO date or timestamp, or None if outside all periods.
+
+        Raises:
+            ValueError: If timestamp is not ISO formatted
+        """
+        return self.classify_day(self.day_of(timestamp))
+
+    def classify_many(self, timestamps: Iterable[str]) -> List[Optional[str]]:
+        """Period of each timestamp in a column, looked up once per date."""
+        by_date: Dict[str, Optional[str]] = {}
+        periods = []
+        for timestamp in timestamps:
+            if timestamp[10:11] not in _DATE_ENDS:
+                periods.append(self.classify(timestamp))
+                continue
+            key = timestamp[:10]
+            if key not in by_date:
+                by_date[key] = self.classify(timestamp)
+            periods.append(by_date[key])
+        return periods
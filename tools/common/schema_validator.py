@@ -22,9 +22,10 @@ All JSON outputs must include metadata:
 
 from datetime import datetime
 from typing import Dict, Any, Tuple, Optional
-import json
 import warnings
 
+from tools.common import codec
+
 
 class SchemaVersion:
     """Semantic version for schema compatibility checking."""
@@ -119,7 +120,7 @@ class SchemaValidator:
 
     # Known schema versions for each data type
     SCHEMA_VERSIONS = {
-        'enriched_sessions': '1.0.0',
+        'enriched_sessions': '2.0.0',
         'routing_patterns': '1.0.0',
         'routing_quality': '1.0.0',
         'marathon_classification': '1.0.0',
@@ -232,10 +233,9 @@ class SchemaValidator:
         Raises:
             SchemaValidationError: If strict=True and validation fails
             FileNotFoundError: If file doesn't exist
-            json.JSONDecodeError: If file is invalid JSON
+            codec.JSONDecodeError: If file is invalid JSON
         """
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        data = codec.load_file(filepath)
 
         is_valid, message = SchemaValidator.validate_data(data, schema_type, strict=strict)
 
@@ -0,0 +1,535 @@
+"""
+Memory-mapped columnar copy of a sessions document for stage handoff.
+
+Stages running as subprocesses receive the extraction output through
+enriched_sessions_data.json, which each of them parses end to end (about
+half a second per 50k delegations) before reading a single field. The
+extraction stage therefore also writes the document as a session frame:
+one typed column per session key and per delegation key, laid out so a
+reader maps the file and reads values in place:
+
+    MAGIC | uint32 header length | JSON header | padding | column bytes...
+
+Every column has an int8 state per row (key absent / value / null) and
+values by kind: 'int' (int64), 'bool' (int8), 'str' (UTF-8 heap with int64
+offsets) or 'json' (encoded values of any other type), so records rebuild
+to dicts equal to the JSON ones. A session's 'delegations' column (kind
+'rows') holds the [start, end) range of its rows in the delegation table.
+
+Opening a frame parses only the header; consumers choose rows by reading
+a column (e.g. delegation_count) and build dicts for just the sessions and
+fields they use. The JSON document stays the human-readable export and
+the fallback: a frame records its source file's size and mtime and
+open_session_frame() ignores it once they change.
+
+Usage:
+    from tools.common.session_frame import SessionFrame, SessionFrameWriter, open_session_frame
+
+    SessionFrame.write(ENRICHED_SESSIONS_FRAME_FILE, document, source=ENRICHED_SESSIONS_FILE)
+
+    writer = SessionFrameWriter()           # Sessions produced one at a time
+    writer.add_session(session)
+    writer.write(ENRICHED_SESSIONS_FRAME_FILE, metadata, source=ENRICHED_SESSIONS_FILE)
+
+    frame = open_session_frame(ENRICHED_SESSIONS_FRAME_FILE, ENRICHED_SESSIONS_FILE)
+    if frame is not None:
+        counts = frame.sessions.values('delegation_count')
+        session = frame.session(0, delegation_fields=('agent_type', 'success'))
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from tools.common import codec
+
+
+MAGIC = b"SESFRM01"
+ALIGNMENT = 8
+
+# Row state of a column
+ABSENT, VALUE, NULL = 0, 1, 2
+
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+# Typecode of the values buffer per column kind
+_VALUE_TYPECODES = {'int': 'q', 'bool': 'b', 'rows': 'q'}
+
+_MISSING = object()
+
+# Column heap bytes kept in memory before spilling to a temporary file
+_SPOOL_BYTES = 1 << 20
+
+
+def _kind_of(value: Any) -> str:
+    """Column kind of a non-null value ('json' for anything without a typed layout)."""
+    kind = type(value)
+    if kind is bool:
+        return 'bool'
+    if kind is int:
+        return 'int' if _INT64_MIN <= value <= _INT64_MAX else 'json'
+    if kind is str:
+        return 'str'
+    return 'json'
+
+
+class _ColumnBuilder:
+    """Accumulates one column's buffers while writing.
+
+    The kind is that of the first value; a value of another kind turns the
+    column into 'json' and re-encodes the values before it.
+    """
+
+    def __init__(self, name: str, rows: int = 0, nested: bool = False):
+        """
+        Args:
+            name: Record key
+            rows: Earlier rows, which lack the key
+            nested: Lists are row ranges of the nested table ('rows' kind)
+        """
+        self.name = name
+        self.nested = nested
+        self.kind: Optional[str] = None  # Until the first value
+        self.state = array('b', bytes(rows))
+
+    def _start(self, kind: str) -> None:
+        self.kind = kind
+        rows = len(self.state)
+        if kind in _VALUE_TYPECODES:
+            self.values = array(_VALUE_TYPECODES[kind], [0]) * (rows + (kind == 'rows'))
+        else:
+            self.offsets = array('q', [0]) * (rows + 1)
+            # Column text can be as large as the corpus; spill it to disk past a threshold
+            self.heap = tempfile.SpooledTemporaryFile(max_size=_SPOOL_BYTES)
+            self.heap_size = 0
+
+    def _promote(self) -> None:
+        """Re-encode the column as 'json'."""
+        if self.kind == 'rows':
+            raise ValueError(f"'{self.name}' mixes lists with other values")
+        if self.kind == 'str':
+            self.heap.seek(0)
+            heap = self.heap.read()
+            self.heap.close()
+        values = [
+            self.values[row] if self.kind == 'int' else
+            bool(self.values[row]) if self.kind == 'bool' else
+            str(heap[self.offsets[row]:self.offsets[row + 1]], 'utf-8')
+            for row in range(len(self.state)) if self.state[row] == VALUE
+        ]
+        state = self.state
+        self.state = array('b')
+        self._start('json')
+        values = iter(values)
+        for row_state in state:
+            self.append(next(values) if row_state == VALUE else _MISSING if row_state == ABSENT else None)
+
+    def append(self, value: Any) -> None:
+        if value is _MISSING or value is None:
+            self.state.append(ABSENT if value is _MISSING else NULL)
+            if self.kind is None:
+                return
+            if self.kind == 'rows':
+                self.values.append(self.values[-1])
+            elif self.kind in _VALUE_TYPECODES:
+                self.values.append(0)
+            else:
+                self.offsets.append(self.heap_size)
+            return
+
+        kind = 'rows' if self.nested and type(value) is list else _kind_of(value)
+        if self.kind is None:
+            self._start(kind)
+        elif kind != self.kind and self.kind != 'json':
+            if kind == 'rows':
+                raise ValueError(f"'{self.name}' mixes lists with other values")
+            self._promote()
+
+        self.state.append(VALUE)
+        if self.kind == 'rows':
+            self.values.append(self.values[-1] + len(value))
+        elif self.kind in _VALUE_TYPECODES:
+            self.values.append(value)
+        else:
+            data = value.encode('utf-8') if self.kind == 'str' else codec.dumps(value, pretty=False)
+            self.heap.write(data)
+            self.heap_size += len(data)
+            self.offsets.append(self.heap_size)
+
+    def buffers(self) -> Dict[str, Tuple[Union[array, IO[bytes]], int]]:
+        """Buffer name -> (array or spooled heap file, size in bytes)."""
+        if self.kind is None:
+            self._start('json')  # Only nulls or absent
+        if self.kind in _VALUE_TYPECODES:
+            arrays = {'state': self.state, 'values': self.values}
+        else:
+            arrays = {'state': self.state, 'offsets': self.offsets}
+        buffers = {name: (data, len(data) * data.itemsize) for name, data in arrays.items()}
+        if self.kind not in _VALUE_TYPECODES:
+            buffers['heap'] = (self.heap, self.heap_size)
+        return buffers
+
+
+class SessionFrameWriter:
+    """
+    Builds a frame session by session, for extraction that streams sessions.
+
+    Only column buffers are kept (packed integers and encoded bytes), not the
+    session dicts; SessionFrame.write() is this writer over a whole document.
+    """
+
+    def __init__(self):
+        self.sessions: Dict[str, _ColumnBuilder] = {}
+        self.delegations: Dict[str, _ColumnBuilder] = {}
+        self.session_rows = 0
+        self.delegation_rows = 0
+
+    @staticmethod
+    def _append(columns: Dict[str, _ColumnBuilder], rows: int, record: Dict[str, Any],
+                nested: Optional[str] = None) -> None:
+        for key, value in record.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = _ColumnBuilder(key, rows, nested=key == nested)
+            column.append(value)
+        if len(columns) > len(record):
+            for column in columns.values():
+                if len(column.state) == rows:
+                    column.append(_MISSING)
+
+    def add_session(self, session: Dict[str, Any]) -> None:
+        """Append a session and its delegations."""
+        self._append(self.sessions, self.session_rows, session, nested='delegations')
+        self.session_rows += 1
+        delegations = session.get('delegations')
+        if type(delegations) is list:
+            for delegation in delegations:
+                self._append(self.delegations, self.delegation_rows, delegation)
+                self.delegation_rows += 1
+
+    def write(self, path: Union[str, Path], metadata: Dict[str, Any],
+              source: Optional[Union[str, Path]] = None) -> None:
+        """
+        Write the frame.
+
+        Args:
+            path: Frame file
+            metadata: Top-level document fields other than 'sessions'
+            source: JSON file holding the same document (written first)
+        """
+        tables = {
+            'sessions': (self.session_rows, self.sessions),
+            'delegations': (self.delegation_rows, self.delegations),
+        }
+        layout: Dict[str, Any] = {}
+        chunks: List[Tuple[Union[array, IO[bytes]], int]] = []
+        offset = 0
+        for table, (rows, columns) in tables.items():
+            specs = []
+            for column in columns.values():
+                buffers = column.buffers()
+                spec = {'name': column.name, 'kind': column.kind, 'buffers': {}}
+                for buffer, (data, size) in buffers.items():
+                    spec['buffers'][buffer] = [offset, size]
+                    chunks.append((data, size))
+                    offset += size + len(_pad(size))
+                specs.append(spec)
+            layout[table] = {'rows': rows, 'columns': specs}
+
+        source_stat = os.stat(source) if source is not None else None
+        header = codec.dumps({
+            'byteorder': sys.byteorder,
+            'source': {'size': source_stat.st_size, 'mtime_ns': source_stat.st_mtime_ns} if source_stat else None,
+            'metadata': metadata,
+            'tables': layout,
+        }, pretty=False)
+        prefix = MAGIC + struct.pack('<I', len(header)) + header
+        prefix += _pad(len(prefix))
+
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(prefix)
+            for data, size in chunks:
+                if isinstance(data, array):
+                    f.write(data)
+                else:
+                    data.seek(0)
+                    shutil.copyfileobj(data, f)
+                    data.close()
+                f.write(_pad(size))
+        tmp_path.replace(path)
+
+
+class _Column:
+    """Read access to one mapped column."""
+
+    def __init__(self, kind: str, state: Sequence[int], values: Optional[Sequence[int]] = None,
+                 offsets: Optional[Sequence[int]] = None, heap: Optional[memoryview] = None):
+        self.kind = kind
+        self.state = state
+        self.values = values
+        self.offsets = offsets
+        self.heap = heap
+
+    def get(self, row: int) -> Any:
+        """Value of a row, _MISSING if the key is absent."""
+        state = self.state[row]
+        if state == ABSENT:
+            return _MISSING
+        if state == NULL:
+            return None
+        if self.kind == 'int':
+            return self.values[row]
+        if self.kind == 'bool':
+            return bool(self.values[row])
+        if self.kind == 'rows':
+            return range(self.values[row], self.values[row + 1])
+        raw = self.heap[self.offsets[row]:self.offsets[row + 1]]
+        return str(raw, 'utf-8') if self.kind == 'str' else codec.loads(bytes(raw))
+
+    def slice(self, start: int, stop: int) -> List[Any]:
+        """Values of rows [start, stop), _MISSING where absent; decoded per column."""
+        states = self.state[start:stop].tolist()
+        present = states.count(VALUE)
+        if self.kind in ('int', 'bool'):
+            values = self.values[start:stop].tolist()
+            if self.kind == 'bool':
+                values = [value == 1 for value in values]
+        elif self.kind == 'rows':
+            bounds = self.values[start:stop + 1].tolist()
+            values = [range(a, b) for a, b in zip(bounds, bounds[1:])]
+        else:
+            offsets = self.offsets[start:stop + 1].tolist()
+            base = offsets[0]
+            heap = bytes(self.heap[base:offsets[-1]])
+            if self.kind == 'str':
+                values = [str(heap[a - base:b - base], 'utf-8') for a, b in zip(offsets, offsets[1:])]
+            else:
+                # One parse for the whole slice instead of one per value
+                values = iter(codec.loads(b'[' + b','.join(
+                    heap[a - base:b - base] for a, b, state in zip(offsets, offsets[1:], states) if state == VALUE
+                ) + b']'))
+                values = [next(values) if state == VALUE else None for state in states]
+        if present == len(states):
+            return values
+        return [value if state == VALUE else None if state == NULL else _MISSING
+                for value, state in zip(values, states)]
+
+
+class FrameTable:
+    """Mapped columns of one record type (sessions or delegations)."""
+
+    def __init__(self, rows: int, columns: Dict[str, _Column]):
+        self.rows = rows
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def names(self) -> List[str]:
+        """Keys stored for this record type."""
+        return list(self.columns)
+
+    def column(self, name: str) -> Sequence[int]:
+        """Raw int64 / int8 values of an 'int' or 'bool' column (0 where absent or null).
+
+        Raises:
+            KeyError: If no record has the key
+            ValueError: If the column holds strings or encoded values
+        """
+        column = self.columns[name]
+        if column.kind not in ('int', 'bool'):
+            raise ValueError(f"Column '{name}' holds {column.kind} values")
+        return column.values
+
+    def values(self, name: str, default: Any = None) -> List[Any]:
+        """Decoded values of a key for every row (default where absent)."""
+        column = self.columns.get(name)
+        if column is None:
+            return [default] * self.rows
+        values = [column.get(row) for row in range(self.rows)]
+        return [default if value is _MISSING else value for value in values]
+
+    def records(self, start: int, stop: int, fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Dicts of rows [start, stop), as record() builds them, decoded column by column."""
+        names = list(self.columns) if fields is None else [name for name in fields if name in self.columns]
+        columns = [self.columns[name].slice(start, stop) for name in names]
+        if not any(_MISSING in column for column in columns):
+            return [dict(zip(names, values)) for values in zip(*columns)]
+        records = [{} for _ in range(start, stop)]
+        for name, column in zip(names, columns):
+            for record, value in zip(records, column):
+                if value is not _MISSING:
+                    record[name] = value
+        return records
+
+    def record(self, row: int, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Dict of a row's keys (all, or those of fields that it has)."""
+        names = self.columns if fields is None else [name for name in fields if name in self.columns]
+        record = {}
+        for name in names:
+            value = self.columns[name].get(row)
+            if value is not _MISSING:
+                record[name] = value
+        return record
+
+
+def _pad(length: int) -> bytes:
+    return b'\0' * (-length % ALIGNMENT)
+
+
+class SessionFrame:
+    """A sessions document (metadata, sessions, their delegations) as mapped columns."""
+
+    def __init__(self, metadata: Dict[str, Any], sessions: FrameTable, delegations: FrameTable,
+                 source: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            metadata: Top-level document fields other than 'sessions'
+            sessions: Session columns ('delegations' holds row ranges)
+            delegations: Delegation columns, sessions' rows in order
+            source: Size and mtime of the JSON file the frame mirrors
+        """
+        self.metadata = metadata
+        self.sessions = sessions
+        self.delegations = delegations
+        self.source = source
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def session(self, row: int, fields: Optional[Iterable[str]] = None,
+                delegation_fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Build one session dict.
+
+        Args:
+            row: Session row
+            fields: Session keys to include (default: all)
+            delegation_fields: Keys of each delegation to include (default: all)
+
+        Returns:
+            Session dict, equal to the JSON one when no fields are given
+        """
+        record = self.sessions.record(row, fields)
+        rows = record.get('delegations')
+        if isinstance(rows, range):
+            delegation_fields = None if delegation_fields is None else list(delegation_fields)
+            record['delegations'] = self.delegations.records(rows.start, rows.stop, delegation_fields)
+        return record
+
+    def iter_sessions(self, rows: Optional[Iterable[int]] = None, fields: Optional[Iterable[str]] = None,
+                      delegation_fields: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Session dicts for rows (default: all), built one at a time."""
+        fields = None if fields is None else list(fields)
+        delegation_fields = None if delegation_fields is None else list(delegation_fields)
+        for row in range(len(self)) if rows is None else rows:
+            yield self.session(row, fields, delegation_fields)
+
+    def to_document(self) -> Dict[str, Any]:
+        """The full document, as codec.load_file() returns it from the JSON file."""
+        return {**self.metadata, 'sessions': list(self.iter_sessions())}
+
+    def is_current(self, source: Union[str, Path]) -> bool:
+        """Whether the JSON file the frame was written from is unchanged."""
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return False
+        return self.source == {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    @staticmethod
+    def write(path: Union[str, Path], document: Dict[str, Any], source: Optional[Union[str, Path]] = None) -> None:
+        """
+        Write a sessions document as a frame.
+
+        Args:
+            path: Frame file
+            document: {..metadata.., 'sessions': [{..., 'delegations': [...]}, ...]}
+            source: JSON file holding the same document (written first)
+        """
+        writer = SessionFrameWriter()
+        for session in document.get('sessions', []):
+            writer.add_session(session)
+        metadata = {key: value for key, value in document.items() if key != 'sessions'}
+        writer.write(path, metadata, source=source)
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'SessionFrame':
+        """
+        Map a frame written by write(); column values stay in the mapping.
+
+        Raises:
+            ValueError: If the file is not a session frame or is truncated
+            OSError: If the file cannot be read
+        """
+        with open(path, 'rb') as f:
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Not a session frame: {path}")
+
+        view = memoryview(mapping)
+        if view[:len(MAGIC)] != MAGIC or len(view) < len(MAGIC) + 4:
+            raise ValueError(f"Not a session frame: {path}")
+        (header_len,) = struct.unpack_from('<I', view, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        try:
+            header = codec.loads(bytes(view[header_start:header_start + header_len]))
+        except codec.JSONDecodeError as e:
+            raise ValueError(f"Invalid session frame header in {path}: {e}")
+        data_start = header_start + header_len
+        data_start += -data_start % ALIGNMENT
+        swap = header['byteorder'] != sys.byteorder
+
+        def buffer(spec: List[int], typecode: Optional[str] = None):
+            start = data_start + spec[0]
+            end = start + spec[1]
+            if end > len(view):
+                raise ValueError(f"Truncated session frame: {path}")
+            if typecode is None or typecode == 'b':
+                return view[start:end] if typecode is None else view[start:end].cast('b')
+            if not swap:
+                return view[start:end].cast(typecode)
+            values = array(typecode, view[start:end])  # Foreign byte order: copy
+            values.byteswap()
+            return values
+
+        tables = {}
+        for name, table in header['tables'].items():
+            columns = {}
+            for spec in table['columns']:
+                buffers = spec['buffers']
+                kind = spec['kind']
+                if kind in _VALUE_TYPECODES:
+                    columns[spec['name']] = _Column(
+                        kind, buffer(buffers['state'], 'b'),
+                        values=buffer(buffers['values'], _VALUE_TYPECODES[kind])
+                    )
+                else:
+                    columns[spec['name']] = _Column(
+                        kind, buffer(buffers['state'], 'b'),
+                        offsets=buffer(buffers['offsets'], 'q'), heap=buffer(buffers['heap'])
+                    )
+            tables[name] = FrameTable(table['rows'], columns)
+
+        return cls(header['metadata'], tables['sessions'], tables['delegations'], source=header['source'])
+
+
+def open_session_frame(path: Union[str, Path], source: Union[str, Path]) -> Optional[SessionFrame]:
+    """
+    Frame at path if it mirrors the current source JSON, else None (read the JSON).
+    """
+    try:
+        frame = SessionFrame.open(path)
+    except (OSError, ValueError, KeyError):
+        return None
+    return frame if frame.is_current(source) else None
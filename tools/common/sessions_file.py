@@ -0,0 +1,221 @@
+"""
+Sessions file writer with a session_id -> byte range sidecar index.
+
+Drill-down workflows need one or a few sessions by id, but the enriched
+sessions file is a single JSON document that has to be parsed (or walked
+with ijson) end to end. The extraction stage writes that document session
+by session instead, recording where each session's JSON object starts and
+how long it is:
+
+    enriched_sessions_data.json       {..metadata.., "sessions": [{...}, {...}]}
+    enriched_sessions_data.idx.json   {"source_size": N, "source_mtime_ns": T,
+                                       "sessions": {"<id>": [offset, length]}}
+
+The written document is the same as codec.dumps({**metadata, "sessions": [...]}),
+so every existing reader keeps working. A reader mmaps the sessions file
+and decodes only the slice of the session it wants.
+
+Sessions can also be written one at a time as they are produced, with
+the metadata (totals included) supplied at the end (SessionsFileWriter).
+
+Usage:
+    from tools.common.sessions_file import SessionsFileWriter, write_sessions_file, load_index, read_session
+
+    write_sessions_file(metadata, sessions, ENRICHED_SESSIONS_FILE, ENRICHED_SESSIONS_INDEX_FILE)
+
+    with SessionsFileWriter(ENRICHED_SESSIONS_FILE, ENRICHED_SESSIONS_INDEX_FILE) as writer:
+        for session in produce_sessions():
+            writer.write(session)
+        writer.finish(metadata)
+
+    index = load_index(ENRICHED_SESSIONS_INDEX_FILE, ENRICHED_SESSIONS_FILE)
+    session = read_session(ENRICHED_SESSIONS_FILE, index[session_id])
+"""
+
+import mmap
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from tools.common import codec
+
+
+# Nesting of each session object inside the pretty-printed document
+_SESSION_INDENT = b'    '
+
+
+def index_path_for(sessions_path: Union[str, Path]) -> Path:
+    """Sidecar index path for a sessions file (foo.json -> foo.idx.json)."""
+    sessions_path = Path(sessions_path)
+    return sessions_path.with_name(f"{sessions_path.stem}.idx.json")
+
+
+class SessionsFileWriter:
+    """
+    Incremental writer: sessions are encoded and written as they are added,
+    the metadata is given once all of them are known.
+
+    Sessions are spooled to a body file next to the output; finish() writes
+    the metadata prefix and copies the body after it, so only one encoded
+    session is held in memory at a time and the result is the same document
+    write_sessions_file() produces. The output and then its index replace
+    the previous files atomically. Leaving the context without finish()
+    discards the body and keeps any previous output.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        index_path: Optional[Union[str, Path]] = None,
+        pretty: Optional[bool] = None
+    ):
+        """
+        Args:
+            path: Output JSON file
+            index_path: Sidecar index file (default: index_path_for(path))
+            pretty: Override codec's default output style
+        """
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path is not None else index_path_for(path)
+        self.pretty = codec.PRETTY if pretty is None else pretty
+        self.ranges: Dict[str, List[int]] = {}
+        self._body_path = self.path.with_name(self.path.name + '.body')
+        self._tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self._body = open(self._body_path, 'wb')
+        self._offset = 0
+        if self.pretty:
+            self._separator, self._opening, self._closing = b',\n' + _SESSION_INDENT, b'\n' + _SESSION_INDENT, b'\n  '
+        else:
+            self._separator, self._opening, self._closing = b',', b'', b''
+
+    def write(self, session: Dict[str, Any]) -> None:
+        """Append one session (a dict with a 'session_id')."""
+        chunk = codec.dumps(session, pretty=self.pretty)
+        if self.pretty:
+            # JSON strings never contain raw newlines, so this only re-indents
+            chunk = chunk.replace(b'\n', b'\n' + _SESSION_INDENT)
+        lead = self._separator if self.ranges else self._opening
+        self._body.write(lead)
+        self._body.write(chunk)
+        # Relative to the body until finish() knows the prefix length
+        self.ranges[session['session_id']] = [self._offset + len(lead), len(chunk)]
+        self._offset += len(lead) + len(chunk)
+
+    def finish(self, metadata: Dict[str, Any]) -> Dict[str, List[int]]:
+        """
+        Write {**metadata, "sessions": [...]} and its sidecar index.
+
+        Args:
+            metadata: Top-level fields written before the sessions array
+
+        Returns:
+            Dict mapping session_id to [offset, length] in the written file
+        """
+        if self.ranges:
+            self._body.write(self._closing)
+        self._body.close()
+
+        # Encode the document around an empty sessions array, then splice the
+        # sessions in; keys keep their order so output matches a single dumps()
+        head = codec.dumps({**metadata, 'sessions': []}, pretty=self.pretty)
+        cut = head.rindex(b'[]')
+        prefix, suffix = head[:cut] + b'[', b']' + head[cut + 2:]
+
+        # Assembled beside the output and swapped in, so readers that mapped
+        # the previous file keep its inode; a stale index is detected by stat
+        with open(self._tmp_path, 'wb') as f, open(self._body_path, 'rb') as body:
+            f.write(prefix)
+            shutil.copyfileobj(body, f)
+            f.write(suffix)
+        os.replace(self._tmp_path, self.path)
+        self._body_path.unlink()
+
+        for ref in self.ranges.values():
+            ref[0] += len(prefix)
+
+        stat = self.path.stat()
+        index_tmp_path = self.index_path.with_suffix(self.index_path.suffix + '.tmp')
+        codec.dump_file({
+            'source_size': stat.st_size,
+            'source_mtime_ns': stat.st_mtime_ns,
+            'sessions': self.ranges,
+        }, index_tmp_path, pretty=False)
+        os.replace(index_tmp_path, self.index_path)
+
+        return self.ranges
+
+    def close(self) -> None:
+        """Discard the body if finish() was not called."""
+        if not self._body.closed:
+            self._body.close()
+        self._body_path.unlink(missing_ok=True)
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'SessionsFileWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_sessions_file(
+    metadata: Dict[str, Any],
+    sessions: Iterable[Dict[str, Any]],
+    path: Union[str, Path],
+    index_path: Optional[Union[str, Path]] = None,
+    pretty: Optional[bool] = None
+) -> Dict[str, List[int]]:
+    """
+    Write {**metadata, "sessions": [...]} and record each session's byte range.
+
+    Args:
+        metadata: Top-level fields written before the sessions array
+        sessions: Session dicts, each with a 'session_id'
+        path: Output JSON file
+        index_path: Sidecar index file (default: index_path_for(path))
+        pretty: Override codec's default output style
+
+    Returns:
+        Dict mapping session_id to [offset, length] in the written file
+    """
+    with SessionsFileWriter(path, index_path, pretty) as writer:
+        for session in sessions:
+            writer.write(session)
+        return writer.finish(metadata)
+
+
+def load_index(
+    index_path: Union[str, Path],
+    sessions_path: Union[str, Path]
+) -> Optional[Dict[str, List[int]]]:
+    """
+    Load a sidecar index if it still describes the sessions file.
+
+    Returns:
+        session_id -> [offset, length], or None if missing or stale
+    """
+    index_path, sessions_path = Path(index_path), Path(sessions_path)
+    if not index_path.exists() or not sessions_path.exists():
+        return None
+
+    try:
+        index = codec.load_file(index_path)
+    except codec.JSONDecodeError:
+        return None
+
+    stat = sessions_path.stat()
+    if index.get('source_size') != stat.st_size or index.get('source_mtime_ns') != stat.st_mtime_ns:
+        return None
+    return index.get('sessions')
+
+
+def read_session(source: Union[str, Path, mmap.mmap], ref: List[int]) -> Dict[str, Any]:
+    """Decode a single session from its byte range (file path or open mmap)."""
+    offset, length = ref
+    if isinstance(source, mmap.mmap):
+        return codec.loads(source[offset:offset + length])
+
+    with open(source, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return codec.loads(mapped[offset:offset + length])
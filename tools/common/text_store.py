@@ -0,0 +1,232 @@
+"""
+Offset-indexed blob store for heavy delegation text fields.
+
+Prompts, full results, user context and assistant synthesis make up most
+of enriched_sessions_data.json, yet metric-only consumers never read them.
+The extraction stage writes those fields to a separate blob file and keeps
+a reference in each delegation instead:
+
+    "text_refs": {"prompt": [offset, length], "result_full": [offset, length], ...}
+
+Offsets and lengths are in bytes (UTF-8). A field whose value was None is
+stored as a None reference so resolution restores it exactly.
+
+Usage:
+    from tools.common.text_store import TextBlobWriter, TextBlobStore, resolve_texts
+
+    with TextBlobWriter(TEXT_BLOBS_FILE) as writer:
+        writer.externalize(delegation)
+
+    store = TextBlobStore(TEXT_BLOBS_FILE)
+    resolve_texts(delegation, store)          # in place, pops 'text_refs'
+    store.get(delegation['text_refs']['prompt'])
+
+Typed models keep references packed (pack_refs()): one array of
+offset/length pairs in TEXT_FIELDS order instead of a dict of lists.
+"""
+
+import mmap
+import os
+from array import array
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+
+# Delegation fields moved out of the enriched sessions file
+TEXT_FIELDS = ('prompt', 'result_full', 'user_context_before', 'assistant_synthesis')
+
+# None is a valid reference (the field was None)
+_MISSING = object()
+
+# Packed reference offsets: field not referenced / reference is None
+NO_REF = -1
+NULL_REF = -2
+
+
+class TextBlobWriter:
+    """Append-only writer producing [offset, length] references."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open the blob file for writing.
+
+        Texts go to a temporary sibling that replaces the file on close(), so
+        readers that mapped the previous file keep reading its inode.
+
+        Args:
+            path: Blob file to write
+        """
+        self.path = Path(path)
+        self._tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        self._file = open(self._tmp_path, 'wb')
+        self._offset = 0
+
+    def put(self, text: Optional[str]) -> Optional[List[int]]:
+        """Store a string and return its reference (None stays None)."""
+        if text is None:
+            return None
+        data = text.encode('utf-8')
+        ref = [self._offset, len(data)]
+        self._file.write(data)
+        self._offset += len(data)
+        return ref
+
+    def externalize(self, delegation: Dict[str, Any], fields: Sequence[str] = TEXT_FIELDS) -> Dict[str, Any]:
+        """
+        Move text fields of a delegation into the store (in place).
+
+        Returns:
+            The delegation, with present text fields replaced by 'text_refs'
+        """
+        refs = {
+            field: self.put(delegation.pop(field))
+            for field in fields
+            if field in delegation
+        }
+        if refs:
+            delegation['text_refs'] = refs
+        return delegation
+
+    def close(self) -> None:
+        """Finish writing and replace the blob file."""
+        if self._file.closed:
+            return
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self) -> None:
+        """Drop what was written and keep the previous blob file."""
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'TextBlobWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class TextBlobStore:
+    """Random-access reader; the file is only opened on first access."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = None
+        self._map: Optional[Union[mmap.mmap, bytes]] = None
+        # Pipeline stages running concurrently may share one store
+        self._lock = threading.Lock()
+
+    def _open(self) -> Union[mmap.mmap, bytes]:
+        if self._map is None:
+            with self._lock:
+                if self._map is None:
+                    self._file = open(self.path, 'rb')
+                    if self.path.stat().st_size == 0:
+                        # mmap refuses empty files
+                        self._map = b''
+                    else:
+                        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the blob file has been touched yet."""
+        return self._map is not None
+
+    def get(self, ref: Optional[Sequence[int]]) -> Optional[str]:
+        """Decode the text behind a reference."""
+        if ref is None:
+            return None
+        offset, length = ref
+        return self._open()[offset:offset + length].decode('utf-8')
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self._map = None
+        self._file = None
+
+
+def resolve_texts(
+    delegation: Dict[str, Any],
+    store: Optional[TextBlobStore],
+    fields: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Inline referenced text fields back into a delegation dict (in place).
+
+    Args:
+        delegation: Delegation dict, possibly holding 'text_refs'
+        store: Blob store the references point into
+        fields: Only resolve these fields (default: all referenced fields);
+            'text_refs' is kept while unresolved fields remain
+
+    Returns:
+        The delegation (unchanged if it holds no references)
+    """
+    refs = delegation.get('text_refs')
+    if not refs:
+        return delegation
+    if store is None:
+        raise ValueError("Delegation references external text but no blob store is available")
+
+    # Value is set before its reference is dropped, so a concurrent reader
+    # of the same delegation sees either the reference or the text
+    for field in list(refs if fields is None else fields):
+        if (ref := refs.get(field, _MISSING)) is not _MISSING:
+            delegation[field] = store.get(ref)
+            refs.pop(field, None)
+
+    if not refs:
+        delegation.pop('text_refs', None)
+    return delegation
+
+
+def pack_refs(refs: Optional[Dict[str, Any]]) -> Optional[array]:
+    """
+    Compact a 'text_refs' dict into offset/length pairs in TEXT_FIELDS order.
+
+    Returns:
+        array('q') of 2 * len(TEXT_FIELDS) values (None if refs is None)
+    """
+    if refs is None:
+        return None
+    packed = array('q')
+    for field in TEXT_FIELDS:
+        ref = refs.get(field, _MISSING)
+        if ref is _MISSING:
+            packed.extend((NO_REF, 0))
+        elif ref is None:
+            packed.extend((NULL_REF, 0))
+        else:
+            packed.extend(ref)
+    return packed
+
+
+def packed_ref(packed: Sequence[int], field: str) -> Optional[Sequence[int]]:
+    """Reference of field in pack_refs() output (None if absent or None)."""
+    if field not in TEXT_FIELDS:
+        return None
+    index = 2 * TEXT_FIELDS.index(field)
+    if packed[index] < 0:
+        return None
+    return packed[index:index + 2]
+
+
+def open_text_store(sessions_file: Union[str, Path], data: Dict[str, Any]) -> Optional[TextBlobStore]:
+    """
+    Blob store declared in an enriched sessions file's metadata.
+
+    Returns:
+        TextBlobStore next to sessions_file, or None for files with inline text
+    """
+    name = data.get('text_store')
+    if not name:
+        return None
+    return TextBlobStore(Path(sessions_file).parent / name)
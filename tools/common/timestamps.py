@@ -0,0 +1,101 @@
+"""
+Epoch-millisecond timestamps and integer calendar bucketing.
+
+Extraction stores each delegation's ISO timestamp once more as an integer
+('timestamp_ms', milliseconds since 1970-01-01 UTC) next to the string.
+Consumers bucket by day, hour and weekday with integer arithmetic on that
+value instead of building a datetime per delegation; day strings and dates
+are computed once per distinct day.
+
+Records written before 'timestamp_ms' existed are parsed on the fly
+(record_ms()), so every consumer works on both.
+
+Timestamps without an offset are taken as UTC. Claude Code writes UTC
+('...Z') timestamps, for which UTC buckets are the calendar values as
+written.
+
+Usage:
+    from tools.common.timestamps import record_ms, day_key, hour_of, weekday_name
+
+    ms = record_ms(delegation)          # None if missing or unparseable
+    if ms is not None:
+        by_date[day_key(ms)] += 1       # '2025-09-15'
+        by_hour[hour_of(ms)] += 1       # 0..23
+        by_weekday[weekday_name(ms)] += 1
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+MS_PER_HOUR = 3_600_000
+MS_PER_DAY = 24 * MS_PER_HOUR
+
+# Field stored next to a record's ISO timestamp field
+MS_SUFFIX = '_ms'
+
+# Missing / unparseable timestamp in integer columns
+NULL_MS = -(1 << 63)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_ONE_MS = timedelta(milliseconds=1)
+
+# Day 0 (1970-01-01) was a Thursday
+_WEEKDAYS = ('Thursday', 'Friday', 'Saturday', 'Sunday', 'Monday', 'Tuesday', 'Wednesday')
+
+
+def timestamp_to_ms(timestamp: Optional[str]) -> Optional[int]:
+    """Epoch milliseconds of an ISO timestamp, None if missing or invalid."""
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // _ONE_MS
+
+
+def record_ms(record: Dict[str, Any], field: str = 'timestamp') -> Optional[int]:
+    """Stored epoch milliseconds of record[field], parsed if not stored."""
+    ms = record.get(field + MS_SUFFIX)
+    if ms is None:
+        ms = timestamp_to_ms(record.get(field))
+    return ms
+
+
+def day_number(ms: int) -> int:
+    """Days since 1970-01-01 (UTC)."""
+    return ms // MS_PER_DAY
+
+
+@lru_cache(maxsize=4096)
+def _day_date(day: int) -> date:
+    return date.fromordinal(_EPOCH_ORDINAL + day)
+
+
+@lru_cache(maxsize=4096)
+def _day_key(day: int) -> str:
+    return _day_date(day).isoformat()
+
+
+def date_of(ms: int) -> date:
+    """Calendar date (UTC)."""
+    return _day_date(ms // MS_PER_DAY)
+
+
+def day_key(ms: int) -> str:
+    """'YYYY-MM-DD' (UTC)."""
+    return _day_key(ms // MS_PER_DAY)
+
+
+def hour_of(ms: int) -> int:
+    """Hour of day 0..23 (UTC)."""
+    return ms // MS_PER_HOUR % 24
+
+
+def weekday_name(ms: int) -> str:
+    """English weekday name (UTC), as strftime('%A') in the C locale."""
+    return _WEEKDAYS[ms // MS_PER_DAY % 7]
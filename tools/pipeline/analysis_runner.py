@@ -15,6 +15,9 @@ Usage:
     # Run with custom output directory
     python analysis_runner.py --all --output results/
 
+    # Run strategies one after another instead of in parallel
+    python analysis_runner.py --all --jobs 1
+
     # Run programmatically
     from analysis_runner import AnalysisRunner
     runner = AnalysisRunner()
@@ -22,12 +25,20 @@ Usage:
 """
 
 import argparse
+import time
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
-import json
 
-from tools.common.analysis_strategy import AnalysisStrategy, CompositeAnalysisStrategy
+from tools.common import codec
+from tools.common.analysis_strategy import (
+    DEFAULT_STRATEGY_WORKERS,
+    AnalysisResult,
+    AnalysisStrategy,
+    CompositeAnalysisStrategy,
+    run_strategies
+)
+from tools.pipeline.run_profile import count_records
 from tools.strategies import (
     MetricsAnalysisStrategy,
     MarathonAnalysisStrategy,
@@ -42,19 +53,21 @@ class AnalysisRunner:
     Benefits:
     - Load data once, run multiple analyses
     - Aggregate results
-    - Parallel execution (future enhancement)
+    - Parallel execution (strategies run in forked workers sharing the data)
     - Consistent output format
     """
 
-    def __init__(self, output_dir: Optional[Path] = None):
+    def __init__(self, output_dir: Optional[Path] = None, workers: int = DEFAULT_STRATEGY_WORKERS):
         """
         Initialize runner.
 
         Args:
             output_dir: Directory for output files (default: ./analysis_results/)
+            workers: Strategies run_multiple() runs at the same time (1 = sequential)
         """
         self.output_dir = output_dir or Path('./analysis_results')
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers
 
         # Registry of available strategies
         self._registry: Dict[str, AnalysisStrategy] = {}
@@ -114,12 +127,16 @@ class AnalysisRunner:
             raise KeyError(f"Strategy '{name}' not found. Available: {self.list_strategies()}")
 
         strategy = self._registry[name]
+        self._print_header(strategy)
+        return self._report(name, strategy.run(data), save)
+
+    def _print_header(self, strategy: AnalysisStrategy) -> None:
         print(f"\n{'='*80}")
         print(f"Running: {strategy.get_name()}")
         print(f"{'='*80}")
 
-        result = strategy.run(data)
-
+    def _report(self, name: str, result: AnalysisResult, save: bool) -> Dict:
+        """Save and print one strategy's result."""
         if save:
             output_file = self.output_dir / f"{name}_result.json"
             result.save_to_file(output_file)
@@ -132,34 +149,55 @@ class AnalysisRunner:
     def run_multiple(
         self,
         strategy_names: List[str],
-        save: bool = True
+        save: bool = True,
+        repository=None
     ) -> Dict[str, Dict]:
         """
         Run multiple strategies with shared data loading.
 
+        Strategies run in parallel (up to self.workers at once); results are
+        saved and printed in the order of strategy_names once all finished.
+
         Args:
             strategy_names: List of strategy identifiers
             save: Whether to save individual results
+            repository: DataRepository to load from (default: the module-level
+                loaders, answered by the data daemon when one is running)
 
         Returns:
             Dictionary mapping strategy names to results
         """
-        # Load data once
+        # Load data once (text blobs only if some strategy reads them)
         print("Loading data...")
-        from tools.common.data_repository import load_delegations, load_sessions
+        from tools.common import data_repository
 
+        # Without a repository, the module functions may use the data daemon
+        loader = repository or data_repository
+        known = [name for name in strategy_names if name in self._registry]
+        with_text = any(self._registry[name].needs_text for name in known)
         data = {
-            'delegations': load_delegations(),
-            'sessions': load_sessions()
+            'delegations': loader.load_delegations(with_text=with_text),
+            'sessions': loader.load_sessions(with_text=with_text),
+            # Metrics records shared with other users of the same dataset
+            'metrics_memo': loader.metrics_memo()
         }
         print(f"Loaded {len(data['delegations'])} delegations, {len(data['sessions'])} sessions\n")
+        count_records(records_in=len(data['delegations']))
+
+        # Run all strategies, then report them in order
+        start = time.perf_counter()
+        runs = dict(zip(known, run_strategies([self._registry[name] for name in known], data, self.workers)))
+        if len(known) > 1:
+            print(f"Ran {len(known)} strategies with up to {self.workers} workers "
+                  f"in {time.perf_counter() - start:.1f}s")
 
-        # Run each strategy
         results = {}
         for name in strategy_names:
             try:
-                result = self.run_strategy(name, data=data, save=save)
-                results[name] = result
+                if name not in runs:
+                    raise KeyError(f"Strategy '{name}' not found. Available: {self.list_strategies()}")
+                self._print_header(self._registry[name])
+                results[name] = self._report(name, runs[name], save)
             except Exception as e:
                 print(f"ERROR running {name}: {e}")
                 results[name] = {'error': str(e)}
@@ -198,7 +236,7 @@ class AnalysisRunner:
             Composite result dictionary
         """
         strategies = [self._registry[name] for name in strategy_names]
-        composite = CompositeAnalysisStrategy(strategies)
+        composite = CompositeAnalysisStrategy(strategies, workers=self.workers)
 
         print(f"\n{'='*80}")
         print(f"Running composite analysis: {len(strategies)} strategies")
@@ -227,8 +265,7 @@ class AnalysisRunner:
         }
 
         output_file = self.output_dir / "aggregate_results.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(aggregate, f, indent=2, ensure_ascii=False)
+        codec.dump_file(aggregate, output_file, ensure_ascii=False)
 
         print(f"\nAggregate results saved to: {output_file}")
 
@@ -276,6 +313,26 @@ class AnalysisRunner:
         return "\n".join(lines)
 
 
+def run_all_analyses(repository=None) -> Dict[str, Dict]:
+    """
+    In-process equivalent of `analysis_runner.py --all` (pipeline ANALYSIS stage).
+
+    Args:
+        repository: DataRepository shared with earlier pipeline stages
+
+    Returns:
+        Dictionary mapping strategy names to results
+    """
+    from tools.common.config import PROJECT_ROOT
+
+    runner = AnalysisRunner(output_dir=PROJECT_ROOT / 'analysis_results')
+    results = runner.run_multiple(runner.list_strategies(), repository=repository)
+
+    successful = sum(1 for r in results.values() if 'error' not in r)
+    print(f"Ran {len(results)} analyses: {successful} successful")
+    return results
+
+
 def main():
     """CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -294,6 +351,9 @@ Examples:
 
   # Generate markdown report
   python analysis_runner.py --all --report
+
+  # Run strategies one after another
+  python analysis_runner.py --all --jobs 1
         """
     )
 
@@ -313,10 +373,12 @@ Examples:
                        help='List available strategies')
     parser.add_argument('--no-save', action='store_true',
                        help='Do not save results to files')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_STRATEGY_WORKERS,
+                       help=f'Strategies run in parallel (default: {DEFAULT_STRATEGY_WORKERS})')
 
     args = parser.parse_args()
 
-    runner = AnalysisRunner(output_dir=Path(args.output))
+    runner = AnalysisRunner(output_dir=Path(args.output), workers=args.jobs)
 
     # List strategies
     if args.list:
@@ -2,10 +2,13 @@
 """
 Classify marathons as positive (productive) vs negative (pathological).
 """
-import json
-from pathlib import Path
+from tools.common import codec
+from tools.common.config import DATA_DIR, ENRICHED_SESSIONS_FILE, ENRICHED_SESSIONS_FRAME_FILE
+from tools.common.session_frame import open_session_frame
+from tools.common.text_store import open_text_store, resolve_texts
+from tools.pipeline.run_profile import count_records
 
-def classify_marathon(session):
+def classify_marathon(session, text_store=None):
     """
     Classify marathon as:
     - POSITIVE: >20 deleg, >85% success, productive work
@@ -18,6 +21,10 @@ def classify_marathon(session):
     if deleg_count <= 20:
         return None  # Not a marathon
 
+    # Prompts live in the text blob store; only marathons need them
+    for d in delegations:
+        resolve_texts(d, text_store, fields=('prompt',))
+
     # Calculate success rate
     successes = sum(1 for d in delegations if d.get('success') is True)
     total = len(delegations)
@@ -57,17 +64,46 @@ def classify_marathon(session):
         'date': session.get('first_timestamp', '')[:10]
     }
 
-def main():
-    # Load enriched sessions
-    with open('data/enriched_sessions_data.json') as f:
-        data = json.load(f)
+# Delegation fields classify_marathon() reads
+MARATHON_FIELDS = ('agent_type', 'success', 'prompt', 'text_refs')
+
+def load_marathon_candidates():
+    """Sessions with more than 20 delegations from the mapped session frame.
+
+    Returns:
+        (sessions, sessions scanned, text store), or None without a current frame
+    """
+    frame = open_session_frame(ENRICHED_SESSIONS_FRAME_FILE, ENRICHED_SESSIONS_FILE)
+    if frame is None:
+        return None
+    counts = frame.sessions.column('delegation_count')
+    rows = [row for row in range(len(frame)) if counts[row] > 20]
+    sessions = list(frame.iter_sessions(rows, delegation_fields=MARATHON_FIELDS))
+    return sessions, len(frame), open_text_store(ENRICHED_SESSIONS_FILE, frame.metadata)
+
+def main(repository=None):
+    # Load enriched sessions (in-process pipeline runs share the repository's copy;
+    # subprocess runs map the session frame and build only marathon sessions)
+    candidates = load_marathon_candidates() if repository is None else None
+    if candidates is not None:
+        sessions, scanned, text_store = candidates
+    elif repository is None:
+        data = codec.load_file(ENRICHED_SESSIONS_FILE)
+        sessions, scanned = data['sessions'], len(data['sessions'])
+        text_store = open_text_store(ENRICHED_SESSIONS_FILE, data)
+    else:
+        data = repository.load_document('enriched_sessions')
+        sessions, scanned = data['sessions'], len(data['sessions'])
+        text_store = repository.get_text_store()
 
     marathons = []
-    for session in data['sessions']:
-        marathon_data = classify_marathon(session)
+    for session in sessions:
+        marathon_data = classify_marathon(session, text_store)
         if marathon_data:
             marathons.append(marathon_data)
 
+    count_records(records_in=scanned, records_out=len(marathons))
+
     # Sort by delegation count
     marathons.sort(key=lambda x: x['delegations'], reverse=True)
 
@@ -134,9 +170,8 @@ def main():
         'ambiguous_marathons': ambiguous
     }
 
-    output = Path('data/marathon-classification.json')
-    with open(output, 'w') as f:
-        json.dump(report, f, indent=2)
+    output = DATA_DIR / 'marathon-classification.json'
+    codec.dump_file(report, output)
 
     print(f"✅ Detailed report saved: {output}")
 
@@ -3,13 +3,17 @@
 Extract ALL sessions from ALL Claude projects.
 Match with the 1246 delegations from agent_calls_metadata.csv
 """
-import json
 import csv
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
 
+from tools.common import codec
 from tools.common.config import AGENT_CALLS_CSV, SESSIONS_DATA_FILE, PROJECTS_DIR, DATA_DIR, get_runtime_config
+from tools.common.timestamps import timestamp_to_ms
+from tools.pipeline.file_scan_cache import filter_messages, stream_sessions
+from tools.pipeline.session_index import SessionIndex
+from tools.pipeline.run_profile import count_records
 
 def load_known_delegations():
     """Load the 1246 delegations we know about."""
@@ -26,17 +30,12 @@ def load_known_delegations():
     
     return delegations
 
-def extract_all_sessions():
-    """Scan ALL project directories for session files.
-
-    Filters by runtime config (project path and date range if specified).
+def resolve_projects_dir(runtime_config):
+    """Source directory for conversation files.
 
-    Source: Reads from data/conversations/ (backup) by default,
-    or ~/.claude/projects/ (live) if source_live=True.
+    Source: data/conversations/ (backup) by default, falling back to
+    ~/.claude/projects/ (live) if the backup is missing or source_live=True.
     """
-    runtime_config = get_runtime_config()
-
-    # Determine source directory
     if runtime_config.source_live:
         projects_dir = Path.home() / ".claude/projects"
         print(f"Reading from LIVE source: {projects_dir}", flush=True)
@@ -47,44 +46,36 @@ def extract_all_sessions():
             print(f"⚠️  Backup not found. Run with --source-live or backup first.", flush=True)
             projects_dir = Path.home() / ".claude/projects"
             print(f"   Falling back to LIVE: {projects_dir}", flush=True)
+    return projects_dir
 
-    all_sessions = {}
+def has_filters(runtime_config):
+    """Whether project/date filters replace the CSV-based session matching."""
+    return bool(runtime_config.project_filter or runtime_config.start_date or runtime_config.end_date)
 
-    for project_dir in projects_dir.iterdir():
-        if not project_dir.is_dir():
-            continue
+def extract_all_sessions():
+    """Stream sessions from ALL project directories, one at a time.
 
-        for jsonl_file in project_dir.glob("*.jsonl"):
-            with open(jsonl_file) as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    try:
-                        msg = json.loads(line)
-                        session_id = msg.get("sessionId")
-
-                        # Apply project filter
-                        project_path = msg.get("cwd", "")
-                        if not runtime_config.matches_project(project_path):
-                            continue
-
-                        # Apply date filter
-                        timestamp = msg.get("timestamp", "")
-                        if timestamp and not runtime_config.matches_date_range(timestamp):
-                            continue
-
-                        if session_id:
-                            if session_id not in all_sessions:
-                                all_sessions[session_id] = []
-                            all_sessions[session_id].append(msg)
-                    except json.JSONDecodeError:
-                        continue
-
-    return all_sessions
+    Filters by runtime config (project path and date range if specified).
+
+    Returns:
+        Iterator of (session_id, messages) pairs
+    """
+    runtime_config = get_runtime_config()
+    projects_dir = resolve_projects_dir(runtime_config)
+
+    # Unchanged files come from the per-file cache, grown files are tail-read.
+    # Only Task calls and their results need decoding for delegation metrics.
+    return stream_sessions(
+        projects_dir,
+        workers=runtime_config.scan_workers,
+        runtime_config=runtime_config,
+        prefilter=True
+    )
 
 def analyze_delegation_chain(messages):
     """Extract delegation metrics from message chain."""
     delegations = []
+    index = SessionIndex(messages)
     
     for i, msg in enumerate(messages):
         if msg.get("type") != "assistant":
@@ -101,6 +92,7 @@ def analyze_delegation_chain(messages):
                 
                 delegation = {
                     "timestamp": msg.get("timestamp"),
+                    "timestamp_ms": timestamp_to_ms(msg.get("timestamp")),
                     "agent_type": input_data.get("subagent_type"),
                     "description": input_data.get("description"),
                     "prompt": input_data.get("prompt"),
@@ -112,110 +104,122 @@ def analyze_delegation_chain(messages):
                 }
                 
                 # Find result - search entire remaining session (agent delegations can take 100+ messages)
-                for j in range(i+1, len(messages)):
-                    next_msg = messages[j]
-                    if next_msg.get("type") == "user":
-                        user_content = next_msg.get("message", {}).get("content", [])
-                        if isinstance(user_content, list):
-                            for res in user_content:
-                                if (res.get("type") == "tool_result" and
-                                    res.get("tool_use_id") == delegation["tool_use_id"]):
-                                    delegation["success"] = not res.get("is_error", False)
-                                    delegation["result_preview"] = str(res.get("content", ""))[:500]
-                                    break
-                        # If we found the result, stop searching
-                        if "success" in delegation:
-                            break
+                res = index.find_result(delegation["tool_use_id"], i)
+                if res is not None:
+                    delegation["success"] = not res.get("is_error", False)
+                    delegation["result_preview"] = str(res.get("content", ""))[:500]
                 
                 delegations.append(delegation)
     
     return delegations
 
-def main():
-    runtime_config = get_runtime_config()
+class SessionsDataWriter:
+    """Analyze scanned sessions one at a time and write SESSIONS_DATA_FILE.
 
-    # If we have project/date filters, extract sessions directly without CSV matching
-    # Otherwise, use the CSV-based matching (backward compatible)
-    if runtime_config.project_filter or runtime_config.start_date or runtime_config.end_date:
-        print("Scanning Claude projects with filters...", flush=True)
-        all_sessions = extract_all_sessions()
-        print(f"Found {len(all_sessions)} sessions matching filters", flush=True)
-
-        # Analyze all filtered sessions
-        matched_sessions = []
-        total_delegations = 0
-
-        for session_id, messages in all_sessions.items():
-            messages_sorted = sorted(messages, key=lambda x: x.get("timestamp", ""))
-            delegations = analyze_delegation_chain(messages_sorted)
-
-            if delegations:  # Only include sessions with delegations
-                matched_sessions.append({
-                    "session_id": session_id,
-                    "message_count": len(messages_sorted),
-                    "delegation_count": len(delegations),
-                    "delegations": delegations
-                })
-                total_delegations += len(delegations)
+    Only messages matching the runtime project/date filters are analyzed
+    (without a start date: since DEFAULT_ANALYSIS_START), whether or not
+    the scan already applied them. With explicit filters every session with
+    delegations is kept, in scan order; otherwise sessions are matched
+    against the known delegations CSV and written in CSV order. Only the
+    analyzed delegations are held until finish().
+    """
+
+    def __init__(self, runtime_config):
+        """
+        Args:
+            runtime_config: Project/date filters; also decides between
+                filtered mode and CSV matching
+        """
+        self.runtime_config = runtime_config
+        self.filtered = has_filters(runtime_config)
+        self.sessions_scanned = 0
+        self.matched = {}
+
+        if not self.filtered:
+            # Original CSV-based matching (backward compatible)
+            print("Loading known delegations...", flush=True)
+            self.known_delegations = load_known_delegations()
+            print(f"Found {len(self.known_delegations)} sessions with delegations", flush=True)
+
+    def add_session(self, session_id, messages):
+        """Analyze the messages of one scanned session that match the runtime config."""
+        # A no-op on sessions the scan already filtered
+        messages = filter_messages(messages, self.runtime_config)
+        if not messages:
+            return
+        self.sessions_scanned += 1
+        if not self.filtered and session_id not in self.known_delegations:
+            return
+
+        messages_sorted = sorted(messages, key=lambda x: x.get("timestamp", ""))
+        delegations = analyze_delegation_chain(messages_sorted)
+
+        # Filtered mode only includes sessions with delegations
+        if delegations or not self.filtered:
+            self.matched[session_id] = {
+                "session_id": session_id,
+                "message_count": len(messages_sorted),
+                "delegation_count": len(delegations),
+                "delegations": delegations
+            }
+
+    def finish(self):
+        """Write SESSIONS_DATA_FILE."""
+        if self.filtered:
+            matched_sessions = list(self.matched.values())
+        else:
+            matched_sessions = [
+                self.matched[session_id] for session_id in self.known_delegations
+                if session_id in self.matched
+            ]
+        total_delegations = sum(session["delegation_count"] for session in matched_sessions)
 
         output = {
             "extraction_date": datetime.now().isoformat(),
-            "total_sessions_scanned": len(all_sessions),
+            "total_sessions_scanned": self.sessions_scanned,
             "matched_sessions": len(matched_sessions),
             "total_delegations_extracted": total_delegations,
             "sessions": matched_sessions
         }
 
-        with open(SESSIONS_DATA_FILE, 'w') as f:
-            json.dump(output, f, indent=2)
+        codec.dump_file(output, SESSIONS_DATA_FILE)
+        count_records(records_out=len(matched_sessions))
 
         print(f"\n=== EXTRACTION COMPLETE ===", flush=True)
-        print(f"Sessions with delegations: {len(matched_sessions)}", flush=True)
+        print(f"Sessions scanned: {self.sessions_scanned}", flush=True)
+        if self.filtered:
+            print(f"Sessions with delegations: {len(matched_sessions)}", flush=True)
+        else:
+            print(f"Sessions matched: {len(matched_sessions)}", flush=True)
         print(f"Delegations extracted: {total_delegations}", flush=True)
         print(f"Output: {SESSIONS_DATA_FILE}", flush=True)
 
-    else:
-        # Original CSV-based matching (backward compatible)
-        print("Loading known delegations...", flush=True)
-        known_delegations = load_known_delegations()
-        print(f"Found {len(known_delegations)} sessions with delegations", flush=True)
+    def close(self):
+        """Nothing to release: the output is only written by finish()."""
 
-        print("Scanning all Claude projects...", flush=True)
-        all_sessions = extract_all_sessions()
-        print(f"Found {len(all_sessions)} total sessions", flush=True)
-
-        # Match and analyze
-        matched_sessions = []
-        total_delegations = 0
-
-        for session_id in known_delegations.keys():
-            if session_id in all_sessions:
-                messages = sorted(all_sessions[session_id], key=lambda x: x.get("timestamp", ""))
-                delegations = analyze_delegation_chain(messages)
-
-                matched_sessions.append({
-                    "session_id": session_id,
-                    "message_count": len(messages),
-                    "delegation_count": len(delegations),
-                    "delegations": delegations
-                })
-                total_delegations += len(delegations)
+def write_sessions_data(sessions, runtime_config):
+    """Analyze scanned sessions and write SESSIONS_DATA_FILE.
 
-        output = {
-            "extraction_date": datetime.now().isoformat(),
-            "total_sessions_scanned": len(all_sessions),
-            "matched_sessions": len(matched_sessions),
-            "total_delegations_extracted": total_delegations,
-            "sessions": matched_sessions
-        }
+    Args:
+        sessions: (session_id, messages) pairs, filtered or not
+        runtime_config: Project/date filters; also decides between
+            filtered mode and CSV matching
+    """
+    writer = SessionsDataWriter(runtime_config)
+    for session_id, messages in sessions:
+        writer.add_session(session_id, messages)
+    writer.finish()
 
-        with open(SESSIONS_DATA_FILE, 'w') as f:
-            json.dump(output, f, indent=2)
+def main():
+    runtime_config = get_runtime_config()
 
-        print(f"\n=== EXTRACTION COMPLETE ===", flush=True)
-        print(f"Sessions matched: {len(matched_sessions)}", flush=True)
-        print(f"Delegations extracted: {total_delegations}", flush=True)
-        print(f"Output: {SESSIONS_DATA_FILE}", flush=True)
+    # If we have project/date filters, extract sessions directly without CSV matching
+    # Otherwise, use the CSV-based matching (backward compatible)
+    if has_filters(runtime_config):
+        print("Scanning Claude projects with filters...", flush=True)
+    else:
+        print("Scanning all Claude projects...", flush=True)
+    write_sessions_data(extract_all_sessions(), runtime_config)
 
 if __name__ == "__main__":
     main()
@@ -8,76 +8,53 @@ Additions vs extract_all_sessions.py:
 3. Agent→Agent sequences (chronological order)
 4. Session narrative structure
 """
-import json
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
 
-from tools.common.config import ENRICHED_SESSIONS_FILE, PROJECTS_DIR
-from tools.common.schema_validator import SchemaValidator
-from file_scan_cache import (
-    is_cache_valid,
-    load_sessions_cache,
-    save_sessions_cache,
-    get_file_metadata,
-    save_metadata_cache,
-    clear_cache
+from tools.common.config import (
+    ENRICHED_SESSIONS_FILE, ENRICHED_SESSIONS_INDEX_FILE, ENRICHED_SESSIONS_FRAME_FILE, DELEGATION_TABLE_FILE,
+    TEXT_BLOBS_FILE, PROJECTS_DIR, get_runtime_config
 )
+from tools.common.delegation_table import DelegationTableBuilder
+from tools.common.schema_validator import SchemaValidator
+from tools.common.session_frame import SessionFrameWriter
+from tools.common.sessions_file import SessionsFileWriter
+from tools.common.text_store import TextBlobWriter
+from tools.common.timestamps import timestamp_to_ms
+from tools.pipeline.jsonl_prefilter import materialize
+from tools.pipeline.session_index import SessionIndex
+from tools.pipeline.file_scan_cache import stream_sessions, clear_cache, get_cache_info
+from tools.pipeline.run_profile import count_records
 
 def extract_all_sessions(use_cache=True):
-    """Scan ALL project directories for session files.
+    """Stream sessions from ALL project directories, one at a time.
+
+    Only files that are new or changed since the last run are re-parsed;
+    unchanged files are served from the per-file scan cache. Only Task
+    calls and their results are decoded up front; other messages are light
+    records that must go through materialize() before reading content.
+    Runtime project/date filters do not apply: every scanned session is
+    enriched.
 
     Args:
-        use_cache: If True, use cached data when valid (default: True)
+        use_cache: If True, use and refresh the per-file cache (default: True)
 
     Returns:
-        Dict mapping session_id to list of messages
+        Iterator of (session_id, messages) pairs
     """
     projects_dir = PROJECTS_DIR
+    runtime_config = get_runtime_config()
 
-    # Try to use cache if enabled
-    if use_cache and is_cache_valid(projects_dir):
-        print("Using cached data (files unchanged)...", flush=True)
-        cached_sessions = load_sessions_cache()
-        if cached_sessions is not None:
-            print(f"Loaded {len(cached_sessions)} sessions from cache", flush=True)
-            return cached_sessions
-        print("Cache invalid, performing full scan...", flush=True)
-    elif use_cache:
-        print("Cache miss, performing full scan...", flush=True)
-    else:
+    if not use_cache:
         print("Cache disabled, performing full scan...", flush=True)
 
-    # Perform full scan
-    all_sessions = {}
-
-    for project_dir in projects_dir.iterdir():
-        if not project_dir.is_dir():
-            continue
-
-        for jsonl_file in project_dir.glob("*.jsonl"):
-            with open(jsonl_file) as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    try:
-                        msg = json.loads(line)
-                        session_id = msg.get("sessionId")
-                        if session_id:
-                            if session_id not in all_sessions:
-                                all_sessions[session_id] = []
-                            all_sessions[session_id].append(msg)
-                    except json.JSONDecodeError:
-                        continue
-
-    # Save to cache for next time
-    if use_cache:
-        print("Saving to cache...", flush=True)
-        metadata = get_file_metadata(projects_dir)
-        save_metadata_cache(metadata)
-        save_sessions_cache(all_sessions)
-
-    return all_sessions
+    return stream_sessions(
+        projects_dir,
+        use_cache=use_cache,
+        workers=runtime_config.scan_workers,
+        prefilter=True
+    )
 
 def extract_user_message_text(msg):
     """Extract user message text content."""
@@ -95,6 +72,7 @@ def extract_user_message_text(msg):
 def analyze_enriched_session(messages):
     """Extract delegations WITH full context."""
     delegations = []
+    index = SessionIndex(messages)
 
     for i, msg in enumerate(messages):
         if msg.get("type") != "assistant":
@@ -111,6 +89,7 @@ def analyze_enriched_session(messages):
 
                 delegation = {
                     "timestamp": msg.get("timestamp"),
+                    "timestamp_ms": timestamp_to_ms(msg.get("timestamp")),
                     "agent_type": input_data.get("subagent_type"),
                     "description": input_data.get("description"),
                     "prompt": input_data.get("prompt"),
@@ -125,34 +104,23 @@ def analyze_enriched_session(messages):
                 if i > 0:
                     prev_msg = messages[i-1]
                     if prev_msg.get("type") == "user":
-                        delegation["user_context_before"] = extract_user_message_text(prev_msg)
+                        delegation["user_context_before"] = extract_user_message_text(materialize(prev_msg))
 
                 # ENRICHMENT 2: Find FULL result (not truncated)
-                for j in range(i+1, len(messages)):
-                    next_msg = messages[j]
-                    if next_msg.get("type") == "user":
-                        user_content = next_msg.get("message", {}).get("content", [])
-                        if isinstance(user_content, list):
-                            for res in user_content:
-                                if (res.get("type") == "tool_result" and
-                                    res.get("tool_use_id") == delegation["tool_use_id"]):
-                                    delegation["success"] = not res.get("is_error", False)
-                                    delegation["is_error"] = res.get("is_error", False)
-                                    # FULL result, not truncated
-                                    delegation["result_full"] = str(res.get("content", ""))
-                                    delegation["result_preview"] = str(res.get("content", ""))[:500]
-                                    break
-                        if "success" in delegation:
-                            break
+                res = index.find_result(delegation["tool_use_id"], i)
+                if res is not None:
+                    delegation["success"] = not res.get("is_error", False)
+                    delegation["is_error"] = res.get("is_error", False)
+                    # FULL result, not truncated
+                    delegation["result_full"] = str(res.get("content", ""))
+                    delegation["result_preview"] = str(res.get("content", ""))[:500]
 
                 # ENRICHMENT 3: Capture assistant message AFTER result (synthesis)
                 if "success" in delegation:
-                    for k in range(i+1, len(messages)):
-                        after_msg = messages[k]
-                        if after_msg.get("type") == "assistant":
-                            # First assistant message after result = synthesis
-                            delegation["assistant_synthesis"] = extract_user_message_text(after_msg)
-                            break
+                    k = index.next_assistant(i)
+                    if k is not None:
+                        # First assistant message after result = synthesis
+                        delegation["assistant_synthesis"] = extract_user_message_text(materialize(messages[k]))
 
                 delegations.append(delegation)
 
@@ -167,83 +135,182 @@ def analyze_enriched_session(messages):
 
     return delegations
 
-def main():
-    print("Scanning all Claude projects...", flush=True)
-    all_sessions = extract_all_sessions()
-    print(f"Found {len(all_sessions)} total sessions", flush=True)
-
-    # Filter sessions with delegations (from September 2025)
-    enriched_sessions = []
-    total_delegations = 0
-
-    for session_id, messages in all_sessions.items():
-        messages = sorted(messages, key=lambda x: x.get("timestamp", ""))
-
-        # Quick check: does this session have Task tool_use?
-        has_delegations = any(
-            msg.get("type") == "assistant" and
-            any(
-                item.get("type") == "tool_use" and item.get("name") == "Task"
-                for item in msg.get("message", {}).get("content", [])
-                if isinstance(msg.get("message", {}).get("content", []), list)
-            )
-            for msg in messages
+def enrich_session(session_id, messages):
+    """Enrich one session.
+
+    Returns:
+        The enriched session, or None unless it is a September 2025 session
+        with delegations
+    """
+    messages = sorted(messages, key=lambda x: x.get("timestamp", ""))
+
+    # Quick check: does this session have Task tool_use?
+    has_delegations = any(
+        msg.get("type") == "assistant" and
+        any(
+            item.get("type") == "tool_use" and item.get("name") == "Task"
+            for item in msg.get("message", {}).get("content", [])
+            if isinstance(msg.get("message", {}).get("content", []), list)
         )
+        for msg in messages
+    )
 
-        if not has_delegations:
-            continue
+    if not has_delegations:
+        return None
 
-        # Check if September 2025
-        first_timestamp = messages[0].get("timestamp", "")
-        if not first_timestamp.startswith("2025-09"):
-            continue
+    # Check if September 2025
+    first_timestamp = messages[0].get("timestamp", "")
+    if not first_timestamp.startswith("2025-09"):
+        return None
 
-        delegations = analyze_enriched_session(messages)
-
-        if delegations:
-            enriched_sessions.append({
-                "session_id": session_id,
-                "first_timestamp": first_timestamp,
-                "message_count": len(messages),
-                "delegation_count": len(delegations),
-                "delegations": delegations
-            })
-            total_delegations += len(delegations)
-
-    # Create versioned output with schema metadata
-    metadata = SchemaValidator.create_metadata(
-        generator_name="extract_enriched_data.py",
-        schema_type="enriched_sessions",
-        additional_metadata={
-            "extraction_version": "enriched_v1",
-            "total_sessions_scanned": len(all_sessions),
-            "matched_sessions": len(enriched_sessions),
-            "total_delegations_extracted": total_delegations,
-            "enrichments": [
-                "Full delegation results (not truncated)",
-                "User context before delegation",
-                "Assistant synthesis after delegation",
-                "Agent sequence information (previous/next)",
-                "Sequence numbers within session"
-            ]
-        }
-    )
+    delegations = analyze_enriched_session(messages)
 
-    output = {
-        **metadata,
-        "sessions": enriched_sessions
+    if not delegations:
+        return None
+    return {
+        "session_id": session_id,
+        "first_timestamp": first_timestamp,
+        "message_count": len(messages),
+        "delegation_count": len(delegations),
+        "delegations": delegations
     }
 
-    with open(ENRICHED_SESSIONS_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
+def enrich_sessions(sessions):
+    """Yield enriched September 2025 sessions with delegations, one at a time.
+
+    Args:
+        sessions: (session_id, messages) pairs, as yielded by stream_sessions()
+    """
+    for session_id, messages in sessions:
+        session = enrich_session(session_id, messages)
+        if session is not None:
+            yield session
+
+class EnrichedDataWriter:
+    """Enrich scanned sessions one at a time into the enriched outputs.
+
+    Each session is enriched, written to every output and dropped before the
+    next one, so memory grows with the largest session plus the packed
+    columns of the delegation table and session frame. Totals go into the
+    metadata in finish(); close() without finish() keeps the previous files.
+
+    Usage:
+        with EnrichedDataWriter() as writer:
+            for session_id, messages in stream_sessions(...):
+                writer.add_session(session_id, messages)
+            writer.finish()
+    """
+
+    def __init__(self):
+        # Columnar copies for vectorized aggregation (see DataRepository.load_delegation_table)
+        # and for downstream stages (see tools/common/session_frame.py)
+        self.table = DelegationTableBuilder()
+        self.frame = SessionFrameWriter()
+        self.texts = TextBlobWriter(TEXT_BLOBS_FILE)
+        self.output = SessionsFileWriter(ENRICHED_SESSIONS_FILE, ENRICHED_SESSIONS_INDEX_FILE)
+        self.sessions_scanned = 0
+        self.matched_sessions = 0
+        self.total_delegations = 0
+        self.finished = False
+
+    def add_session(self, session_id, messages):
+        """Enrich one scanned session and write it if it matches."""
+        self.sessions_scanned += 1
+        session = enrich_session(session_id, messages)
+        if session is None:
+            return
+
+        self.table.add_session(session)
+
+        # Heavy text goes to the blob store; delegations keep 'text_refs'
+        for delegation in session["delegations"]:
+            self.texts.externalize(delegation)
+
+        # Written session by session so the sidecar index can record byte ranges
+        self.output.write(session)
+        self.frame.add_session(session)
+        self.matched_sessions += 1
+        self.total_delegations += session["delegation_count"]
+
+    def finish(self):
+        """Write the metadata and replace every enriched output.
+
+        Returns:
+            The metadata written to ENRICHED_SESSIONS_FILE
+        """
+        # Swap in the blobs before the sessions file, so the new text_refs
+        # are never published ahead of the file they point into
+        self.texts.close()
+
+        # Create versioned output with schema metadata
+        metadata = SchemaValidator.create_metadata(
+            generator_name="extract_enriched_data.py",
+            schema_type="enriched_sessions",
+            additional_metadata={
+                "extraction_version": "enriched_v2",
+                "text_store": TEXT_BLOBS_FILE.name,
+                "total_sessions_scanned": self.sessions_scanned,
+                "matched_sessions": self.matched_sessions,
+                "total_delegations_extracted": self.total_delegations,
+                "enrichments": [
+                    "Full delegation results (not truncated)",
+                    "User context before delegation",
+                    "Assistant synthesis after delegation",
+                    "Agent sequence information (previous/next)",
+                    "Sequence numbers within session"
+                ]
+            }
+        )
+        self.output.finish(metadata)
+        self.output.close()
+        self.finished = True
+
+        self.table.build().save(DELEGATION_TABLE_FILE)
+
+        # Written after the JSON so the frame records the final file's size and mtime
+        self.frame.write(ENRICHED_SESSIONS_FRAME_FILE, metadata, source=ENRICHED_SESSIONS_FILE)
+        count_records(records_out=self.matched_sessions)
+
+        print(f"\n=== ENRICHED EXTRACTION COMPLETE ===", flush=True)
+        print(f"Sessions scanned: {self.sessions_scanned}", flush=True)
+        print(f"Sessions matched: {self.matched_sessions}", flush=True)
+        print(f"Delegations extracted: {self.total_delegations}", flush=True)
+        print(f"Output: {ENRICHED_SESSIONS_FILE}", flush=True)
+        print(f"Session index: {ENRICHED_SESSIONS_INDEX_FILE}", flush=True)
+        print(f"Session frame: {ENRICHED_SESSIONS_FRAME_FILE}", flush=True)
+        print(f"Delegation table: {DELEGATION_TABLE_FILE}", flush=True)
+        print(f"Text blobs: {TEXT_BLOBS_FILE}", flush=True)
+        print(f"\nEnrichments:", flush=True)
+        for e in metadata["enrichments"]:
+            print(f"  - {e}", flush=True)
+        return metadata
+
+    def close(self):
+        """Drop partial outputs unless finish() ran."""
+        if not self.finished:
+            self.texts.discard()
+        self.output.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_enriched_data(sessions):
+    """Enrich September 2025 sessions and write the enriched outputs.
 
-    print(f"\n=== ENRICHED EXTRACTION COMPLETE ===", flush=True)
-    print(f"Sessions matched: {len(enriched_sessions)}", flush=True)
-    print(f"Delegations extracted: {total_delegations}", flush=True)
-    print(f"Output: {ENRICHED_SESSIONS_FILE}", flush=True)
-    print(f"\nEnrichments:", flush=True)
-    for e in output["enrichments"]:
-        print(f"  - {e}", flush=True)
+    Args:
+        sessions: (session_id, messages) pairs, as yielded by stream_sessions()
+    """
+    with EnrichedDataWriter() as writer:
+        for session_id, messages in sessions:
+            writer.add_session(session_id, messages)
+        writer.finish()
+
+def main():
+    print("Scanning all Claude projects...", flush=True)
+    write_enriched_data(extract_all_sessions())
 
 if __name__ == "__main__":
     import sys
@@ -256,7 +323,6 @@ if __name__ == "__main__":
             original_main = main
 
             def no_cache_main():
-                import file_scan_cache
                 # Monkey patch to disable cache
                 original_extract = extract_all_sessions
 
@@ -275,8 +341,7 @@ if __name__ == "__main__":
             sys.exit(0)
 
         elif sys.argv[1] == "--cache-info":
-            from file_scan_cache import get_cache_info
-            info = get_cache_info()
+            info = get_cache_info(prefilter=True)
             print("=== Cache Information ===", flush=True)
             for key, value in info.items():
                 print(f"{key}: {value}", flush=True)
@@ -4,12 +4,18 @@ Extract routing patterns from enriched sessions data.
 Segments by period and analyzes agent→sub-agent transitions.
 """
 
-import json
 from datetime import datetime
 from collections import defaultdict, Counter
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from tools.common.config import get_runtime_config, ENRICHED_SESSIONS_FILE, ROUTING_PATTERNS_FILE
+from tools.common import codec
+from tools.common.config import (
+    get_runtime_config, ENRICHED_SESSIONS_FILE, ENRICHED_SESSIONS_FRAME_FILE, ROUTING_PATTERNS_FILE
+)
+from tools.common.period_index import PeriodIndex
+from tools.common.session_frame import open_session_frame
+from tools.common.text_store import open_text_store, resolve_texts
+from tools.pipeline.run_profile import count_records
 
 def parse_timestamp(ts_str: str) -> datetime:
     """Parse ISO timestamp."""
@@ -18,6 +24,8 @@ def parse_timestamp(ts_str: str) -> datetime:
 def get_period(timestamp: str, periods_dict: Dict[str, Dict]) -> str:
     """Determine which period a timestamp belongs to.
 
+    Builds a PeriodIndex for one lookup; loops should build the index once.
+
     Args:
         timestamp: ISO timestamp string
         periods_dict: Period definitions from RuntimeConfig
@@ -25,25 +33,48 @@ def get_period(timestamp: str, periods_dict: Dict[str, Dict]) -> str:
     Returns:
         Period ID or None if outside all periods
     """
-    dt = parse_timestamp(timestamp)
-    date_only = dt.date()
+    return PeriodIndex(periods_dict).classify(timestamp)
+
+# Delegation fields extract_routing_patterns() reads
+ROUTING_FIELDS = (
+    'agent_type', 'prompt', 'text_refs', 'description', 'success', 'next_agent', 'sequence_number', 'timestamp'
+)
 
-    for period_id, period_meta in periods_dict.items():
-        start_date = datetime.fromisoformat(period_meta['start']).date()
-        end_date = datetime.fromisoformat(period_meta['end']).date()
-        if start_date <= date_only <= end_date:
-            return period_id
-    return None
+def iter_frame_sessions(frame, period_index: PeriodIndex):
+    """Sessions of a mapped session frame that fall in a period.
+
+    Sessions outside every period are skipped before their delegations are built.
+    """
+    first_timestamps = frame.sessions.values('first_timestamp')
+    rows = [row for row, timestamp in enumerate(first_timestamps) if period_index.classify(timestamp)]
+    return frame.iter_sessions(
+        rows, fields=('session_id', 'first_timestamp', 'delegations'), delegation_fields=ROUTING_FIELDS
+    )
 
-def extract_routing_patterns(data_path: str):
-    """Extract routing patterns by period."""
+def extract_routing_patterns(data_path: str, data: Optional[Dict] = None, text_store=None):
+    """Extract routing patterns by period.
 
-    with open(data_path, 'r') as f:
-        data = json.load(f)
+    Args:
+        data_path: Enriched sessions file
+        data: Already parsed document (skips reading data_path)
+        text_store: Blob store for data's text references
+    """
 
     # Get periods from runtime config
     runtime_config = get_runtime_config()
     periods_dict = runtime_config.get_periods()
+    period_index = PeriodIndex(periods_dict)
+
+    # Without a document, map the session frame when it mirrors data_path
+    frame = open_session_frame(ENRICHED_SESSIONS_FRAME_FILE, data_path) if data is None else None
+    if frame is not None:
+        sessions, scanned = iter_frame_sessions(frame, period_index), len(frame)
+        text_store = open_text_store(data_path, frame.metadata)
+    else:
+        if data is None:
+            data = codec.load_file(data_path)
+            text_store = open_text_store(data_path, data)
+        sessions, scanned = data['sessions'], len(data['sessions'])
 
     # Structure to hold routing info by period
     routing_by_period = {
@@ -57,8 +88,8 @@ def extract_routing_patterns(data_path: str):
     }
 
     # Process each session
-    for session in data['sessions']:
-        session_period = get_period(session['first_timestamp'], periods_dict)
+    for session in sessions:
+        session_period = period_index.classify(session['first_timestamp'])
         if not session_period:
             continue
         
@@ -67,6 +98,8 @@ def extract_routing_patterns(data_path: str):
         # Process delegations in sequence
         for i, delegation in enumerate(session['delegations']):
             agent = delegation['agent_type']
+            # Only the prompt is needed from the text blob store
+            resolve_texts(delegation, text_store, fields=('prompt',))
             
             # Store full delegation context
             delegation_info = {
@@ -96,7 +129,11 @@ def extract_routing_patterns(data_path: str):
             if delegation.get('next_agent'):
                 transition = (agent, delegation['next_agent'])
                 period_data['transitions'].append(transition)
-    
+
+    count_records(
+        records_in=scanned,
+        records_out=sum(len(period['delegations']) for period in routing_by_period.values())
+    )
     return routing_by_period
 
 def analyze_agent_usage(routing_data: Dict) -> Dict:
@@ -132,9 +169,17 @@ def analyze_agent_usage(routing_data: Dict) -> Dict:
     
     return analysis
 
-def main():
+def main(repository=None):
     print("Extracting routing patterns...")
-    routing_data = extract_routing_patterns(str(ENRICHED_SESSIONS_FILE))
+    if repository is None:
+        routing_data = extract_routing_patterns(str(ENRICHED_SESSIONS_FILE))
+    else:
+        # In-process pipeline run: reuse the document other stages parsed
+        routing_data = extract_routing_patterns(
+            str(ENRICHED_SESSIONS_FILE),
+            data=repository.load_document('enriched_sessions'),
+            text_store=repository.get_text_store()
+        )
 
     print("Analyzing agent usage...")
     analysis = analyze_agent_usage(routing_data)
@@ -157,8 +202,7 @@ def main():
         }
     }
 
-    with open(ROUTING_PATTERNS_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
+    codec.dump_file(output, ROUTING_PATTERNS_FILE)
 
     print(f"\nRouting patterns extracted to: {ROUTING_PATTERNS_FILE}")
 
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Fused extraction: scan every JSONL file once and write all projections.
+
+extract_all_sessions.py and extract_enriched_data.py each scanned the
+conversation files on their own. This script scans once and streams each
+session to every registered projection:
+
+    sessions  -> SESSIONS_DATA_FILE (project/date filtered or CSV matched)
+    enriched  -> ENRICHED_SESSIONS_FILE, its index, delegation table and text blobs
+
+Each projection keeps the filtering of its standalone script:
+
+    sessions  runtime project/date filters, always (without a start date:
+              messages since DEFAULT_ANALYSIS_START); applied by the
+              projection itself
+    enriched  none; every scanned session is enriched
+
+Projections registered with filtered=True apply the runtime filters
+themselves. The filters are pushed down into the scan, so folders and files
+that cannot match are never read, only when every selected projection is
+one of them (e.g. --only sessions).
+
+Sessions come from stream_sessions() one at a time and are dropped once all
+projections have seen them, so the scan is never held as a whole. A
+projection is built per run by a factory(runtime_config) and provides:
+
+    add_session(session_id, messages)  # called once per scanned session
+    finish()                           # all sessions seen: write outputs
+    close()                            # always called; discard if unfinished
+
+It must not modify the message lists or dicts, since later projections read
+the same objects.
+
+Usage:
+    python extract_sessions.py                      # all projections
+    python extract_sessions.py --only enriched      # a subset
+    python extract_sessions.py --no-cache
+"""
+import argparse
+import contextlib
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from tools.common.config import get_runtime_config
+from tools.pipeline.file_scan_cache import stream_sessions
+from tools.pipeline.extract_all_sessions import resolve_projects_dir, SessionsDataWriter
+from tools.pipeline.extract_enriched_data import EnrichedDataWriter
+from tools.pipeline.run_profile import count_records
+
+# factory(runtime_config) -> object with add_session(), finish() and close()
+ProjectionFactory = Callable[[object], object]
+
+# Registered projections, run in registration order
+PROJECTIONS: Dict[str, ProjectionFactory] = {}
+
+# Projections applying the runtime project/date filters themselves
+FILTERED_PROJECTIONS: Set[str] = set()
+
+def register_projection(name: str, factory: ProjectionFactory, filtered: bool = False) -> None:
+    """
+    Register an output written from the shared scan.
+
+    Args:
+        name: Unique identifier for the projection
+        factory: callable(runtime_config) returning a projection for one run
+        filtered: The projection drops messages outside the runtime
+            project/date filters itself, so the scan may skip them
+
+    Example:
+        register_projection('custom', lambda config: CustomWriter(config))
+    """
+    if name in PROJECTIONS:
+        print(f"Warning: Overwriting existing projection '{name}'", flush=True)
+    PROJECTIONS[name] = factory
+    if filtered:
+        FILTERED_PROJECTIONS.add(name)
+    else:
+        FILTERED_PROJECTIONS.discard(name)
+
+def enriched_projection(runtime_config):
+    """ENRICHED_SESSIONS_FILE and its companion files (runtime filters do not apply)."""
+    return EnrichedDataWriter()
+
+# SESSIONS_DATA_FILE (CSV matched unless project/date filters are set)
+register_projection('sessions', SessionsDataWriter, filtered=True)
+register_projection('enriched', enriched_projection)
+
+def run_projections(
+    sessions: Iterable[Tuple[str, List[Dict]]],
+    runtime_config,
+    names: Optional[List[str]] = None
+) -> int:
+    """
+    Feed one pass over the scanned sessions to several projections.
+
+    Args:
+        sessions: (session_id, messages) pairs, narrowed to the runtime
+            project/date filters only if every projection is filtered
+            (see run())
+        runtime_config: RuntimeConfig passed to each projection factory
+        names: Projections to run (default: all, in registration order)
+
+    Returns:
+        Number of sessions scanned
+
+    Raises:
+        KeyError: If a name is not registered
+    """
+    names = names or list(PROJECTIONS)
+    for name in names:
+        if name not in PROJECTIONS:
+            raise KeyError(f"Projection '{name}' not found. Available: {list(PROJECTIONS)}")
+
+    scanned = 0
+    with contextlib.ExitStack() as stack:
+        projections = []
+        for name in names:
+            projection = PROJECTIONS[name](runtime_config)
+            stack.callback(projection.close)
+            projections.append((name, projection))
+
+        for session_id, messages in sessions:
+            for _, projection in projections:
+                projection.add_session(session_id, messages)
+            scanned += 1
+        print(f"Found {scanned} total sessions", flush=True)
+
+        for name, projection in projections:
+            print(f"\n--- Projection: {name} ---", flush=True)
+            projection.finish()
+    return scanned
+
+def run(repository=None, use_cache: bool = True, names: Optional[List[str]] = None) -> None:
+    """
+    Scan once and write the projections (pipeline EXTRACTION stage entry point).
+
+    Args:
+        repository: DataRepository shared by in-process pipeline stages;
+            outputs are written to disk, so it is not read here
+        use_cache: Reuse the per-file scan cache
+        names: Projections to run (default: all)
+    """
+    runtime_config = get_runtime_config()
+    projects_dir = resolve_projects_dir(runtime_config)
+
+    # Folders and files that cannot match are skipped unread only if no
+    # selected projection needs them
+    pushdown = all(name in FILTERED_PROJECTIONS for name in names or PROJECTIONS)
+    print("Scanning all Claude projects...", flush=True)
+    sessions = stream_sessions(
+        projects_dir,
+        use_cache=use_cache,
+        workers=runtime_config.scan_workers,
+        runtime_config=runtime_config if pushdown else None,
+        prefilter=True
+    )
+    scanned = run_projections(sessions, runtime_config, names)
+    count_records(records_in=scanned)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan conversations once and write all extraction outputs")
+    parser.add_argument('--only', action='append', choices=list(PROJECTIONS),
+                        help='Run only this projection (repeatable)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore the per-file scan cache')
+    args = parser.parse_args()
+
+    run(use_cache=not args.no_cache, names=args.only)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
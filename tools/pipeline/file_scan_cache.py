@@ -1,175 +1,675 @@
 #!/usr/bin/env python3
 """File scanning cache to avoid redundant file system scans.
 
-This module provides a caching layer for file scanning operations.
-It caches:
-1. File modification times (mtime) to detect changes
-2. Parsed session data to avoid re-reading unchanged files
-
-Cache invalidation:
-- Cache is invalidated if any file's mtime changes
-- Cache is invalidated if new files are added
+This module provides a per-file caching layer for file scanning operations.
+For every .jsonl file under the projects directory it caches:
+1. File size and modification time (mtime) to detect changes
+2. Parsed messages of that file to avoid re-reading it
+3. Byte offset consumed so far plus a checksum of the last consumed line
+4. Earliest and latest message timestamp (for date-filtered runs)
+
+Cache invalidation (per file, keyed by relative path):
+- Claude Code only appends to session files, so a file that grew is
+  resumed from its stored offset and only the appended tail is parsed
+- A file is re-parsed in full if it was truncated or its last consumed
+  line no longer matches (rewritten)
+- New files are parsed and added
+- Entries for deleted files are dropped
 - Cache can be manually cleared
 
 Performance impact:
 - First run (cold cache): Same as no cache
-- Subsequent runs (warm cache): 3-5x faster
+- Subsequent runs (warm cache): only new/changed files are parsed, so a
+  tree of thousands of frozen sessions with a few live ones rescans in
+  well under a second
 
 Optimization:
 - Uses pickle protocol 5 for fastest serialization
 - No compression (CPU overhead not worth it for SSD I/O)
+- One cache file per source root (backup and live trees never collide)
+- Files that need reading can be sharded across a process pool
+- Optional byte-level pre-filter only decodes Task calls and their results
+  (pre-filtered entries live in a separate "_light" cache file)
+- stream_sessions() yields one session at a time and releases each file's
+  messages once all of its sessions have been consumed
+
+Predicate pushdown (scan_sessions() with a RuntimeConfig):
+- Project folders that cannot match the project filter are never listed
+- Files are skipped unread when all their messages fall outside the date
+  range: from the cached timestamp span, the file's mtime (before the
+  start date) or its first timestamp (after the end date)
+- Skipped files keep their cache entries for later unfiltered runs
 """
-import json
+import hashlib
+import multiprocessing
+import os
 import pickle
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Any, Tuple
+from datetime import datetime, timezone
 
+from tools.common import codec
 from tools.common.config import DATA_DIR
+from tools.pipeline import jsonl_prefilter
 
 # Cache file locations
 CACHE_DIR = DATA_DIR / ".cache"
-METADATA_CACHE_FILE = CACHE_DIR / "file_metadata.json"
-SESSIONS_CACHE_FILE = CACHE_DIR / "sessions_data.pkl"
+
+# Bump when the per-file entry layout changes (older caches are discarded)
+CACHE_VERSION = 4
+
+# Lines read looking for a file's first timestamp
+FIRST_TIMESTAMP_LINES = 16
+
+# Scan workers never fork: the in-process pipeline calls scan_sessions()
+# from a stage thread while other stages run, and a forked child can
+# inherit a lock held by one of those threads and deadlock on it.
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
 
 def ensure_cache_dir():
     """Create cache directory if it doesn't exist."""
-    CACHE_DIR.mkdir(exist_ok=True)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+def get_cache_file(projects_dir: Path, prefilter: bool = False) -> Path:
+    """Cache file for a given source root.
+
+    Args:
+        projects_dir: Root directory being scanned
+        prefilter: Whether entries hold pre-filtered (light) messages
+
+    Returns:
+        Path of the pickle holding per-file entries for that root
+    """
+    digest = hashlib.sha1(str(Path(projects_dir).resolve()).encode()).hexdigest()[:12]
+    suffix = "_light" if prefilter else ""
+    return CACHE_DIR / f"file_sessions_{digest}{suffix}.pkl"
 
-def get_file_metadata(projects_dir: Path) -> Dict[str, float]:
-    """Get metadata (mtime) for all .jsonl files.
+def get_file_metadata(projects_dir: Path, runtime_config=None) -> Dict[str, Dict[str, float]]:
+    """Get metadata (size, mtime) for all .jsonl files.
 
     Args:
         projects_dir: Path to ~/.claude/projects/
+        runtime_config: Optional RuntimeConfig; folders failing its
+            matches_project_dir() are not listed
 
     Returns:
-        Dict mapping file path to mtime timestamp
+        Dict mapping relative file path to {'size': ..., 'mtime': ...}
     """
     metadata = {}
 
     for project_dir in projects_dir.iterdir():
         if not project_dir.is_dir():
             continue
+        if runtime_config is not None and not runtime_config.matches_project_dir(project_dir.name):
+            continue
 
         for jsonl_file in project_dir.glob("*.jsonl"):
             # Use relative path from projects_dir for consistency
             rel_path = str(jsonl_file.relative_to(projects_dir))
-            metadata[rel_path] = jsonl_file.stat().st_mtime
+            stat = jsonl_file.stat()
+            metadata[rel_path] = {"size": stat.st_size, "mtime": stat.st_mtime}
 
     return metadata
 
-def load_metadata_cache() -> Dict[str, float] | None:
-    """Load cached file metadata.
+def load_file_cache(projects_dir: Path, prefilter: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Load cached per-file entries for a source root.
 
     Returns:
-        Dict of file path to mtime, or None if cache doesn't exist
+        Dict of relative path to entry ({'size', 'mtime', 'messages'}),
+        empty if the cache is missing, unreadable or from another version
     """
-    if not METADATA_CACHE_FILE.exists():
-        return None
+    cache_file = get_cache_file(projects_dir, prefilter)
+    if not cache_file.exists():
+        return {}
 
     try:
-        with open(METADATA_CACHE_FILE) as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return None
+        with open(cache_file, 'rb') as f:
+            payload = pickle.load(f)
+    except (pickle.PickleError, EOFError, OSError):
+        return {}
+
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+        return {}
+
+    return payload.get("files", {})
 
-def save_metadata_cache(metadata: Dict[str, float]):
-    """Save file metadata to cache."""
+def save_file_cache(projects_dir: Path, entries: Dict[str, Dict[str, Any]], prefilter: bool = False):
+    """Save per-file entries using pickle protocol 5."""
     ensure_cache_dir()
-    with open(METADATA_CACHE_FILE, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    payload = {
+        "version": CACHE_VERSION,
+        "root": str(projects_dir),
+        "saved_at": datetime.now().isoformat(),
+        "files": entries,
+    }
+    cache_file = get_cache_file(projects_dir, prefilter)
+    tmp_file = cache_file.with_suffix(".tmp")
+    with open(tmp_file, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_file.replace(cache_file)
+
+def is_entry_fresh(entry: Dict[str, Any] | None, meta: Dict[str, float]) -> bool:
+    """Check whether a cached file entry still matches the file on disk."""
+    return (
+        entry is not None and
+        entry.get("size") == meta["size"] and
+        entry.get("mtime") == meta["mtime"]
+    )
+
+def _line_checksum(raw_line: bytes) -> str:
+    """Short checksum identifying a line (used to detect rewrites)."""
+    return hashlib.blake2b(raw_line, digest_size=8).hexdigest()
+
+def read_jsonl_from(
+    path: Path,
+    start: int = 0,
+    prefilter: bool = False,
+    pending_ids: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """Parse complete lines of a conversation file from a byte offset.
+
+    A trailing line without newline is only consumed if it already decodes
+    (the writer may still be appending to it); otherwise it is left for
+    the next read.
+
+    With prefilter=True only Task tool_use lines and the tool_result lines
+    answering them are JSON-decoded; every other line becomes a light
+    record (see jsonl_prefilter) that can be decoded later on demand.
 
-def load_sessions_cache() -> Dict[str, List[Dict]] | None:
-    """Load cached session data from pickle.
+    Args:
+        path: JSONL file
+        start: Byte offset to resume from (0 for a full read)
+        prefilter: Skip decoding lines irrelevant to delegation extraction
+        pending_ids: Task ids still awaiting a result (when resuming)
 
     Returns:
-        Dict of session_id to messages, or None if cache doesn't exist
+        Dict with 'messages' (those carrying a sessionId), 'offset' (bytes
+        consumed), 'tail_start' and 'tail_checksum' of the last consumed
+        line, 'pending_ids' (Task ids without a result yet) and the
+        'min_timestamp' / 'max_timestamp' of the messages (None if none)
     """
-    if not SESSIONS_CACHE_FILE.exists():
-        return None
+    messages = []
+    offset = start
+    tail_start = None
+    tail_checksum = None
+    min_timestamp = max_timestamp = None
+    pending = jsonl_prefilter.pending_from(pending_ids)
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        for raw_line in f:
+            complete = raw_line.endswith(b"\n")
+            msg = None
+            if prefilter and complete and not jsonl_prefilter.needs_decode(raw_line, pending):
+                if jsonl_prefilter.has_session_id(raw_line):
+                    msg = jsonl_prefilter.light_record(raw_line, path, offset)
+                    if msg is None:
+                        msg = _decode_line(raw_line)
+            elif raw_line.strip():
+                try:
+                    msg = codec.loads(raw_line)
+                except codec.JSONDecodeError:
+                    if not complete:
+                        break
+                if prefilter and isinstance(msg, dict):
+                    jsonl_prefilter.track_task_ids(msg, pending)
+            if msg is not None and msg.get("sessionId"):
+                messages.append(msg)
+                timestamp = msg.get("timestamp")
+                if timestamp and isinstance(timestamp, str):
+                    if min_timestamp is None or timestamp < min_timestamp:
+                        min_timestamp = timestamp
+                    if max_timestamp is None or timestamp > max_timestamp:
+                        max_timestamp = timestamp
+            tail_start = offset
+            tail_checksum = _line_checksum(raw_line)
+            offset += len(raw_line)
+
+    return {
+        "messages": messages,
+        "offset": offset,
+        "tail_start": tail_start,
+        "tail_checksum": tail_checksum,
+        "pending_ids": sorted(tool_id.decode("utf-8") for tool_id in pending),
+        "min_timestamp": min_timestamp,
+        "max_timestamp": max_timestamp,
+    }
 
+def _decode_line(raw_line: bytes) -> Dict[str, Any] | None:
+    """Decode a complete line, ignoring malformed JSON."""
     try:
-        with open(SESSIONS_CACHE_FILE, 'rb') as f:
-            return pickle.load(f)
-    except (pickle.PickleError, OSError):
+        return codec.loads(raw_line)
+    except codec.JSONDecodeError:
         return None
 
-def save_sessions_cache(sessions: Dict[str, List[Dict]]):
-    """Save session data to cache using pickle protocol 5."""
-    ensure_cache_dir()
-    with open(SESSIONS_CACHE_FILE, 'wb') as f:
-        pickle.dump(sessions, f, protocol=pickle.HIGHEST_PROTOCOL)
+def parse_jsonl_file(path: Path) -> List[Dict]:
+    """Parse every message carrying a sessionId from a conversation file."""
+    return read_jsonl_from(path)["messages"]
+
+def can_resume(path: Path, entry: Dict[str, Any] | None, meta: Dict[str, float]) -> bool:
+    """Check whether a cached entry can be extended by reading only the tail.
+
+    Conversation files are append-only, so a file that is at least as long
+    as the consumed offset and still ends the consumed region with the same
+    line is assumed to have grown in place. Truncated or rewritten files
+    fail this check and must be re-read in full.
+    """
+    if entry is None or entry.get("offset") is None:
+        return False
+    if meta["size"] < entry["offset"]:
+        return False
+    if entry.get("tail_start") is None:
+        return entry["offset"] == 0
+
+    with open(path, 'rb') as f:
+        f.seek(entry["tail_start"])
+        raw_line = f.read(entry["offset"] - entry["tail_start"])
+    return _line_checksum(raw_line) == entry["tail_checksum"]
+
+def plan_refresh(
+    path: Path,
+    entry: Dict[str, Any] | None,
+    meta: Dict[str, float]
+) -> Tuple[str, int]:
+    """Decide how a file must be read to bring its cache entry up to date.
+
+    Returns:
+        (mode, start_offset) where mode is 'cached', 'tail' or 'full'
+    """
+    if is_entry_fresh(entry, meta):
+        return "cached", 0
+    if can_resume(path, entry, meta):
+        return "tail", entry["offset"]
+    return "full", 0
+
+def apply_read(
+    entry: Dict[str, Any] | None,
+    meta: Dict[str, float],
+    mode: str,
+    result: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Combine a read result with the previous cache entry."""
+    if mode == "tail":
+        return {
+            **meta,
+            "messages": entry["messages"] + result["messages"],
+            "offset": result["offset"],
+            "tail_start": result["tail_start"] if result["tail_start"] is not None else entry["tail_start"],
+            "tail_checksum": result["tail_checksum"] or entry["tail_checksum"],
+            "pending_ids": result["pending_ids"],
+            "min_timestamp": min(_present(entry.get("min_timestamp"), result["min_timestamp"]), default=None),
+            "max_timestamp": max(_present(entry.get("max_timestamp"), result["max_timestamp"]), default=None),
+        }
+    return {**meta, **result}
+
+def _present(*values: str | None) -> List[str]:
+    return [value for value in values if value is not None]
+
+def _resume_ids(entry: Dict[str, Any] | None, mode: str) -> List[str]:
+    """Task ids still awaiting a result when resuming a file's tail."""
+    if mode != "tail":
+        return []
+    return entry.get("pending_ids", [])
+
+def refresh_entry(
+    path: Path,
+    entry: Dict[str, Any] | None,
+    meta: Dict[str, float],
+    prefilter: bool = False
+) -> Tuple[Dict[str, Any], str]:
+    """Bring a cached file entry up to date with the file on disk.
+
+    Returns:
+        (entry, mode) where mode is 'cached', 'tail' or 'full'
+    """
+    mode, start = plan_refresh(path, entry, meta)
+    if mode == "cached":
+        return entry, mode
+    result = read_jsonl_from(path, start, prefilter, _resume_ids(entry, mode))
+    return apply_read(entry, meta, mode, result), mode
+
+def read_first_timestamp(path: Path) -> str | None:
+    """Timestamp of the first timestamped message among a file's first lines."""
+    with open(path, 'rb') as f:
+        for _, raw_line in zip(range(FIRST_TIMESTAMP_LINES), f):
+            msg = _decode_line(raw_line) if raw_line.strip() else None
+            if isinstance(msg, dict) and msg.get("timestamp") and isinstance(msg["timestamp"], str):
+                return msg["timestamp"]
+    return None
+
+def outside_date_range(
+    path: Path,
+    entry: Dict[str, Any] | None,
+    meta: Dict[str, float],
+    runtime_config
+) -> bool:
+    """Check, without parsing the file, that no message is in the date range.
+
+    A fresh cache entry answers from its timestamp span. Otherwise no message
+    is later than the file's last write (mtime), and since files are
+    append-only none is earlier than its first timestamp.
+    """
+    try:
+        if is_entry_fresh(entry, meta):
+            if entry.get("min_timestamp") is None:
+                return False
+            return not runtime_config.overlaps_date_range(entry["min_timestamp"], entry["max_timestamp"])
+
+        modified = datetime.fromtimestamp(meta["mtime"], timezone.utc).date().isoformat()
+        if not runtime_config.overlaps_date_range(None, modified):
+            return True
+
+        if runtime_config.end_date:
+            first = read_first_timestamp(path)
+            return first is not None and not runtime_config.overlaps_date_range(first, None)
+    except (OSError, ValueError):
+        pass
+    return False
+
+def filter_messages(messages: List[Dict], runtime_config) -> List[Dict]:
+    """Keep messages matching the runtime project and date filters."""
+    kept = []
+    for msg in messages:
+        # Apply project filter
+        if not runtime_config.matches_project(msg.get("cwd", "")):
+            continue
+
+        # Apply date filter
+        timestamp = msg.get("timestamp", "")
+        if timestamp and not runtime_config.matches_date_range(timestamp):
+            continue
+
+        kept.append(msg)
+    return kept
+
+def filter_sessions(all_sessions: Dict[str, List[Dict]], runtime_config) -> Dict[str, List[Dict]]:
+    """Apply filter_messages() per session, dropping sessions left empty."""
+    return {
+        session_id: kept
+        for session_id, messages in all_sessions.items()
+        if (kept := filter_messages(messages, runtime_config))
+    }
+
+def _read_task(task: Tuple[Path, int, bool, List[str], Any]) -> Dict[str, Any]:
+    """Worker entry point: read one file and optionally filter its messages."""
+    path, start, prefilter, pending_ids, runtime_config = task
+    result = read_jsonl_from(path, start, prefilter, pending_ids)
+    if runtime_config is not None:
+        result["messages"] = filter_messages(result["messages"], runtime_config)
+    return result
+
+def resolve_workers(workers: int | None) -> int:
+    """Number of scan processes to use (0 or None means one per CPU)."""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+def run_read_tasks(tasks: List[Tuple[Path, int, bool, List[str], Any]], workers: int = 1) -> List[Dict[str, Any]]:
+    """Read files serially or sharded across a process pool.
+
+    Results are returned in task order, so merging stays deterministic
+    regardless of which worker finished first. Workers are started with
+    POOL_START_METHOD, so this is safe to call from any thread.
+    """
+    if workers <= 1 or len(tasks) < 2:
+        return [_read_task(task) for task in tasks]
+
+    # Several chunks per worker keeps the pool busy when file sizes vary
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        mp_context=multiprocessing.get_context(POOL_START_METHOD)
+    ) as pool:
+        return list(pool.map(_read_task, tasks, chunksize=chunksize))
+
+def merge_sessions(entries: Dict[str, Dict[str, Any]]) -> Dict[str, List[Dict]]:
+    """Group cached messages by session id.
+
+    Files are merged in sorted path order so the result is deterministic.
+    """
+    all_sessions: Dict[str, List[Dict]] = {}
+    for rel_path in sorted(entries):
+        for msg in entries[rel_path]["messages"]:
+            all_sessions.setdefault(msg["sessionId"], []).append(msg)
+    return all_sessions
+
+def iter_sessions(entries: Dict[str, Dict[str, Any]]) -> Iterator[Tuple[str, List[Dict]]]:
+    """Yield (session_id, messages) pairs in merge_sessions() order.
+
+    Entries are consumed: a file's messages are taken out of `entries` when
+    its first session is yielded and released once all of its sessions are
+    out, so only files with sessions still pending stay in memory. A
+    session spread over several files is yielded once, with the messages
+    of every file in sorted path order.
+    """
+    paths = sorted(entries)
+    holders: Dict[str, List[str]] = {}
+    for rel_path in paths:
+        for msg in entries[rel_path]["messages"]:
+            files = holders.setdefault(msg["sessionId"], [])
+            if not files or files[-1] != rel_path:
+                files.append(rel_path)
+
+    # rel_path -> session_id -> messages, for files taken out of entries
+    groups: Dict[str, Dict[str, List[Dict]]] = {}
+
+    def grouped(rel_path: str) -> Dict[str, List[Dict]]:
+        if rel_path not in groups:
+            by_session: Dict[str, List[Dict]] = {}
+            for msg in entries.pop(rel_path)["messages"]:
+                by_session.setdefault(msg["sessionId"], []).append(msg)
+            groups[rel_path] = by_session
+        return groups[rel_path]
+
+    for rel_path in paths:
+        if rel_path not in entries and rel_path not in groups:
+            continue  # Every session of this file was yielded from an earlier one
+        for session_id in list(grouped(rel_path)):
+            messages = []
+            for holder in holders.pop(session_id):
+                by_session = grouped(holder)
+                messages.extend(by_session.pop(session_id))
+                if not by_session:
+                    del groups[holder]
+            yield session_id, messages
+
+def scan_sessions(
+    projects_dir: Path,
+    use_cache: bool = True,
+    workers: int = 1,
+    runtime_config=None,
+    prefilter: bool = False
+) -> Dict[str, List[Dict]]:
+    """Scan all session files into one session_id -> messages dict.
+
+    See stream_sessions() for the arguments; this collects its output.
+    """
+    return dict(stream_sessions(projects_dir, use_cache, workers, runtime_config, prefilter))
 
-def is_cache_valid(projects_dir: Path) -> bool:
-    """Check if cache is valid (no files changed).
+def stream_sessions(
+    projects_dir: Path,
+    use_cache: bool = True,
+    workers: int = 1,
+    runtime_config=None,
+    prefilter: bool = False
+) -> Iterator[Tuple[str, List[Dict]]]:
+    """Scan all session files, reading only what is new since the last run.
+
+    Unchanged files come from the cache, grown files are resumed from their
+    stored byte offset, and new, truncated or rewritten files are re-read.
+    Files that need reading are sharded across `workers` processes.
 
     Args:
-        projects_dir: Path to ~/.claude/projects/
+        projects_dir: Root directory containing one folder per project
+        use_cache: If True, reuse and update the per-file cache
+        workers: Number of scan processes (1 = serial, 0 = one per CPU)
+        runtime_config: Optional RuntimeConfig whose project/date filters
+            are applied to the returned messages; folders and files that
+            cannot match are skipped unread
+        prefilter: Only decode Task calls and their results; other
+            messages are light records (see jsonl_prefilter.materialize)
+
+    Yields:
+        (session_id, messages) pairs, one session at a time; scanned files
+        are released as their sessions are consumed (see iter_sessions())
+    """
+    entries = _scan_entries(projects_dir, use_cache, workers, runtime_config, prefilter)
+    sessions = iter_sessions(entries)
+    # iter_sessions() now owns the only reference and drops files as it goes
+    del entries
+
+    filtered = runtime_config is not None and use_cache
+    for session_id, messages in sessions:
+        if filtered:
+            messages = filter_messages(messages, runtime_config)
+            if not messages:
+                continue
+        yield session_id, messages
+
+def _scan_entries(
+    projects_dir: Path,
+    use_cache: bool,
+    workers: int,
+    runtime_config,
+    prefilter: bool
+) -> Dict[str, Dict[str, Any]]:
+    """Refresh the entries of every listed file and save the cache.
 
     Returns:
-        True if cache is valid and can be used
+        rel_path -> entry for the files whose messages make up the scan
     """
-    # Check if cache exists
-    if not METADATA_CACHE_FILE.exists() or not SESSIONS_CACHE_FILE.exists():
-        return False
+    current = get_file_metadata(projects_dir, runtime_config)
+    cached = load_file_cache(projects_dir, prefilter) if use_cache else {}
+
+    plans = {}
+    skipped = set()
+    for rel_path in sorted(current):
+        path, entry, meta = projects_dir / rel_path, cached.get(rel_path), current[rel_path]
+        if runtime_config is not None and outside_date_range(path, entry, meta, runtime_config):
+            skipped.add(rel_path)
+            continue
+        plans[rel_path] = plan_refresh(path, entry, meta)
+    to_read = [rel_path for rel_path, (mode, _) in plans.items() if mode != "cached"]
+
+    # The cache must hold unfiltered messages; without it, workers can drop
+    # filtered-out messages before shipping results back to the parent
+    worker_config = None if use_cache else runtime_config
+    tasks = []
+    for rel_path in to_read:
+        mode, start = plans[rel_path]
+        pending_ids = _resume_ids(cached.get(rel_path), mode)
+        tasks.append((projects_dir / rel_path, start, prefilter, pending_ids, worker_config))
+    results = dict(zip(to_read, run_read_tasks(tasks, resolve_workers(workers))))
+
+    entries = {}
+    counts = {"cached": 0, "tail": 0, "full": 0}
+    for rel_path, (mode, _) in plans.items():
+        if mode == "cached":
+            entries[rel_path] = cached[rel_path]
+        else:
+            entries[rel_path] = apply_read(cached.get(rel_path), current[rel_path], mode, results[rel_path])
+        counts[mode] += 1
+
+    # Entries of skipped files and unlisted folders stay as they were
+    untouched = {
+        rel_path: entry for rel_path, entry in cached.items()
+        if rel_path in skipped or (rel_path not in current and not _listed(rel_path, runtime_config))
+    }
+    removed = len(cached.keys() - current.keys() - untouched.keys())
 
-    # Load cached metadata
-    cached_metadata = load_metadata_cache()
-    if cached_metadata is None:
-        return False
+    if runtime_config is not None:
+        print(f"Pushdown: {len(current)} files listed, {len(skipped)} outside the date range", flush=True)
 
-    # Get current metadata
-    current_metadata = get_file_metadata(projects_dir)
+    if use_cache:
+        print(
+            f"Cache: {counts['cached']} files reused, {counts['tail']} tail-read, "
+            f"{counts['full']} fully parsed, {removed} removed",
+            flush=True
+        )
+        if counts["tail"] or counts["full"] or removed:
+            save_file_cache(projects_dir, {**untouched, **entries}, prefilter)
 
-    # Compare metadata
-    # Cache is invalid if:
-    # 1. Different number of files (files added/removed)
-    # 2. Any file's mtime changed
-    if len(cached_metadata) != len(current_metadata):
-        return False
+    return entries
+
+def _listed(rel_path: str, runtime_config) -> bool:
+    """Whether get_file_metadata() lists the folder holding rel_path."""
+    return runtime_config is None or runtime_config.matches_project_dir(Path(rel_path).parts[0])
+
+def diff_cache(projects_dir: Path, prefilter: bool = False) -> Tuple[List[str], List[str], List[str]]:
+    """Compare the cache with the files on disk.
+
+    Returns:
+        (new_or_changed, unchanged, removed) relative paths
+    """
+    current = get_file_metadata(projects_dir)
+    cached = load_file_cache(projects_dir, prefilter)
+
+    changed = sorted(p for p, meta in current.items() if not is_entry_fresh(cached.get(p), meta))
+    changed_set = set(changed)
+    unchanged = sorted(p for p in current if p not in changed_set)
+    removed = sorted(cached.keys() - current.keys())
+    return changed, unchanged, removed
+
+def is_cache_valid(projects_dir: Path, prefilter: bool = False) -> bool:
+    """Check if cache is fully valid (no files added, changed or removed).
 
-    for file_path, mtime in current_metadata.items():
-        if file_path not in cached_metadata:
-            return False
-        if cached_metadata[file_path] != mtime:
-            return False
+    Args:
+        projects_dir: Path to ~/.claude/projects/
 
-    return True
+    Returns:
+        True if every file can be served from cache
+    """
+    if not get_cache_file(projects_dir, prefilter).exists():
+        return False
+
+    changed, _, removed = diff_cache(projects_dir, prefilter)
+    return not changed and not removed
 
 def clear_cache():
     """Clear all cache files."""
-    if METADATA_CACHE_FILE.exists():
-        METADATA_CACHE_FILE.unlink()
-    if SESSIONS_CACHE_FILE.exists():
-        SESSIONS_CACHE_FILE.unlink()
+    if CACHE_DIR.exists():
+        for cache_file in CACHE_DIR.glob("file_sessions_*.pkl"):
+            cache_file.unlink()
     print("Cache cleared", flush=True)
 
-def get_cache_info() -> Dict[str, Any]:
+def get_cache_info(projects_dir: Path | None = None, prefilter: bool = False) -> Dict[str, Any]:
     """Get information about the current cache state.
 
+    Args:
+        projects_dir: Source root (defaults to ~/.claude/projects/)
+        prefilter: Inspect the pre-filtered (light) cache
+
     Returns:
         Dict with cache statistics
     """
+    if projects_dir is None:
+        from tools.common.config import PROJECTS_DIR
+        projects_dir = PROJECTS_DIR
+
+    cache_file = get_cache_file(projects_dir, prefilter)
     info = {
-        "cache_exists": METADATA_CACHE_FILE.exists() and SESSIONS_CACHE_FILE.exists(),
-        "metadata_file": str(METADATA_CACHE_FILE),
-        "sessions_file": str(SESSIONS_CACHE_FILE),
+        "cache_exists": cache_file.exists(),
+        "cache_file": str(cache_file),
+        "source_root": str(projects_dir),
     }
 
-    if METADATA_CACHE_FILE.exists():
-        stat = METADATA_CACHE_FILE.stat()
-        info["metadata_size_kb"] = stat.st_size / 1024
-        info["metadata_modified"] = datetime.fromtimestamp(stat.st_mtime).isoformat()
+    if cache_file.exists():
+        stat = cache_file.stat()
+        info["cache_size_kb"] = stat.st_size / 1024
+        info["cache_modified"] = datetime.fromtimestamp(stat.st_mtime).isoformat()
 
-    if SESSIONS_CACHE_FILE.exists():
-        stat = SESSIONS_CACHE_FILE.stat()
-        info["sessions_size_kb"] = stat.st_size / 1024
-        info["sessions_modified"] = datetime.fromtimestamp(stat.st_mtime).isoformat()
+        entries = load_file_cache(projects_dir, prefilter)
+        info["cached_files"] = len(entries)
+        info["cached_sessions"] = len({
+            msg["sessionId"] for entry in entries.values() for msg in entry["messages"]
+        })
 
-        # Load to get session count
-        sessions = load_sessions_cache()
-        if sessions:
-            info["cached_sessions"] = len(sessions)
+        if projects_dir.exists():
+            changed, unchanged, removed = diff_cache(projects_dir, prefilter)
+            info["files_unchanged"] = len(unchanged)
+            info["files_new_or_changed"] = len(changed)
+            info["files_removed"] = len(removed)
 
     return info
 
@@ -178,7 +678,7 @@ if __name__ == "__main__":
     from tools.common.config import PROJECTS_DIR
 
     print("=== Cache Information ===")
-    info = get_cache_info()
+    info = get_cache_info(PROJECTS_DIR)
     for key, value in info.items():
         print(f"{key}: {value}")
 
@@ -3,26 +3,28 @@
 Generate comprehensive routing patterns analysis report.
 """
 
-import json
+from tools.common import codec
 from tools.common.config import ROUTING_PATTERNS_FILE, ROUTING_QUALITY_FILE, GOOD_ROUTING_FILE, PROJECT_ROOT
 
-def load_all_data():
-    """Load all analysis data."""
-    with open(ROUTING_PATTERNS_FILE, 'r') as f:
-        routing = json.load(f)
+def load_all_data(repository=None):
+    """Load all analysis data (from the repository's cache when given)."""
+    if repository is not None:
+        return (
+            repository.load_document('routing_patterns'),
+            repository.load_document('routing_analysis'),
+            repository.load_document('good_patterns'),
+        )
 
-    with open(ROUTING_QUALITY_FILE, 'r') as f:
-        quality = json.load(f)
-
-    with open(GOOD_ROUTING_FILE, 'r') as f:
-        good = json.load(f)
+    routing = codec.load_file(ROUTING_PATTERNS_FILE)
+    quality = codec.load_file(ROUTING_QUALITY_FILE)
+    good = codec.load_file(GOOD_ROUTING_FILE)
 
     return routing, quality, good
 
-def generate_report():
+def generate_report(repository=None):
     """Generate comprehensive routing analysis report."""
     
-    routing, quality, good = load_all_data()
+    routing, quality, good = load_all_data(repository)
     
     report = []
     
@@ -312,8 +314,8 @@ def generate_report():
     
     return "\n".join(report)
 
-def main():
-    report_content = generate_report()
+def main(repository=None):
+    report_content = generate_report(repository)
     
     output_path = PROJECT_ROOT / 'routage-patterns-analysis.md'
     with open(output_path, 'w') as f:
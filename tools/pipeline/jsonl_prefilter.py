@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Byte-level pre-filter for conversation JSONL lines.
+
+Delegation extraction only needs the full content of two kinds of lines:
+1. Assistant messages containing a Task tool_use
+2. User messages carrying the tool_result of such a Task call
+
+Every other line only contributes ordering and counting metadata
+(sessionId, type, timestamp, cwd). Those are pulled out of the raw bytes
+with anchored regexes and stored as a light record, together with a
+reference (path, offset, length) to the original line. Analyses that need
+a neighbouring message (user context, assistant synthesis) decode it on
+demand with materialize().
+
+Light records behave like messages without 'message' content, so code
+that probes msg.get("message", {}).get("content", []) skips them naturally.
+
+Performance impact:
+- Only Task calls and their results are JSON-decoded, typically an order
+  of magnitude fewer lines than a full decode
+"""
+import re
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Set
+
+from tools.common import codec
+
+# Quick substring gates before running any regex
+_TASK_GATE = b'"Task"'
+_RESULT_GATE = b'"tool_result"'
+
+_TASK_RE = re.compile(rb'"name":\s*"Task"')
+_SESSION_RE = re.compile(rb'"sessionId":\s*"([^"]*)"')
+_CWD_RE = re.compile(rb'"cwd":\s*"((?:[^"\\]|\\.)*)"')
+# Top-level message types; nested content types (text, tool_use, ...) never match
+_TYPE_RE = re.compile(rb'"type":\s*"(user|assistant|system|summary)"')
+_TIMESTAMP_RE = re.compile(rb'"timestamp":\s*"([^"]*)"')
+
+def _to_str(raw: bytes) -> str:
+    """Decode a JSON string body, unescaping only when needed."""
+    if b"\\" in raw:
+        return codec.loads(b'"' + raw + b'"')
+    return raw.decode("utf-8")
+
+def needs_decode(raw_line: bytes, pending_ids: Set[bytes]) -> bool:
+    """Check whether a line may matter to delegation extraction.
+
+    Args:
+        raw_line: Raw JSONL line
+        pending_ids: Task tool_use ids whose result has not been seen yet
+
+    Returns:
+        True for Task tool_use lines and tool_result lines of pending Tasks
+    """
+    if _TASK_GATE in raw_line and _TASK_RE.search(raw_line):
+        return True
+    if pending_ids and _RESULT_GATE in raw_line:
+        return any(tool_id in raw_line for tool_id in pending_ids)
+    return False
+
+def track_task_ids(msg: Dict[str, Any], pending_ids: Set[bytes]) -> None:
+    """Update pending Task ids from a fully decoded message."""
+    content = msg.get("message", {}).get("content", [])
+    if not isinstance(content, list):
+        return
+    for item in content:
+        if not isinstance(item, dict):
+            continue
+        if item.get("type") == "tool_use" and item.get("name") == "Task" and item.get("id"):
+            pending_ids.add(item["id"].encode("utf-8"))
+        elif item.get("type") == "tool_result" and item.get("tool_use_id"):
+            pending_ids.discard(item["tool_use_id"].encode("utf-8"))
+
+def light_record(raw_line: bytes, path: Path, offset: int) -> Optional[Dict[str, Any]]:
+    """Build lightweight metadata for a line that is not decoded.
+
+    Each field is only taken from the raw bytes when its key occurs exactly
+    once in the line; nested occurrences (e.g. a timestamp inside a tool
+    result) make the line ambiguous and it must be decoded instead.
+
+    Returns:
+        Record with sessionId/type/timestamp/cwd and a '_ref' to the line,
+        or None if the line is ambiguous and needs a full decode
+    """
+    if raw_line.count(b'"sessionId":') != 1 or raw_line.count(b'"timestamp":') > 1:
+        return None
+    if raw_line.count(b'"cwd":') > 1 or len(_TYPE_RE.findall(raw_line)) > 1:
+        return None
+
+    match = _SESSION_RE.search(raw_line)
+    if not match:
+        return None
+
+    record = {
+        "sessionId": _to_str(match.group(1)),
+        "_ref": (str(path), offset, len(raw_line)),
+    }
+
+    for key, regex in (("type", _TYPE_RE), ("cwd", _CWD_RE), ("timestamp", _TIMESTAMP_RE)):
+        match = regex.search(raw_line)
+        if match:
+            record[key] = _to_str(match.group(1))
+
+    return record
+
+def has_session_id(raw_line: bytes) -> bool:
+    """Cheap check for lines that cannot carry a sessionId at all."""
+    return b'"sessionId"' in raw_line
+
+def is_light(msg: Dict[str, Any]) -> bool:
+    """Whether a message is a light record (content not decoded)."""
+    return "_ref" in msg
+
+def materialize(msg: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the fully decoded message for a light record.
+
+    Conversation files are append-only and the scan cache re-reads files
+    that were rewritten, so stored offsets stay valid.
+    """
+    ref = msg.get("_ref")
+    if ref is None:
+        return msg
+
+    path, offset, length = ref
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return codec.loads(f.read(length))
+
+def pending_from(ids: Iterable[str]) -> Set[bytes]:
+    """Rebuild the pending Task id set stored in a cache entry."""
+    return {tool_id.encode("utf-8") for tool_id in ids}
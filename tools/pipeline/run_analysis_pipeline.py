@@ -26,15 +26,29 @@ Usage:
 
     # Force re-run of stages (skip cache)
     python run_analysis_pipeline.py --all --force
+
+    # Run every stage script in its own interpreter
+    python run_analysis_pipeline.py --all --subprocess
+
+    # Run at most 2 scripts concurrently (1 = strictly one at a time)
+    python run_analysis_pipeline.py --all --jobs 2
+
+    # Resource trends and regressions across recorded runs
+    python run_analysis_pipeline.py --profile-report
 """
 
 import argparse
+import contextlib
+import importlib
+import io
 import sys
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from enum import Enum
 from pathlib import Path
-from typing import List, Dict, Optional, Set, Tuple
+from typing import Callable, List, Dict, Optional, Set, Tuple, Union
 from datetime import datetime
-import json
 
 from tools.common.config import (
     PROJECT_ROOT,
@@ -42,11 +56,27 @@ from tools.common.config import (
     RAW_DATA_DIR,
     SESSIONS_DATA_FILE,
     ENRICHED_SESSIONS_FILE,
+    ENRICHED_SESSIONS_INDEX_FILE,
+    ENRICHED_SESSIONS_FRAME_FILE,
+    DELEGATION_TABLE_FILE,
+    TEXT_BLOBS_FILE,
     ROUTING_PATTERNS_FILE,
     TEMPORAL_SEGMENTATION_FILE,
     DELEGATION_RAW_FILE,
     AGENT_CALLS_CSV,
-    ensure_data_dirs
+    STAGE_MANIFEST_FILE,
+    PIPELINE_EXECUTION_LOG,
+    ensure_data_dirs,
+    get_runtime_config
+)
+from tools.common import codec
+from tools.pipeline.stage_manifest import StageManifest
+from tools.pipeline.run_profile import (
+    ResourceProfile,
+    load_history,
+    profile_report,
+    profile_unit,
+    run_profiled
 )
 
 
@@ -71,7 +101,8 @@ class StageDefinition:
         scripts: List[str],
         produces: List[Path],
         requires: List[Path],
-        depends_on: List[PipelineStage]
+        depends_on: List[PipelineStage],
+        sources: Optional[List[Path]] = None
     ):
         self.stage = stage
         self.name = name
@@ -80,6 +111,8 @@ class StageDefinition:
         self.produces = produces
         self.requires = requires
         self.depends_on = depends_on
+        # Code imported by the scripts beyond tools/common (for the manifest)
+        self.sources = sources or []
 
     def check_prerequisites(self) -> Tuple[bool, List[str]]:
         """Check if all required files exist.
@@ -143,12 +176,15 @@ STAGE_DEFINITIONS: Dict[PipelineStage, StageDefinition] = {
         name="Data Extraction",
         description="Extract raw session data from Claude projects",
         scripts=[
-            "tools/pipeline/extract_all_sessions.py",
-            "tools/pipeline/extract_enriched_data.py",
+            "tools/pipeline/extract_sessions.py",
         ],
         produces=[
             SESSIONS_DATA_FILE,
             ENRICHED_SESSIONS_FILE,
+            ENRICHED_SESSIONS_INDEX_FILE,
+            ENRICHED_SESSIONS_FRAME_FILE,
+            DELEGATION_TABLE_FILE,
+            TEXT_BLOBS_FILE,
         ],
         requires=[
             # External dependency - checked differently
@@ -170,6 +206,8 @@ STAGE_DEFINITIONS: Dict[PipelineStage, StageDefinition] = {
         ],
         requires=[
             ENRICHED_SESSIONS_FILE,
+            ENRICHED_SESSIONS_FRAME_FILE,
+            TEXT_BLOBS_FILE,
         ],
         depends_on=[PipelineStage.EXTRACTION]
     ),
@@ -202,9 +240,11 @@ STAGE_DEFINITIONS: Dict[PipelineStage, StageDefinition] = {
         ],
         requires=[
             ENRICHED_SESSIONS_FILE,
+            TEXT_BLOBS_FILE,
             ROUTING_PATTERNS_FILE,
         ],
-        depends_on=[PipelineStage.ENRICHMENT]
+        depends_on=[PipelineStage.ENRICHMENT],
+        sources=[PROJECT_ROOT / "tools" / "strategies"]
     ),
 
     PipelineStage.REPORTING: StageDefinition(
@@ -226,19 +266,149 @@ STAGE_DEFINITIONS: Dict[PipelineStage, StageDefinition] = {
 }
 
 
+# In-process stage entry points, called with the shared DataRepository.
+# Entries are callables or "module:function" strings (imported on first use);
+# stages without entries run their scripts as subprocesses.
+StageCallable = Callable[..., object]
+STAGE_CALLABLES: Dict[PipelineStage, List[Union[str, StageCallable]]] = {
+    PipelineStage.EXTRACTION: [
+        "tools.pipeline.extract_sessions:run",
+    ],
+    PipelineStage.ENRICHMENT: [
+        "tools.pipeline.extract_routing_patterns:main",
+        "tools.pipeline.classify_marathons:main",
+    ],
+    PipelineStage.SEGMENTATION: [
+        "tools.pipeline.segment_data:main",
+    ],
+    PipelineStage.ANALYSIS: [
+        "tools.pipeline.analysis_runner:run_all_analyses",
+    ],
+    PipelineStage.REPORTING: [
+        "tools.pipeline.generate_routing_report:main",
+    ],
+}
+
+
+def register_stage_callable(stage: PipelineStage, func: Union[str, StageCallable]) -> None:
+    """Add an in-process entry point to a stage.
+
+    Args:
+        stage: Stage the callable belongs to
+        func: callable(repository) or "module:function"
+    """
+    STAGE_CALLABLES.setdefault(stage, []).append(func)
+
+
+def resolve_stage_callable(entry: Union[str, StageCallable]) -> StageCallable:
+    """Import a "module:function" entry point (callables are returned as-is)."""
+    if callable(entry):
+        return entry
+    module_name, _, func_name = entry.partition(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def describe_stage_callable(entry: Union[str, StageCallable]) -> str:
+    """Readable name of an entry point for logs."""
+    if callable(entry):
+        return f"{entry.__module__}:{entry.__qualname__}"
+    return entry
+
+
+# Scripts (or callables) run concurrently across ready stages
+DEFAULT_MAX_WORKERS = 4
+
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout replacement sending each capturing thread's writes to its own buffer."""
+
+    def __init__(self, target):
+        self.target = target
+        self._local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, 'buffer', None)
+        (buffer if buffer is not None else self.target).write(text)
+        return len(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, 'buffer', None) is None:
+            self.target.flush()
+
+    @contextlib.contextmanager
+    def capture(self):
+        # Captures nest: the outer buffer resumes when the inner one ends
+        previous = getattr(self._local, 'buffer', None)
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = previous
+
+
+_stdout_lock = threading.Lock()
+
+
+def capture_thread_output():
+    """Capture print() output of the current thread only.
+
+    contextlib.redirect_stdout swaps the process-wide sys.stdout, which
+    would mix the output of stages running on other threads.
+    """
+    with _stdout_lock:
+        if not isinstance(sys.stdout, _ThreadOutput):
+            sys.stdout = _ThreadOutput(sys.stdout)
+        return sys.stdout.capture()
+
+
 class PipelineOrchestrator:
     """Orchestrates multi-stage analysis pipeline with dependency management."""
 
-    def __init__(self, verbose: bool = True, force: bool = False):
+    def __init__(
+        self,
+        verbose: bool = True,
+        force: bool = False,
+        in_process: bool = True,
+        repository=None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        manifest: Optional[StageManifest] = None
+    ):
         """Initialize orchestrator.
 
         Args:
             verbose: Print progress messages
             force: Force re-run of stages even if outputs exist
+            in_process: Run stages with registered callables in this
+                process, sharing one DataRepository (False = subprocesses)
+            repository: DataRepository shared by in-process stages
+                (default: the repository behind data_repository's functions)
+            max_workers: Scripts or callables run concurrently by run_pipeline()
+            manifest: Content-hash fingerprints of completed stages
+                (default: loaded from STAGE_MANIFEST_FILE)
         """
         self.verbose = verbose
         self.force = force
+        self.in_process = in_process
+        self.max_workers = max(1, max_workers)
+        self.manifest = manifest if manifest is not None else StageManifest(STAGE_MANIFEST_FILE)
+        self._repository = repository
         self.execution_log: List[Dict] = []
+        self.run_id = datetime.now().isoformat()
+        # stage -> profiles of its units in the current run
+        self.unit_profiles: Dict[PipelineStage, List[ResourceProfile]] = {}
+        self._log_lock = threading.Lock()
+
+    @property
+    def repository(self):
+        """DataRepository shared by in-process stages (created on first use)."""
+        if self._repository is None:
+            from tools.common.data_repository import get_repository
+            self._repository = get_repository()
+        return self._repository
+
+    def runs_in_process(self, stage_def: StageDefinition) -> bool:
+        """Whether a stage runs through its registered callables."""
+        return self.in_process and bool(STAGE_CALLABLES.get(stage_def.stage))
 
     def log(self, message: str):
         """Log message if verbose mode enabled."""
@@ -310,6 +480,13 @@ class PipelineOrchestrator:
         if not stage_def.check_outputs_exist():
             return True, "Outputs missing"
 
+        # Content hashes beat mtimes: identical re-extracted data is a match
+        current = self.manifest.is_current(stage_def, get_runtime_config())
+        if current is not None:
+            if current:
+                return False, "Inputs, code and config unchanged (manifest)"
+            return True, "Inputs, code, config or outputs changed (manifest)"
+
         if stage_def.is_stale():
             return True, "Outputs stale (inputs newer)"
 
@@ -321,7 +498,7 @@ class PipelineOrchestrator:
         dry_run: bool = False,
         planned_stages: Set[PipelineStage] = None
     ) -> bool:
-        """Execute a pipeline stage.
+        """Execute a pipeline stage, running its scripts one after another.
 
         Args:
             stage_def: Stage definition
@@ -331,8 +508,38 @@ class PipelineOrchestrator:
         Returns:
             True if successful (or dry run), False if failed
         """
-        import subprocess
+        success, needs_run = self._begin_stage(stage_def, dry_run, planned_stages)
+        if not (success and needs_run):
+            return success
 
+        if dry_run:
+            self.log("🔍 [DRY RUN] Would execute:")
+            if self.runs_in_process(stage_def):
+                for entry in STAGE_CALLABLES[stage_def.stage]:
+                    self.log(f"  - {describe_stage_callable(entry)} (in-process)")
+            else:
+                for script in stage_def.scripts:
+                    self.log(f"  - python {script}")
+            return True
+
+        start_time = datetime.now()
+        if not all(unit() for unit in self.stage_units(stage_def)):
+            return False
+
+        self._finish_stage(stage_def, start_time)
+        return True
+
+    def _begin_stage(
+        self,
+        stage_def: StageDefinition,
+        dry_run: bool = False,
+        planned_stages: Set[PipelineStage] = None
+    ) -> Tuple[bool, bool]:
+        """Announce a stage, validate it and decide whether it must run.
+
+        Returns:
+            (success, needs_run); a skipped stage is (True, False)
+        """
         self.log(f"\n{'='*80}")
         self.log(f"Stage: {stage_def.name}")
         self.log(f"{'='*80}")
@@ -346,102 +553,289 @@ class PipelineOrchestrator:
         )
         if not can_execute:
             self.log(f"❌ Cannot execute: {'; '.join(reasons)}")
-            return False
+            return False, False
 
         # Check if stage needs to run
         should_run, reason = self.should_run_stage(stage_def)
         if not should_run:
             self.log(f"⏭️  Skipping: {reason}")
-            return True
+            return True, False
 
         self.log(f"▶️  Running: {reason}")
+        return True, True
 
-        if dry_run:
-            self.log("🔍 [DRY RUN] Would execute:")
-            for script in stage_def.scripts:
-                self.log(f"  - python {script}")
-            return True
-
-        # Execute scripts
-        start_time = datetime.now()
-        for script in stage_def.scripts:
-            self.log(f"\n📄 Executing: {script}")
+    def _finish_stage(self, stage_def: StageDefinition, start_time: datetime) -> None:
+        """Record a successfully completed stage."""
+        duration = (datetime.now() - start_time).total_seconds()
+        self.log(f"\n✅ Stage complete in {duration:.1f}s ({stage_def.stage.value})")
 
-            # Parse script and args
-            parts = script.split()
-            script_path = PROJECT_ROOT / parts[0]
-            args = parts[1:] if len(parts) > 1 else []
+        self.manifest.record(stage_def, get_runtime_config())
 
-            if not script_path.exists():
-                self.log(f"❌ Script not found: {script_path}")
-                return False
+        # Stage totals: wall time of the stage, resources summed over its units
+        profile = ResourceProfile(duration_seconds=duration)
+        for unit_profile in self.unit_profiles.pop(stage_def.stage, []):
+            profile.add(unit_profile)
+        self._log_execution(stage_def, None, profile, success=True)
 
-            try:
-                # Pass runtime config through environment variables
-                import os
-                env = os.environ.copy()
-
-                from tools.common.config import get_runtime_config
-                runtime_config = get_runtime_config()
-
-                if runtime_config.project_filter:
-                    env['ANALYSIS_PROJECT_FILTER'] = runtime_config.project_filter
-                if runtime_config.start_date:
-                    env['ANALYSIS_START_DATE'] = runtime_config.start_date
-                if runtime_config.end_date:
-                    env['ANALYSIS_END_DATE'] = runtime_config.end_date
-                if runtime_config.discover_periods:
-                    env['ANALYSIS_DISCOVER_PERIODS'] = 'true'
-                if runtime_config.source_live:
-                    env['ANALYSIS_SOURCE_LIVE'] = 'true'
-
-                result = subprocess.run(
-                    ["python", str(script_path)] + args,
-                    cwd=PROJECT_ROOT,
-                    capture_output=True,
-                    text=True,
-                    timeout=600,  # 10 minute timeout
-                    env=env
+    def _log_execution(
+        self,
+        stage_def: StageDefinition,
+        unit: Optional[str],
+        profile: ResourceProfile,
+        success: bool
+    ) -> None:
+        """Add a stage (unit=None) or unit run to the execution log."""
+        with self._log_lock:
+            self.execution_log.append({
+                "stage": stage_def.stage.value,
+                "timestamp": datetime.now().isoformat(),
+                "duration_seconds": round(profile.duration_seconds, 3),
+                "success": success,
+                "run_id": self.run_id,
+                "unit": unit,
+                "mode": "in-process" if self.runs_in_process(stage_def) else "subprocess",
+                **profile.to_dict()
+            })
+
+    def stage_units(self, stage_def: StageDefinition) -> List[Callable[[], bool]]:
+        """Independently runnable pieces of a stage.
+
+        One unit per registered callable (in-process) or per script
+        (subprocess). Scripts within a stage must not depend on each other,
+        since run_pipeline() may run them concurrently.
+        """
+        if self.runs_in_process(stage_def):
+            return [
+                lambda entry=entry: self._run_unit(
+                    stage_def, describe_stage_callable(entry), lambda: self._run_callable(entry)
                 )
+                for entry in STAGE_CALLABLES[stage_def.stage]
+            ]
+        return [
+            lambda script=script: self._run_unit(stage_def, script, lambda: self._run_script(script))
+            for script in stage_def.scripts
+        ]
 
-                if result.returncode != 0:
-                    self.log(f"❌ Script failed with exit code {result.returncode}")
-                    if result.stderr:
-                        self.log(f"Error output:\n{result.stderr}")
-                    return False
+    def _run_unit(self, stage_def: StageDefinition, name: str, run: Callable[[], bool]) -> bool:
+        """Run one stage unit, recording its resource profile.
+
+        Returns:
+            The unit's success
+        """
+        with profile_unit(in_thread=self.runs_in_process(stage_def)) as profile:
+            success = run()
+
+        self._log_execution(stage_def, name, profile, success)
+        with self._log_lock:
+            self.unit_profiles.setdefault(stage_def.stage, []).append(profile)
+        return success
 
-                if result.stdout and self.verbose:
-                    # Print last few lines of output
-                    lines = result.stdout.strip().split('\n')
-                    for line in lines[-5:]:
-                        self.log(f"  {line}")
+    def _run_script(self, script: str) -> bool:
+        """Run one stage script in its own Python subprocess.
 
-            except subprocess.TimeoutExpired:
-                self.log(f"❌ Script timeout (>10 minutes)")
+        Returns:
+            True if the script exited successfully
+        """
+        import subprocess
+
+        self.log(f"\n📄 Executing: {script}")
+
+        # Parse script and args
+        parts = script.split()
+        script_path = PROJECT_ROOT / parts[0]
+        args = parts[1:] if len(parts) > 1 else []
+
+        if not script_path.exists():
+            self.log(f"❌ Script not found: {script_path}")
+            return False
+
+        try:
+            # Pass runtime config through environment variables
+            import os
+            env = os.environ.copy()
+
+            from tools.common.config import get_runtime_config
+            runtime_config = get_runtime_config()
+
+            if runtime_config.project_filter:
+                env['ANALYSIS_PROJECT_FILTER'] = runtime_config.project_filter
+            if runtime_config.start_date:
+                env['ANALYSIS_START_DATE'] = runtime_config.start_date
+            if runtime_config.end_date:
+                env['ANALYSIS_END_DATE'] = runtime_config.end_date
+            if runtime_config.discover_periods:
+                env['ANALYSIS_DISCOVER_PERIODS'] = 'true'
+            if runtime_config.source_live:
+                env['ANALYSIS_SOURCE_LIVE'] = 'true'
+            if runtime_config.scan_workers != 1:
+                env['ANALYSIS_SCAN_WORKERS'] = str(runtime_config.scan_workers)
+
+            # Like subprocess.run(), also measuring the script's resources
+            result = run_profiled(
+                ["python", str(script_path)] + args,
+                cwd=PROJECT_ROOT,
+                timeout=600,  # 10 minute timeout
+                env=env
+            )
+
+            if result.returncode != 0:
+                self.log(f"❌ {script} failed with exit code {result.returncode}")
+                if result.stderr:
+                    self.log(f"Error output:\n{result.stderr}")
                 return False
+
+            if result.stdout and self.verbose:
+                # Print last few lines of output
+                lines = result.stdout.strip().split('\n')
+                for line in lines[-5:]:
+                    self.log(f"  {line}")
+
+        except subprocess.TimeoutExpired:
+            self.log(f"❌ Script timeout (>10 minutes): {script}")
+            return False
+        except Exception as e:
+            self.log(f"❌ Execution error in {script}: {e}")
+            return False
+
+        return True
+
+    def _run_callable(self, entry: Union[str, StageCallable]) -> bool:
+        """Run one registered stage callable in this process.
+
+        Callables share self.repository, so documents parsed by one stage
+        are reused by the next instead of being re-read from disk.
+
+        Returns:
+            True if the callable returned without raising
+        """
+        name = describe_stage_callable(entry)
+        self.log(f"\n📄 Executing: {name} (in-process)")
+
+        try:
+            func = resolve_stage_callable(entry)
+            with capture_thread_output() as output:
+                func(self.repository)
+        except Exception as e:
+            self.log(f"❌ Execution error in {name}: {e}")
+            self.log(traceback.format_exc())
+            return False
+
+        if self.verbose and output.getvalue().strip():
+            # Print last few lines of output
+            lines = output.getvalue().strip().split('\n')
+            for line in lines[-5:]:
+                self.log(f"  {line}")
+
+        return True
+
+    def _run_buffered(self, unit: Callable[[], bool]) -> Tuple[bool, str]:
+        """Run one stage unit, holding back everything it prints.
+
+        Returns:
+            The unit's success and its captured output
+        """
+        with capture_thread_output() as output:
+            try:
+                success = unit()
             except Exception as e:
                 self.log(f"❌ Execution error: {e}")
-                return False
+                success = False
+        return success, output.getvalue()
 
-        duration = (datetime.now() - start_time).total_seconds()
-        self.log(f"\n✅ Stage complete in {duration:.1f}s")
+    def _run_scheduled(self, stages: List[PipelineStage]) -> bool:
+        """Run stages as a dependency graph on a bounded thread pool.
+
+        A stage starts as soon as the planned stages it depends on have
+        finished; dependencies outside the plan are checked by
+        validate_stage(). All units of running stages share the pool, so
+        independent stages and independent scripts within a stage overlap
+        and wall time follows the critical path. When several stages become
+        ready together they start in plan order. Units print into their own
+        buffers; a stage's output is written as one block, in unit order,
+        once all of its units have finished.
 
-        # Log execution
-        self.execution_log.append({
-            "stage": stage_def.stage.value,
-            "timestamp": datetime.now().isoformat(),
-            "duration_seconds": duration,
-            "success": True
-        })
+        Returns:
+            True if all stages successful, False otherwise
+        """
+        planned = set(stages)
+        waiting = list(stages)
+        done: Set[PipelineStage] = set()
+        failed: List[PipelineStage] = []
+        # stage -> [start time, units still running, output per unit]
+        running: Dict[PipelineStage, list] = {}
+        futures: Dict[Future, Tuple[PipelineStage, int]] = {}
+
+        def is_ready(stage: PipelineStage) -> bool:
+            return all(
+                dep in done or dep not in planned
+                for dep in STAGE_DEFINITIONS[stage].depends_on
+            )
 
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                # Start every stage whose dependencies are met (skipped
+                # stages complete at once and may unblock others)
+                started = True
+                while started and not failed:
+                    started = False
+                    for stage in [s for s in waiting if is_ready(s)]:
+                        waiting.remove(stage)
+                        started = True
+                        stage_def = STAGE_DEFINITIONS[stage]
+
+                        success, needs_run = self._begin_stage(stage_def, planned_stages=planned)
+                        if not success:
+                            failed.append(stage)
+                            break
+
+                        units = self.stage_units(stage_def) if needs_run else []
+                        if not units:
+                            done.add(stage)
+                            continue
+
+                        running[stage] = [datetime.now(), len(units), [''] * len(units)]
+                        for index, unit in enumerate(units):
+                            futures[pool.submit(self._run_buffered, unit)] = (stage, index)
+
+                if not futures:
+                    break
+
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, index = futures.pop(future)
+                    success, running[stage][2][index] = future.result()
+
+                    if not success and stage not in failed:
+                        failed.append(stage)
+                    running[stage][1] -= 1
+                    if running[stage][1] > 0:
+                        continue
+                    sys.stdout.write(''.join(running[stage][2]))
+                    sys.stdout.flush()
+                    if stage not in failed:
+                        self._finish_stage(STAGE_DEFINITIONS[stage], running[stage][0])
+                        done.add(stage)
+
+        if failed:
+            self.log(f"\n❌ Pipeline failed at stage: {', '.join(stage.value for stage in failed)}")
+            return False
         return True
 
+    def save_execution_log(self, path: Path = PIPELINE_EXECUTION_LOG) -> None:
+        """Append this run's stage and unit profiles to the run history (JSONL)."""
+        if not self.execution_log:
+            return
+        with open(path, 'ab') as f:
+            for entry in self.execution_log:
+                f.write(codec.dumps(entry, pretty=False) + b'\n')
+        self.execution_log = []
+
     def run_pipeline(
         self,
         stages: List[PipelineStage],
         dry_run: bool = False
     ) -> bool:
-        """Run pipeline stages in order.
+        """Run pipeline stages, each as soon as its dependencies are done.
 
         Args:
             stages: List of stages to run
@@ -477,25 +871,25 @@ class PipelineOrchestrator:
         # Create set of planned stages for dependency validation
         planned_stages = set(stages)
 
-        # Execute stages in order
-        for stage in stages:
-            stage_def = STAGE_DEFINITIONS[stage]
-            success = self.execute_stage(
-                stage_def,
-                dry_run=dry_run,
-                planned_stages=planned_stages
-            )
+        if dry_run:
+            # Validate stages in order
+            for stage in stages:
+                stage_def = STAGE_DEFINITIONS[stage]
+                success = self.execute_stage(
+                    stage_def,
+                    dry_run=dry_run,
+                    planned_stages=planned_stages
+                )
+                if not success:
+                    self.log(f"\n❌ Pipeline failed at stage: {stage.value}")
+                    return False
+        else:
+            success = self._run_scheduled(stages)
+            # Failed runs are kept too: their unit entries show what broke
+            self.save_execution_log()
             if not success:
-                self.log(f"\n❌ Pipeline failed at stage: {stage.value}")
                 return False
 
-        # Save execution log
-        if not dry_run and self.execution_log:
-            log_file = PROJECT_ROOT / "pipeline_execution_log.json"
-            with open(log_file, 'a') as f:
-                for entry in self.execution_log:
-                    f.write(json.dumps(entry) + '\n')
-
         self.log("\n" + "=" * 80)
         if dry_run:
             self.log("🔍 DRY RUN COMPLETE - Pipeline validated")
@@ -534,6 +928,12 @@ Examples:
 
   # Force re-run (ignore cache)
   python run_analysis_pipeline.py --stage analysis --force
+
+  # Full rescan sharded across 16 processes
+  python run_analysis_pipeline.py --stage extraction --force --workers 16
+
+  # Which stage got slower or heavier over the last 20 runs
+  python run_analysis_pipeline.py --profile-report 20
         """
     )
 
@@ -569,11 +969,31 @@ Examples:
         action='store_true',
         help='Suppress progress messages'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        metavar='N',
+        help=f'Run up to N stage scripts concurrently (default: {DEFAULT_MAX_WORKERS}, 1 = one at a time)'
+    )
+    parser.add_argument(
+        '--subprocess',
+        action='store_true',
+        help='Run each stage script in a separate Python process instead of in-process'
+    )
     parser.add_argument(
         '--list-stages',
         action='store_true',
         help='List all pipeline stages and exit'
     )
+    parser.add_argument(
+        '--profile-report',
+        type=int,
+        nargs='?',
+        const=10,
+        metavar='RUNS',
+        help='Show per-stage and per-script resource trends over the last RUNS runs (default: 10) and exit'
+    )
 
     # Runtime configuration parameters
     parser.add_argument(
@@ -609,10 +1029,31 @@ Examples:
         help='Read conversations from ~/.claude/projects/ instead of backup archive'
     )
 
+    # Extraction performance
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Scan conversation files with N processes (0 = one per CPU, default: 1)'
+    )
+    parser.add_argument(
+        '--compact-json',
+        action='store_true',
+        help='Write compact (non-indented) JSON artifacts; faster for large outputs'
+    )
+
     args = parser.parse_args()
 
+    # Output style is read by every stage through the shared JSON codec
+    if args.compact_json:
+        import os
+        os.environ['ANALYSIS_JSON_COMPACT'] = 'true'
+        codec.set_pretty(False)
+
     # Set runtime configuration from CLI arguments
-    if args.project or args.start_date or args.end_date or args.discover_periods or args.source_live:
+    if (args.project or args.start_date or args.end_date or args.discover_periods
+            or args.source_live or args.workers != 1):
         from tools.common.config import RuntimeConfig, set_runtime_config
 
         config = RuntimeConfig(
@@ -620,7 +1061,8 @@ Examples:
             start_date=args.start_date,
             end_date=args.end_date,
             discover_periods=args.discover_periods,
-            source_live=args.source_live
+            source_live=args.source_live,
+            scan_workers=args.workers
         )
         set_runtime_config(config)
 
@@ -637,8 +1079,15 @@ Examples:
                 print(f"  Source: ~/.claude/projects/ (live)")
             else:
                 print(f"  Source: data/conversations/ (backup)")
+            if args.workers != 1:
+                print(f"  Scan workers: {args.workers or 'one per CPU'}")
             print()
 
+    # Resource profile across recorded runs
+    if args.profile_report is not None:
+        print(profile_report(load_history(PIPELINE_EXECUTION_LOG), last_runs=max(2, args.profile_report)))
+        return 0
+
     # List stages
     if args.list_stages:
         print("Pipeline Stages (in execution order):\n")
@@ -676,7 +1125,9 @@ Examples:
     # Run pipeline
     orchestrator = PipelineOrchestrator(
         verbose=not args.quiet,
-        force=args.force
+        force=args.force,
+        in_process=not args.subprocess,
+        max_workers=args.jobs
     )
 
     success = orchestrator.run_pipeline(
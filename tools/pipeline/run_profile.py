@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""Resource profile of pipeline stage and script runs.
+
+Every stage unit (a registered callable run in-process, or a script run as a
+subprocess) is measured while it runs; the stage entry sums its units. The
+orchestrator appends one JSON line per unit and per stage to
+PIPELINE_EXECUTION_LOG, so the history survives across runs and
+`run_analysis_pipeline.py --profile-report` can show trends and regressions.
+
+Measured fields:
+    duration_seconds     wall time
+    cpu_user_seconds     CPU time of the script's process, or of the thread
+    cpu_system_seconds   running an in-process callable (Linux; elsewhere the
+                         whole process, which overlaps with concurrent units)
+    peak_rss_kb          peak resident memory of the script's process; for
+                         in-process units the process high-water mark when
+                         the unit finished
+    read_bytes           bytes passed through read()/write() system calls
+    write_bytes          (Linux /proc accounting, None elsewhere)
+    records_in           records reported by the unit through count_records()
+    records_out
+
+Log entry (one per line, legacy entries only have the first four fields):
+    {"stage": "extraction", "timestamp": "...", "duration_seconds": 4.2,
+     "success": true, "run_id": "...", "unit": "tools...:run" | null,
+     "mode": "in-process" | "subprocess", "cpu_user_seconds": ..., ...}
+"""
+import contextlib
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from tools.common import codec
+
+# Per-thread CPU accounting where the platform has it
+_THREAD_USAGE = getattr(resource, 'RUSAGE_THREAD', resource.RUSAGE_SELF)
+
+# ru_maxrss is in bytes on macOS, kilobytes elsewhere
+_MAXRSS_DIVISOR = 1024 if sys.platform == 'darwin' else 1
+
+# File a stage script run by run_profiled() appends its record counts to
+RECORD_COUNTS_ENV = 'ANALYSIS_RECORD_COUNTS_FILE'
+
+# Relative increase over the median of earlier runs reported as a regression
+REGRESSION_THRESHOLD = 0.25
+
+# Wall time increases below this are noise, whatever their ratio
+MIN_REGRESSION_SECONDS = 0.5
+
+_local = threading.local()
+
+
+@dataclass
+class ResourceProfile:
+    """Resources used by one stage unit (or, summed, by a whole stage)."""
+    duration_seconds: float = 0.0
+    cpu_user_seconds: float = 0.0
+    cpu_system_seconds: float = 0.0
+    peak_rss_kb: Optional[int] = None
+    read_bytes: Optional[int] = None
+    write_bytes: Optional[int] = None
+    records_in: int = 0
+    records_out: int = 0
+
+    def add(self, other: 'ResourceProfile') -> None:
+        """Accumulate another unit of the same stage (wall time excluded)."""
+        self.cpu_user_seconds += other.cpu_user_seconds
+        self.cpu_system_seconds += other.cpu_system_seconds
+        self.peak_rss_kb = _combine(self.peak_rss_kb, other.peak_rss_kb, max)
+        self.read_bytes = _combine(self.read_bytes, other.read_bytes, int.__add__)
+        self.write_bytes = _combine(self.write_bytes, other.write_bytes, int.__add__)
+        self.records_in += other.records_in
+        self.records_out += other.records_out
+
+    def to_dict(self) -> Dict:
+        fields = asdict(self)
+        for name in ('duration_seconds', 'cpu_user_seconds', 'cpu_system_seconds'):
+            fields[name] = round(fields[name], 3)
+        return fields
+
+
+def _combine(a, b, op):
+    if a is None or b is None:
+        return b if a is None else a
+    return op(a, b)
+
+
+def _read_io(path: str) -> Optional[Tuple[int, int]]:
+    """(rchar, wchar) from a /proc io file, None where unavailable."""
+    try:
+        with open(path) as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return int(fields['rchar']), int(fields['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def count_records(records_in: int = 0, records_out: int = 0) -> None:
+    """
+    Report records a stage unit consumed and produced.
+
+    Counts go to the unit profiled on the current thread or, in a stage
+    script started by run_profiled(), to the orchestrator through a file.
+    Called outside a profiled run, this does nothing.
+
+    Args:
+        records_in: Records read (sessions or delegations, as the stage counts them)
+        records_out: Records written
+    """
+    profile = getattr(_local, 'profile', None)
+    if profile is not None:
+        profile.records_in += records_in
+        profile.records_out += records_out
+        return
+
+    path = os.environ.get(RECORD_COUNTS_ENV)
+    if path:
+        with open(path, 'a') as f:
+            f.write(f"{records_in} {records_out}\n")
+
+
+@contextlib.contextmanager
+def profile_unit(in_thread: bool = True):
+    """
+    Profile one stage unit run on the current thread.
+
+    Args:
+        in_thread: Measure this thread's CPU, memory and I/O (in-process
+            units); False leaves them to run_profiled() (script units)
+
+    Yields:
+        ResourceProfile, complete when the block exits
+    """
+    profile = ResourceProfile()
+    previous = getattr(_local, 'profile', None)
+    _local.profile = profile
+
+    start_usage = resource.getrusage(_THREAD_USAGE) if in_thread else None
+    start_io = _read_io('/proc/thread-self/io') if in_thread else None
+    start = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        profile.duration_seconds = time.perf_counter() - start
+        if in_thread:
+            usage = resource.getrusage(_THREAD_USAGE)
+            profile.cpu_user_seconds = usage.ru_utime - start_usage.ru_utime
+            profile.cpu_system_seconds = usage.ru_stime - start_usage.ru_stime
+            profile.peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // _MAXRSS_DIVISOR
+            end_io = _read_io('/proc/thread-self/io')
+            if start_io and end_io:
+                profile.read_bytes = end_io[0] - start_io[0]
+                profile.write_bytes = end_io[1] - start_io[1]
+        _local.profile = previous
+
+
+def run_profiled(args: Sequence[str], timeout: float, **popen_kwargs) -> subprocess.CompletedProcess:
+    """
+    Run a command like subprocess.run(capture_output=True, text=True) and
+    measure the child process.
+
+    The measurements go to the unit profiled on this thread (see
+    profile_unit()); the child's record counts arrive through RECORD_COUNTS_ENV.
+
+    Raises:
+        subprocess.TimeoutExpired: If the command ran longer than timeout (it is killed)
+    """
+    profile = getattr(_local, 'profile', None) or ResourceProfile()
+    env = dict(popen_kwargs.pop('env', None) or os.environ)
+    counts_fd, counts_path = tempfile.mkstemp(prefix='record_counts_', suffix='.txt')
+    os.close(counts_fd)
+    env[RECORD_COUNTS_ENV] = counts_path
+    expired = threading.Event()
+
+    try:
+        with tempfile.TemporaryFile('w+') as stdout, tempfile.TemporaryFile('w+') as stderr:
+            start = time.perf_counter()
+            proc = subprocess.Popen(args, stdout=stdout, stderr=stderr, env=env, **popen_kwargs)
+            timer = threading.Timer(timeout, lambda: (expired.set(), proc.kill()))
+            timer.start()
+            try:
+                # Wait without reaping so the child's /proc io file is still readable
+                os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+                io = _read_io(f'/proc/{proc.pid}/io')
+                _, status, usage = os.wait4(proc.pid, 0)
+            finally:
+                timer.cancel()
+            proc.returncode = os.waitstatus_to_exitcode(status)
+
+            profile.duration_seconds = time.perf_counter() - start
+            profile.cpu_user_seconds = usage.ru_utime
+            profile.cpu_system_seconds = usage.ru_stime
+            profile.peak_rss_kb = usage.ru_maxrss // _MAXRSS_DIVISOR
+            if io:
+                profile.read_bytes, profile.write_bytes = io
+
+            with open(counts_path) as f:
+                for line in f:
+                    records_in, records_out = line.split()
+                    profile.records_in += int(records_in)
+                    profile.records_out += int(records_out)
+
+            if expired.is_set():
+                raise subprocess.TimeoutExpired(args, timeout)
+
+            stdout.seek(0)
+            stderr.seek(0)
+            return subprocess.CompletedProcess(args, proc.returncode, stdout.read(), stderr.read())
+    finally:
+        os.unlink(counts_path)
+
+
+def load_history(path: Path) -> List[Dict]:
+    """Entries of the run history, oldest first (unreadable lines skipped)."""
+    if not Path(path).exists():
+        return []
+
+    entries = []
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                entries.append(codec.loads(line))
+            except codec.JSONDecodeError:
+                continue
+    return entries
+
+
+def _median(values: List[float]) -> Optional[float]:
+    return statistics.median(values) if values else None
+
+
+def _change(latest: Optional[float], baseline: Optional[float]) -> Optional[float]:
+    """Relative change of latest over baseline (None if not comparable)."""
+    if latest is None or not baseline:
+        return None
+    return latest / baseline - 1
+
+
+def _seconds_per_record(entry: Dict) -> Optional[float]:
+    records = entry.get('records_in')
+    return entry['duration_seconds'] / records if records else None
+
+
+def _fmt(value, scale: float = 1, digits: int = 1) -> str:
+    return '-' if value is None else f"{value / scale:.{digits}f}"
+
+
+def _fmt_change(change: Optional[float]) -> str:
+    return '-' if change is None else f"{change:+.0%}"
+
+
+def find_regressions(series: List[Dict]) -> List[str]:
+    """
+    Compare the latest run of a stage or unit with the median of earlier runs.
+
+    Wall time per input record is compared when records are counted, so a
+    stage that merely processed more data is not flagged; its growth is
+    still shown. Without record counts, wall time is compared directly.
+
+    Args:
+        series: Successful entries of one stage or unit, oldest first
+
+    Returns:
+        Human-readable regression descriptions (empty if none)
+    """
+    if len(series) < 2:
+        return []
+
+    latest, earlier = series[-1], series[:-1]
+    regressions = []
+
+    wall = _median([e['duration_seconds'] for e in earlier])
+    per_record = _median([v for v in map(_seconds_per_record, earlier) if v is not None])
+    latest_per_record = _seconds_per_record(latest)
+    records = _median([e['records_in'] for e in earlier if e.get('records_in')])
+
+    slower = latest['duration_seconds'] - wall >= MIN_REGRESSION_SECONDS
+    if latest_per_record is not None and per_record is not None:
+        change = _change(latest_per_record, per_record)
+        if slower and change > REGRESSION_THRESHOLD:
+            regressions.append(
+                f"wall {wall:.1f}s -> {latest['duration_seconds']:.1f}s, "
+                f"records in x{latest['records_in'] / records:.2f}, "
+                f"time per record {change:+.0%}"
+            )
+    else:
+        change = _change(latest['duration_seconds'], wall)
+        if slower and change > REGRESSION_THRESHOLD:
+            regressions.append(f"wall {wall:.1f}s -> {latest['duration_seconds']:.1f}s ({change:+.0%})")
+
+    rss = _median([e['peak_rss_kb'] for e in earlier if e.get('peak_rss_kb')])
+    change = _change(latest.get('peak_rss_kb'), rss)
+    if change is not None and change > REGRESSION_THRESHOLD:
+        regressions.append(
+            f"peak RSS {rss / 1024:.0f}MB -> {latest['peak_rss_kb'] / 1024:.0f}MB ({change:+.0%})"
+        )
+
+    return regressions
+
+
+def profile_report(entries: List[Dict], last_runs: int = 10) -> str:
+    """
+    Summarize the run history per stage and per unit.
+
+    For each stage (and each of its units) the latest run is shown with its
+    change against the median of the earlier runs in the window, followed by
+    the wall-time trend and any regressions (see find_regressions()).
+    In-process and subprocess runs are compared separately.
+
+    Args:
+        entries: Run history, oldest first (see load_history())
+        last_runs: Number of most recent runs of each stage or unit considered
+
+    Returns:
+        Report text
+    """
+    # (stage, mode, unit) -> entries; unit None is the stage total
+    series: Dict[Tuple[str, Optional[str], Optional[str]], List[Dict]] = {}
+    for entry in entries:
+        if entry.get('success') and 'duration_seconds' in entry:
+            series.setdefault((entry['stage'], entry.get('mode'), entry.get('unit')), []).append(entry)
+
+    if not series:
+        return "No pipeline runs recorded yet."
+
+    lines = [
+        f"PIPELINE PROFILE (last {last_runs} runs of each stage; change vs. median of earlier runs)",
+        "",
+        f"{'stage / unit':44} {'runs':>4} {'wall s':>7} {'change':>7} {'cpu s':>7} {'RSS MB':>7} "
+        f"{'read MB':>8} {'wrote MB':>8} {'rec in':>8} {'rec out':>8} {'ms/rec':>7}",
+    ]
+    regressions = []
+
+    stages = list(dict.fromkeys(stage for stage, _, _ in series))
+    keys = sorted(series, key=lambda key: (stages.index(key[0]), key[1] or '', key[2] is not None))
+    for key in keys:
+        stage, mode, unit = key
+        window = series[key][-last_runs:]
+        latest = window[-1]
+        if unit is None:
+            label = f"{stage} ({mode})" if mode else stage
+        else:
+            label = f"  {unit}"
+        wall = _median([e['duration_seconds'] for e in window[:-1]])
+        cpu = None
+        if 'cpu_user_seconds' in latest:
+            cpu = latest['cpu_user_seconds'] + latest['cpu_system_seconds']
+        per_record = _seconds_per_record(latest)
+
+        lines.append(
+            f"{label[:44]:44} {len(window):>4} {latest['duration_seconds']:>7.2f} "
+            f"{_fmt_change(_change(latest['duration_seconds'], wall)):>7} {_fmt(cpu, digits=2):>7} "
+            f"{_fmt(latest.get('peak_rss_kb'), 1024):>7} {_fmt(latest.get('read_bytes'), 1 << 20):>8} "
+            f"{_fmt(latest.get('write_bytes'), 1 << 20):>8} {latest.get('records_in') or '-':>8} "
+            f"{latest.get('records_out') or '-':>8} {_fmt(per_record, 0.001, 2):>7}"
+        )
+        if len(window) > 1:
+            trend = ' '.join(f"{e['duration_seconds']:.2f}" for e in window)
+            lines.append(f"    wall trend: {trend}")
+
+        name = label if unit is None else f"{stage} / {unit}"
+        for regression in find_regressions(window):
+            regressions.append(f"  {name}: {regression}")
+
+    lines.append("")
+    if regressions:
+        lines.append(f"REGRESSIONS (latest run over +{REGRESSION_THRESHOLD:.0%} of the earlier median):")
+        lines.extend(regressions)
+    else:
+        lines.append("No regressions in the latest runs.")
+    return "\n".join(lines)
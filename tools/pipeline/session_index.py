@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Single-pass index over a session's messages for delegation extraction.
+
+Looking up a Task result by scanning forward from every Task call is
+O(delegations x messages) per session, which explodes on marathon sessions
+with hundreds of delegations. SessionIndex walks the (sorted) message list
+once and answers both lookups the extractors need:
+1. tool_use_id -> first tool_result after a given message
+2. first assistant message after a given message (synthesis)
+
+Lookups return exactly what the forward scans returned, so extraction
+output is unchanged; enrichment becomes linear in session length.
+"""
+from bisect import bisect_right
+from typing import Dict, Any, List, Optional, Tuple
+
+class SessionIndex:
+    """Result and next-assistant index for one sorted session."""
+
+    def __init__(self, messages: List[Dict[str, Any]]):
+        """Build the index in one forward and one backward pass.
+
+        Args:
+            messages: Session messages sorted by timestamp
+        """
+        # tool_use_id -> ([message indexes], [tool_result items]) in message order
+        self._results: Dict[str, Tuple[List[int], List[Dict[str, Any]]]] = {}
+
+        for j, msg in enumerate(messages):
+            if msg.get("type") != "user":
+                continue
+            content = msg.get("message", {}).get("content", [])
+            if not isinstance(content, list):
+                continue
+            seen = set()
+            for res in content:
+                if not isinstance(res, dict) or res.get("type") != "tool_result":
+                    continue
+                tool_use_id = res.get("tool_use_id")
+                # Only the first matching item of a message counts
+                if tool_use_id in seen:
+                    continue
+                seen.add(tool_use_id)
+                positions, items = self._results.setdefault(tool_use_id, ([], []))
+                positions.append(j)
+                items.append(res)
+
+        # next_assistant[i] = index of the first assistant message after i
+        self._next_assistant: List[Optional[int]] = [None] * len(messages)
+        following = None
+        for i in range(len(messages) - 1, -1, -1):
+            self._next_assistant[i] = following
+            if messages[i].get("type") == "assistant":
+                following = i
+
+    def find_result(self, tool_use_id: str, after: int) -> Optional[Dict[str, Any]]:
+        """First tool_result for tool_use_id in a user message after index `after`."""
+        entry = self._results.get(tool_use_id)
+        if entry is None:
+            return None
+        positions, items = entry
+        k = bisect_right(positions, after)
+        return items[k] if k < len(items) else None
+
+    def next_assistant(self, after: int) -> Optional[int]:
+        """Index of the first assistant message after index `after`."""
+        return self._next_assistant[after]
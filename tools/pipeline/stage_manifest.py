@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Content-hash manifest deciding whether a pipeline stage must re-run.
+
+StageDefinition.is_stale() compares modification times, so touching an input
+or re-extracting byte-identical data re-runs every downstream stage. The
+manifest instead records, for each completed stage, a fingerprint of:
+
+1. SHA-256 of every required input file
+2. SHA-256 of the stage scripts (with their arguments), of every project
+   module they import directly or transitively (e.g. the extraction helpers
+   in tools/pipeline) and of the shared library code (tools/common, plus
+   per-stage extra sources for code loaded dynamically)
+3. The RuntimeConfig fields that change outputs (everything but scan_workers)
+   and the JSON output style
+4. SHA-256 of every produced output file
+
+A stage whose current fingerprint matches its entry is skipped, which gives
+early cutoff: an upstream re-run that rewrote identical bytes leaves its
+dependents untouched. Without an entry (first run, or a stage never run
+under the manifest) the caller falls back to the mtime check.
+
+File hashes are memoized by (size, mtime_ns), so unchanged files are only
+stat()ed on later runs. Generation timestamps in a file's metadata header
+(generated_at, extraction_date) are left out of its hash; otherwise no
+re-extraction would ever be byte-identical.
+
+Layout (data/.cache/stage_manifest.json):
+    {"version": 1,
+     "files": {"<path>": [size, mtime_ns, sha256]},
+     "stages": {"<stage>": {"inputs": {...}, "code": "...", "config": {...}, "outputs": {...}}}}
+"""
+import ast
+import dataclasses
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from tools.common import codec
+from tools.common.config import PROJECT_ROOT
+
+MANIFEST_VERSION = 1
+
+# Library code every stage imports; a change there invalidates all stages
+SHARED_SOURCES = [PROJECT_ROOT / "tools" / "common"]
+
+# RuntimeConfig fields that do not influence stage outputs
+IGNORED_CONFIG_FIELDS = ("scan_workers",)
+
+# Run timestamps written by SchemaValidator.create_metadata() and the
+# sessions extractor, scrubbed from the first HEADER_BYTES of each file
+VOLATILE_HEADER_FIELDS = re.compile(rb'"(generated_at|extraction_date)":\s*"[^"]*"')
+HEADER_BYTES = 4096
+
+
+def _source_files(path: Path) -> List[Path]:
+    """Python files under a directory (or the path itself)."""
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*.py") if "__pycache__" not in p.parts)
+    return [path]
+
+
+def _module_file(module: str) -> Optional[Path]:
+    """Source file of a project module, or None for third-party/stdlib."""
+    base = PROJECT_ROOT.joinpath(*module.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _imported_modules(path: Path) -> List[str]:
+    """Absolute names of the modules a file imports (anywhere in the file)."""
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return []
+
+    package = ".".join(path.relative_to(PROJECT_ROOT).with_suffix("").parts[:-1])
+    modules = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parent = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                base = ".".join(part for part in (parent, node.module) if part)
+            else:
+                base = node.module or ""
+            modules.append(base)
+            # "from package import module" imports a submodule
+            modules.extend(f"{base}.{alias.name}" for alias in node.names)
+    return modules
+
+
+def imported_sources(script: Path) -> List[Path]:
+    """A script plus every project module it imports, transitively."""
+    seen = {script}
+    pending = [script]
+    while pending:
+        path = pending.pop()
+        if not path.is_file():
+            continue
+        for module in _imported_modules(path):
+            source = _module_file(module)
+            if source is not None and source not in seen:
+                seen.add(source)
+                pending.append(source)
+    return sorted(seen)
+
+
+class StageManifest:
+    """Per-stage fingerprints persisted between pipeline runs."""
+
+    def __init__(self, path: Path):
+        """
+        Load the manifest (a missing or outdated file starts empty).
+
+        Args:
+            path: Manifest JSON file
+        """
+        self.path = Path(path)
+        self.files: Dict[str, list] = {}
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+        if self.path.exists():
+            try:
+                payload = codec.load_file(self.path)
+            except codec.JSONDecodeError:
+                payload = {}
+            if payload.get("version") == MANIFEST_VERSION:
+                self.files = payload.get("files", {})
+                self.stages = payload.get("stages", {})
+
+    def file_hash(self, path: Path) -> Optional[str]:
+        """SHA-256 of a file, reusing the stored digest if size and mtime match."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        key = str(path)
+        memo = self.files.get(key)
+        if memo and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+            return memo[2]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            digest.update(VOLATILE_HEADER_FIELDS.sub(rb'"\1"', f.read(HEADER_BYTES)))
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        self.files[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def _hash_files(self, paths: Iterable[Path]) -> Dict[str, Optional[str]]:
+        return {str(path): self.file_hash(path) for path in paths}
+
+    def code_hash(self, stage_def) -> str:
+        """Combined hash of stage scripts, their arguments and all code they run."""
+        digest = hashlib.sha256()
+        paths = set()
+        for script in stage_def.scripts:
+            digest.update(script.encode("utf-8"))
+            paths.update(imported_sources(PROJECT_ROOT / script.split()[0]))
+        for source in SHARED_SOURCES + list(stage_def.sources):
+            paths.update(_source_files(source))
+        for path in sorted(paths):
+            digest.update(str(path.relative_to(PROJECT_ROOT)).encode("utf-8"))
+            digest.update(str(self.file_hash(path)).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def config_fingerprint(runtime_config) -> Dict[str, Any]:
+        """RuntimeConfig fields (and output style) that affect stage outputs."""
+        fields = {
+            name: value
+            for name, value in dataclasses.asdict(runtime_config).items()
+            if name not in IGNORED_CONFIG_FIELDS
+        }
+        fields["pretty_json"] = codec.PRETTY
+        # Round-trip so the comparison sees what a reloaded manifest sees
+        return codec.loads(codec.dumps(fields, pretty=False))
+
+    def fingerprint(self, stage_def, runtime_config) -> Dict[str, Any]:
+        """Inputs, code and config fingerprint of a stage (outputs excluded)."""
+        return {
+            "inputs": self._hash_files(stage_def.requires),
+            "code": self.code_hash(stage_def),
+            "config": self.config_fingerprint(runtime_config),
+        }
+
+    def is_current(self, stage_def, runtime_config) -> Optional[bool]:
+        """
+        Whether a stage's recorded run still matches.
+
+        Returns:
+            True if inputs, code, config and outputs are unchanged, False if
+            anything differs, None if the stage has no manifest entry
+        """
+        entry = self.stages.get(stage_def.stage.value)
+        if entry is None:
+            return None
+
+        current = self.fingerprint(stage_def, runtime_config)
+        if any(entry.get(key) != value for key, value in current.items()):
+            return False
+        return entry.get("outputs") == self._hash_files(stage_def.produces)
+
+    def record(self, stage_def, runtime_config) -> None:
+        """Store the fingerprint of a stage that just completed and save."""
+        entry = self.fingerprint(stage_def, runtime_config)
+        entry["outputs"] = self._hash_files(stage_def.produces)
+        self.stages[stage_def.stage.value] = entry
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        codec.dump_file({
+            "version": MANIFEST_VERSION,
+            "files": self.files,
+            "stages": self.stages,
+        }, tmp_path, pretty=False)
+        os.replace(tmp_path, self.path)
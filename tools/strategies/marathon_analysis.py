@@ -10,14 +10,41 @@ Analyzes:
 Converted from: analyze_marathons_optimized.py
 """
 
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Callable, Dict, Any, List, Tuple, Optional
 from collections import defaultdict, Counter, deque
-from datetime import datetime
 
-from tools.common.analysis_strategy import AnalysisStrategy, AnalysisResult
+from tools.common.analysis_strategy import Accumulator, AnalysisResult, ScanningAnalysisStrategy
+from tools.common.timestamps import date_of, record_ms
 
 
-class MarathonAnalysisStrategy(AnalysisStrategy):
+class MarathonAccumulator(Accumulator):
+    """Collects sessions with more than `threshold` delegations."""
+
+    def __init__(self, threshold: int, classify_period: Callable[[Dict], str]):
+        self.threshold = threshold
+        self.classify_period = classify_period
+        self.marathons: List[Dict] = []
+
+    def visit_session(self, session: Dict) -> None:
+        delegations = session.get('delegations', [])
+        if len(delegations) <= self.threshold:
+            return
+
+        first_deleg = delegations[0] if delegations else {}
+        self.marathons.append({
+            'session_id': session.get('session_id'),
+            'count': len(delegations),
+            'period': self.classify_period(first_deleg),
+            'date': first_deleg.get('timestamp', ''),
+            'delegations': delegations
+        })
+
+    def result(self) -> List[Dict]:
+        """Marathons, longest first."""
+        return sorted(self.marathons, key=lambda x: x['count'], reverse=True)
+
+
+class MarathonAnalysisStrategy(ScanningAnalysisStrategy):
     """
     Analyzes marathon sessions (>20 delegations) to identify patterns and issues.
     """
@@ -35,12 +62,16 @@ class MarathonAnalysisStrategy(AnalysisStrategy):
     def get_name(self) -> str:
         return "Marathon Analysis"
 
-    def analyze(self, data: Dict[str, Any]) -> AnalysisResult:
+    def create_accumulators(self) -> Dict[str, Accumulator]:
+        return {'marathons': MarathonAccumulator(self.marathon_threshold, self._classify_period)}
+
+    def summarize(self, data: Dict[str, Any], accumulators: Dict[str, Accumulator]) -> AnalysisResult:
         """
-        Execute marathon analysis on sessions.
+        Build marathon findings from the scanned sessions.
 
         Args:
             data: Dictionary with 'sessions' key
+            accumulators: Filled accumulators from create_accumulators()
 
         Returns:
             AnalysisResult with marathon findings
@@ -55,8 +86,7 @@ class MarathonAnalysisStrategy(AnalysisStrategy):
                 summary="No sessions to analyze"
             )
 
-        # Extract marathons
-        marathons = self._extract_marathons(sessions)
+        marathons = accumulators['marathons'].result()
 
         if not marathons:
             return AnalysisResult(
@@ -98,45 +128,19 @@ class MarathonAnalysisStrategy(AnalysisStrategy):
             }
         )
 
-    def _extract_marathons(self, sessions: List[Dict]) -> List[Dict]:
-        """Extract marathon sessions (>threshold delegations)."""
-        marathons = []
-
-        for session in sessions:
-            session_id = session.get('session_id')
-            delegations = session.get('delegations', [])
-
-            if len(delegations) > self.marathon_threshold:
-                first_deleg = delegations[0] if delegations else {}
-                period = self._classify_period(first_deleg.get('timestamp', ''))
-
-                marathons.append({
-                    'session_id': session_id,
-                    'count': len(delegations),
-                    'period': period,
-                    'date': first_deleg.get('timestamp', ''),
-                    'delegations': delegations
-                })
-
-        return sorted(marathons, key=lambda x: x['count'], reverse=True)
-
-    def _classify_period(self, date_str: str) -> str:
-        """Classify session into temporal period."""
-        if not date_str:
+    def _classify_period(self, delegation: Dict) -> str:
+        """Classify session into temporal period by its first delegation."""
+        ms = record_ms(delegation)
+        if ms is None:
             return 'Unknown'
 
-        try:
-            date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            day = date.day
-
-            if 3 <= day <= 11:
-                return 'P2'
-            elif 12 <= day <= 20:
-                return 'P3'
-            else:
-                return 'P4'
-        except (ValueError, AttributeError):
-            return 'Unknown'
+        day = date_of(ms).day
+        if 3 <= day <= 11:
+            return 'P2'
+        elif 12 <= day <= 20:
+            return 'P3'
+        else:
+            return 'P4'
 
     def _analyze_single_marathon(self, marathon: Dict) -> Dict:
         """Deep dive analysis of a single marathon."""
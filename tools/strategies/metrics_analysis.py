@@ -12,27 +12,178 @@ Converted from: analyze_metrics.py
 
 from typing import Dict, Any, List
 from collections import defaultdict
-from datetime import datetime
 import statistics
 
-from tools.common.analysis_strategy import AnalysisStrategy, AnalysisResult
-from tools.common.metrics_service import extract_delegation_metrics, calculate_token_totals
+from tools.common.analysis_strategy import Accumulator, AnalysisResult, ScanningAnalysisStrategy
+from tools.common.metrics_service import DelegationMetrics
+from tools.common.timestamps import day_key, hour_of, timestamp_to_ms, weekday_name
+
+
+# Module-level defaultdict factories: accumulators are pickled when
+# run_strategies() hands them to forkserver/spawn workers
+def _new_agent_stats() -> Dict:
+    return {
+        'count': 0,
+        'total_input': 0,
+        'total_output': 0,
+        'total_cache_read': 0,
+        'total_cache_write': 0,
+        'amplification_ratios': [],
+        'cache_hit_rates': [],
+        'first_seen': None,
+        'last_seen': None
+    }
+
+
+def _new_counts() -> defaultdict:
+    return defaultdict(int)
+
+
+class AgentStatsAccumulator(Accumulator):
+    """Token totals, ratios and first/last use per agent."""
+
+    def __init__(self):
+        self.agent_stats = defaultdict(_new_agent_stats)
+
+    def visit_delegation(self, delegation: Dict, metrics: DelegationMetrics) -> None:
+        agent = metrics.agent_type
+        if not agent:
+            return
+
+        stats = self.agent_stats[agent]
+        stats['count'] += 1
+        stats['total_input'] += metrics.input_tokens
+        stats['total_output'] += metrics.output_tokens
+        stats['total_cache_read'] += metrics.cache_read_tokens
+        stats['total_cache_write'] += metrics.cache_write_tokens
+
+        if metrics.amplification_ratio > 0:
+            stats['amplification_ratios'].append(metrics.amplification_ratio)
+        if metrics.cache_hit_rate > 0:
+            stats['cache_hit_rates'].append(metrics.cache_hit_rate)
+
+        # Track temporal usage
+        if metrics.timestamp:
+            if not stats['first_seen'] or metrics.timestamp < stats['first_seen']:
+                stats['first_seen'] = metrics.timestamp
+            if not stats['last_seen'] or metrics.timestamp > stats['last_seen']:
+                stats['last_seen'] = metrics.timestamp
+
+    def result(self) -> Dict:
+        """Per-agent statistics with averages (ratio lists dropped)."""
+        agent_stats = {}
+        for agent, stats in self.agent_stats.items():
+            stats = dict(stats)
+            if stats['amplification_ratios']:
+                stats['avg_amplification'] = statistics.mean(stats['amplification_ratios'])
+                stats['median_amplification'] = statistics.median(stats['amplification_ratios'])
+            else:
+                stats['avg_amplification'] = 0
+                stats['median_amplification'] = 0
+
+            if stats['cache_hit_rates']:
+                stats['avg_cache_hit_rate'] = statistics.mean(stats['cache_hit_rates'])
+            else:
+                stats['avg_cache_hit_rate'] = 0
+
+            # Clean up lists for serialization
+            del stats['amplification_ratios']
+            del stats['cache_hit_rates']
+            agent_stats[agent] = stats
+
+        return agent_stats
+
 
+class TemporalDistributionAccumulator(Accumulator):
+    """Delegation counts by date (and agent), hour and weekday."""
 
-class MetricsAnalysisStrategy(AnalysisStrategy):
+    def __init__(self):
+        self.by_date = defaultdict(_new_counts)
+        self.by_hour = defaultdict(int)
+        self.by_weekday = defaultdict(int)
+        self.invalid_timestamps: List[str] = []
+
+    def visit_delegation(self, delegation: Dict, metrics: DelegationMetrics) -> None:
+        if not (metrics.timestamp and metrics.agent_type):
+            return
+
+        # Epoch milliseconds stored at extraction (parsed for older data)
+        ms = delegation.get('timestamp_ms')
+        if ms is None:
+            ms = timestamp_to_ms(metrics.timestamp)
+            if ms is None:
+                self.invalid_timestamps.append(metrics.timestamp)
+                return
+
+        self.by_date[day_key(ms)][metrics.agent_type] += 1
+        self.by_hour[hour_of(ms)] += 1
+        self.by_weekday[weekday_name(ms)] += 1
+
+    def result(self) -> Dict:
+        # Convert defaultdicts to regular dicts for serialization
+        return {
+            'by_date': {date: dict(agents) for date, agents in self.by_date.items()},
+            'by_hour': dict(self.by_hour),
+            'by_weekday': dict(self.by_weekday)
+        }
+
+
+class TokenTotalsAccumulator(Accumulator):
+    """Global token totals (as metrics_service.calculate_token_totals())."""
+
+    def __init__(self):
+        self.total_delegations = 0
+        self.total_input = 0
+        self.total_output = 0
+        self.total_cache_read = 0
+        self.total_cache_write = 0
+
+    def visit_delegation(self, delegation: Dict, metrics: DelegationMetrics) -> None:
+        self.total_delegations += 1
+        self.total_input += metrics.input_tokens
+        self.total_output += metrics.output_tokens
+        self.total_cache_read += metrics.cache_read_tokens
+        self.total_cache_write += metrics.cache_write_tokens
+
+    def result(self) -> Dict:
+        return {
+            'total_delegations': self.total_delegations,
+            'total_input_tokens': self.total_input,
+            'total_output_tokens': self.total_output,
+            'total_cache_read': self.total_cache_read,
+            'total_cache_write': self.total_cache_write,
+            'total_tokens': self.total_input + self.total_output,
+            'global_amplification': self.total_output / self.total_input if self.total_input > 0 else 0.0,
+            'global_cache_efficiency': self.total_cache_read / self.total_input if self.total_input > 0 else 0.0
+        }
+
+
+class MetricsAnalysisStrategy(ScanningAnalysisStrategy):
     """
     Analyzes delegation metrics including token usage and agent statistics.
+
+    All three views are accumulated in the same pass over delegations.
     """
 
+    needs_text = False
+
     def get_name(self) -> str:
         return "Metrics Analysis"
 
-    def analyze(self, data: Dict[str, Any]) -> AnalysisResult:
+    def create_accumulators(self) -> Dict[str, Accumulator]:
+        return {
+            'agents': AgentStatsAccumulator(),
+            'temporal': TemporalDistributionAccumulator(),
+            'totals': TokenTotalsAccumulator()
+        }
+
+    def summarize(self, data: Dict[str, Any], accumulators: Dict[str, Accumulator]) -> AnalysisResult:
         """
-        Execute metrics analysis on delegations.
+        Build metrics findings from the scanned delegations.
 
         Args:
             data: Dictionary with 'delegations' key
+            accumulators: Filled accumulators from create_accumulators()
 
         Returns:
             AnalysisResult with metrics findings
@@ -47,14 +198,12 @@ class MetricsAnalysisStrategy(AnalysisStrategy):
                 summary="No delegations to analyze"
             )
 
-        # Analyze by agent
-        agent_stats = self._analyze_by_agent(delegations)
-
-        # Analyze temporal distribution
-        temporal_stats = self._analyze_temporal_distribution(delegations)
+        agent_stats = accumulators['agents'].result()
+        temporal_stats = accumulators['temporal'].result()
+        global_metrics = accumulators['totals'].result()
 
-        # Global metrics
-        global_metrics = self._calculate_global_metrics(delegations)
+        for timestamp in accumulators['temporal'].invalid_timestamps:
+            self.add_warning(f"Invalid timestamp: {timestamp}")
 
         # Build summary
         summary = self._build_summary(global_metrics, agent_stats)
@@ -73,110 +222,6 @@ class MetricsAnalysisStrategy(AnalysisStrategy):
             }
         )
 
-    def _analyze_by_agent(self, delegations: List[Dict]) -> Dict:
-        """Analyze metrics per agent."""
-        agent_stats = defaultdict(lambda: {
-            'count': 0,
-            'total_input': 0,
-            'total_output': 0,
-            'total_cache_read': 0,
-            'total_cache_write': 0,
-            'amplification_ratios': [],
-            'cache_hit_rates': [],
-            'first_seen': None,
-            'last_seen': None
-        })
-
-        for delegation in delegations:
-            metrics = extract_delegation_metrics(delegation)
-            agent = metrics['agent_type']
-
-            if agent:
-                stats = agent_stats[agent]
-                stats['count'] += 1
-                stats['total_input'] += metrics['input_tokens']
-                stats['total_output'] += metrics['output_tokens']
-                stats['total_cache_read'] += metrics['cache_read_tokens']
-                stats['total_cache_write'] += metrics['cache_write_tokens']
-
-                if metrics['amplification_ratio'] > 0:
-                    stats['amplification_ratios'].append(metrics['amplification_ratio'])
-                if metrics['cache_hit_rate'] > 0:
-                    stats['cache_hit_rates'].append(metrics['cache_hit_rate'])
-
-                # Track temporal usage
-                if metrics['timestamp']:
-                    if not stats['first_seen'] or metrics['timestamp'] < stats['first_seen']:
-                        stats['first_seen'] = metrics['timestamp']
-                    if not stats['last_seen'] or metrics['timestamp'] > stats['last_seen']:
-                        stats['last_seen'] = metrics['timestamp']
-
-        # Calculate averages
-        for agent, stats in agent_stats.items():
-            if stats['amplification_ratios']:
-                stats['avg_amplification'] = statistics.mean(stats['amplification_ratios'])
-                stats['median_amplification'] = statistics.median(stats['amplification_ratios'])
-            else:
-                stats['avg_amplification'] = 0
-                stats['median_amplification'] = 0
-
-            if stats['cache_hit_rates']:
-                stats['avg_cache_hit_rate'] = statistics.mean(stats['cache_hit_rates'])
-            else:
-                stats['avg_cache_hit_rate'] = 0
-
-            # Clean up lists for serialization
-            del stats['amplification_ratios']
-            del stats['cache_hit_rates']
-
-        return dict(agent_stats)
-
-    def _analyze_temporal_distribution(self, delegations: List[Dict]) -> Dict:
-        """Analyze temporal distribution of delegations."""
-        temporal_stats = {
-            'by_date': defaultdict(lambda: defaultdict(int)),
-            'by_hour': defaultdict(int),
-            'by_weekday': defaultdict(int)
-        }
-
-        for delegation in delegations:
-            metrics = extract_delegation_metrics(delegation)
-            if metrics['timestamp'] and metrics['agent_type']:
-                try:
-                    dt = datetime.fromisoformat(metrics['timestamp'].replace('Z', '+00:00'))
-                    date_str = dt.strftime('%Y-%m-%d')
-                    hour = dt.hour
-                    weekday = dt.strftime('%A')
-
-                    temporal_stats['by_date'][date_str][metrics['agent_type']] += 1
-                    temporal_stats['by_hour'][hour] += 1
-                    temporal_stats['by_weekday'][weekday] += 1
-                except ValueError as e:
-                    self.add_warning(f"Invalid timestamp: {metrics['timestamp']}")
-                    continue
-
-        # Convert defaultdicts to regular dicts for serialization
-        return {
-            'by_date': {date: dict(agents) for date, agents in temporal_stats['by_date'].items()},
-            'by_hour': dict(temporal_stats['by_hour']),
-            'by_weekday': dict(temporal_stats['by_weekday'])
-        }
-
-    def _calculate_global_metrics(self, delegations: List[Dict]) -> Dict:
-        """Calculate global token metrics."""
-        totals = calculate_token_totals(delegations)
-
-        return {
-            'total_delegations': totals['total_delegations'],
-            'total_input_tokens': totals['total_input_tokens'],
-            'total_output_tokens': totals['total_output_tokens'],
-            'total_cache_read': totals['total_cache_read_tokens'],
-            'total_cache_write': totals['total_cache_write_tokens'],
-            'total_tokens': totals['total_tokens'],
-            'global_amplification': totals['global_amplification_ratio'],
-            'global_cache_efficiency': totals['global_cache_efficiency']
-        }
-
     def _build_summary(self, global_metrics: Dict, agent_stats: Dict) -> str:
         """Build human-readable summary."""
         lines = []